@@ -3,6 +3,34 @@ import { NextRequest, NextResponse } from 'next/server';
 // Orders Service URL from environment
 const NEXT_PUBLIC_ORDERS_SERVICE_URL = process.env.NEXT_PUBLIC_ORDERS_SERVICE_URL || 'http://localhost:8003';
 
+// Request headers forwarded to the orders service (partial and conditional downloads)
+const FORWARDED_REQUEST_HEADERS = ['range', 'if-none-match', 'if-modified-since', 'if-range'];
+
+// Response headers passed back to the browser
+const FORWARDED_RESPONSE_HEADERS = [
+  'content-type',
+  'content-length',
+  'content-disposition',
+  'content-range',
+  'accept-ranges',
+  'etag',
+  'last-modified',
+  'cache-control',
+];
+
+// Helper function to get auth token from request
+function getAuthorization(request: NextRequest): string | null {
+  // Try the Authorization header first (fetch from the app)
+  const authHeader = request.headers.get('authorization');
+  if (authHeader) {
+    return authHeader;
+  }
+
+  // Fall back to the access_token cookie (e.g. <img src> thumbnails)
+  const tokenCookie = request.cookies.get('access_token');
+  return tokenCookie?.value ? `Bearer ${tokenCookie.value}` : null;
+}
+
 export async function GET(
   request: NextRequest,
   { params }: { params: Promise<{ documentId: string }> }
@@ -20,48 +48,50 @@ export async function GET(
       );
     }
 
-    console.log('=== PROXY DOWNLOAD ===');
-    console.log('Document ID:', documentId);
-    console.log('Auth header present:', !!request.headers.get('authorization'));
+    // Keep the query string (?variant=thumbnail|preview)
+    const url = `${NEXT_PUBLIC_ORDERS_SERVICE_URL}/api/v1/orders/documents/${documentId}/download${request.nextUrl.search}`;
 
-    const url = `${NEXT_PUBLIC_ORDERS_SERVICE_URL}/api/v1/orders/documents/${documentId}/download`;
+    const headers: Record<string, string> = {};
+    const authorization = getAuthorization(request);
+    if (authorization) {
+      headers['Authorization'] = authorization;
+    }
+    for (const name of FORWARDED_REQUEST_HEADERS) {
+      const value = request.headers.get(name);
+      if (value) {
+        headers[name] = value;
+      }
+    }
 
     const response = await fetch(url, {
       method: 'GET',
-      headers: {
-        // Forward authorization headers if any - use same pattern as other working APIs
-        ...(request.headers.get('authorization') && {
-          'Authorization': request.headers.get('authorization')!
-        }),
-      },
+      headers,
     });
 
-    console.log('Response status:', response.status);
-
-    if (!response.ok) {
+    if (!response.ok && response.status !== 304) {
       const errorData = await response.json().catch(() => ({}));
-      console.error('Failed to download document:', errorData);
+      console.error('Failed to download document:', response.status, errorData);
       return NextResponse.json(
         { error: errorData.detail || 'Failed to download document' },
         { status: response.status }
       );
     }
 
-    // Get content type from response
-    const contentType = response.headers.get('content-type') || 'application/octet-stream';
-    console.log('Content-Type:', contentType);
-
-    // Get the file blob
-    const blob = await response.blob();
-    console.log('Blob size:', blob.size);
+    const responseHeaders = new Headers();
+    for (const name of FORWARDED_RESPONSE_HEADERS) {
+      const value = response.headers.get(name);
+      if (value) {
+        responseHeaders.set(name, value);
+      }
+    }
+    if (!responseHeaders.has('content-disposition') && response.status !== 304) {
+      responseHeaders.set('content-disposition', 'attachment');
+    }
 
-    // Return the file with proper headers
-    return new NextResponse(blob, {
-      status: 200,
-      headers: {
-        'Content-Type': contentType,
-        'Content-Disposition': response.headers.get('content-disposition') || 'attachment',
-      },
+    // Stream the body through instead of buffering the whole file (200, 206 or 304)
+    return new NextResponse(response.status === 304 ? null : response.body, {
+      status: response.status,
+      headers: responseHeaders,
     });
 
   } catch (error) {
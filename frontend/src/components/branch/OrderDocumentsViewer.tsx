@@ -13,6 +13,8 @@ interface OrderDocument {
   file_size: number;
   mime_type: string;
   download_url: string;
+  thumbnail_url?: string | null;  // Resized variants, once rendered (served by the download route)
+  preview_url?: string | null;
   created_at: string;
   uploaded_by: string;
 }
@@ -182,7 +184,14 @@ export function OrderDocumentsViewer({ orderId }: OrderDocumentsViewerProps) {
 
       let url: string;
 
-      // Always fetch the file as blob for proper streaming from MinIO
+      // Images with a rendered preview variant are shown from it directly
+      if (isImage(doc.mime_type) && doc.preview_url) {
+        setPreviewUrl(doc.preview_url);
+        setPreviewDoc(doc);
+        return;
+      }
+
+      // Otherwise fetch the file as blob for proper streaming from MinIO
       // This works for both presigned URLs and API routes
       let response: Response;
 
@@ -327,7 +336,16 @@ export function OrderDocumentsViewer({ orderId }: OrderDocumentsViewerProps) {
                   <div className="flex items-center justify-between p-3 bg-gray-50">
                     <div className="flex items-center gap-3 flex-1 min-w-0">
                       <div className="flex-shrink-0">
-                        {getFileIcon(doc.mime_type)}
+                        {doc.thumbnail_url ? (
+                          <img
+                            src={doc.thumbnail_url}
+                            alt={doc.title}
+                            loading="lazy"
+                            className="w-10 h-10 object-cover rounded border border-gray-200"
+                          />
+                        ) : (
+                          getFileIcon(doc.mime_type)
+                        )}
                       </div>
                       <div className="flex-1 min-w-0">
                         <p className="text-sm font-medium text-gray-900 truncate">
@@ -849,8 +849,10 @@ ALTER TABLE vehicle_types ENABLE ROW LEVEL SECURITY;
 -- ================================================================================
 
 -- Create audit_logs table
+-- Range partitioned by month on created_at; the company service creates
+-- upcoming partitions and retires expired ones (src/services/audit_partitions.py)
 CREATE TABLE IF NOT EXISTS audit_logs (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     tenant_id VARCHAR(255) NOT NULL,
 
     -- User information
@@ -893,28 +895,19 @@ CREATE TABLE IF NOT EXISTS audit_logs (
 
     -- Timestamps
     action_timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
 
 -- Create indexes for audit_logs performance
-CREATE INDEX IF NOT EXISTS idx_audit_logs_tenant_created ON audit_logs(tenant_id, created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_tenant_action_timestamp ON audit_logs(tenant_id, action_timestamp DESC);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_tenant_module_entity ON audit_logs(tenant_id, module, entity_id);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_tenant_user_created ON audit_logs(tenant_id, user_id, created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_tenant_user_action_timestamp ON audit_logs(tenant_id, user_id, action_timestamp DESC);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_entity_type_id ON audit_logs(entity_type, entity_id);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_action ON audit_logs(action);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_module ON audit_logs(module);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_sub_module ON audit_logs(sub_module);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at ON audit_logs(created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_action_timestamp ON audit_logs(action_timestamp DESC);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_status_changed ON audit_logs(status_changed);
+-- Composite, tenant-first indexes matching the audit access paths (cascade to partitions)
+CREATE INDEX IF NOT EXISTS idx_audit_logs_tenant_module_entity_created ON audit_logs(tenant_id, module, entity_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_tenant_created ON audit_logs(tenant_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_tenant_user_created ON audit_logs(tenant_id, user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_entity_module_type_created ON audit_logs(entity_id, module, entity_type, created_at);
 CREATE INDEX IF NOT EXISTS idx_audit_logs_request_id ON audit_logs(request_id);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_from_status ON audit_logs(from_status);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_to_status ON audit_logs(to_status);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_old_status ON audit_logs(old_status);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_new_status ON audit_logs(new_status);
 
 -- Composite index for efficient status change queries
 CREATE INDEX IF NOT EXISTS idx_audit_logs_status_change ON audit_logs(entity_type, entity_id, action, action_timestamp DESC) WHERE action = 'status_change';
@@ -68,6 +68,176 @@ CREATE INDEX IF NOT EXISTS idx_approval_audit_created_at ON approval_audit(creat
 -- Create triggers to update updated_at
 CREATE TRIGGER update_approval_actions_updated_at BEFORE UPDATE ON approval_actions FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Daily rollups of finance approvals for the reports (see migration 035)
+CREATE TABLE IF NOT EXISTS finance_approval_daily_rollups (
+    id BIGSERIAL PRIMARY KEY,
+    tenant_id VARCHAR(50) NOT NULL,
+    day DATE NOT NULL,
+    customer_id VARCHAR(50),
+    payment_type VARCHAR(20),
+    status VARCHAR(50) NOT NULL,
+    approver_id VARCHAR(50),
+    customer_name VARCHAR(200),
+    approver_name VARCHAR(100),
+    order_count INTEGER NOT NULL DEFAULT 0,
+    order_amount NUMERIC(16, 2) NOT NULL DEFAULT 0,
+    approved_amount NUMERIC(16, 2) NOT NULL DEFAULT 0,
+    timed_count INTEGER NOT NULL DEFAULT 0,
+    approval_seconds_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    approval_seconds_min DOUBLE PRECISION,
+    approval_seconds_max DOUBLE PRECISION,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_finance_approval_daily_rollups_key
+    ON finance_approval_daily_rollups (tenant_id, day, customer_id, payment_type, status, approver_id)
+    NULLS NOT DISTINCT;
+
+-- Day an approval counts for: the decision day in UTC, the creation day while pending
+CREATE OR REPLACE FUNCTION finance_rollup_day(approved_at TIMESTAMPTZ, created_at TIMESTAMPTZ)
+RETURNS DATE AS $$
+    SELECT (COALESCE(approved_at, created_at) AT TIME ZONE 'UTC')::date
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Serves the partial-day reads and the min/max recomputation below
+CREATE INDEX IF NOT EXISTS idx_approval_actions_tenant_rollup_day
+    ON approval_actions (tenant_id, finance_rollup_day(approved_at, created_at));
+
+-- Apply the signed contributions of each statement's changed rows
+CREATE OR REPLACE FUNCTION apply_approval_rollup_changes()
+RETURNS TRIGGER AS $$
+DECLARE
+    changes TEXT;
+BEGIN
+    changes := CASE TG_OP
+        WHEN 'INSERT' THEN 'SELECT n.*, 1 AS sign FROM new_rows n'
+        WHEN 'DELETE' THEN 'SELECT o.*, -1 AS sign FROM old_rows o'
+        ELSE 'SELECT n.*, 1 AS sign FROM new_rows n UNION ALL SELECT o.*, -1 AS sign FROM old_rows o'
+    END;
+
+    EXECUTE format($sql$
+        WITH contributions AS (
+            SELECT
+                c.*,
+                (c.status = 'approved' AND c.approved_at IS NOT NULL) AS timed,
+                EXTRACT(EPOCH FROM c.approved_at - c.created_at) AS approval_seconds
+            FROM (%s) c
+            WHERE c.approval_type = 'finance' AND c.is_active IS TRUE
+        )
+        INSERT INTO finance_approval_daily_rollups AS r (
+            tenant_id, day, customer_id, payment_type, status, approver_id,
+            customer_name, approver_name, order_count, order_amount, approved_amount,
+            timed_count, approval_seconds_sum, approval_seconds_min, approval_seconds_max
+        )
+        SELECT
+            tenant_id,
+            finance_rollup_day(approved_at, created_at),
+            customer_id,
+            payment_type,
+            status,
+            approver_id,
+            MAX(customer_name) FILTER (WHERE sign > 0),
+            MAX(approver_name) FILTER (WHERE sign > 0),
+            SUM(sign),
+            COALESCE(SUM(sign * order_amount), 0),
+            COALESCE(SUM(sign * approved_amount), 0),
+            COALESCE(SUM(sign) FILTER (WHERE timed), 0),
+            COALESCE(SUM(sign * approval_seconds) FILTER (WHERE timed), 0),
+            MIN(approval_seconds) FILTER (WHERE timed AND sign > 0),
+            MAX(approval_seconds) FILTER (WHERE timed AND sign > 0)
+        FROM contributions
+        GROUP BY 1, 2, 3, 4, 5, 6
+        -- An UPDATE that changed none of the rolled-up columns nets out to nothing
+        HAVING SUM(sign) <> 0
+            OR COALESCE(SUM(sign * order_amount), 0) <> 0
+            OR COALESCE(SUM(sign * approved_amount), 0) <> 0
+            OR COALESCE(SUM(sign * approval_seconds) FILTER (WHERE timed), 0) <> 0
+        ON CONFLICT (tenant_id, day, customer_id, payment_type, status, approver_id) DO UPDATE SET
+            customer_name = COALESCE(EXCLUDED.customer_name, r.customer_name),
+            approver_name = COALESCE(EXCLUDED.approver_name, r.approver_name),
+            order_count = r.order_count + EXCLUDED.order_count,
+            order_amount = r.order_amount + EXCLUDED.order_amount,
+            approved_amount = r.approved_amount + EXCLUDED.approved_amount,
+            timed_count = r.timed_count + EXCLUDED.timed_count,
+            approval_seconds_sum = r.approval_seconds_sum + EXCLUDED.approval_seconds_sum,
+            approval_seconds_min = LEAST(r.approval_seconds_min, EXCLUDED.approval_seconds_min),
+            approval_seconds_max = GREATEST(r.approval_seconds_max, EXCLUDED.approval_seconds_max),
+            updated_at = NOW()
+    $sql$, changes);
+
+    IF TG_OP = 'INSERT' THEN
+        RETURN NULL;
+    END IF;
+
+    -- Min/max cannot be decremented: recompute them where timed rows went away
+    UPDATE finance_approval_daily_rollups r
+    SET approval_seconds_min = t.min_seconds,
+        approval_seconds_max = t.max_seconds
+    FROM (
+        SELECT
+            k.tenant_id, k.day, k.customer_id, k.payment_type, k.status, k.approver_id,
+            MIN(EXTRACT(EPOCH FROM a.approved_at - a.created_at)) AS min_seconds,
+            MAX(EXTRACT(EPOCH FROM a.approved_at - a.created_at)) AS max_seconds
+        FROM (
+            SELECT DISTINCT
+                tenant_id, finance_rollup_day(approved_at, created_at) AS day,
+                customer_id, payment_type, status, approver_id
+            FROM old_rows
+            WHERE approval_type = 'finance' AND is_active IS TRUE
+              AND status = 'approved' AND approved_at IS NOT NULL
+        ) k
+        LEFT JOIN approval_actions a
+          ON a.tenant_id = k.tenant_id
+         AND finance_rollup_day(a.approved_at, a.created_at) = k.day
+         AND a.customer_id IS NOT DISTINCT FROM k.customer_id
+         AND a.payment_type IS NOT DISTINCT FROM k.payment_type
+         AND a.status = k.status
+         AND a.approver_id IS NOT DISTINCT FROM k.approver_id
+         AND a.approval_type = 'finance' AND a.is_active IS TRUE
+         AND a.approved_at IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5, 6
+    ) t
+    WHERE r.tenant_id = t.tenant_id
+      AND r.day = t.day
+      AND r.customer_id IS NOT DISTINCT FROM t.customer_id
+      AND r.payment_type IS NOT DISTINCT FROM t.payment_type
+      AND r.status = t.status
+      AND r.approver_id IS NOT DISTINCT FROM t.approver_id;
+
+    DELETE FROM finance_approval_daily_rollups r
+    USING (
+        SELECT DISTINCT tenant_id, finance_rollup_day(approved_at, created_at) AS day
+        FROM old_rows
+    ) k
+    WHERE r.tenant_id = k.tenant_id
+      AND r.day = k.day
+      AND r.order_count = 0;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS rollup_approval_actions_insert ON approval_actions;
+CREATE TRIGGER rollup_approval_actions_insert
+    AFTER INSERT ON approval_actions
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_approval_rollup_changes();
+
+DROP TRIGGER IF EXISTS rollup_approval_actions_update ON approval_actions;
+CREATE TRIGGER rollup_approval_actions_update
+    AFTER UPDATE ON approval_actions
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_approval_rollup_changes();
+
+DROP TRIGGER IF EXISTS rollup_approval_actions_delete ON approval_actions;
+CREATE TRIGGER rollup_approval_actions_delete
+    AFTER DELETE ON approval_actions
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_approval_rollup_changes();
+
 -- Add foreign key constraints (commented out as they may not be needed with multi-service architecture)
 -- ALTER TABLE approval_audit ADD CONSTRAINT fk_approval_audit_approval_action_id FOREIGN KEY (approval_action_id) REFERENCES approval_actions(id) ON DELETE CASCADE;
 
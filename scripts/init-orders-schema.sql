@@ -22,6 +22,8 @@ CREATE TABLE IF NOT EXISTS orders (
     branch_id VARCHAR(255) NOT NULL,
     order_type VARCHAR(20) NOT NULL DEFAULT 'delivery',
     status VARCHAR(50) NOT NULL DEFAULT 'draft',
+    status_changed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    previous_status VARCHAR(50),
     priority VARCHAR(20) NOT NULL DEFAULT 'normal',
     tms_order_status VARCHAR(50) DEFAULT 'available' CHECK (
         tms_order_status IN ('available', 'partial', 'fully_assigned')
@@ -29,6 +31,10 @@ CREATE TABLE IF NOT EXISTS orders (
     items_json JSONB,
     remaining_items_json JSONB,
 
+    -- Customer snapshot captured from the company service
+    customer_snapshot JSONB,
+    customer_snapshot_at TIMESTAMP WITH TIME ZONE,
+
     -- Pickup information
     pickup_address TEXT,
     pickup_contact_name VARCHAR(100),
@@ -112,6 +118,7 @@ CREATE TABLE IF NOT EXISTS order_items (
     total_price NUMERIC(12, 2),
     weight NUMERIC(10, 2),
     volume NUMERIC(10, 2),
+    product_snapshot JSONB,
     dimensions_length NUMERIC(8, 2),
     dimensions_width NUMERIC(8, 2),
     dimensions_height NUMERIC(8, 2),
@@ -138,6 +145,7 @@ CREATE TABLE IF NOT EXISTS order_documents (
     file_size INTEGER NOT NULL,
     mime_type VARCHAR(100) NOT NULL,
     file_hash VARCHAR(64),
+    derivatives JSONB,
     is_required BOOLEAN DEFAULT false,
     is_verified BOOLEAN DEFAULT false,
     verified_by VARCHAR(255),
@@ -171,6 +179,8 @@ CREATE INDEX IF NOT EXISTS idx_orders_driver_id ON orders(driver_id);
 CREATE INDEX IF NOT EXISTS idx_orders_trip_id ON orders(trip_id);
 CREATE INDEX IF NOT EXISTS idx_orders_is_active ON orders(is_active);
 CREATE INDEX IF NOT EXISTS idx_orders_created_by_role ON orders(created_by_role);
+CREATE INDEX IF NOT EXISTS idx_orders_tenant_status_created ON orders(tenant_id, status, created_at)
+    INCLUDE (payment_type, total_amount) WHERE is_active = TRUE;
 
 CREATE INDEX IF NOT EXISTS idx_order_items_order_id ON order_items(order_id);
 CREATE INDEX IF NOT EXISTS idx_order_items_product_id ON order_items(product_id);
@@ -229,6 +239,20 @@ CREATE TRIGGER update_order_items_updated_at BEFORE UPDATE ON order_items FOR EA
 CREATE TRIGGER update_order_documents_updated_at BEFORE UPDATE ON order_documents FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_trip_item_assignments_updated_at BEFORE UPDATE ON trip_item_assignments FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Track the last status change on orders
+CREATE OR REPLACE FUNCTION track_order_status_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.status IS DISTINCT FROM OLD.status THEN
+        NEW.previous_status = OLD.status;
+        NEW.status_changed_at = NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER track_orders_status_change BEFORE UPDATE OF status ON orders FOR EACH ROW EXECUTE FUNCTION track_order_status_change();
+
 -- Create sequence for order numbers
 CREATE SEQUENCE IF NOT EXISTS order_number_seq
     START WITH 1
@@ -267,6 +291,17 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Planner row estimate of a query, for the estimated order list count
+CREATE OR REPLACE FUNCTION count_estimate(query TEXT)
+RETURNS BIGINT AS $$
+DECLARE
+    plan JSON;
+BEGIN
+    EXECUTE 'EXPLAIN (FORMAT JSON) ' || query INTO plan;
+    RETURN (plan->0->'Plan'->>'Plan Rows')::BIGINT;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
 -- Create function to update item statuses for an order (called by TMS service)
 CREATE OR REPLACE FUNCTION update_order_items_status(
     p_order_id VARCHAR,
@@ -455,6 +490,32 @@ CREATE TRIGGER trigger_update_order_status_from_trip_assignments
     FOR EACH ROW
     EXECUTE FUNCTION update_order_status_from_items();
 
+-- Tombstones of removed trip item assignments, for the driver delta sync (migration 038)
+CREATE TABLE IF NOT EXISTS trip_item_assignment_tombstones (
+    id BIGSERIAL PRIMARY KEY,
+    assignment_id UUID NOT NULL,
+    trip_id VARCHAR(50) NOT NULL,
+    tenant_id VARCHAR(255) NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION record_trip_item_assignment_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO trip_item_assignment_tombstones (assignment_id, trip_id, tenant_id)
+    VALUES (OLD.id, OLD.trip_id, OLD.tenant_id);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER record_trip_item_assignments_tombstone
+    AFTER DELETE ON trip_item_assignments
+    FOR EACH ROW
+    EXECUTE FUNCTION record_trip_item_assignment_tombstone();
+
+CREATE INDEX IF NOT EXISTS idx_trip_item_assignment_tombstones_trip_deleted ON trip_item_assignment_tombstones(trip_id, deleted_at);
+CREATE INDEX IF NOT EXISTS idx_trip_item_assignment_tombstones_deleted_at ON trip_item_assignment_tombstones(deleted_at);
+
 -- Grant permissions to the application user
 GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA public TO postgres;
 GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA public TO postgres;
\ No newline at end of file
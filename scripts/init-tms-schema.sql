@@ -30,6 +30,9 @@ CREATE TABLE IF NOT EXISTS trips (
     paused_at TIMESTAMP WITH TIME ZONE,
     paused_reason VARCHAR(500),
     resumed_at TIMESTAMP WITH TIME ZONE,
+    status_changed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    previous_status VARCHAR(50),
+    sync_version BIGINT, -- Last writing transaction, for the driver delta sync
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW()
 );
@@ -75,7 +78,9 @@ CREATE TABLE IF NOT EXISTS trip_orders (
     original_items INTEGER,        -- For split orders
     original_weight INTEGER,       -- For split orders
     items_json JSONB,              -- Store assigned items with quantities and statuses
-    remaining_items_json JSONB     -- Store remaining items for partial assignments
+    remaining_items_json JSONB,    -- Store remaining items for partial assignments
+    sync_version BIGINT,           -- Last writing transaction, for the driver delta sync
+    updated_at TIMESTAMP DEFAULT NOW()
 );
 
 -- Trip Routes Table (for delivery sequence)
@@ -94,6 +99,39 @@ CREATE TABLE IF NOT EXISTS trip_routes (
     created_at TIMESTAMP DEFAULT NOW()
 );
 
+-- Trips and stops removed from a driver, for the driver delta sync
+CREATE TABLE IF NOT EXISTS driver_sync_tombstones (
+    id BIGSERIAL PRIMARY KEY,
+    driver_id VARCHAR(50) NOT NULL,
+    entity_type VARCHAR(20) NOT NULL CHECK (entity_type IN ('trip', 'stop')),
+    entity_id VARCHAR(50) NOT NULL,
+    trip_id VARCHAR(50) NOT NULL,
+    sync_version BIGINT NOT NULL DEFAULT (pg_current_xact_id()::text::bigint),
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Outcome of each offline driver journal event, keyed by client event id
+CREATE TABLE IF NOT EXISTS driver_journal_events (
+    event_id VARCHAR(64) PRIMARY KEY,
+    driver_id VARCHAR(50) NOT NULL,
+    trip_id VARCHAR(50) NOT NULL,
+    event_type VARCHAR(30) NOT NULL,
+    result VARCHAR(20) NOT NULL CHECK (result IN ('applied', 'rejected')),
+    detail TEXT,
+    occurred_at TIMESTAMP,
+    applied_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Journal item statuses not yet accepted by the orders service (retried on the next journal)
+CREATE TABLE IF NOT EXISTS pending_order_item_syncs (
+    trip_id VARCHAR(50) PRIMARY KEY,
+    tenant_id VARCHAR(50),
+    item_statuses JSON NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
 -- Audit Logs Table
 CREATE TABLE IF NOT EXISTS tms_audit_logs (
     id SERIAL PRIMARY KEY,
@@ -114,6 +152,8 @@ CREATE INDEX IF NOT EXISTS idx_trips_branch ON trips(branch);
 CREATE INDEX IF NOT EXISTS idx_trips_user_id ON trips(user_id);
 CREATE INDEX IF NOT EXISTS idx_trips_company_id ON trips(company_id);
 CREATE INDEX IF NOT EXISTS idx_trips_user_company ON trips(user_id, company_id);
+CREATE INDEX IF NOT EXISTS idx_trips_driver_created ON trips(driver_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_trips_driver_sync_version ON trips(driver_id, sync_version);
 CREATE INDEX IF NOT EXISTS idx_trip_orders_trip_id ON trip_orders(trip_id);
 CREATE INDEX IF NOT EXISTS idx_trip_orders_order_id ON trip_orders(order_id);
 CREATE INDEX IF NOT EXISTS idx_trip_orders_tms_status ON trip_orders(tms_order_status);
@@ -123,6 +163,10 @@ CREATE INDEX IF NOT EXISTS idx_trip_orders_sequence ON trip_orders(trip_id, sequ
 CREATE INDEX IF NOT EXISTS idx_trip_orders_user_id ON trip_orders(user_id);
 CREATE INDEX IF NOT EXISTS idx_trip_orders_company_id ON trip_orders(company_id);
 CREATE INDEX IF NOT EXISTS idx_trip_orders_user_company ON trip_orders(user_id, company_id);
+CREATE INDEX IF NOT EXISTS idx_trip_orders_trip_sync_version ON trip_orders(trip_id, sync_version);
+CREATE INDEX IF NOT EXISTS idx_driver_sync_tombstones_driver_version ON driver_sync_tombstones(driver_id, sync_version);
+CREATE INDEX IF NOT EXISTS idx_driver_sync_tombstones_created_at ON driver_sync_tombstones(created_at);
+CREATE INDEX IF NOT EXISTS idx_driver_journal_events_driver_applied ON driver_journal_events(driver_id, applied_at);
 CREATE INDEX IF NOT EXISTS idx_trip_routes_trip_id ON trip_routes(trip_id);
 CREATE INDEX IF NOT EXISTS idx_trip_routes_user_id ON trip_routes(user_id);
 CREATE INDEX IF NOT EXISTS idx_trip_routes_company_id ON trip_routes(company_id);
@@ -147,6 +191,94 @@ CREATE TRIGGER update_trips_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Function to track the last status change on trips
+CREATE OR REPLACE FUNCTION track_trip_status_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.status IS DISTINCT FROM OLD.status THEN
+        NEW.previous_status = OLD.status;
+        NEW.status_changed_at = NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS track_trips_status_change ON trips;
+CREATE TRIGGER track_trips_status_change
+    BEFORE UPDATE OF status ON trips
+    FOR EACH ROW
+    EXECUTE FUNCTION track_trip_status_change();
+
+DROP TRIGGER IF EXISTS update_trip_orders_updated_at ON trip_orders;
+CREATE TRIGGER update_trip_orders_updated_at
+    BEFORE UPDATE ON trip_orders
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Function to stamp the writing transaction on trips and trip_orders (driver delta sync)
+CREATE OR REPLACE FUNCTION stamp_sync_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.sync_version = pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS stamp_trips_sync_version ON trips;
+CREATE TRIGGER stamp_trips_sync_version
+    BEFORE INSERT OR UPDATE ON trips
+    FOR EACH ROW
+    EXECUTE FUNCTION stamp_sync_version();
+
+DROP TRIGGER IF EXISTS stamp_trip_orders_sync_version ON trip_orders;
+CREATE TRIGGER stamp_trip_orders_sync_version
+    BEFORE INSERT OR UPDATE ON trip_orders
+    FOR EACH ROW
+    EXECUTE FUNCTION stamp_sync_version();
+
+-- Function to leave tombstones for deleted or reassigned trips
+CREATE OR REPLACE FUNCTION record_trip_sync_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO driver_sync_tombstones (driver_id, entity_type, entity_id, trip_id)
+        VALUES (OLD.driver_id, 'trip', OLD.id, OLD.id);
+        RETURN OLD;
+    END IF;
+
+    -- Reassigned: the previous driver drops the trip, the new one receives its stops
+    IF NEW.driver_id IS DISTINCT FROM OLD.driver_id THEN
+        INSERT INTO driver_sync_tombstones (driver_id, entity_type, entity_id, trip_id)
+        VALUES (OLD.driver_id, 'trip', OLD.id, OLD.id);
+        UPDATE trip_orders SET updated_at = NOW() WHERE trip_id = NEW.id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS record_trips_sync_change ON trips;
+CREATE TRIGGER record_trips_sync_change
+    AFTER DELETE OR UPDATE OF driver_id ON trips
+    FOR EACH ROW
+    EXECUTE FUNCTION record_trip_sync_change();
+
+-- Function to leave tombstones for stops removed from a trip
+CREATE OR REPLACE FUNCTION record_trip_order_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- No row when the whole trip is being deleted; its trip tombstone covers the stops
+    INSERT INTO driver_sync_tombstones (driver_id, entity_type, entity_id, trip_id)
+    SELECT driver_id, 'stop', OLD.id::text, OLD.trip_id FROM trips WHERE id = OLD.trip_id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS record_trip_orders_tombstone ON trip_orders;
+CREATE TRIGGER record_trip_orders_tombstone
+    AFTER DELETE ON trip_orders
+    FOR EACH ROW
+    EXECUTE FUNCTION record_trip_order_tombstone();
+
 -- Function to log trip changes
 CREATE OR REPLACE FUNCTION log_trip_changes()
 RETURNS TRIGGER AS $$
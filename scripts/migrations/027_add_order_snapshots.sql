@@ -0,0 +1,19 @@
+-- Migration: Add denormalized customer/product snapshots to orders
+-- Description: Orders keep a compact copy of their customer and order items keep
+-- a copy of their product, so order reads no longer call the company service.
+-- Existing rows are backfilled lazily by the orders service on first read.
+
+ALTER TABLE orders ADD COLUMN IF NOT EXISTS customer_snapshot JSONB;
+ALTER TABLE orders ADD COLUMN IF NOT EXISTS customer_snapshot_at TIMESTAMP WITH TIME ZONE;
+
+ALTER TABLE order_items ADD COLUMN IF NOT EXISTS product_snapshot JSONB;
+
+COMMENT ON COLUMN orders.customer_snapshot IS 'Customer details captured from the company service when the order was saved';
+COMMENT ON COLUMN orders.customer_snapshot_at IS 'When customer_snapshot was captured or last refreshed';
+COMMENT ON COLUMN order_items.product_snapshot IS 'Product details captured from the product service when the item was saved';
+
+-- Change events refresh snapshots of open orders by customer / product
+CREATE INDEX IF NOT EXISTS idx_order_items_product_id ON order_items(product_id);
+
+-- Grant permissions
+GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA public TO postgres;
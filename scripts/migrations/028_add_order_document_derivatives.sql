@@ -0,0 +1,11 @@
+-- Migration: Add resized image variants to order documents
+-- Description: Thumbnails and previews of image documents are rendered in the
+-- background after upload and stored next to the original in MinIO. The
+-- column records which variants exist; NULL means none were rendered yet.
+
+ALTER TABLE order_documents ADD COLUMN IF NOT EXISTS derivatives JSONB;
+
+COMMENT ON COLUMN order_documents.derivatives IS 'Resized image variants: name -> {path, mime_type, size, width, height}';
+
+-- Grant permissions
+GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA public TO postgres;
@@ -0,0 +1,39 @@
+-- Migration 029: Track the last status change on trips (tms_db)
+-- Description: trips.status_changed_at / previous_status replace the per-request
+-- lookup of the latest 'status_change' audit log in company_db. A trigger keeps
+-- them current for every write path (ORM updates and bulk UPDATE statements).
+--
+-- Existing trips start from created_at; run the backfill job afterwards to load
+-- the real timestamps from company_db audit_logs:
+--     python scripts/backfill_trip_status_changes.py   (in services/tms)
+
+-- Step 1: Add columns (no default yet, so existing rows are not stamped with NOW())
+ALTER TABLE trips ADD COLUMN IF NOT EXISTS status_changed_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE trips ADD COLUMN IF NOT EXISTS previous_status VARCHAR(50);
+
+-- Step 2: Provisional backfill
+UPDATE trips SET status_changed_at = created_at WHERE status_changed_at IS NULL;
+
+ALTER TABLE trips ALTER COLUMN status_changed_at SET DEFAULT NOW();
+
+-- Step 3: Maintain the columns on every status change
+CREATE OR REPLACE FUNCTION track_trip_status_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.status IS DISTINCT FROM OLD.status THEN
+        NEW.previous_status = OLD.status;
+        NEW.status_changed_at = NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS track_trips_status_change ON trips;
+CREATE TRIGGER track_trips_status_change
+    BEFORE UPDATE OF status ON trips
+    FOR EACH ROW
+    EXECUTE FUNCTION track_trip_status_change();
+
+-- Step 4: Add comments for documentation
+COMMENT ON COLUMN trips.status_changed_at IS 'When the trip entered its current status';
+COMMENT ON COLUMN trips.previous_status IS 'Status before the last status change';
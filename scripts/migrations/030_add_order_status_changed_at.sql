@@ -0,0 +1,50 @@
+-- Migration 030: Track the last status change on orders (orders_db)
+-- Description: orders.status_changed_at / previous_status replace the
+-- per-request aggregation over order_status_history in the order list. A
+-- trigger keeps them current for every write path, including the
+-- update_order_status_from_items() trigger.
+
+-- Step 1: Add columns (no default yet, so existing rows are not stamped with NOW())
+ALTER TABLE orders ADD COLUMN IF NOT EXISTS status_changed_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE orders ADD COLUMN IF NOT EXISTS previous_status VARCHAR(50);
+
+-- Step 2: Backfill from the latest status history entry of each order
+UPDATE orders o
+SET status_changed_at = h.created_at,
+    previous_status = h.from_status
+FROM (
+    SELECT DISTINCT ON (order_id) order_id, created_at, from_status
+    FROM order_status_history
+    ORDER BY order_id, created_at DESC
+) h
+WHERE h.order_id = o.id
+  AND o.status_changed_at IS NULL;
+
+UPDATE orders SET status_changed_at = created_at WHERE status_changed_at IS NULL;
+
+ALTER TABLE orders ALTER COLUMN status_changed_at SET DEFAULT NOW();
+
+-- Step 3: Maintain the columns on every status change
+CREATE OR REPLACE FUNCTION track_order_status_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.status IS DISTINCT FROM OLD.status THEN
+        NEW.previous_status = OLD.status;
+        NEW.status_changed_at = NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS track_orders_status_change ON orders;
+CREATE TRIGGER track_orders_status_change
+    BEFORE UPDATE OF status ON orders
+    FOR EACH ROW
+    EXECUTE FUNCTION track_order_status_change();
+
+-- Step 4: Add comments for documentation
+COMMENT ON COLUMN orders.status_changed_at IS 'When the order entered its current status';
+COMMENT ON COLUMN orders.previous_status IS 'Status before the last status change';
+
+-- Grant permissions
+GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA public TO postgres;
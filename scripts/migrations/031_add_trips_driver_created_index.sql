@@ -0,0 +1,7 @@
+-- Migration 031: Index for the paged driver trip list (tms_db)
+-- Description: GET /api/v1/driver/trips pages a driver's trips newest first
+-- with a keyset cursor on (created_at, id). This index serves both the filter
+-- and the order, so a page reads only `limit` index entries however long the
+-- driver's history is. Order counts use idx_trip_orders_trip_id.
+
+CREATE INDEX IF NOT EXISTS idx_trips_driver_created ON trips(driver_id, created_at DESC, id DESC);
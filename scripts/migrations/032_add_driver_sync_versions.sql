@@ -0,0 +1,106 @@
+-- Migration 032: Change versions for the driver delta sync (tms_db)
+-- Description: GET /api/v1/driver/sync returns only the trips and stops that
+-- changed since the client's cursor. Every insert/update of trips and
+-- trip_orders stamps sync_version with the writing transaction's id, and
+-- deleted (or reassigned) rows leave a tombstone for the driver who had them.
+--
+-- A sync reads the snapshot xmin first and hands it out as the next cursor;
+-- every transaction below it has finished, so rows with
+-- sync_version >= cursor are all a client can still be missing, however
+-- the writing transactions interleave.
+
+-- Step 1: Version columns
+ALTER TABLE trips ADD COLUMN IF NOT EXISTS sync_version BIGINT;
+ALTER TABLE trip_orders ADD COLUMN IF NOT EXISTS sync_version BIGINT;
+ALTER TABLE trip_orders ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT NOW();
+
+UPDATE trips SET sync_version = 0 WHERE sync_version IS NULL;
+UPDATE trip_orders SET sync_version = 0 WHERE sync_version IS NULL;
+
+-- Step 2: Stamp versions on every write path (ORM and bulk UPDATE statements)
+CREATE OR REPLACE FUNCTION stamp_sync_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.sync_version = pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS stamp_trips_sync_version ON trips;
+CREATE TRIGGER stamp_trips_sync_version
+    BEFORE INSERT OR UPDATE ON trips
+    FOR EACH ROW
+    EXECUTE FUNCTION stamp_sync_version();
+
+DROP TRIGGER IF EXISTS stamp_trip_orders_sync_version ON trip_orders;
+CREATE TRIGGER stamp_trip_orders_sync_version
+    BEFORE INSERT OR UPDATE ON trip_orders
+    FOR EACH ROW
+    EXECUTE FUNCTION stamp_sync_version();
+
+DROP TRIGGER IF EXISTS update_trip_orders_updated_at ON trip_orders;
+CREATE TRIGGER update_trip_orders_updated_at
+    BEFORE UPDATE ON trip_orders
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Step 3: Tombstones for rows a driver's device must drop
+CREATE TABLE IF NOT EXISTS driver_sync_tombstones (
+    id BIGSERIAL PRIMARY KEY,
+    driver_id VARCHAR(50) NOT NULL,
+    entity_type VARCHAR(20) NOT NULL CHECK (entity_type IN ('trip', 'stop')),
+    entity_id VARCHAR(50) NOT NULL,
+    trip_id VARCHAR(50) NOT NULL,
+    sync_version BIGINT NOT NULL DEFAULT (pg_current_xact_id()::text::bigint),
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION record_trip_sync_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO driver_sync_tombstones (driver_id, entity_type, entity_id, trip_id)
+        VALUES (OLD.driver_id, 'trip', OLD.id, OLD.id);
+        RETURN OLD;
+    END IF;
+
+    -- Reassigned: the previous driver drops the trip, the new one receives its stops
+    IF NEW.driver_id IS DISTINCT FROM OLD.driver_id THEN
+        INSERT INTO driver_sync_tombstones (driver_id, entity_type, entity_id, trip_id)
+        VALUES (OLD.driver_id, 'trip', OLD.id, OLD.id);
+        UPDATE trip_orders SET updated_at = NOW() WHERE trip_id = NEW.id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS record_trips_sync_change ON trips;
+CREATE TRIGGER record_trips_sync_change
+    AFTER DELETE OR UPDATE OF driver_id ON trips
+    FOR EACH ROW
+    EXECUTE FUNCTION record_trip_sync_change();
+
+CREATE OR REPLACE FUNCTION record_trip_order_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- No row when the whole trip is being deleted; its trip tombstone covers the stops
+    INSERT INTO driver_sync_tombstones (driver_id, entity_type, entity_id, trip_id)
+    SELECT driver_id, 'stop', OLD.id::text, OLD.trip_id FROM trips WHERE id = OLD.trip_id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS record_trip_orders_tombstone ON trip_orders;
+CREATE TRIGGER record_trip_orders_tombstone
+    AFTER DELETE ON trip_orders
+    FOR EACH ROW
+    EXECUTE FUNCTION record_trip_order_tombstone();
+
+-- Step 4: Indexes for the sync queries
+CREATE INDEX IF NOT EXISTS idx_trips_driver_sync_version ON trips(driver_id, sync_version);
+CREATE INDEX IF NOT EXISTS idx_trip_orders_trip_sync_version ON trip_orders(trip_id, sync_version);
+CREATE INDEX IF NOT EXISTS idx_driver_sync_tombstones_driver_version ON driver_sync_tombstones(driver_id, sync_version);
+
+COMMENT ON COLUMN trips.sync_version IS 'Id of the last transaction that wrote the row (driver delta sync)';
+COMMENT ON COLUMN trip_orders.sync_version IS 'Id of the last transaction that wrote the row (driver delta sync)';
+COMMENT ON TABLE driver_sync_tombstones IS 'Trips and stops removed from a driver, for the driver delta sync';
@@ -0,0 +1,21 @@
+-- Migration 033: Applied driver journal events (tms_db)
+-- Description: POST /api/v1/driver/journal replays events a driver captured
+-- offline. Each event carries a client-generated event_id; its outcome is
+-- recorded here in the same transaction that applies it, so a journal
+-- re-sent after a lost response is answered from this table instead of
+-- being applied twice.
+
+CREATE TABLE IF NOT EXISTS driver_journal_events (
+    event_id VARCHAR(64) PRIMARY KEY,
+    driver_id VARCHAR(50) NOT NULL,
+    trip_id VARCHAR(50) NOT NULL,
+    event_type VARCHAR(30) NOT NULL,
+    result VARCHAR(20) NOT NULL CHECK (result IN ('applied', 'rejected')),
+    detail TEXT,
+    occurred_at TIMESTAMP,
+    applied_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_driver_journal_events_driver_applied ON driver_journal_events(driver_id, applied_at);
+
+COMMENT ON TABLE driver_journal_events IS 'Outcome of each offline driver journal event, keyed by client event id';
@@ -0,0 +1,10 @@
+-- Migration 034: Index for the order aggregates (orders_db)
+-- Description: GET /api/v1/orders/aggregate counts and sums active orders of
+-- a tenant grouped by status, created_at bucket and payment type. A covering
+-- index over (tenant_id, status, created_at) lets the finance dashboard read
+-- it without touching the order rows.
+
+CREATE INDEX IF NOT EXISTS idx_orders_tenant_status_created
+    ON orders(tenant_id, status, created_at)
+    INCLUDE (payment_type, total_amount)
+    WHERE is_active = TRUE;
@@ -0,0 +1,15 @@
+-- Migration 036: Planner row estimates for the order list (orders_db)
+-- Description: GET /api/v1/orders/?count=estimated reports the planner's
+-- row estimate for the filtered orders instead of counting them, so deep
+-- filters over large tenants do not pay for an exact COUNT on every page.
+-- count_estimate() returns the estimated rows of the query it is given.
+
+CREATE OR REPLACE FUNCTION count_estimate(query TEXT)
+RETURNS BIGINT AS $$
+DECLARE
+    plan JSON;
+BEGIN
+    EXECUTE 'EXPLAIN (FORMAT JSON) ' || query INTO plan;
+    RETURN (plan->0->'Plan'->>'Plan Rows')::BIGINT;
+END;
+$$ LANGUAGE plpgsql STABLE;
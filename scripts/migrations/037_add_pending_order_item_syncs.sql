@@ -0,0 +1,17 @@
+-- Migration 037: Outbox of driver journal item statuses (tms_db)
+-- Description: POST /api/v1/driver/journal records delivery outcomes in TMS
+-- before it tells the orders service about the new item statuses. The
+-- statuses are written here in the same transaction, removed once Orders
+-- accepts them, and retried whenever a journal for the trip is sent again
+-- (results for such trips are flagged orders_sync_pending).
+
+CREATE TABLE IF NOT EXISTS pending_order_item_syncs (
+    trip_id VARCHAR(50) PRIMARY KEY,
+    tenant_id VARCHAR(50),
+    item_statuses JSON NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+COMMENT ON TABLE pending_order_item_syncs IS 'Driver journal item statuses not yet accepted by the orders service';
@@ -0,0 +1,39 @@
+-- Migration 038: Tombstones of removed trip item assignments (orders_db)
+-- Description: The driver delta sync (POST /trip-item-assignments/changes)
+-- reports assignments changed since the client's cursor by updated_at, but
+-- /item-status (remove_from_trip) and /trip-item-assignments/delete remove
+-- assignments with a hard DELETE, which left the devices holding them.
+-- Every deleted assignment now leaves a tombstone the sync reports under
+-- deleted_item_assignments. Tombstones older than
+-- DRIVER_SYNC_TOMBSTONE_RETENTION_DAYS are pruned daily by the orders
+-- service; older driver cursors get a full sync instead.
+
+CREATE TABLE IF NOT EXISTS trip_item_assignment_tombstones (
+    id BIGSERIAL PRIMARY KEY,
+    assignment_id UUID NOT NULL,
+    trip_id VARCHAR(50) NOT NULL,
+    tenant_id VARCHAR(255) NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION record_trip_item_assignment_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO trip_item_assignment_tombstones (assignment_id, trip_id, tenant_id)
+    VALUES (OLD.id, OLD.trip_id, OLD.tenant_id);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS record_trip_item_assignments_tombstone ON trip_item_assignments;
+CREATE TRIGGER record_trip_item_assignments_tombstone
+    AFTER DELETE ON trip_item_assignments
+    FOR EACH ROW
+    EXECUTE FUNCTION record_trip_item_assignment_tombstone();
+
+CREATE INDEX IF NOT EXISTS idx_trip_item_assignment_tombstones_trip_deleted
+    ON trip_item_assignment_tombstones(trip_id, deleted_at);
+CREATE INDEX IF NOT EXISTS idx_trip_item_assignment_tombstones_deleted_at
+    ON trip_item_assignment_tombstones(deleted_at);
+
+COMMENT ON TABLE trip_item_assignment_tombstones IS 'Trip item assignments removed from trips, for the driver delta sync';
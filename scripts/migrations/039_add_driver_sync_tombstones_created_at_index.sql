@@ -0,0 +1,6 @@
+-- Migration 039: Index for pruning driver sync tombstones (tms_db)
+-- Description: The TMS service deletes driver_sync_tombstones older than
+-- DRIVER_SYNC_TOMBSTONE_RETENTION_DAYS once a day; driver cursors older than
+-- that get a full sync from the driver service instead.
+
+CREATE INDEX IF NOT EXISTS idx_driver_sync_tombstones_created_at ON driver_sync_tombstones(created_at);
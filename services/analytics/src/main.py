@@ -3,7 +3,6 @@ Analytics Service Main Application
 """
 import logging
 from contextlib import asynccontextmanager
-import time
 
 from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
@@ -14,6 +13,7 @@ from starlette.responses import Response as StarletteResponse
 from src.api.endpoints import orders, trips, drivers, trucks, dashboard
 from src.config import settings
 from src.database import company_engine, Base
+from shared.asgi import FusedMiddleware, MetricsStage
 
 # Configure logging
 logging.basicConfig(level=settings.LOG_LEVEL)
@@ -79,50 +79,9 @@ app.add_middleware(
     allow_headers=settings.ALLOW_HEADERS,
 )
 
-# Add metrics tracking middleware
-@app.middleware("http")
-async def metrics_middleware(request: Request, call_next):
-    start_time = time.time()
-
-    try:
-        response = await call_next(request)
-    except HTTPException as e:
-        endpoint = request.url.path
-        if endpoint.startswith("/"):
-            endpoint = endpoint.split("/")[-1] or "root"
-
-        http_requests_total.labels(
-            method=request.method,
-            endpoint=endpoint,
-            status_code=str(e.status_code)
-        ).inc()
-
-        duration = time.time() - start_time
-        http_request_duration_seconds.labels(
-            method=request.method,
-            endpoint=endpoint
-        ).observe(duration)
-
-        raise
-
-    duration = time.time() - start_time
-
-    endpoint = request.url.path
-    if endpoint.startswith("/"):
-        endpoint = endpoint.split("/")[-1] or "root"
-
-    http_requests_total.labels(
-        method=request.method,
-        endpoint=endpoint,
-        status_code=str(response.status_code)
-    ).inc()
-
-    http_request_duration_seconds.labels(
-        method=request.method,
-        endpoint=endpoint
-    ).observe(duration)
-
-    return response
+# Request metrics as a pure ASGI middleware stage
+middleware_stages = [MetricsStage(http_requests_total, http_request_duration_seconds)]
+app.add_middleware(FusedMiddleware, stages=middleware_stages)
 
 
 # Metrics endpoint
@@ -139,7 +98,8 @@ async def health_check():
     return {
         "status": "healthy",
         "service": settings.SERVICE_NAME,
-        "version": settings.VERSION
+        "version": settings.VERSION,
+        "middleware": {stage.name: stage.get_stats() for stage in middleware_stages},
     }
 
 
@@ -0,0 +1,127 @@
+"""
+Benchmark login throughput of the password hashing pool
+
+Simulates a shift-start login storm: ``--users`` concurrent sign-ins, each
+verifying a scrypt hash through ``PasswordHasher``, while a ticker task
+measures how late the event loop wakes up (a blocked loop shows up as lag).
+Prints the cost of one hash, throughput, login latency percentiles and loop
+lag, once per scrypt cost to compare candidate settings:
+
+    python scripts/benchmark_login.py [--users 200] [--workers 4] [--log-n 14 15 16]
+
+No database is needed; the legacy SHA256 path is included as a baseline.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi import HTTPException
+from src.password_hasher import PasswordHasher, legacy_hash
+
+PASSWORD = "Shift-Start-2024!"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def measure_loop_lag(stop: asyncio.Event, lags: List[float], interval: float = 0.01):
+    """Record how much later than requested the event loop wakes up"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def login_storm(hasher: PasswordHasher, stored_hash: str, users: int) -> dict:
+    latencies: List[float] = []
+    rejected = 0
+
+    async def login():
+        nonlocal rejected
+        started = time.perf_counter()
+        try:
+            assert await hasher.verify(PASSWORD, stored_hash)
+        except HTTPException:
+            rejected += 1
+            return
+        latencies.append(time.perf_counter() - started)
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_loop_lag(stop, lags))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(users)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+
+    return {
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "latencies": latencies,
+        "rejected": rejected,
+        "max_lag": max(lags, default=0.0),
+    }
+
+
+async def run(users: int, workers: int, max_pending: int, log_ns: List[int]):
+    print(f"{users} concurrent logins, {workers} worker(s), max {max_pending} pending\n")
+    print(f"{'kdf':<14} {'1 hash':>9} {'logins/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'loop lag':>9} {'503s':>5}")
+
+    baseline = legacy_hash(PASSWORD)
+    started = time.perf_counter()
+    for _ in range(users):
+        assert legacy_hash(PASSWORD) == baseline
+    per_login = (time.perf_counter() - started) / users
+    print(f"{'legacy sha256':<14} {per_login * 1000:>7.3f}ms {1 / per_login:>9.0f} {'-':>9} {'-':>9} {'-':>9} {'-':>9} {'-':>5}")
+
+    for log_n in log_ns:
+        hasher = PasswordHasher(
+            log_n=log_n,
+            block_size=8,
+            parallelism=1,
+            workers=workers,
+            max_pending=max_pending,
+            queue_timeout=30.0
+        )
+        await hasher.initialize()
+        try:
+            started = time.perf_counter()
+            stored_hash = hasher.hash_sync(PASSWORD)
+            single = time.perf_counter() - started
+
+            result = await login_storm(hasher, stored_hash, users)
+            latencies = result["latencies"] or [0.0]
+            memory_mib = 128 * 8 * (2 ** log_n) / (1024 * 1024)
+            print(
+                f"{f'scrypt ln={log_n}':<14} {single * 1000:>7.1f}ms {result['throughput']:>9.1f} "
+                f"{statistics.median(latencies) * 1000:>7.0f}ms "
+                f"{percentile(latencies, 95) * 1000:>7.0f}ms "
+                f"{percentile(latencies, 99) * 1000:>7.0f}ms "
+                f"{result['max_lag'] * 1000:>7.1f}ms {result['rejected']:>5}"
+                f"   ({memory_mib:.0f} MiB per hash)"
+            )
+        finally:
+            await hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200, help="Concurrent logins per run")
+    parser.add_argument("--workers", type=int, default=4, help="Hashing pool size")
+    parser.add_argument("--max-pending", type=int, default=64, help="Logins allowed to wait for a worker")
+    parser.add_argument("--log-n", type=int, nargs="+", default=[14, 15, 16], help="scrypt costs to compare")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.workers, args.max_pending, args.log_n))
@@ -77,9 +77,15 @@ async def get_role_permissions(
 @router.post("/clear-cache")
 async def clear_permission_cache(
     user_id: str = Query(None, description="Specific user ID to clear cache for (optional)"),
+    role_id: int = Query(None, description="Clear cache for every user with this role (optional)"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Clear permission cache for a specific user or all users"""
+    """
+    Clear permission cache for a user, a role or all users.
+
+    Invalidations are published to every service, so changes made to roles or
+    role permissions outside the API (e.g. SQL migrations) apply immediately.
+    """
     from ...services.permission_service import PermissionService
 
     perm_service = PermissionService(db)
@@ -88,7 +94,15 @@ async def clear_permission_cache(
         # Clear cache for specific user
         await perm_service.clear_user_cache(user_id)
         return {"message": f"Cache cleared for user {user_id}"}
+    elif role_id is not None:
+        # Clear cache for every holder of the role
+        await perm_service.invalidate_role_cache(role_id)
+        role = (await db.execute(select(Role).where(Role.id == role_id))).scalar_one_or_none()
+        if role:
+            await perm_service.publish_role_catalog_change(role.tenant_id)
+        return {"message": f"Cache cleared for role {role_id}"}
     else:
         # Clear all cache
         await perm_service.clear_all_cache()
-        return {"message": "All permission cache cleared"}
\ No newline at end of file
+        await perm_service.publish_role_catalog_change(None)
+        return {"message": "All permission cache cleared"}
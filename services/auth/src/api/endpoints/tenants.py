@@ -282,7 +282,7 @@ async def update_tenant_admin(
         if "email" in admin_data:
             update_data["email"] = admin_data["email"].lower()
         if "password" in admin_data:
-            update_data["password_hash"] = get_password_hash(admin_data["password"])
+            update_data["password_hash"] = await get_password_hash(admin_data["password"])
         if "first_name" in admin_data:
             update_data["first_name"] = admin_data["first_name"]
         if "last_name" in admin_data:
@@ -238,7 +238,13 @@ async def update_user(
                 detail="Cannot change superuser status"
             )
 
-    user = await UserService.update_user(db, user_id, update_data.model_dump(exclude_unset=True))
+    update_fields = update_data.model_dump(exclude_unset=True)
+    user = await UserService.update_user(db, user_id, update_fields)
+
+    # Role or activation changes must reach every service's permission cache
+    if update_fields.keys() & {"role_id", "is_active", "is_superuser"}:
+        await perm_service.invalidate_user_cache(user_id)
+
     return user
 
 
@@ -303,6 +309,8 @@ async def delete_user(
             detail="Failed to delete user"
         )
 
+    await perm_service.invalidate_user_cache(user_id)
+
     return {"message": "User deleted successfully"}
 
 
@@ -351,14 +359,14 @@ async def change_user_password(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is required when changing your own password"
             )
-        if not verify_password(password_data.current_password, user.password_hash):
+        if not await verify_password(password_data.current_password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect"
             )
 
     # Update password
-    new_hash = get_password_hash(password_data.new_password)
+    new_hash = await get_password_hash(password_data.new_password)
     user.password_hash = new_hash
     await db.commit()
 
@@ -404,6 +412,7 @@ async def activate_user(
     user.login_attempts = 0
     user.locked_until = None
     await db.commit()
+    await perm_service.invalidate_user_cache(user_id)
 
     return {"message": "User activated successfully"}
 
@@ -459,6 +468,7 @@ async def deactivate_user(
 
     user.is_active = False
     await db.commit()
+    await perm_service.invalidate_user_cache(user_id)
 
     return {"message": "User deactivated successfully"}
 
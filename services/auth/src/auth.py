@@ -2,36 +2,53 @@
 Authentication utilities and JWT handling
 """
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from jose import JWTError, jwt
 from fastapi import HTTPException, status
 import secrets
-import hashlib
 
 from .config_local import AuthSettings, GLOBAL_JWT_SECRET, GLOBAL_JWT_ALGORITHM, GLOBAL_JWT_EXPIRE_MINUTES
+from .password_hasher import password_hasher, legacy_hash
 from .schemas import TokenData
 
 settings = AuthSettings()
 
 
-def get_password_hash(password: str) -> str:
-    """Generate SHA256 password hash using global JWT secret"""
-    # Use the global JWT secret as salt for password hashing
-    salted_password = password + GLOBAL_JWT_SECRET
-    # Hash with SHA256
-    hash_result = hashlib.sha256(salted_password.encode('utf-8')).hexdigest()
-    # print(f"[AUTH] Hashed password: {hash_result[:20]}... with secret {GLOBAL_JWT_SECRET[:20]}...")
-    return hash_result
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its SHA256 hash using global JWT secret"""
-    # Hash the provided password with the same global JWT secret
-    salted_password = plain_password + GLOBAL_JWT_SECRET
-    computed_hash = hashlib.sha256(salted_password.encode('utf-8')).hexdigest()
-    # print(f"[AUTH] Verifying password: computed {computed_hash[:20]}... vs stored {hashed_password[:20]}...")
-    # Compare hashes
-    return computed_hash == hashed_password
+async def get_password_hash(password: str) -> str:
+    """Generate a scrypt password hash in the password hashing pool"""
+    return await password_hasher.hash(password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its stored (scrypt or legacy SHA256) hash"""
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and upgrade its hash if needed
+
+    Returns:
+        Tuple of (verified, new_hash); new_hash is set when the stored hash is
+        legacy SHA256 or uses outdated scrypt parameters and should be replaced.
+    """
+    if not await verify_password(plain_password, hashed_password):
+        return False, None
+    if not password_hasher.needs_rehash(hashed_password):
+        return True, None
+    new_hash = await get_password_hash(plain_password)
+    password_hasher.stats["rehashed"] += 1
+    return True, new_hash
+
+
+def hash_token(token: str) -> str:
+    """
+    Deterministic hash of a high-entropy token (refresh tokens), for lookups
+
+    Random tokens do not need a slow KDF; keeps the SHA256 format so stored
+    refresh tokens stay valid.
+    """
+    return legacy_hash(token)
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -127,6 +127,15 @@ class AuthSettings(Settings, LoggingMixin):
     PASSWORD_REQUIRE_NUMBERS: bool = True
     PASSWORD_REQUIRE_SPECIAL: bool = True
 
+    # Password hashing: scrypt cost (N = 2 ** LOG_N, ~128 * r * N bytes per hash)
+    # and the worker pool shared by logins and password changes
+    PASSWORD_HASH_LOG_N: int = int(os.getenv("PASSWORD_HASH_LOG_N", "15"))
+    PASSWORD_HASH_BLOCK_SIZE: int = int(os.getenv("PASSWORD_HASH_BLOCK_SIZE", "8"))
+    PASSWORD_HASH_PARALLELISM: int = int(os.getenv("PASSWORD_HASH_PARALLELISM", "1"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "5"))
+
     # Session settings
     SESSION_EXPIRE_MINUTES: int = 1440  # 24 hours
     MAX_LOGIN_ATTEMPTS: int = 5
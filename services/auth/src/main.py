@@ -3,7 +3,6 @@ Authentication Service Main Application
 """
 import logging
 from contextlib import asynccontextmanager
-import time
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -15,7 +14,11 @@ from starlette.responses import Response, JSONResponse
 from src.api.endpoints import auth, users, tenants, admin, permissions, roles, currencies, timezones
 from src.config_local import AuthSettings
 from src.database import engine, Base, AsyncSessionLocal
-from src.middleware.tenant_status import TenantStatusMiddleware
+from src.middleware.tenant_status import TenantStatusStage
+from src.services.permission_cache import permission_cache
+from src.password_hasher import password_hasher
+from src.services.permission_service import PermissionService
+from shared.asgi import FusedMiddleware, MetricsStage
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -69,9 +72,24 @@ async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+    # Connect the shared permission cache and warm it so downstream services
+    # do not fall through to the auth service after a deploy
+    await permission_cache.initialize()
+    try:
+        async with AsyncSessionLocal() as session:
+            warmed = await PermissionService(session).warm_cache()
+        logger.info(f"Permission cache warmed - users={warmed}")
+    except Exception as e:
+        logger.warning(f"Failed to warm permission cache: {e}")
+
+    # Worker pool for scrypt password hashing
+    await password_hasher.initialize()
+
     yield
 
     logger.info("Shutting down auth service")
+    await password_hasher.shutdown()
+    await permission_cache.shutdown()
 
 
 # Create FastAPI application
@@ -99,36 +117,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add tenant status validation middleware
-app.add_middleware(TenantStatusMiddleware)
-
-# Add metrics tracking middleware
-@app.middleware("http")
-async def metrics_middleware(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-
-    # Calculate request duration
-    duration = time.time() - start_time
-
-    # Get endpoint path (simplified)
-    endpoint = request.url.path
-    if endpoint.startswith("/api/v1/"):
-        endpoint = endpoint.split("/")[-1] or "root"
-
-    # Record metrics
-    http_requests_total.labels(
-        method=request.method,
-        endpoint=endpoint,
-        status_code=str(response.status_code)
-    ).inc()
-
-    http_request_duration_seconds.labels(
-        method=request.method,
-        endpoint=endpoint
-    ).observe(duration)
-
-    return response
+# Tenant status validation and request metrics as one pure ASGI middleware
+middleware_stages = [
+    TenantStatusStage(),
+    MetricsStage(http_requests_total, http_request_duration_seconds),
+]
+app.add_middleware(FusedMiddleware, stages=middleware_stages)
 
 
 # Metrics endpoint
@@ -142,7 +136,12 @@ async def metrics():
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "auth-service"}
+    return {
+        "status": "healthy",
+        "service": "auth-service",
+        "password_hashing": password_hasher.get_stats(),
+        "middleware": {stage.name: stage.get_stats() for stage in middleware_stages},
+    }
 
 
 @app.get("/ready", tags=["Health"])
@@ -1,6 +1,6 @@
 """
 Middleware for Auth Service
 """
-from .tenant_status import TenantStatusMiddleware
+from .tenant_status import TenantStatusStage
 
-__all__ = ["TenantStatusMiddleware"]
+__all__ = ["TenantStatusStage"]
@@ -1,54 +1,52 @@
 """
-Tenant status validation middleware for Auth Service
+Tenant status validation for Auth Service
 """
 import time
 import logging
-from typing import Optional
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from typing import Any, Dict
+
+from shared.asgi import Reject, RequestContext, Stage
 
 from ..database import Tenant, AsyncSessionLocal
 from sqlalchemy import select
 
 logger = logging.getLogger(__name__)
 
+# Public endpoints without tenant validation
+SKIP_PATHS = [
+    "/health",
+    "/ready",
+    "/metrics",
+    "/docs",
+    "/api/v1/auth/login",
+    "/api/v1/auth/refresh",
+    "/openapi.json",
+    "/redoc",
+]
+
 
-class TenantStatusMiddleware(BaseHTTPMiddleware):
+class TenantStatusStage(Stage):
     """
-    Middleware to validate tenant status on authenticated requests
+    Pipeline stage validating tenant status on authenticated requests
     Blocks requests from inactive tenants
     """
 
-    def __init__(self, app):
-        super().__init__(app)
+    name = "tenant_status"
+
+    def __init__(self):
+        super().__init__(skip_paths=(), skip_exact=SKIP_PATHS)
         self._tenant_status_cache = {}
         self._cache_ttl = 60
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def on_request(self, ctx: RequestContext) -> None:
         """
         Validate tenant status before processing request
         """
-        # Skip tenant validation for public endpoints
-        skip_paths = [
-            "/health",
-            "/ready",
-            "/metrics",
-            "/docs",
-            "/api/v1/auth/login",
-            "/api/v1/auth/refresh",
-            "/openapi.json",
-            "/redoc",
-        ]
-
-        if request.url.path in skip_paths:
-            return await call_next(request)
-
         # Try to get tenant_id from JWT token in Authorization header
         tenant_id = None
         is_superuser = False
 
-        auth_header = request.headers.get("authorization")
+        auth_header = ctx.headers.get("authorization")
         if auth_header and auth_header.startswith("Bearer "):
             try:
                 from ..auth import verify_token
@@ -56,14 +54,14 @@ class TenantStatusMiddleware(BaseHTTPMiddleware):
                 token_data = verify_token(token)
                 tenant_id = getattr(token_data, 'tenant_id', None)
                 is_superuser = getattr(token_data, 'is_superuser', False)
-            except Exception as e:
+            except Exception:
                 # If token is invalid, let the request proceed to endpoints
                 # The endpoints will handle authentication properly
                 pass
 
         # Skip for super admins (no tenant) or if no tenant_id
         if is_superuser or not tenant_id:
-            return await call_next(request)
+            return
 
         # Check tenant status
         is_active = await self._get_tenant_status(tenant_id)
@@ -71,14 +69,12 @@ class TenantStatusMiddleware(BaseHTTPMiddleware):
         if not is_active:
             logger.warning(
                 f"Blocked request from inactive tenant {tenant_id} "
-                f"path={request.url.path}"
-            )
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Your company account has been deactivated. Please contact support."
+                f"path={ctx.path}"
             )
+            raise Reject(403, "Your company account has been deactivated. Please contact support.")
 
-        return await call_next(request)
+    def get_stats(self) -> Dict[str, Any]:
+        return {"cached_tenants": len(self._tenant_status_cache)}
 
     async def _get_tenant_status(self, tenant_id: str) -> bool:
         """
@@ -0,0 +1,212 @@
+"""
+Password hashing with a memory-hard KDF off the event loop
+
+Passwords are hashed with scrypt (``hashlib.scrypt``, memory-hard, no extra
+dependency). Every hash and verify runs in a dedicated, bounded thread pool:
+OpenSSL releases the GIL while scrypt runs, so the workers hash in parallel
+while the event loop keeps serving requests. A semaphore caps how many
+requests may wait for a worker; beyond that callers wait up to
+PASSWORD_HASH_QUEUE_TIMEOUT and then get a 503, so a login storm degrades
+into retries instead of unbounded memory use and latency.
+
+Stored hashes are versioned:
+
+- v0 (legacy): 64 hex chars, SHA-256 of password + GLOBAL_JWT_SECRET
+- v1: ``$scrypt$v=1$ln=15,r=8,p=1$<salt>$<hash>`` (base64, no padding)
+
+``needs_rehash`` is true for legacy hashes and for v1 hashes with outdated
+cost parameters; the login path re-hashes those after a successful verify.
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from .config_local import AuthSettings, GLOBAL_JWT_SECRET
+
+settings = AuthSettings()
+
+SCRYPT_PREFIX = "$scrypt$"
+SCRYPT_VERSION = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def legacy_hash(value: str) -> str:
+    """v0 hash: SHA-256 of the value salted with the global JWT secret"""
+    return hashlib.sha256((value + GLOBAL_JWT_SECRET).encode("utf-8")).hexdigest()
+
+
+def is_legacy_hash(hashed: str) -> bool:
+    return len(hashed) == 64 and not hashed.startswith("$")
+
+
+class PasswordHasher:
+    """Versioned scrypt password hashes computed in a bounded worker pool"""
+
+    def __init__(
+        self,
+        log_n: int,
+        block_size: int,
+        parallelism: int,
+        workers: int,
+        max_pending: int,
+        queue_timeout: float
+    ):
+        self.log_n = log_n
+        self.block_size = block_size
+        self.parallelism = parallelism
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.stats = {"hashed": 0, "verified": 0, "rehashed": 0, "rejected": 0, "pool_seconds": 0.0}
+
+    async def initialize(self):
+        """Start the worker pool"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="password-hash"
+            )
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+    async def shutdown(self):
+        """Stop the worker pool once running hashes finish"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self._slots = None
+
+    # Synchronous primitives (run in the pool)
+
+    @staticmethod
+    def _scrypt(password: str, salt: bytes, log_n: int, block_size: int, parallelism: int) -> bytes:
+        # scrypt needs ~128 * r * N bytes; leave headroom for OpenSSL's maxmem check
+        return hashlib.scrypt(
+            password.encode("utf-8"),
+            salt=salt,
+            n=2 ** log_n,
+            r=block_size,
+            p=parallelism,
+            maxmem=2 * 128 * block_size * (2 ** log_n) * parallelism + 1024 * 1024,
+            dklen=KEY_BYTES
+        )
+
+    def hash_sync(self, password: str) -> str:
+        """Hash a password with the current cost parameters"""
+        salt = os.urandom(SALT_BYTES)
+        key = self._scrypt(password, salt, self.log_n, self.block_size, self.parallelism)
+        return (
+            f"{SCRYPT_PREFIX}v={SCRYPT_VERSION}$ln={self.log_n},r={self.block_size},p={self.parallelism}"
+            f"${_b64encode(salt)}${_b64encode(key)}"
+        )
+
+    def verify_sync(self, password: str, hashed: str) -> bool:
+        """Verify a password against a v0 or v1 hash in constant time"""
+        if is_legacy_hash(hashed):
+            return hmac.compare_digest(legacy_hash(password), hashed)
+
+        params = self._parse(hashed)
+        if params is None:
+            return False
+        key = self._scrypt(password, params["salt"], params["ln"], params["r"], params["p"])
+        return hmac.compare_digest(key, params["key"])
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Whether a stored hash uses a legacy format or outdated cost parameters"""
+        params = self._parse(hashed)
+        return params is None or (
+            params["ln"], params["r"], params["p"]
+        ) != (self.log_n, self.block_size, self.parallelism)
+
+    @staticmethod
+    def _parse(hashed: str) -> Optional[Dict[str, Any]]:
+        if not hashed.startswith(SCRYPT_PREFIX):
+            return None
+        try:
+            _, _, version, cost, salt, key = hashed.split("$")
+            if version != f"v={SCRYPT_VERSION}":
+                return None
+            params = dict(item.split("=") for item in cost.split(","))
+            return {
+                "ln": int(params["ln"]),
+                "r": int(params["r"]),
+                "p": int(params["p"]),
+                "salt": _b64decode(salt),
+                "key": _b64decode(key),
+            }
+        except (ValueError, KeyError):
+            return None
+
+    # Async API
+
+    async def _run(self, func, *args):
+        if self._executor is None:
+            await self.initialize()
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.stats["rejected"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent sign-ins, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
+
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.stats["pool_seconds"] += time.perf_counter() - started
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        """Hash a password in the worker pool"""
+        hashed = await self._run(self.hash_sync, password)
+        self.stats["hashed"] += 1
+        return hashed
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """Verify a password; legacy hashes are cheap and checked inline"""
+        self.stats["verified"] += 1
+        if is_legacy_hash(hashed):
+            return self.verify_sync(password, hashed)
+        return await self._run(self.verify_sync, password, hashed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "pool_seconds": round(self.stats["pool_seconds"], 3),
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "params": {"ln": self.log_n, "r": self.block_size, "p": self.parallelism},
+        }
+
+
+# Global singleton instance, started by the application lifespan
+password_hasher = PasswordHasher(
+    log_n=settings.PASSWORD_HASH_LOG_N,
+    block_size=settings.PASSWORD_HASH_BLOCK_SIZE,
+    parallelism=settings.PASSWORD_HASH_PARALLELISM,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+)
@@ -0,0 +1,275 @@
+"""
+Shared permission cache - local LRU backed by Redis with push invalidation
+
+Every service keeps a small in-process LRU in front of a Redis tier that is
+shared by all services. The auth service publishes invalidation events on the
+``permissions:invalidate`` channel whenever roles, permissions or user-role
+assignments change, so TTLs only bound staleness if an event is missed.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis.asyncio as redis
+
+from ..config_local import get_settings
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "permissions:invalidate"
+ROLE_CATALOG_CHANNEL = "roles:invalidate"
+ROLE_CATALOG_VERSION_PREFIX = "roles:version:"
+USER_KEY_PREFIX = "perm:user:"
+ROLE_INDEX_PREFIX = "perm:role_users:"
+
+
+class PermissionCache:
+    """Two-tier (local LRU + Redis) cache of user permissions"""
+
+    def __init__(
+        self,
+        redis_url: Optional[str],
+        local_ttl: int = 900,
+        redis_ttl: int = 3600,
+        max_local_entries: int = 10000
+    ):
+        self._redis_url = redis_url
+        self._local_ttl = local_ttl
+        self._redis_ttl = redis_ttl
+        self._max_local_entries = max_local_entries
+        self._local: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._redis: Optional[redis.Redis] = None
+        self._pubsub = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self._local_hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._invalidations_received = 0
+
+    async def initialize(self):
+        """Connect to Redis and start listening for invalidation events"""
+        if not self._redis_url or self._redis:
+            return
+        try:
+            self._redis = redis.from_url(
+                self._redis_url,
+                encoding="utf-8",
+                decode_responses=True
+            )
+            self._pubsub = self._redis.pubsub()
+            await self._pubsub.subscribe(INVALIDATION_CHANNEL)
+            self._listener_task = asyncio.create_task(self._invalidation_listener())
+            logger.info("Permission cache connected to Redis")
+        except Exception as e:
+            logger.warning(f"Permission cache running local-only, Redis unavailable: {e}")
+            self._redis = None
+            self._pubsub = None
+
+    async def shutdown(self):
+        """Stop the listener and close the Redis connection"""
+        if self._listener_task:
+            self._listener_task.cancel()
+            self._listener_task = None
+        if self._pubsub:
+            try:
+                await self._pubsub.unsubscribe(INVALIDATION_CHANNEL)
+                await self._pubsub.close()
+            except Exception:
+                pass
+            self._pubsub = None
+        if self._redis:
+            await self._redis.close()
+            self._redis = None
+
+    async def get(self, user_id: str) -> Optional[List[str]]:
+        """Return cached permissions for a user, or None on a miss"""
+        entry = self._local.get(user_id)
+        if entry is not None:
+            if time.monotonic() < entry["expires_at"]:
+                self._local.move_to_end(user_id)
+                self._local_hits += 1
+                return entry["permissions"]
+            del self._local[user_id]
+
+        if self._redis:
+            try:
+                raw = await self._redis.get(f"{USER_KEY_PREFIX}{user_id}")
+                if raw:
+                    data = json.loads(raw)
+                    self._store_local(user_id, data.get("role_id"), data["permissions"])
+                    self._redis_hits += 1
+                    return data["permissions"]
+            except Exception as e:
+                logger.warning(f"Permission cache Redis read failed: {e}")
+
+        self._misses += 1
+        return None
+
+    async def set(self, user_id: str, role_id: Optional[int], permissions: List[str]):
+        """Store permissions for a user in both tiers"""
+        await self.set_many([(user_id, role_id, permissions)])
+
+    async def set_many(self, entries: List[Tuple[str, Optional[int], List[str]]]):
+        """Store permissions for many users using a single Redis pipeline"""
+        for user_id, role_id, permissions in entries:
+            self._store_local(user_id, role_id, permissions)
+
+        if not self._redis or not entries:
+            return
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for user_id, role_id, permissions in entries:
+                pipe.set(
+                    f"{USER_KEY_PREFIX}{user_id}",
+                    json.dumps({"role_id": role_id, "permissions": permissions}),
+                    ex=self._redis_ttl
+                )
+                if role_id is not None:
+                    role_key = f"{ROLE_INDEX_PREFIX}{role_id}"
+                    pipe.sadd(role_key, user_id)
+                    pipe.expire(role_key, self._redis_ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Permission cache Redis write failed: {e}")
+
+    async def invalidate_user(self, user_id: str):
+        """Drop a user's permissions everywhere and notify other processes"""
+        self._evict_local("user", user_id)
+        if self._redis:
+            try:
+                await self._redis.delete(f"{USER_KEY_PREFIX}{user_id}")
+            except Exception as e:
+                logger.warning(f"Permission cache Redis delete failed: {e}")
+        await self._publish("user", user_id)
+
+    async def invalidate_role(self, role_id: int):
+        """Drop permissions of every user holding a role and notify other processes"""
+        self._evict_local("role", role_id)
+        if self._redis:
+            try:
+                role_key = f"{ROLE_INDEX_PREFIX}{role_id}"
+                user_ids = await self._redis.smembers(role_key)
+                keys = [f"{USER_KEY_PREFIX}{user_id}" for user_id in user_ids]
+                await self._redis.delete(role_key, *keys)
+            except Exception as e:
+                logger.warning(f"Permission cache Redis delete failed: {e}")
+        await self._publish("role", role_id)
+
+    async def invalidate_all(self):
+        """Drop every cached permission set and notify other processes"""
+        self._evict_local("all", None)
+        if self._redis:
+            try:
+                keys = [key async for key in self._redis.scan_iter(match="perm:*")]
+                if keys:
+                    await self._redis.delete(*keys)
+            except Exception as e:
+                logger.warning(f"Permission cache Redis delete failed: {e}")
+        await self._publish("all", None)
+
+    async def publish_role_catalog_change(self, tenant_id: Optional[str]) -> Optional[int]:
+        """
+        Bump the role catalog version of a tenant (or all tenants when None)
+        and notify services holding cached role catalogs.
+        """
+        if not self._redis:
+            return None
+        try:
+            version = await self._redis.incr(f"{ROLE_CATALOG_VERSION_PREFIX}{tenant_id or '*'}")
+            await self._redis.publish(
+                ROLE_CATALOG_CHANNEL,
+                json.dumps({"tenant_id": tenant_id, "version": version})
+            )
+            return version
+        except Exception as e:
+            logger.warning(f"Failed to publish role catalog change: {e}")
+            return None
+
+    def clear_local(self):
+        """Clear the in-process tier and reset statistics"""
+        self._local.clear()
+        self._local_hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache performance statistics"""
+        hits = self._local_hits + self._redis_hits
+        total = hits + self._misses
+        return {
+            "cache_size": len(self._local),
+            "hits": hits,
+            "local_hits": self._local_hits,
+            "redis_hits": self._redis_hits,
+            "misses": self._misses,
+            "hit_rate": hits / total if total > 0 else 0,
+            "total_requests": total,
+            "invalidations_received": self._invalidations_received,
+            "redis_connected": self._redis is not None
+        }
+
+    def _store_local(self, user_id: str, role_id: Optional[int], permissions: List[str]):
+        self._local[user_id] = {
+            "role_id": role_id,
+            "permissions": permissions,
+            "expires_at": time.monotonic() + self._local_ttl
+        }
+        self._local.move_to_end(user_id)
+        while len(self._local) > self._max_local_entries:
+            self._local.popitem(last=False)
+
+    def _evict_local(self, scope: str, value: Any):
+        if scope == "user":
+            self._local.pop(str(value), None)
+        elif scope == "role":
+            for user_id in [
+                uid for uid, entry in self._local.items()
+                if entry["role_id"] is not None and str(entry["role_id"]) == str(value)
+            ]:
+                del self._local[user_id]
+        else:
+            self._local.clear()
+
+    async def _publish(self, scope: str, value: Any):
+        if not self._redis:
+            return
+        try:
+            await self._redis.publish(
+                INVALIDATION_CHANNEL,
+                json.dumps({"scope": scope, "value": value})
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish permission invalidation: {e}")
+
+    async def _invalidation_listener(self):
+        """Apply invalidation events published by any service to the local tier"""
+        try:
+            async for message in self._pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                try:
+                    event = json.loads(message["data"])
+                    self._evict_local(event.get("scope", "all"), event.get("value"))
+                    self._invalidations_received += 1
+                except (json.JSONDecodeError, TypeError) as e:
+                    logger.error(f"Invalid permission invalidation event: {e}")
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            # Without the channel we can no longer trust the local tier
+            logger.error(f"Permission invalidation listener stopped: {e}")
+            self._local.clear()
+
+
+# Global singleton instance
+permission_cache = PermissionCache(
+    redis_url=getattr(settings, "REDIS_URL", None),
+    local_ttl=getattr(settings, "PERMISSION_CACHE_LOCAL_TTL", 900),
+    redis_ttl=getattr(settings, "PERMISSION_CACHE_TTL", 3600),
+    max_local_entries=getattr(settings, "PERMISSION_CACHE_MAX_ENTRIES", 10000)
+)
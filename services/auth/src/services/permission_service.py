@@ -2,13 +2,14 @@
 Permission service for database lookup with caching
 """
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 import json
 
-from ..database import Role, Permission, RolePermission
+from ..database import Role, Permission, RolePermission, User
+from .permission_cache import permission_cache
 
 
 class PermissionService:
@@ -16,29 +17,22 @@ class PermissionService:
 
     def __init__(self, db_session: AsyncSession):
         self.db = db_session
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_ttl = 900  # 15 minutes cache TTL
-        self._cache_hits = 0
-        self._cache_misses = 0
+        # Shared two-tier cache; invalidations are published to every service
+        self.cache = permission_cache
 
     async def get_user_permissions(self, user_id: str, role_id: int) -> List[str]:
         """Get all permissions for a user based on their role with caching"""
-        cache_key = f"user_permissions:{user_id}"
-        current_time = datetime.utcnow()
-
-        # Check cache first
-        if cache_key in self._cache:
-            cache_entry = self._cache[cache_key]
-            if current_time < cache_entry["expires_at"]:
-                self._cache_hits += 1
-                return cache_entry["permissions"]
-            else:
-                # Cache expired, remove it
-                del self._cache[cache_key]
-
-        self._cache_misses += 1
-
-        # Query database for permissions
+        cached = await self.cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        permissions = await self.get_role_permissions(role_id)
+        await self.cache.set(user_id, role_id, permissions)
+
+        return permissions
+
+    async def get_role_permissions(self, role_id: int) -> List[str]:
+        """Get all permissions granted to a role"""
         query = (
             select(Permission)
             .join(RolePermission)
@@ -47,19 +41,11 @@ class PermissionService:
         )
 
         result = await self.db.execute(query)
-        permissions = [
+        return [
             f"{perm.resource}:{perm.action}"
             for perm in result.scalars().all()
         ]
 
-        # Cache the result
-        self._cache[cache_key] = {
-            "permissions": permissions,
-            "expires_at": current_time + timedelta(seconds=self._cache_ttl)
-        }
-
-        return permissions
-
     async def check_permission(self, user_id: str, role_id: int, required_permission: str) -> bool:
         """Check if user has a specific permission"""
         permissions = await self.get_user_permissions(user_id, role_id)
@@ -110,6 +96,7 @@ class PermissionService:
     async def get_permissions_with_metadata(self, user_id: str, role_id: int) -> Dict[str, Any]:
         """Get permissions with additional metadata for debugging"""
         permissions = await self.get_user_permissions(user_id, role_id)
+        stats = self.cache.get_stats()
 
         return {
             "user_id": user_id,
@@ -117,47 +104,40 @@ class PermissionService:
             "permissions": permissions,
             "permission_count": len(permissions),
             "cache_stats": {
-                "hits": self._cache_hits,
-                "misses": self._cache_misses,
-                "hit_rate": self._cache_hits / (self._cache_hits + self._cache_misses) if (self._cache_hits + self._cache_misses) > 0 else 0
+                "hits": stats["hits"],
+                "misses": stats["misses"],
+                "hit_rate": stats["hit_rate"]
             },
             "cached_at": datetime.utcnow().isoformat()
         }
 
     async def invalidate_user_cache(self, user_id: str):
-        """Invalidate cached permissions for a specific user"""
-        cache_key = f"user_permissions:{user_id}"
-        if cache_key in self._cache:
-            del self._cache[cache_key]
+        """Invalidate cached permissions for a specific user in every service"""
+        await self.cache.invalidate_user(user_id)
 
     async def invalidate_role_cache(self, role_id: int):
-        """Invalidate cache for all users with a specific role"""
-        keys_to_remove = []
-        for cache_key in self._cache.keys():
-            if cache_key.startswith("user_permissions:"):
-                # This is a simplified approach - in production, you'd want to maintain
-                # a reverse index of role_id -> user_ids for efficient invalidation
-                keys_to_remove.append(cache_key)
+        """Invalidate cached permissions for all users with a specific role in every service"""
+        await self.cache.invalidate_role(role_id)
+
+    async def publish_role_catalog_change(self, tenant_id: Optional[str]):
+        """Notify services caching the role catalog that a tenant's roles changed"""
+        await self.cache.publish_role_catalog_change(tenant_id)
+
+    async def clear_user_cache(self, user_id: str) -> None:
+        """Clear cache for a specific user"""
+        await self.invalidate_user_cache(user_id)
 
-        for key in keys_to_remove:
-            del self._cache[key]
+    async def clear_all_cache(self) -> None:
+        """Clear all permission cache in every service"""
+        await self.cache.invalidate_all()
 
     def clear_cache(self):
-        """Clear all cached permissions"""
-        self._cache.clear()
-        self._cache_hits = 0
-        self._cache_misses = 0
+        """Clear locally cached permissions"""
+        self.cache.clear_local()
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache performance statistics"""
-        total_requests = self._cache_hits + self._cache_misses
-        return {
-            "cache_size": len(self._cache),
-            "hits": self._cache_hits,
-            "misses": self._cache_misses,
-            "hit_rate": self._cache_hits / total_requests if total_requests > 0 else 0,
-            "total_requests": total_requests
-        }
+        return self.cache.get_stats()
 
     async def preload_permissions(self, user_ids: List[str], role_ids: List[int]):
         """Preload permissions for multiple users (batch operation)"""
@@ -165,7 +145,7 @@ class PermissionService:
         query = (
             select(RolePermission.role_id, Permission.resource, Permission.action)
             .join(Permission)
-            .where(RolePermission.role_id.in_(role_ids))
+            .where(RolePermission.role_id.in_(set(role_ids)))
             .order_by(RolePermission.role_id, Permission.resource, Permission.action)
         )
 
@@ -178,12 +158,24 @@ class PermissionService:
                 role_permissions[role_id] = []
             role_permissions[role_id].append(f"{resource}:{action}")
 
-        # Cache permissions for each user
-        current_time = datetime.utcnow()
-        for user_id, role_id in zip(user_ids, role_ids):
-            if role_id in role_permissions:
-                cache_key = f"user_permissions:{user_id}"
-                self._cache[cache_key] = {
-                    "permissions": role_permissions[role_id],
-                    "expires_at": current_time + timedelta(seconds=self._cache_ttl)
-                }
\ No newline at end of file
+        # Cache permissions for each user in one pipeline
+        await self.cache.set_many([
+            (user_id, role_id, role_permissions.get(role_id, []))
+            for user_id, role_id in zip(user_ids, role_ids)
+        ])
+
+    async def warm_cache(self) -> int:
+        """Preload permissions of all active users into the shared cache"""
+        result = await self.db.execute(
+            select(User.id, User.role_id).where(
+                User.is_active == True,
+                User.role_id.isnot(None)
+            )
+        )
+        rows = result.all()
+        if rows:
+            await self.preload_permissions(
+                [row.id for row in rows],
+                [row.role_id for row in rows]
+            )
+        return len(rows)
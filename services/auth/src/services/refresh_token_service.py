@@ -8,7 +8,7 @@ from sqlalchemy import select
 from fastapi import HTTPException, status
 
 from ..database import RefreshToken
-from ..auth import get_password_hash
+from ..auth import hash_token
 from ..config_local import GLOBAL_REFRESH_TOKEN_EXPIRE_DAYS
 
 
@@ -28,7 +28,7 @@ class RefreshTokenService:
         expires_at = datetime.now(timezone.utc) + timedelta(days=expires_days)
 
         # Hash the token for storage
-        token_hash = get_password_hash(token)
+        token_hash = hash_token(token)
 
         # Create refresh token record
         refresh_token = RefreshToken(
@@ -52,7 +52,7 @@ class RefreshTokenService:
         """Verify a refresh token and return the token record"""
 
         # Hash the token to check against stored hash
-        token_hash = get_password_hash(token)
+        token_hash = hash_token(token)
 
         # Find the token in the database
         query = select(RefreshToken).where(
@@ -368,7 +368,7 @@ class TenantService:
         admin_user = User(
             id=str(uuid4()),
             email=admin_data["email"].lower(),
-            password_hash=get_password_hash(admin_data["password"]),
+            password_hash=await get_password_hash(admin_data["password"]),
             first_name=admin_data["first_name"],
             last_name=admin_data["last_name"],
             is_active=True,
@@ -418,7 +418,7 @@ class TenantService:
         admin_user = User(
             id=str(uuid4()),
             email=admin_data["email"].lower(),
-            password_hash=get_password_hash(admin_data["password"]),
+            password_hash=await get_password_hash(admin_data["password"]),
             first_name=admin_data["first_name"],
             last_name=admin_data["last_name"],
             is_active=True,
@@ -13,6 +13,7 @@ from ..database import User, Role, Permission, RefreshToken
 from ..schemas import UserCreate, UserUpdate, LoginRequest, TokenData
 from ..auth import (
     verify_password,
+    verify_and_update_password,
     get_password_hash,
     create_access_token,
     create_refresh_token,
@@ -22,6 +23,7 @@ from ..auth import (
 )
 from ..config_local import AuthSettings
 from .refresh_token_service import RefreshTokenService
+from .permission_cache import permission_cache
 import httpx
 import logging
 
@@ -103,8 +105,9 @@ class UserService:
         if not user.password_hash:
             return None, "No password set for this account"
 
-        # Verify password using SHA256 pre-hashing approach
-        if not verify_password(login_data.password, user.password_hash):
+        # Verify password in the hashing pool; legacy/outdated hashes are upgraded below
+        verified, new_hash = await verify_and_update_password(login_data.password, user.password_hash)
+        if not verified:
             # Increment login attempts
             user.login_attempts = increment_login_attempts(user.login_attempts)
             user.updated_at = datetime.utcnow()
@@ -124,6 +127,8 @@ class UserService:
             return None, "Invalid credentials"
 
         # Reset login attempts on successful login
+        if new_hash:
+            user.password_hash = new_hash
         user.login_attempts = reset_login_attempts()
         user.last_login = datetime.utcnow()
         user.locked_until = None
@@ -144,10 +149,11 @@ class UserService:
             )
 
         # Hash password
-        password_hash = get_password_hash(user_data.password)
+        password_hash = await get_password_hash(user_data.password)
 
         # Determine the role_id to use
         role_id = user_data.role_id
+        created_default_roles = False
 
         # If role_id is provided, validate it exists and belongs to the tenant
         if role_id is not None and role_id > 0:
@@ -212,6 +218,7 @@ class UserService:
                         user_role = new_role
 
                 role_id = user_role.id if user_role else None
+                created_default_roles = True
                 print(f"Created User role with ID: {role_id}")
             else:
                 role_id = role.id
@@ -240,6 +247,10 @@ class UserService:
         await db.commit()
         await db.refresh(db_user)
 
+        if created_default_roles:
+            # Services may hold an empty role catalog for this tenant
+            await permission_cache.publish_role_catalog_change(user_data.tenant_id)
+
         # Load relationships
         return await UserService.get_by_id(db, db_user.id)
 
@@ -295,14 +306,14 @@ class UserService:
             return False
 
         # Verify current password
-        if not user.password_hash or not verify_password(current_password, user.password_hash):
+        if not user.password_hash or not await verify_password(current_password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid current password"
             )
 
         # Update password
-        user.password_hash = get_password_hash(new_password)
+        user.password_hash = await get_password_hash(new_password)
         user.updated_at = datetime.utcnow()
         await db.commit()
 
@@ -0,0 +1,121 @@
+"""
+Benchmark customer search: legacy OR-ed ILIKE filters vs the indexed search
+
+Seeds 100k customers into a scratch tenant, times both query shapes for a
+few representative terms and prints the EXPLAIN ANALYZE plans. Run after
+migration 024 so the trigram and prefix indexes exist:
+
+    python scripts/benchmark_search.py [--rows 100000] [--runs 20] [--keep]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.database import engine, Customer
+from src.services.search import search_filter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, text, delete
+from sqlalchemy.dialects import postgresql
+
+SEARCH_TERMS = ["ac", "acme", "cust-04217", "logistics 77", "no-such-customer"]
+
+
+def legacy_query(tenant_id: str, term: str):
+    return select(Customer.id).where(
+        Customer.tenant_id == tenant_id,
+        Customer.name.ilike(f"%{term}%") |
+        Customer.code.ilike(f"%{term}%") |
+        Customer.email.ilike(f"%{term}%") |
+        Customer.phone.ilike(f"%{term}%")
+    ).limit(20)
+
+
+def indexed_query(tenant_id: str, term: str):
+    return select(Customer.id).where(
+        Customer.tenant_id == tenant_id,
+        search_filter("customers", term)
+    ).limit(20)
+
+
+async def seed_customers(db: AsyncSession, tenant_id: str, tag: str, rows: int):
+    """Insert synthetic customers with a single INSERT ... SELECT"""
+    await db.execute(
+        text(
+            """
+            INSERT INTO customers (id, tenant_id, code, name, email, phone, is_active,
+                                   available_for_all_branches, created_at)
+            SELECT gen_random_uuid(), :tenant_id,
+                   :tag || '-' || lpad(i::text, 6, '0'),
+                   (ARRAY['Acme', 'Globex', 'Initech', 'Umbrella', 'Stark'])[1 + i % 5]
+                       || ' Logistics ' || i,
+                   'cust-' || lpad(i::text, 6, '0') || '@example.com',
+                   '+91-' || lpad((i * 7919 % 10000000000)::text, 10, '0'),
+                   true, true, now()
+            FROM generate_series(1, :rows) AS i
+            """
+        ),
+        {"tenant_id": tenant_id, "tag": tag, "rows": rows}
+    )
+    await db.commit()
+    await db.execute(text("ANALYZE customers"))
+
+
+async def time_query(db: AsyncSession, query, runs: int) -> float:
+    """Median latency in milliseconds"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await db.execute(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def explain(db: AsyncSession, query) -> str:
+    compiled = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    result = await db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {compiled}"))
+    return "\n".join(row[0] for row in result)
+
+
+async def run_benchmark(rows: int, runs: int, keep: bool):
+    tag = f"BM{uuid.uuid4().hex[:6].upper()}"
+    tenant_id = f"search-benchmark-{tag.lower()}"
+
+    async with AsyncSession(engine) as db:
+        print(f"Seeding {rows} customers into tenant {tenant_id}...")
+        start = time.perf_counter()
+        await seed_customers(db, tenant_id, tag, rows)
+        print(f"Seeded in {time.perf_counter() - start:.1f}s\n")
+
+        try:
+            print(f"{'term':<20} {'legacy ms':>10} {'indexed ms':>11} {'speedup':>8}")
+            for term in SEARCH_TERMS:
+                legacy_ms = await time_query(db, legacy_query(tenant_id, term), runs)
+                indexed_ms = await time_query(db, indexed_query(tenant_id, term), runs)
+                print(f"{term:<20} {legacy_ms:>10.2f} {indexed_ms:>11.2f} {legacy_ms / indexed_ms:>7.1f}x")
+
+            for term in ("ac", "logistics 77"):
+                print(f"\n--- legacy plan for {term!r} ---")
+                print(await explain(db, legacy_query(tenant_id, term)))
+                print(f"\n--- indexed plan for {term!r} ---")
+                print(await explain(db, indexed_query(tenant_id, term)))
+        finally:
+            if not keep:
+                await db.execute(delete(Customer).where(Customer.tenant_id == tenant_id))
+                await db.commit()
+                print(f"\nRemoved benchmark tenant {tenant_id}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of customers to seed")
+    parser.add_argument("--runs", type=int, default=20, help="Timed executions per query")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded tenant after the run")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.rows, args.runs, args.keep))
@@ -0,0 +1,205 @@
+"""
+Query plan regression checks for the partitioned audit_logs table
+
+Seeds synthetic audit logs for a few scratch tenants over the last months,
+then EXPLAINs the audit access paths and fails (exit code 1) when a query
+stops using its composite index, falls back to a sequential scan of a
+partition, or touches more partitions than its date range needs. Run after
+migration 025:
+
+    python scripts/check_audit_query_plans.py [--rows 200000] [--keep]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.database import engine, AuditLog
+from src.api.endpoints.audit import build_audit_log_filters
+from src.services.audit_partitions import add_months, ensure_partitions, is_partitioned, month_start
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, desc, func, select, text, delete
+from sqlalchemy.dialects import postgresql
+
+TENANTS = 20
+MONTHS = 3
+
+
+def plan_cases(tenant_id: str, entity_id: str) -> List[Dict[str, Any]]:
+    """Access paths of the audit endpoints and per-entity history lookups"""
+    now = datetime.now(timezone.utc)
+    this_month = datetime.combine(month_start(now.date()), datetime.min.time(), tzinfo=timezone.utc)
+
+    return [
+        {
+            "name": "list by module and entity type, this month",
+            "query": select(AuditLog).where(and_(*build_audit_log_filters(
+                tenant_id, date_from=this_month, date_to=now, module="orders", entity_type="order"
+            ))).order_by(desc(AuditLog.created_at)).limit(50),
+            "indexes": {"idx_audit_logs_tenant_module_entity_created"},
+            "max_partitions": 1,
+        },
+        {
+            "name": "list by module, no date range",
+            "query": select(AuditLog).where(and_(*build_audit_log_filters(
+                tenant_id, module="trips", entity_type="trip"
+            ))).order_by(desc(AuditLog.created_at)).limit(50),
+            "indexes": {"idx_audit_logs_tenant_module_entity_created"},
+            "max_partitions": None,
+        },
+        {
+            "name": "summary count, this month",
+            "query": select(func.count()).select_from(AuditLog).where(and_(*build_audit_log_filters(
+                tenant_id, date_from=this_month, date_to=now
+            ))),
+            "indexes": {"idx_audit_logs_tenant_created", "idx_audit_logs_tenant_module_entity_created"},
+            "max_partitions": 1,
+        },
+        {
+            "name": "summary by module, this month",
+            "query": select(AuditLog.module, func.count()).where(and_(*build_audit_log_filters(
+                tenant_id, date_from=this_month, date_to=now
+            ))).group_by(AuditLog.module),
+            "indexes": {"idx_audit_logs_tenant_created", "idx_audit_logs_tenant_module_entity_created"},
+            "max_partitions": 1,
+        },
+        {
+            "name": "user activity",
+            "query": select(AuditLog).where(and_(*build_audit_log_filters(
+                tenant_id, user_id="user-0001"
+            ))).order_by(desc(AuditLog.created_at)).limit(50),
+            "indexes": {"idx_audit_logs_tenant_user_created"},
+            "max_partitions": None,
+        },
+        {
+            "name": "entity history",
+            "query": select(AuditLog).where(
+                AuditLog.entity_id == entity_id,
+                AuditLog.module == "orders",
+                AuditLog.entity_type == "order"
+            ).order_by(AuditLog.created_at),
+            "indexes": {"idx_audit_logs_entity_module_type_created"},
+            "max_partitions": None,
+        },
+    ]
+
+
+async def seed_audit_logs(db: AsyncSession, tag: str, rows: int):
+    """Insert synthetic audit logs with a single INSERT ... SELECT"""
+    await db.execute(
+        text(
+            """
+            INSERT INTO audit_logs (id, tenant_id, user_id, action, module, entity_type,
+                                    entity_id, description, created_at)
+            SELECT gen_random_uuid(),
+                   :tag || '-' || (i % :tenants),
+                   'user-' || lpad((i % 50)::text, 4, '0'),
+                   (ARRAY['create', 'update', 'status_change'])[1 + i % 3],
+                   (ARRAY['orders', 'trips', 'customers', 'vehicles'])[1 + i % 4],
+                   (ARRAY['order', 'trip', 'customer', 'vehicle'])[1 + i % 4],
+                   'entity-' || (i % 5000),
+                   'benchmark event',
+                   now() - make_interval(secs => random() * :days * 86400)
+            FROM generate_series(1, :rows) AS i
+            """
+        ),
+        {"tag": tag, "tenants": TENANTS, "rows": rows, "days": MONTHS * 28}
+    )
+    await db.commit()
+    await db.execute(text("ANALYZE audit_logs"))
+
+
+async def partition_index_parents(db: AsyncSession) -> Dict[str, str]:
+    """Partition index name -> name of the index declared on audit_logs"""
+    result = await db.execute(
+        text(
+            "SELECT child.relname, parent.relname FROM pg_inherits i "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "WHERE parent.relkind = 'I' AND parent.relname LIKE 'idx_audit_logs_%'"
+        )
+    )
+    return {row[0]: row[1] for row in result}
+
+
+def walk_plan(node: Dict[str, Any], nodes: List[Dict[str, Any]]):
+    nodes.append(node)
+    for child in node.get("Plans", []):
+        walk_plan(child, nodes)
+
+
+async def explain(db: AsyncSession, query) -> Dict[str, Any]:
+    compiled = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def check_case(db: AsyncSession, case: Dict[str, Any], index_parents: Dict[str, str]) -> Optional[str]:
+    """Return a failure message, or None if the plan is as expected"""
+    nodes: List[Dict[str, Any]] = []
+    walk_plan(await explain(db, case["query"]), nodes)
+
+    scans = [node for node in nodes if str(node.get("Relation Name", "")).startswith("audit_logs")]
+    seq_scans = [node["Relation Name"] for node in scans if node["Node Type"] == "Seq Scan"]
+    if seq_scans:
+        return f"sequential scan of {', '.join(sorted(set(seq_scans)))}"
+
+    used = {index_parents.get(node["Index Name"], node["Index Name"]) for node in scans if "Index Name" in node}
+    if not used & case["indexes"]:
+        return f"expected one of {sorted(case['indexes'])}, plan used {sorted(used) or 'no index'}"
+
+    partitions = {node["Relation Name"] for node in scans}
+    if case["max_partitions"] is not None and len(partitions) > case["max_partitions"]:
+        return f"scanned {len(partitions)} partitions, expected at most {case['max_partitions']}"
+
+    return None
+
+
+async def run_checks(rows: int, keep: bool) -> bool:
+    tag = f"plancheck-{uuid.uuid4().hex[:6]}"
+
+    async with AsyncSession(engine) as db:
+        if not await is_partitioned(db):
+            print("audit_logs is not partitioned, run migration 025 first")
+            return False
+
+        today = datetime.now(timezone.utc).date()
+        await ensure_partitions(db, add_months(month_start(today), -MONTHS), month_start(today))
+        await db.commit()
+
+        print(f"Seeding {rows} audit logs for {TENANTS} tenants tagged {tag}...")
+        await seed_audit_logs(db, tag, rows)
+
+        failures = 0
+        try:
+            index_parents = await partition_index_parents(db)
+            for case in plan_cases(f"{tag}-1", "entity-42"):
+                failure = await check_case(db, case, index_parents)
+                print(f"{'FAIL' if failure else 'ok  '} {case['name']}" + (f": {failure}" if failure else ""))
+                failures += bool(failure)
+        finally:
+            if not keep:
+                await db.execute(delete(AuditLog).where(AuditLog.tenant_id.like(f"{tag}-%")))
+                await db.commit()
+                print(f"\nRemoved audit logs tagged {tag}")
+
+    print(f"\n{failures} plan regression(s)" if failures else "\nAll audit query plans use their indexes")
+    return failures == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000, help="Number of audit logs to seed")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded audit logs after the run")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(run_checks(args.rows, args.keep)) else 1)
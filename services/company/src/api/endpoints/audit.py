@@ -5,8 +5,8 @@ from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc, func
-from datetime import datetime
+from sqlalchemy import select, insert, and_, or_, desc, func
+from datetime import datetime, timezone
 import csv
 import io
 import logging
@@ -14,16 +14,58 @@ import logging
 from src.database import get_db, AuditLog
 from src.schemas import (
     AuditLogCreate,
+    AuditLogBatchCreate,
+    AuditLogBatchResponse,
     AuditLogResponse,
     AuditLogListResponse
 )
-from src.security import TokenData, require_permissions, get_current_tenant_id
+from src.security import TokenData, require_permissions, require_service_token, get_current_tenant_id
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def build_audit_log_filters(
+    tenant_id: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    user_id: Optional[str] = None,
+    user_email: Optional[str] = None,
+    module: Optional[str] = None,
+    action: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[str] = None
+) -> list:
+    """
+    Filters for audit log queries.
+
+    Tenant, module, entity type and the created_at range are served by the
+    composite indexes of the partitioned audit_logs table; date bounds also
+    prune the partitions outside the requested range.
+    """
+    filters = [AuditLog.tenant_id == tenant_id]
+
+    if module:
+        filters.append(AuditLog.module == module)
+    if entity_type:
+        filters.append(AuditLog.entity_type == entity_type)
+    if date_from:
+        filters.append(AuditLog.created_at >= date_from)
+    if date_to:
+        filters.append(AuditLog.created_at <= date_to)
+    if user_id:
+        filters.append(AuditLog.user_id == user_id)
+    if user_email:
+        filters.append(AuditLog.user_email == user_email)
+    if action:
+        filters.append(AuditLog.action == action)
+    if entity_id:
+        filters.append(AuditLog.entity_id == entity_id)
+
+    return filters
+
+
 @router.post("/logs", response_model=AuditLogResponse, status_code=201)
 async def create_audit_log(
     log_data: AuditLogCreate,
@@ -36,7 +78,7 @@ async def create_audit_log(
     audit events to the Company service for centralized logging.
     """
     try:
-        audit_log = AuditLog(**log_data.model_dump())
+        audit_log = AuditLog(**log_data.model_dump(exclude_none=True))
         db.add(audit_log)
         await db.commit()
         await db.refresh(audit_log)
@@ -47,6 +89,38 @@ async def create_audit_log(
         raise HTTPException(status_code=500, detail=f"Failed to create audit log: {str(e)}")
 
 
+@router.post("/logs/batch", response_model=AuditLogBatchResponse, status_code=201)
+async def create_audit_logs_batch(
+    batch: AuditLogBatchCreate,
+    service: TokenData = Depends(require_service_token),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many audit log entries in one transaction (called by other services)
+
+    Used by the buffered audit shippers of the Orders, TMS and Driver
+    services, authenticated with their service tokens. Rows are written with
+    multi-row INSERTs and a single commit.
+    """
+    received_at = datetime.now(timezone.utc)
+    rows = []
+    for log_data in batch.logs:
+        row = log_data.model_dump()
+        row["created_at"] = row["created_at"] or received_at
+        rows.append(row)
+
+    try:
+        await db.execute(insert(AuditLog), rows)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error creating {len(rows)} audit logs: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to create audit logs: {str(e)}")
+
+    logger.info(f"Audit logs created: {len(rows)} entries")
+    return AuditLogBatchResponse(inserted=len(rows))
+
+
 @router.get("/logs", response_model=AuditLogListResponse)
 async def query_audit_logs(
     request: Request,
@@ -71,27 +145,20 @@ async def query_audit_logs(
     Supports filtering by date range, user, module, action, and entity.
     """
     # Build query with tenant isolation
-    filters = [AuditLog.tenant_id == tenant_id]
-
-    if date_from:
-        filters.append(AuditLog.created_at >= date_from)
-    if date_to:
-        filters.append(AuditLog.created_at <= date_to)
-    if user_id:
-        filters.append(AuditLog.user_id == user_id)
-    if user_email:
-        filters.append(AuditLog.user_email == user_email)
-    if module:
-        filters.append(AuditLog.module == module)
-    if action:
-        filters.append(AuditLog.action == action)
-    if entity_type:
-        filters.append(AuditLog.entity_type == entity_type)
-    if entity_id:
-        filters.append(AuditLog.entity_id == entity_id)
+    filters = build_audit_log_filters(
+        tenant_id,
+        date_from=date_from,
+        date_to=date_to,
+        user_id=user_id,
+        user_email=user_email,
+        module=module,
+        action=action,
+        entity_type=entity_type,
+        entity_id=entity_id
+    )
 
     # Get total count
-    count_query = select(func.count(AuditLog.id)).where(and_(*filters))
+    count_query = select(func.count()).select_from(AuditLog).where(and_(*filters))
     total_result = await db.execute(count_query)
     total = total_result.scalar()
 
@@ -134,24 +201,17 @@ async def export_audit_logs(
     Uses the same filter parameters as the query endpoint.
     """
     # Build filters (same as query endpoint)
-    filters = [AuditLog.tenant_id == tenant_id]
-
-    if date_from:
-        filters.append(AuditLog.created_at >= date_from)
-    if date_to:
-        filters.append(AuditLog.created_at <= date_to)
-    if user_id:
-        filters.append(AuditLog.user_id == user_id)
-    if user_email:
-        filters.append(AuditLog.user_email == user_email)
-    if module:
-        filters.append(AuditLog.module == module)
-    if action:
-        filters.append(AuditLog.action == action)
-    if entity_type:
-        filters.append(AuditLog.entity_type == entity_type)
-    if entity_id:
-        filters.append(AuditLog.entity_id == entity_id)
+    filters = build_audit_log_filters(
+        tenant_id,
+        date_from=date_from,
+        date_to=date_to,
+        user_id=user_id,
+        user_email=user_email,
+        module=module,
+        action=action,
+        entity_type=entity_type,
+        entity_id=entity_id
+    )
 
     # Get all matching logs (no pagination for export)
     query = select(AuditLog).where(and_(*filters)).order_by(desc(AuditLog.created_at))
@@ -213,17 +273,10 @@ async def get_audit_summary(
     Useful for dashboards and analytics.
     """
     # Build filters
-    filters = [AuditLog.tenant_id == tenant_id]
-
-    if date_from:
-        filters.append(AuditLog.created_at >= date_from)
-    if date_to:
-        filters.append(AuditLog.created_at <= date_to)
-
-    base_filter = and_(*filters)
+    base_filter = and_(*build_audit_log_filters(tenant_id, date_from=date_from, date_to=date_to))
 
     # Get total count
-    total_query = select(func.count(AuditLog.id)).where(base_filter)
+    total_query = select(func.count()).select_from(AuditLog).where(base_filter)
     total_result = await db.execute(total_query)
     total = total_result.scalar()
 
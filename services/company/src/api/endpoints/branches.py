@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from src.database import get_db, Branch, Customer, Vehicle, VehicleStatus, CustomerBranch, VehicleBranch
+from src.services.search import search_filter
 from src.helpers import validate_branch_exists
 from src.schemas import (
     Branch as BranchSchema,
@@ -69,11 +70,7 @@ async def list_branches(
 
     # Apply filters
     if search:
-        query = query.where(
-            Branch.name.ilike(f"%{search}%") |
-            Branch.code.ilike(f"%{search}%") |
-            Branch.city.ilike(f"%{search}%")
-        )
+        query = query.where(search_filter("branches", search))
 
     if is_active is not None:
         query = query.where(Branch.is_active == is_active)
@@ -177,11 +174,7 @@ async def get_my_assigned_branches(
 
     # Apply filters
     if search:
-        query = query.where(
-            Branch.name.ilike(f"%{search}%") |
-            Branch.code.ilike(f"%{search}%") |
-            Branch.city.ilike(f"%{search}%")
-        )
+        query = query.where(search_filter("branches", search))
 
     if is_active is not None:
         query = query.where(Branch.is_active == is_active)
@@ -9,6 +9,7 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_db, BusinessTypeModel
+from src.services.search import search_filter
 from src.schemas import (
     BusinessTypeModel as BusinessTypeModelSchema,
     BusinessTypeCreate,
@@ -54,11 +55,7 @@ async def list_business_types(
 
     # Apply filters
     if search:
-        query = query.where(
-            BusinessTypeModel.name.ilike(f"%{search}%") |
-            BusinessTypeModel.code.ilike(f"%{search}%") |
-            BusinessTypeModel.description.ilike(f"%{search}%")
-        )
+        query = query.where(search_filter("business_types", search))
 
     if is_active is not None:
         query = query.where(BusinessTypeModel.is_active == is_active)
@@ -10,11 +10,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from src.database import get_db, Customer, Branch, BusinessType, BusinessTypeModel, CustomerBranch, CustomerBusinessType
+from src.services.change_events import change_events
+from src.services.search import search_filter
 from src.helpers import validate_branch_exists
 from src.schemas import (
     Customer as CustomerSchema,
     CustomerCreate,
     CustomerUpdate,
+    BatchLookupRequest,
     PaginatedResponse
 )
 from src.security import (
@@ -59,12 +62,7 @@ async def list_customers(
 
     # Apply filters
     if search:
-        query = query.where(
-            Customer.name.ilike(f"%{search}%") |
-            Customer.code.ilike(f"%{search}%") |
-            Customer.email.ilike(f"%{search}%") |
-            Customer.phone.ilike(f"%{search}%")
-        )
+        query = query.where(search_filter("customers", search))
 
     # Support both old enum filter and new foreign key filter
     if business_type_id:
@@ -141,6 +139,35 @@ async def get_customer(
     return CustomerSchema.model_validate(customer)
 
 
+@router.post("/batch", response_model=List[CustomerSchema])
+async def get_customers_batch(
+    lookup: BatchLookupRequest,
+    token_data: TokenData = Depends(require_any_permission(["customers:read_all", "customers:read"])),
+    tenant_id: str = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get many customers by ID in a single request
+
+    IDs that do not exist in the tenant are omitted from the response.
+
+    Requires:
+    - customers:read_all (to view any customer) OR
+    - customers:read (to view basic customer info)
+    """
+    query = select(Customer).where(
+        Customer.id.in_(set(lookup.ids)),
+        Customer.tenant_id == tenant_id
+    ).options(
+        selectinload(Customer.business_type_relation),
+        selectinload(Customer.business_types).selectinload(CustomerBusinessType.business_type),
+        selectinload(Customer.branches).selectinload(CustomerBranch.branch)
+    )
+
+    result = await db.execute(query)
+    return [CustomerSchema.model_validate(customer) for customer in result.scalars().all()]
+
+
 @router.post("/", response_model=CustomerSchema, status_code=201)
 async def create_customer(
     customer_data: CustomerCreate,
@@ -359,7 +386,9 @@ async def update_customer(
     )
     customer = customer_with_relationships.scalar_one()
 
-    return CustomerSchema.model_validate(customer)
+    response = CustomerSchema.model_validate(customer)
+    await change_events.publish("customer", tenant_id, response.model_dump(mode="json"))
+    return response
 
 
 @router.delete("/{customer_id}", status_code=204)
@@ -13,6 +13,7 @@ from sqlalchemy.orm import selectinload
 import httpx
 
 from src.database import get_db, Customer, MarketingPersonCustomer, EmployeeProfile
+from src.services.search import search_filter
 from src.schemas import (
     PaginatedResponse
 )
@@ -134,13 +135,7 @@ async def get_marketing_persons(
 
     # Apply search filter if provided
     if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            (EmployeeProfile.first_name.ilike(search_pattern)) |
-            (EmployeeProfile.last_name.ilike(search_pattern)) |
-            (EmployeeProfile.email.ilike(search_pattern)) |
-            (EmployeeProfile.employee_code.ilike(search_pattern))
-        )
+        query = query.where(search_filter("employees", search))
 
     result = await db.execute(query)
     marketing_persons = result.scalars().all()
@@ -199,12 +194,7 @@ async def get_customers_for_assignment(
 
     # Apply filters
     if search:
-        query = query.where(
-            Customer.name.ilike(f"%{search}%") |
-            Customer.code.ilike(f"%{search}%") |
-            Customer.email.ilike(f"%{search}%") |
-            Customer.phone.ilike(f"%{search}%")
-        )
+        query = query.where(search_filter("customers", search))
 
     if is_active is not None:
         query = query.where(Customer.is_active == is_active)
@@ -656,12 +646,7 @@ async def get_marketing_person_customers_by_branch(
 
     # Apply search filter
     if search:
-        query = query.where(
-            Customer.name.ilike(f"%{search}%") |
-            Customer.code.ilike(f"%{search}%") |
-            Customer.email.ilike(f"%{search}%") |
-            Customer.phone.ilike(f"%{search}%")
-        )
+        query = query.where(search_filter("customers", search))
 
     query = query.order_by(Customer.name)
 
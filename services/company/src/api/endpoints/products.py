@@ -10,11 +10,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from src.database import get_db, Product, ProductCategory, Branch, ProductBranch, ProductUnitType
+from src.services.change_events import change_events
+from src.services.search import search_filter
 from src.helpers import validate_category_exists, validate_branch_exists
 from src.schemas import (
     Product as ProductSchema,
     ProductCreate,
     ProductUpdate,
+    BatchLookupRequest,
     PaginatedResponse
 )
 from src.security import (
@@ -56,20 +59,13 @@ async def list_products(
 
     # Apply filters
     if search:
-        query = query.where(
-            or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.code.ilike(f"%{search}%"),
-                Product.description.ilike(f"%{search}%")
-            )
-        )
+        query = query.where(search_filter("products", search))
 
     if category_id:
         query = query.where(Product.category_id == category_id)
 
     if branch_id:
         # Filter products available for all branches OR specific branch
-        from sqlalchemy import or_
         query = query.where(
             or_(
                 Product.available_for_all_branches == True,
@@ -163,6 +159,35 @@ async def get_product(
     return ProductSchema.model_validate(product)
 
 
+@router.post("/batch", response_model=List[ProductSchema])
+async def get_products_batch(
+    lookup: BatchLookupRequest,
+    token_data: TokenData = Depends(require_any_permission(["products:read_all", "products:read"])),
+    tenant_id: str = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get many products by ID in a single request
+
+    IDs that do not exist in the tenant are omitted from the response.
+
+    Requires:
+    - products:read_all (to view any product) OR
+    - products:read (to view basic product info)
+    """
+    query = select(Product).where(
+        Product.id.in_(set(lookup.ids)),
+        Product.tenant_id == tenant_id
+    ).options(
+        selectinload(Product.branches).selectinload(ProductBranch.branch),
+        selectinload(Product.category).selectinload(ProductCategory.children),
+        selectinload(Product.unit_type)
+    )
+
+    result = await db.execute(query)
+    return [ProductSchema.model_validate(product) for product in result.scalars().all()]
+
+
 @router.post("/", response_model=ProductSchema, status_code=201)
 async def create_product(
     product_data: ProductCreate,
@@ -351,7 +376,9 @@ async def update_product(
     )
     product = result.scalar_one()
 
-    return ProductSchema.model_validate(product)
+    response = ProductSchema.model_validate(product)
+    await change_events.publish("product", tenant_id, response.model_dump(mode="json"))
+    return response
 
 
 @router.delete("/{product_id}", status_code=204)
@@ -502,7 +529,10 @@ async def bulk_update_products(
     loaded_products = {p.id: p for p in result.scalars().all()}
 
     # Return in the same order as the input
-    return [ProductSchema.model_validate(loaded_products[p.id]) for p in updated_products]
+    responses = [ProductSchema.model_validate(loaded_products[p.id]) for p in updated_products]
+    for response in responses:
+        await change_events.publish("product", tenant_id, response.model_dump(mode="json"))
+    return responses
 
 
 @router.get("/{product_id}/stock-history")
@@ -9,7 +9,8 @@ import io
 from pathlib import Path
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File as FastAPIFile, BackgroundTasks, Response, Request
 from fastapi.responses import StreamingResponse
-from sqlalchemy import select, func, and_, or_, desc, asc, inspect
+from sqlalchemy import select, update, func, and_, desc, asc, inspect, literal_column, true
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 import uuid
@@ -27,8 +28,15 @@ from src.database import (
     EmployeeDocument,
     Branch
 )
+from src.services.profile_stats import profile_stats_snapshot
+from src.services.search import search_filter
 from src.config_local import settings
+from src.services.role_catalog import role_catalog
 from src.helpers import validate_employee_exists, validate_branch_exists
+from src.utils.uploads import save_upload
+from src.utils.image_derivatives import AVATAR_DERIVATIVE_SPECS, derivative_path
+from src.services.avatar_derivatives import avatar_derivatives
+from src.services.change_events import change_events, driver_change
 from src.schemas import (
     DriverProfile as DriverProfileSchema,
     DriverProfileCreate,
@@ -533,10 +541,9 @@ async def upload_profile_avatar(
             detail="Invalid file type. Only JPEG, PNG, and GIF are allowed"
         )
 
-    # Validate file size (max 5MB)
+    # Validate file size (max 5MB); enforced again while the file is streamed
     max_size = 5 * 1024 * 1024
-    file_content = await file.read()
-    if len(file_content) > max_size:
+    if file.size is not None and file.size > max_size:
         raise HTTPException(
             status_code=400,
             detail="File too large. Maximum size is 5MB"
@@ -553,8 +560,9 @@ async def upload_profile_avatar(
 
     # Save file
     try:
-        with open(file_path, "wb") as buffer:
-            buffer.write(file_content)
+        await save_upload(file, file_path, max_size, "File too large. Maximum size is 5MB")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to save avatar: {str(e)}")
         raise HTTPException(
@@ -562,8 +570,16 @@ async def upload_profile_avatar(
             detail="Failed to save avatar"
         )
 
+    # Thumbnail/preview are rendered in the background, next to the original
+    derivatives_scheduled = avatar_derivatives.schedule(file_path)
+
     # Update profile with avatar URL
     avatar_url = f"/files/{tenant_id}/avatars/{profile_type}/{unique_filename}"
+    # Variant URLs only when they will be rendered (the pipeline may be off)
+    variant_urls = {
+        f"{name}_url": derivative_path(avatar_url, name)
+        for name in AVATAR_DERIVATIVE_SPECS
+    } if derivatives_scheduled else {}
 
     if profile_type == "employee":
         query = select(EmployeeProfile).where(
@@ -585,6 +601,7 @@ async def upload_profile_avatar(
         "profile_id": profile_id,
         "profile_type": profile_type,
         "avatar_url": avatar_url,
+        **variant_urls,
         "message": "Avatar uploaded successfully"
     }
 
@@ -609,15 +626,7 @@ async def search_profiles(
 
     # Apply text search
     if search_params.query:
-        query = query.where(
-            or_(
-                EmployeeProfile.first_name.ilike(f"%{search_params.query}%"),
-                EmployeeProfile.last_name.ilike(f"%{search_params.query}%"),
-                EmployeeProfile.employee_code.ilike(f"%{search_params.query}%"),
-                EmployeeProfile.email.ilike(f"%{search_params.query}%"),
-                EmployeeProfile.phone.ilike(f"%{search_params.query}%")
-            )
-        )
+        query = query.where(search_filter("employees", search_params.query))
 
     # Apply branch filter
     if search_params.branches:
@@ -754,6 +763,14 @@ async def get_driver_profile(
     return DriverProfileSchema(**driver_profile_to_dict(driver))
 
 
+async def _publish_driver_change(db: AsyncSession, driver: DriverProfile, tenant_id: str):
+    """Publish a driver's status and auth user ID for the TMS resource directory"""
+    result = await db.execute(
+        select(EmployeeProfile.user_id).where(EmployeeProfile.id == driver.employee_profile_id)
+    )
+    await change_events.publish("driver", tenant_id, driver_change(driver, result.scalar_one_or_none()))
+
+
 @router.post("/drivers", response_model=DriverProfileSchema, status_code=201)
 async def create_driver_profile(
     driver_data: DriverProfileCreate,
@@ -828,6 +845,7 @@ async def create_driver_profile(
     await db.refresh(driver)
 
     logger.info(f"Driver profile created: id={driver.id}, employee_profile_id={driver.employee_profile_id}, tenant_id={driver.tenant_id}")
+    await _publish_driver_change(db, driver, tenant_id)
 
     return DriverProfileSchema(**driver_profile_to_dict(driver))
 
@@ -896,6 +914,7 @@ async def update_driver_profile(
 
     await db.commit()
     await db.refresh(driver)
+    await _publish_driver_change(db, driver, tenant_id)
 
     return DriverProfileSchema(**driver_profile_to_dict(driver))
 
@@ -960,6 +979,7 @@ async def update_driver_status_internal(
     await db.refresh(driver)
 
     logger.info(f"Driver {driver_id} status updated to {status} via internal endpoint")
+    await _publish_driver_change(db, driver, tenant_id)
 
     return {
         "id": str(driver.id),
@@ -1711,10 +1731,9 @@ async def upload_document(
             detail=f"Invalid file type. Allowed types: {', '.join(allowed_extensions)}"
         )
 
-    # Check file size (max 10MB)
+    # Check file size (max 10MB); enforced again while the file is streamed
     max_size = 10 * 1024 * 1024
-    file_content = await file.read()
-    if len(file_content) > max_size:
+    if file.size is not None and file.size > max_size:
         raise HTTPException(
             status_code=400,
             detail="File too large. Maximum size is 10MB"
@@ -1767,8 +1786,9 @@ async def upload_document(
 
     # Save file with error handling
     try:
-        with open(file_path, "wb") as buffer:
-            buffer.write(file_content)
+        file_size, _ = await save_upload(file, file_path, max_size, "File too large. Maximum size is 10MB")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to save file: {str(e)}")
         # Clean up partial file if it exists
@@ -1792,7 +1812,7 @@ async def upload_document(
         document_number=document_number,
         file_path=str(file_path),
         file_url=f"/files/{tenant_id}/documents/{employee_profile_id}/{safe_filename}",
-        file_size=len(file_content),
+        file_size=file_size,
         file_type=file_extension.lstrip('.'),
         issue_date=issue_date,
         expiry_date=expiry_date,
@@ -2228,184 +2248,145 @@ async def reorder_documents(
     }
 
 
-@router.get("/stats", response_model=ProfileStats)
-async def get_profile_statistics(
-    token_data: TokenData = Depends(require_any_permission([*USER_READ_ALL, *USER_READ])),
-    tenant_id: str = Depends(get_current_tenant_id),
-    db: AsyncSession = Depends(get_db)
-):
+def _completion_percentage(complete: int, total: int) -> float:
     """
-    Get profile statistics dashboard
-
-    Requires:
-    - users:read_all (to view all statistics) OR
-    - users:read (to view basic statistics)
+    Average profile completion percentage from aggregate counts
+    Simplified: Profile is complete (100%) if updated_at is not None, else 0%
     """
+    if not total:
+        return 0.0
+    return round(complete * 100 / total, 2)
 
-    # Get total profiles
-    total_query = select(func.count(EmployeeProfile.id)).where(
-        EmployeeProfile.tenant_id == tenant_id
-    )
-    total_result = await db.execute(total_query)
-    total_profiles = total_result.scalar()
 
-    # Get active/inactive profiles
-    active_query = select(func.count(EmployeeProfile.id)).where(
-        EmployeeProfile.tenant_id == tenant_id,
-        EmployeeProfile.is_active == True
-    )
-    active_result = await db.execute(active_query)
-    active_profiles = active_result.scalar()
-    inactive_profiles = total_profiles - active_profiles
-
-    # Get profiles by type
-    profiles_by_type = {
-        "employee": total_profiles,  # Base employee profiles
-        "driver": 0,
-        "finance_manager": 0,
-        "branch_manager": 0,
-        "logistics_manager": 0
-    }
+def _count_map(counts) -> Any:
+    """Scalar subquery folding a (key, count) subquery into a JSON object"""
+    return select(
+        func.coalesce(
+            func.jsonb_object_agg(counts.c.key, counts.c.count, type_=JSONB),
+            literal_column("'{}'::jsonb")
+        )
+    ).scalar_subquery()
 
-    # Count specialized profiles
-    driver_query = select(func.count(DriverProfile.id)).where(
-        DriverProfile.tenant_id == tenant_id
-    )
-    driver_result = await db.execute(driver_query)
-    profiles_by_type["driver"] = driver_result.scalar()
 
-    finance_query = select(func.count(FinanceManagerProfile.id)).where(
-        FinanceManagerProfile.tenant_id == tenant_id
-    )
-    finance_result = await db.execute(finance_query)
-    profiles_by_type["finance_manager"] = finance_result.scalar()
+def _tenant_count(model, tenant_id: str) -> Any:
+    """Scalar subquery counting a tenant's rows of a model"""
+    return select(func.count()).select_from(model).where(
+        model.tenant_id == tenant_id
+    ).scalar_subquery()
 
-    branch_query = select(func.count(BranchManagerProfile.id)).where(
-        BranchManagerProfile.tenant_id == tenant_id
-    )
-    branch_result = await db.execute(branch_query)
-    profiles_by_type["branch_manager"] = branch_result.scalar()
 
-    logistics_query = select(func.count(LogisticsManagerProfile.id)).where(
-        LogisticsManagerProfile.tenant_id == tenant_id
-    )
-    logistics_result = await db.execute(logistics_query)
-    profiles_by_type["logistics_manager"] = logistics_result.scalar()
+async def _query_profile_statistics(db: AsyncSession, tenant_id: str) -> Dict[str, Any]:
+    """Compute the profile statistics dashboard in a single aggregate query"""
+    now = datetime.utcnow()
+
+    employees = select(
+        func.count().label("total"),
+        func.count().filter(EmployeeProfile.is_active == True).label("active"),
+        func.count().filter(EmployeeProfile.created_at >= now - timedelta(days=30)).label("recent"),
+        func.count().filter(EmployeeProfile.updated_at.isnot(None)).label("complete")
+    ).where(
+        EmployeeProfile.tenant_id == tenant_id
+    ).subquery()
+
+    documents = select(
+        func.count().label("total"),
+        func.count().filter(EmployeeDocument.is_verified == True).label("verified"),
+        func.count().filter(
+            EmployeeDocument.expiry_date.between(now, now + timedelta(days=30))
+        ).label("expiring_soon"),
+        func.count().filter(EmployeeDocument.expiry_date < now).label("expired")
+    ).where(
+        EmployeeDocument.tenant_id == tenant_id
+    ).subquery()
 
-    # Get profiles by branch
-    branch_query = select(
-        Branch.name,
-        func.count(EmployeeProfile.id)
+    by_branch = select(
+        Branch.name.label("key"),
+        func.count(EmployeeProfile.id).label("count")
     ).select_from(
         EmployeeProfile
     ).join(
         Branch, EmployeeProfile.branch_id == Branch.id
     ).where(
         EmployeeProfile.tenant_id == tenant_id
-    ).group_by(Branch.name)
-
-    branch_result = await db.execute(branch_query)
-    profiles_by_branch = {row[0]: row[1] for row in branch_result}
+    ).group_by(Branch.name).subquery()
 
-    # Get profiles by department
-    dept_query = select(
-        EmployeeProfile.department,
-        func.count(EmployeeProfile.id)
+    by_department = select(
+        EmployeeProfile.department.label("key"),
+        func.count(EmployeeProfile.id).label("count")
     ).where(
         EmployeeProfile.tenant_id == tenant_id,
         EmployeeProfile.department.isnot(None)
-    ).group_by(EmployeeProfile.department)
+    ).group_by(EmployeeProfile.department).subquery()
+
+    query = select(
+        employees.c.total,
+        employees.c.active,
+        employees.c.recent,
+        employees.c.complete,
+        documents.c.total.label("documents_total"),
+        documents.c.verified.label("documents_verified"),
+        documents.c.expiring_soon.label("documents_expiring_soon"),
+        documents.c.expired.label("documents_expired"),
+        _tenant_count(DriverProfile, tenant_id).label("drivers"),
+        _tenant_count(FinanceManagerProfile, tenant_id).label("finance_managers"),
+        _tenant_count(BranchManagerProfile, tenant_id).label("branch_managers"),
+        _tenant_count(LogisticsManagerProfile, tenant_id).label("logistics_managers"),
+        _count_map(by_branch).label("profiles_by_branch"),
+        _count_map(by_department).label("profiles_by_department")
+    ).select_from(employees.join(documents, true()))
+
+    row = (await db.execute(query)).one()
 
-    dept_result = await db.execute(dept_query)
-    profiles_by_department = {row[0]: row[1] for row in dept_result}
-
-    # Get recent additions (last 30 days)
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    recent_query = select(func.count(EmployeeProfile.id)).where(
-        EmployeeProfile.tenant_id == tenant_id,
-        EmployeeProfile.created_at >= thirty_days_ago
-    )
-    recent_result = await db.execute(recent_query)
-    recent_additions = recent_result.scalar()
-
-    # Get document statistics
-    doc_total_query = select(func.count(EmployeeDocument.id)).where(
-        EmployeeDocument.tenant_id == tenant_id
-    )
-    doc_total_result = await db.execute(doc_total_query)
-    documents_total = doc_total_result.scalar()
-
-    doc_verified_query = select(func.count(EmployeeDocument.id)).where(
-        EmployeeDocument.tenant_id == tenant_id,
-        EmployeeDocument.is_verified == True
-    )
-    doc_verified_result = await db.execute(doc_verified_query)
-    documents_verified = doc_verified_result.scalar()
-
-    documents_pending = documents_total - documents_verified
-
-    # Documents expiring soon
-    expiry_threshold = datetime.utcnow() + timedelta(days=30)
-    doc_expiring_query = select(func.count(EmployeeDocument.id)).where(
-        EmployeeDocument.tenant_id == tenant_id,
-        EmployeeDocument.expiry_date.isnot(None),
-        EmployeeDocument.expiry_date <= expiry_threshold,
-        EmployeeDocument.expiry_date >= datetime.utcnow()
-    )
-    doc_expiring_result = await db.execute(doc_expiring_query)
-    documents_expiring_soon = doc_expiring_result.scalar()
-
-    # Documents expired
-    doc_expired_query = select(func.count(EmployeeDocument.id)).where(
-        EmployeeDocument.tenant_id == tenant_id,
-        EmployeeDocument.expiry_date < datetime.utcnow()
-    )
-    doc_expired_result = await db.execute(doc_expired_query)
-    documents_expired = doc_expired_result.scalar()
-
-    # Calculate actual average completion percentage
-    avg_completion_percentage = await _calculate_average_completion(db, tenant_id)
-
-    return ProfileStats(
-        total_profiles=total_profiles,
-        active_profiles=active_profiles,
-        inactive_profiles=inactive_profiles,
-        profiles_by_type=profiles_by_type,
-        profiles_by_branch=profiles_by_branch,
-        profiles_by_department=profiles_by_department,
-        recent_additions=recent_additions,
-        documents_total=documents_total,
-        documents_verified=documents_verified,
-        documents_pending=documents_pending,
-        documents_expiring_soon=documents_expiring_soon,
-        documents_expired=documents_expired,
-        avg_completion_percentage=avg_completion_percentage
-    )
+    return {
+        "total_profiles": row.total,
+        "active_profiles": row.active,
+        "inactive_profiles": row.total - row.active,
+        "profiles_by_type": {
+            "employee": row.total,  # Base employee profiles
+            "driver": row.drivers,
+            "finance_manager": row.finance_managers,
+            "branch_manager": row.branch_managers,
+            "logistics_manager": row.logistics_managers
+        },
+        "profiles_by_branch": row.profiles_by_branch,
+        "profiles_by_department": row.profiles_by_department,
+        "recent_additions": row.recent,
+        "documents_total": row.documents_total,
+        "documents_verified": row.documents_verified,
+        "documents_pending": row.documents_total - row.documents_verified,
+        "documents_expiring_soon": row.documents_expiring_soon,
+        "documents_expired": row.documents_expired,
+        "avg_completion_percentage": _completion_percentage(row.complete, row.total)
+    }
 
 
-async def _calculate_average_completion(db: AsyncSession, tenant_id: str) -> float:
-    """
-    Calculate the average profile completion percentage across all employees
-    Simplified: Profile is complete (100%) if updated_at is not None, else 0%
+@router.get("/stats", response_model=ProfileStats)
+async def get_profile_statistics(
+    fresh: bool = Query(False, description="Bypass the cached statistics snapshot"),
+    token_data: TokenData = Depends(require_any_permission([*USER_READ_ALL, *USER_READ])),
+    tenant_id: str = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+):
     """
-    # Get all employees
-    query = select(EmployeeProfile).where(
-        EmployeeProfile.tenant_id == tenant_id
-    )
-    result = await db.execute(query)
-    employees = result.scalars().all()
+    Get profile statistics dashboard
 
-    if not employees:
-        return 0.0
+    Served from a per-tenant snapshot that is dropped on profile writes,
+    unless fresh=true.
 
-    total_completion = 0
+    Requires:
+    - users:read_all (to view all statistics) OR
+    - users:read (to view basic statistics)
+    """
+    if not fresh:
+        stats = profile_stats_snapshot.get(tenant_id)
+        if stats is not None:
+            return ProfileStats(**stats)
 
-    for employee in employees:
-        # Simplified: 100% if updated_at is not None, else 0%
-        completion_percentage = 100 if employee.updated_at is not None else 0
-        total_completion += completion_percentage
+    generation = profile_stats_snapshot.generation(tenant_id)
+    stats = await _query_profile_statistics(db, tenant_id)
+    profile_stats_snapshot.set(tenant_id, stats, generation)
 
-    return round(total_completion / len(employees), 2)
+    return ProfileStats(**stats)
 
 
 @router.get("/by-role", response_model=Dict[str, Any])
@@ -2413,6 +2394,7 @@ async def get_profiles_by_role(
     request: Request,
     include_inactive: bool = Query(False, description="Include inactive users in the response"),
     include_completion_stats: bool = Query(True, description="Include profile completion statistics"),
+    include_users: bool = Query(True, description="Include the users of each role; counts only when false"),
     token_data: TokenData = Depends(require_any_permission([*USER_READ_ALL, *USER_READ])),
     tenant_id: str = Depends(get_current_tenant_id),
     db: AsyncSession = Depends(get_db)
@@ -2420,7 +2402,8 @@ async def get_profiles_by_role(
     """
     Get all users grouped by their roles with optional profile completion statistics
 
-    Now uses auth service for user and role data instead of company_roles table
+    Now uses auth service for user and role data instead of company_roles table.
+    Counts and completion statistics are computed with a single GROUP BY query.
 
     Requires:
     - users:read_all (to view all profiles) OR
@@ -2455,134 +2438,115 @@ async def get_profiles_by_role(
                 detail="Auth service unavailable"
             )
 
-    # Get all employee profiles for this tenant
-    query = select(EmployeeProfile).options(
-        selectinload(EmployeeProfile.branch)
-    ).where(
-        EmployeeProfile.tenant_id == tenant_id
-    )
-
+    # Only employee profiles that have an auth service user are listed
+    profile_filters = [
+        EmployeeProfile.tenant_id == tenant_id,
+        EmployeeProfile.user_id.in_([auth_user["id"] for auth_user in auth_users])
+    ]
     if not include_inactive:
-        query = query.where(EmployeeProfile.is_active == True)
+        profile_filters.append(EmployeeProfile.is_active == True)
 
-    result = await db.execute(query)
-    employee_profiles = result.scalars().all()
-
-    # Create a map of user_id -> employee_profile
-    profile_map = {ep.user_id: ep for ep in employee_profiles}
+    # Simplified: Profile is complete if updated_at is not None (has been updated at least once)
+    is_complete = EmployeeProfile.updated_at.isnot(None)
 
-    # Fetch all roles from auth service for role name lookup
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            roles_response = await client.get(
-                f"{settings.AUTH_SERVICE_URL}/api/v1/roles/",
-                headers=auth_headers
-            )
-            roles_map = {}
-            if roles_response.status_code == 200:
-                auth_roles = roles_response.json()
-                for role in auth_roles:
-                    roles_map[str(role["id"])] = {
-                        "id": str(role["id"]),
-                        "name": role["name"],
-                        "role_name": role["name"],
-                        "display_name": role.get("description") or role["name"],
-                        "is_system_role": role.get("is_system", False)
-                    }
-        except httpx.RequestError as e:
-            logger.error(f"Error fetching roles from auth service: {e}")
-            roles_map = {}
+    counts_query = select(
+        EmployeeProfile.role_id,
+        func.count().label("total_count"),
+        func.count().filter(EmployeeProfile.is_active == True).label("active_count"),
+        func.count().filter(is_complete).label("complete_count")
+    ).where(*profile_filters).group_by(EmployeeProfile.role_id)
+    role_counts = (await db.execute(counts_query)).all()
 
     # Import the helper function from users.py
     from src.api.endpoints.users import extract_auth_token
     auth_token = extract_auth_token(request)
 
-    # Group users by role from auth service
-    roles_dict: Dict[str, Dict[str, Any]] = {}
+    # Role names come from the cached per-tenant role catalog
+    auth_roles = await role_catalog.get_roles(tenant_id, auth_token)
+    roles_map = {str(role["id"]): role for role in auth_roles.values()}
 
-    for auth_user in auth_users:
-        # Skip if no employee profile exists
-        employee = profile_map.get(auth_user["id"])
-        if not employee:
-            continue
-
-        # Use employee's role_id (from employee_profiles table) instead of auth_user's role_id
-        role_id = str(employee.role_id) if employee.role_id else "unassigned"
+    # Build role groups from the aggregate counts
+    roles_dict: Dict[str, Dict[str, Any]] = {}
+    total_complete = 0
 
-        # Get role information from roles_map (fetched from auth service)
+    for row in role_counts:
+        role_id = str(row.role_id) if row.role_id else "unassigned"
         role_info = roles_map.get(role_id, {})
-        role_name = role_info.get("role_name") or role_info.get("name") or "Unassigned"
-        is_system_role = role_info.get("is_system_role", False)
-
-        # Initialize role group if not exists
-        if role_id not in roles_dict:
-            roles_dict[role_id] = {
-                "role_id": role_id,
-                "role_name": role_name,
-                "role_display_name": role_name,
-                "is_system_role": is_system_role,
-                "users": [],
-                "total_count": 0,
-                "active_count": 0,
-                "inactive_count": 0
-            }
+        role_name = role_info.get("name") or "Unassigned"
 
-        # Calculate profile completion for this user
-        completion_percentage = 0
-        completed_sections = []
-        missing_sections = []
-        total_sections = 0
-
-        if include_completion_stats:
-            # Simplified: Profile is complete if updated_at is not None (has been updated at least once)
-            is_complete = employee.updated_at is not None
-            completion_percentage = 100 if is_complete else 0
-            completed_sections = ["Profile Updated"] if is_complete else []
-            missing_sections = [] if is_complete else ["Profile Not Updated"]
-            total_sections = 1
-
-        # Get branch information
-        branch_name = None
-        if employee.branch:
-            branch_name = employee.branch.name
-
-        # Create user object
-        user_data = {
-            "id": str(employee.id),  # Convert UUID to string
-            "user_id": employee.user_id,
-            "employee_code": employee.employee_code,
-            "first_name": employee.first_name,
-            "last_name": employee.last_name,
-            "email": employee.email,
-            "phone": employee.phone,
-            "department": employee.department,
-            "designation": employee.designation,
-            "branch_id": str(employee.branch_id) if employee.branch_id else None,
-            "branch_name": branch_name,
-            "is_active": employee.is_active,
-            "created_at": employee.created_at.isoformat() if employee.created_at else None,
-            "updated_at": employee.updated_at.isoformat() if employee.updated_at else None,
+        roles_dict[role_id] = {
             "role_id": role_id,
-            "role_name": role_name
+            "role_name": role_name,
+            "role_display_name": role_name,
+            "is_system_role": role_info.get("is_system", False),
+            "users": [],
+            "total_count": row.total_count,
+            "active_count": row.active_count,
+            "inactive_count": row.total_count - row.active_count
         }
+        total_complete += row.complete_count
+
+    if include_users:
+        # Load only the listed columns, with the branch name joined in
+        users_query = select(
+            EmployeeProfile.id,
+            EmployeeProfile.user_id,
+            EmployeeProfile.employee_code,
+            EmployeeProfile.first_name,
+            EmployeeProfile.last_name,
+            EmployeeProfile.email,
+            EmployeeProfile.phone,
+            EmployeeProfile.department,
+            EmployeeProfile.designation,
+            EmployeeProfile.branch_id,
+            EmployeeProfile.role_id,
+            EmployeeProfile.is_active,
+            EmployeeProfile.created_at,
+            EmployeeProfile.updated_at,
+            Branch.name.label("branch_name")
+        ).outerjoin(
+            Branch, EmployeeProfile.branch_id == Branch.id
+        ).where(*profile_filters).order_by(EmployeeProfile.first_name, EmployeeProfile.last_name)
+
+        for employee in (await db.execute(users_query)).all():
+            role_id = str(employee.role_id) if employee.role_id else "unassigned"
+            role_group = roles_dict.get(role_id)
+            if role_group is None:
+                # Created after the counts were taken
+                continue
 
-        # Add completion stats if requested
-        if include_completion_stats:
-            user_data["profile_completion"] = {
-                "completion_percentage": round(completion_percentage, 2),
-                "completed_sections": list(set(completed_sections)),
-                "missing_sections": list(set(missing_sections)),
-                "total_sections": total_sections,
-                "is_complete": completion_percentage >= 100
+            # Create user object
+            user_data = {
+                "id": str(employee.id),  # Convert UUID to string
+                "user_id": employee.user_id,
+                "employee_code": employee.employee_code,
+                "first_name": employee.first_name,
+                "last_name": employee.last_name,
+                "email": employee.email,
+                "phone": employee.phone,
+                "department": employee.department,
+                "designation": employee.designation,
+                "branch_id": str(employee.branch_id) if employee.branch_id else None,
+                "branch_name": employee.branch_name,
+                "is_active": employee.is_active,
+                "created_at": employee.created_at.isoformat() if employee.created_at else None,
+                "updated_at": employee.updated_at.isoformat() if employee.updated_at else None,
+                "role_id": role_id,
+                "role_name": role_group["role_name"]
             }
 
-        # Add user to role group
-        roles_dict[role_id]["users"].append(user_data)
-        roles_dict[role_id]["total_count"] += 1
-        if employee.is_active:
-            roles_dict[role_id]["active_count"] += 1
-        else:
-            roles_dict[role_id]["inactive_count"] += 1
+            # Add completion stats if requested
+            if include_completion_stats:
+                complete = employee.updated_at is not None
+                user_data["profile_completion"] = {
+                    "completion_percentage": 100 if complete else 0,
+                    "completed_sections": ["Profile Updated"] if complete else [],
+                    "missing_sections": [] if complete else ["Profile Not Updated"],
+                    "total_sections": 1,
+                    "is_complete": complete
+                }
+
+            role_group["users"].append(user_data)
 
     # Convert to list and sort (Unassigned at the end)
     roles_list = list(roles_dict.values())
@@ -2593,38 +2557,16 @@ async def get_profiles_by_role(
     total_active = sum(role["active_count"] for role in roles_list)
     total_inactive = sum(role["inactive_count"] for role in roles_list)
 
-    # Calculate completion statistics if requested
+    # Completion is all-or-nothing per profile, so nothing is ever partially complete
     completion_stats = None
-    if include_completion_stats:
-        all_users = [user for role in roles_list for user in role["users"]]
-        total_with_profiles = len(all_users)
-
-        if total_with_profiles > 0:
-            fully_complete = sum(
-                1 for user in all_users
-                if user["profile_completion"]["completion_percentage"] >= 100
-            )
-            partially_complete = sum(
-                1 for user in all_users
-                if 0 < user["profile_completion"]["completion_percentage"] < 100
-            )
-            not_started = sum(
-                1 for user in all_users
-                if user["profile_completion"]["completion_percentage"] == 0
-            )
-
-            avg_completion = sum(
-                user["profile_completion"]["completion_percentage"]
-                for user in all_users
-            ) / total_with_profiles
-
-            completion_stats = {
-                "total_profiles": total_with_profiles,
-                "fully_complete": fully_complete,
-                "partially_complete": partially_complete,
-                "not_started": not_started,
-                "average_completion_percentage": round(avg_completion, 2)
-            }
+    if include_completion_stats and total_users > 0:
+        completion_stats = {
+            "total_profiles": total_users,
+            "fully_complete": total_complete,
+            "partially_complete": 0,
+            "not_started": total_users - total_complete,
+            "average_completion_percentage": _completion_percentage(total_complete, total_users)
+        }
 
     return {
         "roles": roles_list,
@@ -2663,57 +2605,57 @@ async def bulk_profile_operation(
         started_at=datetime.utcnow()
     )
 
-    # Process each profile
-    for profile_id in operation.profile_ids:
-        try:
-            # Verify profile exists
-            query = select(EmployeeProfile).where(
-                EmployeeProfile.id == profile_id,
-                EmployeeProfile.tenant_id == tenant_id
-            )
-            result = await db.execute(query)
-            profile = result.scalar_one_or_none()
-
-            if not profile:
-                response.failed += 1
-                response.failed_ids.append(profile_id)
-                response.errors.append({
-                    "profile_id": profile_id,
-                    "error": "Profile not found"
-                })
-                continue
+    unique_ids = list(dict.fromkeys(operation.profile_ids))
 
-            # Perform operation
-            if operation.operation == "activate":
-                profile.is_active = True
-                response.successful += 1
-
-            elif operation.operation == "deactivate":
-                profile.is_active = False
-                response.successful += 1
-
-            elif operation.operation == "delete":
-                # Soft delete - mark as inactive
-                profile.is_active = False
-                response.successful += 1
-
-            elif operation.operation == "export":
-                # For export, we would add to a background task
-                background_tasks.add_task(
-                    export_single_profile,
-                    tenant_id,
-                    profile_id,
-                    operation.operation_params or {}
+    try:
+        if operation.operation in ("activate", "deactivate", "delete"):
+            # Single set-based UPDATE; delete is a soft delete (mark as inactive)
+            result = await db.execute(
+                update(EmployeeProfile)
+                .where(
+                    EmployeeProfile.tenant_id == tenant_id,
+                    EmployeeProfile.id.in_(unique_ids)
                 )
-                response.successful += 1
-
-        except Exception as e:
+                .values(is_active=operation.operation == "activate", updated_at=func.now())
+                .returning(EmployeeProfile.id)
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            result = await db.execute(
+                select(EmployeeProfile.id).where(
+                    EmployeeProfile.tenant_id == tenant_id,
+                    EmployeeProfile.id.in_(unique_ids)
+                )
+            )
+        found_ids = set(result.scalars().all())
+    except Exception as e:
+        await db.rollback()
+        response.failed = len(operation.profile_ids)
+        response.failed_ids = list(operation.profile_ids)
+        response.errors = [{"profile_id": pid, "error": str(e)} for pid in operation.profile_ids]
+        response.completed_at = datetime.utcnow()
+        return response
+
+    # Per-profile results
+    for profile_id in operation.profile_ids:
+        if profile_id not in found_ids:
             response.failed += 1
             response.failed_ids.append(profile_id)
             response.errors.append({
                 "profile_id": profile_id,
-                "error": str(e)
+                "error": "Profile not found"
             })
+            continue
+
+        if operation.operation == "export":
+            # For export, we would add to a background task
+            background_tasks.add_task(
+                export_single_profile,
+                tenant_id,
+                profile_id,
+                operation.operation_params or {}
+            )
+        response.successful += 1
 
     await db.commit()
     response.completed_at = datetime.utcnow()
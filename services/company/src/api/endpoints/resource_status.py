@@ -0,0 +1,119 @@
+"""
+Internal endpoint for batched vehicle and driver status updates
+"""
+from datetime import datetime, timedelta
+import logging
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_db, Vehicle, VehicleStatus, DriverProfile, EmployeeProfile
+from src.schemas import ResourceStatusBatchRequest, ResourceStatusBatchResponse
+from src.security import (
+    TokenData,
+    get_current_tenant_id,
+    require_any_permission
+)
+from src.services.change_events import change_events, vehicle_change, driver_change
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.post("/resources/status", response_model=ResourceStatusBatchResponse)
+async def update_resource_statuses(
+    batch: ResourceStatusBatchRequest,
+    token_data: TokenData = Depends(require_any_permission(["vehicles:update", "tms:status_update"])),
+    tenant_id: str = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Update vehicle and driver statuses in one request
+
+    Called by TMS on trip transitions instead of a lookup and an update per
+    truck and driver. Vehicles are matched by ID or plate number, drivers by
+    auth user ID or driver profile ID; all changes commit together. The
+    response carries the IDs so callers can skip the lookup next time.
+    Entries that match nothing in the tenant are listed in ``not_found``.
+
+    Requires one of:
+    - vehicles:update
+    - tms:status_update (special permission for TMS service)
+    """
+    not_found = []
+    vehicle_results = []
+    driver_results = []
+    changed_vehicles = []
+    changed_drivers = []
+
+    if batch.vehicles:
+        ids = [change.vehicle_id for change in batch.vehicles if change.vehicle_id]
+        plates = [change.plate_number for change in batch.vehicles if change.plate_number and not change.vehicle_id]
+        result = await db.execute(
+            select(Vehicle).where(
+                Vehicle.tenant_id == tenant_id,
+                or_(Vehicle.id.in_(ids), Vehicle.plate_number.in_(plates))
+            )
+        )
+        vehicles = result.scalars().all()
+        by_id = {str(vehicle.id): vehicle for vehicle in vehicles}
+        by_plate = {vehicle.plate_number: vehicle for vehicle in vehicles}
+
+        for change in batch.vehicles:
+            vehicle = by_id.get(str(change.vehicle_id)) if change.vehicle_id else by_plate.get(change.plate_number)
+            if not vehicle:
+                not_found.append(f"vehicle:{change.vehicle_id or change.plate_number}")
+                continue
+
+            vehicle_status = VehicleStatus(change.status)
+            if vehicle.status != vehicle_status:
+                vehicle.status = vehicle_status
+                # Same maintenance dates as PUT /vehicles/{id}/status
+                if vehicle_status == VehicleStatus.MAINTENANCE:
+                    vehicle.last_maintenance = datetime.utcnow()
+                elif vehicle_status == VehicleStatus.AVAILABLE and vehicle.last_maintenance:
+                    vehicle.next_maintenance = vehicle.last_maintenance + timedelta(days=90)
+                changed_vehicles.append(vehicle)
+            vehicle_results.append(vehicle_change(vehicle))
+
+    if batch.drivers:
+        user_ids = [change.user_id for change in batch.drivers if change.user_id]
+        profile_ids = [change.driver_id for change in batch.drivers if change.driver_id and not change.user_id]
+        result = await db.execute(
+            select(DriverProfile, EmployeeProfile.user_id)
+            .join(EmployeeProfile, DriverProfile.employee_profile_id == EmployeeProfile.id)
+            .where(
+                DriverProfile.tenant_id == tenant_id,
+                or_(EmployeeProfile.user_id.in_(user_ids), DriverProfile.id.in_(profile_ids))
+            )
+        )
+        rows = result.all()
+        by_user = {user_id: (driver, user_id) for driver, user_id in rows}
+        by_profile = {driver.id: (driver, user_id) for driver, user_id in rows}
+
+        for change in batch.drivers:
+            match = by_user.get(change.user_id) if change.user_id else by_profile.get(change.driver_id)
+            if not match:
+                not_found.append(f"driver:{change.user_id or change.driver_id}")
+                continue
+
+            driver, user_id = match
+            if driver.current_status != change.status:
+                driver.current_status = change.status
+                changed_drivers.append((driver, user_id))
+            driver_results.append(driver_change(driver, user_id))
+
+    await db.commit()
+
+    for vehicle in changed_vehicles:
+        await change_events.publish("vehicle", tenant_id, vehicle_change(vehicle))
+    for driver, user_id in changed_drivers:
+        await change_events.publish("driver", tenant_id, driver_change(driver, user_id))
+
+    logger.info(
+        f"Resource statuses for tenant {tenant_id}: {len(changed_vehicles)} vehicles and "
+        f"{len(changed_drivers)} drivers changed, not found: {not_found}"
+    )
+
+    return ResourceStatusBatchResponse(vehicles=vehicle_results, drivers=driver_results, not_found=not_found)
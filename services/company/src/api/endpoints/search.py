@@ -0,0 +1,83 @@
+"""
+Global search endpoints
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_db
+from src.schemas import GlobalSearchResponse
+from src.services.permission_service import CompanyServicePermission
+from src.services.search import (
+    SEARCHABLE_ENTITIES,
+    DEFAULT_SEARCH_LIMIT,
+    MAX_SEARCH_LIMIT,
+    search_entities
+)
+from src.security import (
+    TokenData,
+    get_current_token_data,
+    get_current_tenant_id,
+)
+from src.security.dependencies import get_permission_service
+
+router = APIRouter()
+
+
+@router.get("/", response_model=GlobalSearchResponse)
+async def global_search(
+    q: str = Query(..., min_length=1, max_length=100, description="Search term"),
+    types: Optional[str] = Query(
+        None,
+        description=f"Comma-separated entity types to search ({', '.join(SEARCHABLE_ENTITIES)}); defaults to all readable types"
+    ),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT, description="Maximum results per entity type"),
+    token_data: TokenData = Depends(get_current_token_data),
+    perm_service: CompanyServicePermission = Depends(get_permission_service),
+    tenant_id: str = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Ranked search across customers, employees, branches, products and business types
+
+    Terms shorter than three characters match identifying columns by prefix
+    only; longer terms use the trigram indexes. Only entity types the user
+    can read are searched.
+    """
+    if types:
+        requested = [name.strip() for name in types.split(",") if name.strip()]
+        unknown = [name for name in requested if name not in SEARCHABLE_ENTITIES]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown search types: {unknown}. Valid types: {list(SEARCHABLE_ENTITIES)}"
+            )
+    else:
+        requested = list(SEARCHABLE_ENTITIES)
+
+    if token_data.is_super_user():
+        allowed = requested
+    else:
+        allowed = [
+            name for name in requested
+            if await perm_service.check_any_permission(
+                token_data.user_id,
+                token_data.role_id,
+                SEARCHABLE_ENTITIES[name].read_permissions
+            )
+        ]
+
+    if types and not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Insufficient permissions to search: {requested}"
+        )
+
+    results = await search_entities(db, tenant_id, q, allowed, limit)
+
+    return GlobalSearchResponse(
+        query=q,
+        results=results,
+        total=sum(len(items) for items in results.values())
+    )
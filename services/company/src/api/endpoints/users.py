@@ -1,15 +1,17 @@
 """
 User management endpoints
 """
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 from datetime import datetime, timedelta
 import uuid
 import secrets
+import json
 import logging
 import httpx
+from collections import defaultdict
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
-from sqlalchemy import select, func, and_, or_, delete
+from sqlalchemy import select, func, and_, delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -26,6 +28,8 @@ from src.database import (
     LogisticsManagerProfile,
     EmployeeDocument
 )
+from src.services.search import search_filter
+from src.services.role_catalog import role_catalog
 from src.helpers import validate_branch_exists, validate_role_exists, validate_employee_reporting_hierarchy, validate_employee_exists
 from src.schemas import (
     EmployeeProfile as EmployeeProfileSchema,
@@ -35,6 +39,7 @@ from src.schemas import (
     UserInvitationCreate,
     UserInvitationUpdate,
     PaginatedResponse,
+    BulkUserUpdateResponse,
     UserManagementResponse,
     UserPasswordChange
 )
@@ -86,19 +91,25 @@ def extract_auth_token(request: Request) -> Optional[str]:
     return auth_header.strip()
 
 
-async def get_role_from_auth_service(role_id: Optional[str], auth_token: Optional[str] = None) -> dict:
-    """
-    Fetch role data from auth service by ID.
-    Always returns a role dict, even if fetch fails (returns minimal role object).
+def _format_role(role: dict) -> dict:
+    """Shape an auth service role into the Role structure expected by the frontend"""
+    return {
+        'id': role['id'],  # Return as int to match frontend Role interface
+        'role_name': role['name'],
+        'name': role['name'],  # Add 'name' field for frontend compatibility
+        'display_name': role.get('description') or role['name'],
+        'description': role.get('description'),
+        'is_active': role.get('is_active', True),
+        'is_system_role': role.get('is_system', False),
+        'created_at': role.get('created_at'),
+        'updated_at': role.get('updated_at'),
+        'employees': [],  # Empty to avoid recursion
+        'invitations': []  # Empty to avoid recursion
+    }
 
-    Args:
-        role_id: The role ID (as string) to fetch
-        auth_token: Optional JWT token to authenticate with auth service
 
-    Returns:
-        Role data dict (never None - returns minimal object if fetch fails)
-    """
-    # Return minimal role object if no role_id
+def _fallback_role(role_id: Optional[str]) -> dict:
+    """Minimal role object used when a role is missing or cannot be fetched"""
     if not role_id:
         return {
             'id': 0,
@@ -114,47 +125,8 @@ async def get_role_from_auth_service(role_id: Optional[str], auth_token: Optiona
             'invitations': []
         }
 
-    try:
-        # Convert to int for auth service API
-        role_id_int = int(role_id) if role_id.isdigit() else role_id
-
-        # Prepare headers with auth token if provided
-        headers = {"Accept": "application/json"}
-        if auth_token:
-            headers["Authorization"] = f"Bearer {auth_token}"
-
-        async with httpx.AsyncClient(timeout=10.0) as client:  # Increased timeout
-            response = await client.get(
-                f"{settings.AUTH_SERVICE_URL}/api/v1/roles/",
-                headers=headers
-            )
-            if response.status_code == 200:
-                roles = response.json()
-                role = next((r for r in roles if r["id"] == role_id_int), None)
-                if role:
-                    return {
-                        'id': role['id'],  # Return as int to match frontend Role interface
-                        'role_name': role['name'],
-                        'name': role['name'],  # Add 'name' field for frontend compatibility
-                        'display_name': role.get('description') or role['name'],
-                        'description': role.get('description'),
-                        'is_active': role.get('is_active', True),
-                        'is_system_role': role.get('is_system', False),
-                        'created_at': role.get('created_at'),
-                        'updated_at': role.get('updated_at'),
-                        'employees': [],  # Empty to avoid recursion
-                        'invitations': []  # Empty to avoid recursion
-                    }
-                else:
-                    logger.warning(f"Role ID {role_id} (as int: {role_id_int}) not found in auth service")
-            else:
-                logger.warning(f"Auth service returned status {response.status_code} when fetching roles")
-    except Exception as e:
-        logger.error(f"Failed to fetch role {role_id} from auth service: {e}", exc_info=True)
-
-    # Return minimal role object on failure (instead of None)
     return {
-        'id': int(role_id) if role_id and role_id.isdigit() else 0,
+        'id': int(role_id) if role_id.isdigit() else 0,
         'role_name': f'Role {role_id}',
         'name': f'Role {role_id}',
         'display_name': f'Role {role_id}',
@@ -168,6 +140,150 @@ async def get_role_from_auth_service(role_id: Optional[str], auth_token: Optiona
     }
 
 
+async def resolve_roles_from_auth_service(
+    role_ids: List[Optional[str]],
+    tenant_id: str,
+    auth_token: Optional[str] = None
+) -> Dict[Optional[str], dict]:
+    """
+    Resolve many role IDs against the tenant's cached role catalog at once.
+
+    Args:
+        role_ids: Role IDs (as strings) to resolve; duplicates and None are allowed
+        tenant_id: Tenant owning the roles
+        auth_token: Optional JWT token to authenticate with auth service
+
+    Returns:
+        Mapping of role_id -> role dict (never missing - minimal object if not found)
+    """
+    wanted = set(role_ids)
+    resolved: Dict[Optional[str], dict] = {}
+
+    roles_by_id = {}
+    if any(wanted):
+        roles_by_id = await role_catalog.get_roles(tenant_id, auth_token)
+
+    for role_id in wanted:
+        role = None
+        if role_id:
+            role = roles_by_id.get(int(role_id) if role_id.isdigit() else role_id)
+            if role is None:
+                logger.warning(f"Role ID {role_id} not found in auth service")
+        resolved[role_id] = _format_role(role) if role else _fallback_role(role_id)
+
+    return resolved
+
+
+async def get_role_from_auth_service(
+    role_id: Optional[str],
+    auth_token: Optional[str] = None,
+    tenant_id: Optional[str] = None
+) -> dict:
+    """
+    Fetch role data from auth service by ID.
+    Always returns a role dict, even if fetch fails (returns minimal role object).
+
+    Args:
+        role_id: The role ID (as string) to fetch
+        auth_token: Optional JWT token to authenticate with auth service
+        tenant_id: Tenant owning the role, used to key the role catalog cache
+
+    Returns:
+        Role data dict (never None - returns minimal object if fetch fails)
+    """
+    roles = await resolve_roles_from_auth_service([role_id], tenant_id, auth_token)
+    return roles[role_id]
+
+
+def _branch_to_dict(branch: Branch) -> dict:
+    """Convert a Branch row into the nested branch structure used in responses"""
+    return {
+        'id': branch.id,
+        'tenant_id': branch.tenant_id,
+        'code': branch.code,
+        'name': branch.name,
+        'address': branch.address,
+        'city': branch.city,
+        'state': branch.state,
+        'postal_code': branch.postal_code,
+        'phone': branch.phone,
+        'email': branch.email,
+        'manager_id': branch.manager_id,
+        'is_active': branch.is_active if branch.is_active is not None else True,
+        'created_at': branch.created_at,
+        'updated_at': branch.updated_at
+    }
+
+
+async def _load_employee_branches(db: AsyncSession, employee_ids: List[str]) -> Dict[str, List[dict]]:
+    """Load assigned branches for many employees with two IN queries"""
+    branches_by_user = defaultdict(list)
+    if not employee_ids:
+        return branches_by_user
+
+    eb_result = await db.execute(
+        select(EmployeeBranch).where(EmployeeBranch.employee_profile_id.in_(employee_ids))
+    )
+    all_employee_branches = eb_result.scalars().all()
+
+    all_branch_ids = list(set(eb.branch_id for eb in all_employee_branches))
+    branches_by_id = {}
+    if all_branch_ids:
+        branches_result = await db.execute(select(Branch).where(Branch.id.in_(all_branch_ids)))
+        branches_by_id = {b.id: _branch_to_dict(b) for b in branches_result.scalars().all()}
+
+    for eb in all_employee_branches:
+        if eb.branch_id in branches_by_id:
+            branches_by_user[eb.employee_profile_id].append(branches_by_id[eb.branch_id])
+    return branches_by_user
+
+
+def _employee_list_item(user: EmployeeProfile, role_data: dict, branches_data: List[dict]) -> dict:
+    """Build the employee dict used by list and bulk responses"""
+    return {
+        'id': user.id,
+        'tenant_id': user.tenant_id,
+        'user_id': user.user_id,
+        'employee_code': user.employee_code,
+        'role_id': user.role_id,
+        'role_name': role_data.get('role_name') or role_data.get('name'),  # Add role_name at top level
+        'branch_id': user.branch_id,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'phone': user.phone,
+        'email': user.email,
+        'date_of_birth': user.date_of_birth,
+        'gender': user.gender,
+        'blood_group': user.blood_group,
+        'emergency_contact_name': user.emergency_contact_name,
+        'emergency_contact_phone': user.emergency_contact_phone,
+        'address': user.address,
+        'city': user.city,
+        'state': user.state,
+        'postal_code': user.postal_code,
+        'country': user.country,
+        'hire_date': user.hire_date,
+        'employment_type': user.employment_type,
+        'department': user.department,
+        'designation': user.designation,
+        'reports_to': user.reports_to,
+        'salary': user.salary,
+        'bank_account_number': user.bank_account_number,
+        'bank_name': user.bank_name,
+        'bank_ifsc': user.bank_ifsc,
+        'pan_number': user.pan_number,
+        'aadhaar_number': user.aadhar_number,
+        'is_active': user.is_active,
+        'created_at': user.created_at,
+        'updated_at': user.updated_at,
+        'role': role_data,
+        # Use first branch for backward compatibility (single branch field)
+        'branch': branches_data[0] if branches_data else None,
+        'branches': branches_data,  # All assigned branches
+        'documents': []  # Empty for now
+    }
+
+
 @router.get("/", response_model=PaginatedResponse)
 async def list_users(
     request: Request,
@@ -194,14 +310,7 @@ async def list_users(
 
     # Apply filters
     if search:
-        query = query.where(
-            or_(
-                EmployeeProfile.first_name.ilike(f"%{search}%"),
-                EmployeeProfile.last_name.ilike(f"%{search}%"),
-                EmployeeProfile.email.ilike(f"%{search}%"),
-                EmployeeProfile.employee_code.ilike(f"%{search}%")
-            )
-        )
+        query = query.where(search_filter("employees", search))
 
     if role_id:
         query = query.where(EmployeeProfile.role_id == role_id)
@@ -237,101 +346,17 @@ async def list_users(
     auth_token = extract_auth_token(request)
 
     # Fetch all employee-branch relationships at once for better performance
-    all_user_ids = [u.id for u in users]
-    if all_user_ids:
-        eb_query = select(EmployeeBranch).where(
-            EmployeeBranch.employee_profile_id.in_(all_user_ids)
-        )
-        eb_result = await db.execute(eb_query)
-        all_employee_branches = eb_result.scalars().all()
-
-        # Group by employee_profile_id
-        from collections import defaultdict
-        branches_by_user = defaultdict(list)
-        for eb in all_employee_branches:
-            branches_by_user[eb.employee_profile_id].append(eb.branch_id)
-
-        # Fetch all branch data at once
-        all_branch_ids = list(set([eb.branch_id for eb in all_employee_branches]))
-        branches_by_id = {}
-        if all_branch_ids:
-            branches_query = select(Branch).where(Branch.id.in_(all_branch_ids))
-            branches_result = await db.execute(branches_query)
-            for branch in branches_result.scalars().all():
-                branches_by_id[branch.id] = {
-                    'id': branch.id,
-                    'tenant_id': branch.tenant_id,
-                    'code': branch.code,
-                    'name': branch.name,
-                    'address': branch.address,
-                    'city': branch.city,
-                    'state': branch.state,
-                    'postal_code': branch.postal_code,
-                    'phone': branch.phone,
-                    'email': branch.email,
-                    'manager_id': branch.manager_id,
-                    'is_active': branch.is_active if branch.is_active is not None else True,
-                    'created_at': branch.created_at,
-                    'updated_at': branch.updated_at
-                }
-    else:
-        branches_by_user = defaultdict(list)
-        branches_by_id = {}
-
-    for user in users:
-        # Get role data from auth service (always returns a dict now)
-        role_data = await get_role_from_auth_service(user.role_id, auth_token)
-
-        # Get branches for this user from junction table
-        user_branch_ids = branches_by_user.get(user.id, [])
-        branches_data = [branches_by_id[bid] for bid in user_branch_ids if bid in branches_by_id]
-
-        # Use first branch for backward compatibility (single branch field)
-        branch_data = branches_data[0] if branches_data else None
+    branches_by_user = await _load_employee_branches(db, [u.id for u in users])
 
-        # Convert user to dict and add relationships
-        user_dict = {
-            'id': user.id,
-            'tenant_id': user.tenant_id,
-            'user_id': user.user_id,
-            'employee_code': user.employee_code,
-            'role_id': user.role_id,
-            'role_name': role_data.get('role_name') or role_data.get('name'),  # Add role_name at top level
-            'branch_id': user.branch_id,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'phone': user.phone,
-            'email': user.email,
-            'date_of_birth': user.date_of_birth,
-            'gender': user.gender,
-            'blood_group': user.blood_group,
-            'emergency_contact_name': user.emergency_contact_name,
-            'emergency_contact_phone': user.emergency_contact_phone,
-            'address': user.address,
-            'city': user.city,
-            'state': user.state,
-            'postal_code': user.postal_code,
-            'country': user.country,
-            'hire_date': user.hire_date,
-            'employment_type': user.employment_type,
-            'department': user.department,
-            'designation': user.designation,
-            'reports_to': user.reports_to,
-            'salary': user.salary,
-            'bank_account_number': user.bank_account_number,
-            'bank_name': user.bank_name,
-            'bank_ifsc': user.bank_ifsc,
-            'pan_number': user.pan_number,
-            'aadhaar_number': user.aadhar_number,
-            'is_active': user.is_active,
-            'created_at': user.created_at,
-            'updated_at': user.updated_at,
-            'role': role_data,
-            'branch': branch_data,
-            'branches': branches_data,  # All assigned branches
-            'documents': []  # Empty for now
-        }
+    # Resolve every role on the page with one catalog lookup
+    roles_by_id = await resolve_roles_from_auth_service(
+        [user.role_id for user in users], tenant_id, auth_token
+    )
 
+    for user in users:
+        user_dict = _employee_list_item(
+            user, roles_by_id[user.role_id], branches_by_user.get(user.id, [])
+        )
         processed_users.append(EmployeeProfileSchema.model_validate(user_dict))
 
     return PaginatedResponse(
@@ -387,7 +412,7 @@ async def get_user(
 
     # Get role data from auth service (always returns a dict now)
     auth_token = extract_auth_token(request)
-    role_data = await get_role_from_auth_service(user.role_id, auth_token)
+    role_data = await get_role_from_auth_service(user.role_id, auth_token, tenant_id)
 
     # Get all assigned branches from employee_branches junction table
     branches_query = select(EmployeeBranch).where(
@@ -677,7 +702,7 @@ async def create_user(
 
     # Get role data from auth service
     auth_token = extract_auth_token(request)
-    role_data = await get_role_from_auth_service(user.role_id, auth_token)
+    role_data = await get_role_from_auth_service(user.role_id, auth_token, tenant_id)
 
     # Get all assigned branches
     branches_data = []
@@ -884,7 +909,7 @@ async def update_user(
 
     # Get role data from auth service
     auth_token = extract_auth_token(request)
-    role_data = await get_role_from_auth_service(user.role_id, auth_token)
+    role_data = await get_role_from_auth_service(user.role_id, auth_token, tenant_id)
 
     # Get all assigned branches from employee_branches table
     branches_query = select(EmployeeBranch).where(
@@ -1063,7 +1088,7 @@ async def invite_user(
 
     # Get role data from auth service
     auth_token = extract_auth_token(request)
-    role_data = await get_role_from_auth_service(invitation.role_id, auth_token)
+    role_data = await get_role_from_auth_service(invitation.role_id, auth_token, tenant_id)
 
     # Get branch data separately
     branch_data = None
@@ -1439,9 +1464,11 @@ async def list_invitations(
     # Process each invitation to get relationship data
     processed_invitations = []
     auth_token = extract_auth_token(request)
+    roles_by_id = await resolve_roles_from_auth_service(
+        [invitation.role_id for invitation in invitations], tenant_id, auth_token
+    )
     for invitation in invitations:
-        # Get role data from auth service
-        role_data = await get_role_from_auth_service(invitation.role_id, auth_token)
+        role_data = roles_by_id[invitation.role_id]
 
         # Get branch data separately
         branch_data = None
@@ -1557,7 +1584,7 @@ async def update_invitation(
 
     # Get role data from auth service
     auth_token = extract_auth_token(request)
-    role_data = await get_role_from_auth_service(invitation.role_id, auth_token)
+    role_data = await get_role_from_auth_service(invitation.role_id, auth_token, tenant_id)
 
     # Get branch data separately
     branch_data = None
@@ -1607,10 +1634,16 @@ async def update_invitation(
 
     return UserInvitationSchema.model_validate(invitation_dict)
 
-@router.post("/bulk-update", response_model=List[EmployeeProfileSchema])
+# Columns a bulk update may not touch
+BULK_UPDATE_PROTECTED_FIELDS = {"id", "tenant_id", "user_id", "created_at", "updated_at"}
+BULK_UPDATE_CHUNK_SIZE = 1000
+
+
+@router.post("/bulk-update", response_model=Union[List[EmployeeProfileSchema], BulkUserUpdateResponse])
 async def bulk_update_users(
     request: Request,
     updates: List[dict],
+    report: bool = Query(False, description="Return counts and per-row errors instead of only the updated users"),
     token_data: TokenData = Depends(require_permissions([USER_UPDATE[0]])),
     tenant_id: str = Depends(get_current_tenant_id),
     db: AsyncSession = Depends(get_db)
@@ -1618,107 +1651,132 @@ async def bulk_update_users(
     """
     Bulk update multiple users
 
+    Rows are loaded with one IN query per chunk, and rows sharing the same
+    field values (e.g. activating 500 employees) are written with a single
+    UPDATE ... WHERE id IN (...).
+
     Requires:
     - users:update
 
     Body:
     - updates: List of dicts with 'id' and fields to update
-    """
-    from src.database import Branch
 
+    Returns the updated users, as before. With ``report=true`` it returns a
+    BulkUserUpdateResponse instead: the updated users under ``items`` plus
+    per-row failures, where ``total`` counts rows after merging repeated IDs.
+    """
     if not updates:
         raise HTTPException(status_code=400, detail="No updates provided")
 
-    results = []
+    updatable_fields = set(EmployeeProfile.__table__.columns.keys()) - BULK_UPDATE_PROTECTED_FIELDS
+    errors = []
+    failed_ids = []
+    rejected_ids = set()
+    rows_without_id = 0
+
+    def fail(user_id, error: str, index: Optional[int] = None):
+        failed_ids.append(str(user_id) if user_id else None)
+        errors.append({"index": index, "id": user_id, "error": error})
 
-    for update_data in updates:
+    # Validate rows and merge repeated IDs (later entries win)
+    fields_by_id: Dict[str, dict] = {}
+    for index, update_data in enumerate(updates):
         user_id = update_data.get('id')
         if not user_id:
+            rows_without_id += 1
+            fail(None, "Missing 'id'", index)
             continue
 
-        # Get existing user
-        query = select(EmployeeProfile).where(
-            EmployeeProfile.id == user_id,
-            EmployeeProfile.tenant_id == tenant_id
-        )
-        result = await db.execute(query)
-        user = result.scalar_one_or_none()
-
-        if not user:
+        update_fields = {k: v for k, v in update_data.items() if k != 'id'}
+        unknown = set(update_fields) - updatable_fields
+        if unknown:
+            rejected_ids.add(str(user_id))
+            fail(user_id, f"Unknown or read-only fields: {', '.join(sorted(unknown))}", index)
             continue
 
-        # Update user fields (exclude 'id' from update_data)
-        update_fields = {k: v for k, v in update_data.items() if k != 'id'}
-        for field, value in update_fields.items():
-            if hasattr(user, field):
-                setattr(user, field, value)
+        fields_by_id.setdefault(str(user_id), {}).update(update_fields)
+
+    # Load all target rows in one IN query per chunk
+    requested_ids = list(fields_by_id.keys())
+    existing_ids = set()
+    for i in range(0, len(requested_ids), BULK_UPDATE_CHUNK_SIZE):
+        chunk = requested_ids[i:i + BULK_UPDATE_CHUNK_SIZE]
+        result = await db.execute(
+            select(EmployeeProfile.id).where(
+                EmployeeProfile.tenant_id == tenant_id,
+                EmployeeProfile.id.in_(chunk)
+            )
+        )
+        existing_ids.update(result.scalars().all())
 
-        results.append(user)
+    # Group rows with identical changes so each group is one UPDATE
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for user_id in requested_ids:
+        if user_id not in existing_ids:
+            fail(user_id, "User not found")
+            continue
+        if not fields_by_id[user_id]:
+            continue
+        groups[json.dumps(fields_by_id[user_id], sort_keys=True, default=str)].append(user_id)
+
+    updated_ids = [user_id for user_id in requested_ids if user_id in existing_ids]
+    for user_ids in groups.values():
+        values = fields_by_id[user_ids[0]]
+        for i in range(0, len(user_ids), BULK_UPDATE_CHUNK_SIZE):
+            chunk = user_ids[i:i + BULK_UPDATE_CHUNK_SIZE]
+            try:
+                # Savepoint so one bad group does not roll back the others
+                async with db.begin_nested():
+                    await db.execute(
+                        update(EmployeeProfile)
+                        .where(
+                            EmployeeProfile.tenant_id == tenant_id,
+                            EmployeeProfile.id.in_(chunk)
+                        )
+                        .values(**values, updated_at=func.now())
+                        .execution_options(synchronize_session=False)
+                    )
+            except Exception as e:
+                logger.error(f"Bulk user update failed for {len(chunk)} users: {e}")
+                chunk_ids = set(chunk)
+                updated_ids = [user_id for user_id in updated_ids if user_id not in chunk_ids]
+                for user_id in chunk:
+                    fail(user_id, str(getattr(e, "orig", e)))
 
-    # Commit all changes
     await db.commit()
 
-    # Get auth token for role fetching
-    auth_token = extract_auth_token(request)
-
-    # Refresh all users and build response
-    response_users = []
-    for user in results:
-        await db.refresh(user)
-
-        # Convert to dict manually to avoid relationship issues
-        user_dict = {
-            'id': user.id,
-            'tenant_id': user.tenant_id,
-            'email': user.email,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'phone_number': user.phone_number,
-            'employee_code': user.employee_code,
-            'profile_type': user.profile_type,
-            'role_id': user.role_id,
-            'branch_id': user.branch_id,
-            'branch_ids': user.branch_ids or [],
-            'is_active': user.is_active,
-            'is_superuser': user.is_superuser,
-            'last_login': user.last_login,
-            'created_at': user.created_at,
-            'updated_at': user.updated_at,
-            'role': None,
-            'branch': None,
-            'branches': [],
-            'profile': None,
-            'documents': []
-        }
-
-        # Get role data from auth service
-        role_data = await get_role_from_auth_service(user.role_id, auth_token)
-        if role_data:
-            user_dict['role'] = role_data
-
-        # Get branch data if exists
-        if user.branch_id:
-            branch_query = select(Branch).where(Branch.id == user.branch_id)
-            branch_result = await db.execute(branch_query)
-            branch_obj = branch_result.scalar_one_or_none()
-            if branch_obj:
-                user_dict['branch'] = {
-                    'id': branch_obj.id,
-                    'tenant_id': branch_obj.tenant_id,
-                    'code': branch_obj.code,
-                    'name': branch_obj.name,
-                    'address': branch_obj.address,
-                    'city': branch_obj.city,
-                    'state': branch_obj.state,
-                    'postal_code': branch_obj.postal_code,
-                    'phone': branch_obj.phone,
-                    'email': branch_obj.email,
-                    'manager_id': branch_obj.manager_id,
-                    'is_active': branch_obj.is_active,
-                    'created_at': branch_obj.created_at,
-                    'updated_at': branch_obj.updated_at
-                }
+    # Re-select updated rows once and enrich them in bulk
+    users_by_id = {}
+    for i in range(0, len(updated_ids), BULK_UPDATE_CHUNK_SIZE):
+        result = await db.execute(
+            select(EmployeeProfile).where(
+                EmployeeProfile.id.in_(updated_ids[i:i + BULK_UPDATE_CHUNK_SIZE])
+            )
+        )
+        users_by_id.update({user.id: user for user in result.scalars().all()})
+    users = [users_by_id[user_id] for user_id in updated_ids if user_id in users_by_id]
 
-        response_users.append(EmployeeProfileSchema.model_validate(user_dict))
+    branches_by_user = await _load_employee_branches(db, [user.id for user in users])
+    roles_by_id = await resolve_roles_from_auth_service(
+        [user.role_id for user in users], tenant_id, extract_auth_token(request)
+    )
 
-    return response_users
+    items = [
+        EmployeeProfileSchema.model_validate(
+            _employee_list_item(user, roles_by_id[user.role_id], branches_by_user.get(user.id, []))
+        )
+        for user in users
+    ]
+
+    if not report:
+        return items
+
+    return BulkUserUpdateResponse(
+        # One row per distinct ID: repeated IDs were merged into one update
+        total=len(set(requested_ids) | rejected_ids) + rows_without_id,
+        successful=len(items),
+        failed=len(errors),
+        failed_ids=[user_id for user_id in failed_ids if user_id],
+        errors=errors,
+        items=items
+    )
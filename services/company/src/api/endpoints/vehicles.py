@@ -19,6 +19,7 @@ from src.schemas import (
     VehicleUpdate,
     PaginatedResponse
 )
+from src.services.change_events import change_events, vehicle_change
 from src.security import (
     TokenData,
     get_current_tenant_id,
@@ -238,6 +239,8 @@ async def create_vehicle(
     )
     vehicle = vehicle_with_relationships.scalar_one()
 
+    await change_events.publish("vehicle", tenant_id, vehicle_change(vehicle))
+
     return VehicleSchema.model_validate(vehicle)
 
 
@@ -319,6 +322,8 @@ async def update_vehicle(
     )
     vehicle = vehicle_with_relationships.scalar_one()
 
+    await change_events.publish("vehicle", tenant_id, vehicle_change(vehicle))
+
     return VehicleSchema.model_validate(vehicle)
 
 
@@ -350,6 +355,7 @@ async def delete_vehicle(
     # Hard delete - remove vehicle from database
     await db.delete(vehicle)
     await db.commit()
+    await change_events.publish("vehicle", tenant_id, vehicle_change(vehicle, deleted=True))
 
     return None
 
@@ -424,6 +430,8 @@ async def update_vehicle_status(
     )
     vehicle = vehicle_with_relationships.scalar_one()
 
+    await change_events.publish("vehicle", tenant_id, vehicle_change(vehicle))
+
     return VehicleSchema.model_validate(vehicle)
 
 
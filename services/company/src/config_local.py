@@ -114,6 +114,19 @@ class CompanySettings(BaseSettings):
     # Audit Logging
     AUDIT_LOG_ENABLED: bool = os.getenv("AUDIT_LOG_ENABLED", "true").lower() == "true"
     AUDIT_LOG_LEVEL: str = os.getenv("AUDIT_LOG_LEVEL", "INFO")
+    # Fraction of ordinary requests audited; sensitive routes are always audited
+    AUDIT_SAMPLE_RATE: float = float(os.getenv("AUDIT_SAMPLE_RATE", "1.0"))
+    AUDIT_REQUEST_BUFFER_SIZE: int = int(os.getenv("AUDIT_REQUEST_BUFFER_SIZE", "10000"))
+
+    # Audit log partitions: months created ahead, months kept (0 keeps all),
+    # and whether expired partitions are dropped instead of only detached
+    AUDIT_PARTITION_MONTHS_AHEAD: int = int(os.getenv("AUDIT_PARTITION_MONTHS_AHEAD", "3"))
+    AUDIT_RETENTION_MONTHS: int = int(os.getenv("AUDIT_RETENTION_MONTHS", "24"))
+    AUDIT_RETENTION_DROP: bool = os.getenv("AUDIT_RETENTION_DROP", "false").lower() == "true"
+
+    # Avatar thumbnails/previews rendered in a process pool
+    IMAGE_DERIVATIVES_ENABLED: bool = os.getenv("IMAGE_DERIVATIVES_ENABLED", "true").lower() == "true"
+    IMAGE_DERIVATIVE_WORKERS: int = int(os.getenv("IMAGE_DERIVATIVE_WORKERS", "1"))
 
     # Service port
     PORT: int = int(os.getenv("PORT", "8002"))
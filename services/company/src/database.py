@@ -717,24 +717,38 @@ class EmployeeBranch(Base):
 
 
 class AuditLog(Base):
-    """Audit Log model - centralized audit tracking for all company operations"""
+    """
+    Audit Log model - centralized audit tracking for all company operations
+
+    Range partitioned by month on created_at (see src/services/audit_partitions.py),
+    so created_at is part of the primary key. Indexes are composite and match
+    the access paths: tenant-scoped listings by module/entity type and time,
+    per-entity history, and latest status change lookups.
+    """
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index('idx_audit_logs_tenant_module_entity_created', 'tenant_id', 'module', 'entity_type', 'created_at'),
+        Index('idx_audit_logs_tenant_created', 'tenant_id', 'created_at'),
+        Index('idx_audit_logs_tenant_user_created', 'tenant_id', 'user_id', 'created_at'),
+        Index('idx_audit_logs_entity_module_type_created', 'entity_id', 'module', 'entity_type', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
 
     # Primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    tenant_id = Column(String(255), nullable=False, index=True)
+    tenant_id = Column(String(255), nullable=False)
 
     # Who performed the action
-    user_id = Column(String(255), nullable=False, index=True, comment="User who performed the action")
+    user_id = Column(String(255), nullable=False, comment="User who performed the action")
     user_name = Column(String(200), comment="Name of the user (denormalized for query)")
     user_email = Column(String(255), comment="Email of the user (denormalized for query)")
     user_role = Column(String(50), comment="Role of the user")
 
     # What was done
-    action = Column(String(50), nullable=False, index=True, comment="Action performed: create, update, delete, status_change, approve, reject, etc.")
-    module = Column(String(50), nullable=False, index=True, comment="Module: orders, trips, customers, vehicles, etc.")
-    entity_type = Column(String(50), nullable=False, index=True, comment="Type of entity: order, trip, customer, etc.")
-    entity_id = Column(String(255), nullable=False, index=True, comment="ID of the affected entity")
+    action = Column(String(50), nullable=False, comment="Action performed: create, update, delete, status_change, approve, reject, etc.")
+    module = Column(String(50), nullable=False, comment="Module: orders, trips, customers, vehicles, etc.")
+    entity_type = Column(String(50), nullable=False, comment="Type of entity: order, trip, customer, etc.")
+    entity_id = Column(String(255), nullable=False, comment="ID of the affected entity")
 
     # Action details
     description = Column(Text, nullable=False, comment="Human-readable description of the action")
@@ -754,5 +768,5 @@ class AuditLog(Base):
     user_agent = Column(String(500), comment="Browser/client info")
     service_name = Column(String(50), comment="Service that created this log (orders, tms, driver, etc.)")
 
-    # Timestamp
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
\ No newline at end of file
+    # Timestamp (partition key)
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False)
\ No newline at end of file
@@ -3,7 +3,6 @@ Company Service Main Application
 """
 import logging
 from contextlib import asynccontextmanager
-import time
 
 from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
@@ -13,9 +12,14 @@ from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTEN
 from starlette.responses import Response as StarletteResponse
 from sqlalchemy.exc import IntegrityError
 
-from src.api.endpoints import branches, customers, vehicles, products, product_categories, product_unit_types, business_types, vehicle_types, users, roles, profiles, audit, tenant_cleanup, marketing_person_assignments
+from src.api.endpoints import branches, customers, vehicles, products, product_categories, product_unit_types, business_types, vehicle_types, users, roles, profiles, audit, tenant_cleanup, marketing_person_assignments, search, resource_status
 from src.config_local import settings
 from src.database import engine, Base
+from src.services.permission_cache import permission_cache
+from src.services.role_catalog import role_catalog
+from src.services.change_events import change_events
+from src.services.audit_partitions import audit_partition_manager
+from src.services.avatar_derivatives import avatar_derivatives
 from src.security import (
     SecurityException,
     security_exception_handler,
@@ -23,15 +27,9 @@ from src.security import (
     validation_exception_handler,
     general_exception_handler,
 )
-from src.middleware import (
-    AuthenticationMiddleware,
-    RateLimitMiddleware,
-    SecurityHeadersMiddleware,
-    AuditLoggingMiddleware,
-    TenantIsolationMiddleware,
-    TenantContextMiddleware,
-    CompanyTenantStatusMiddleware,
-)
+from src.middleware import RateLimitMiddleware
+from shared.asgi import FusedMiddleware
+from src.middleware.pipeline import build_pipeline_stages
 
 # Configure logging
 logging.basicConfig(level=settings.LOG_LEVEL)
@@ -78,9 +76,25 @@ async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+    # Shared permission cache with push invalidation from the auth service
+    await permission_cache.initialize()
+    await role_catalog.initialize()
+    await change_events.initialize()
+
+    # Monthly audit_logs partitions ahead of time, retention of old ones
+    await audit_partition_manager.initialize()
+
+    # Worker processes rendering avatar thumbnails/previews
+    await avatar_derivatives.initialize()
+
     yield
 
     logger.info("Shutting down company service")
+    await avatar_derivatives.shutdown()
+    await audit_partition_manager.shutdown()
+    await change_events.shutdown()
+    await role_catalog.shutdown()
+    await permission_cache.shutdown()
 
 
 # Create FastAPI application
@@ -94,29 +108,19 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Add security middleware (order matters - add in reverse order of execution)
-# Security headers should be added first (outermost)
-app.add_middleware(SecurityHeadersMiddleware)
-
-# Audit logging for all requests
-if settings.AUDIT_LOG_ENABLED:
-    app.add_middleware(AuditLoggingMiddleware)
-
-# Rate limiting (if enabled)
+# Middleware (order matters - add in reverse order of execution)
+# Rate limiting (if enabled) runs inside the pipeline, keyed on the authenticated user
 if settings.RATE_LIMIT_ENABLED:
     app.add_middleware(RateLimitMiddleware)
 
-# Tenant isolation for multi-tenancy
-app.add_middleware(TenantIsolationMiddleware)
-
-# Tenant context for database operations
-app.add_middleware(TenantContextMiddleware)
-
-# Authentication middleware (must come before CORS for proper header handling)
-app.add_middleware(AuthenticationMiddleware)
-
-# Tenant status validation middleware
-app.add_middleware(CompanyTenantStatusMiddleware)
+# Authentication, tenant isolation and status, audit logging, metrics and
+# security headers as one pure ASGI middleware
+middleware_stages = build_pipeline_stages(
+    settings,
+    http_requests_total,
+    http_request_duration_seconds,
+)
+app.add_middleware(FusedMiddleware, stages=middleware_stages)
 
 # Add standard middleware
 app.add_middleware(
@@ -136,59 +140,6 @@ if settings.SECURITY_ENABLE_CORS:
         allow_headers=settings.ALLOW_HEADERS,
     )
 
-# Add metrics tracking middleware
-@app.middleware("http")
-async def metrics_middleware(request: Request, call_next):
-    start_time = time.time()
-
-    try:
-        response = await call_next(request)
-    except HTTPException as e:
-        # Don't convert HTTPExceptions to responses here
-        # Let them be handled by the exception handlers
-        # Still record the metrics for monitoring
-        endpoint = request.url.path
-        if endpoint.startswith("/"):
-            endpoint = endpoint.split("/")[-1] or "root"
-
-        http_requests_total.labels(
-            method=request.method,
-            endpoint=endpoint,
-            status_code=str(e.status_code)
-        ).inc()
-
-        duration = time.time() - start_time
-        http_request_duration_seconds.labels(
-            method=request.method,
-            endpoint=endpoint
-        ).observe(duration)
-
-        # Re-raise the HTTPException to be handled by proper exception handlers
-        raise
-
-    # Calculate request duration
-    duration = time.time() - start_time
-
-    # Get endpoint path (simplified)
-    endpoint = request.url.path
-    if endpoint.startswith("/"):
-        endpoint = endpoint.split("/")[-1] or "root"
-
-    # Record metrics
-    http_requests_total.labels(
-        method=request.method,
-        endpoint=endpoint,
-        status_code=str(response.status_code)
-    ).inc()
-
-    http_request_duration_seconds.labels(
-        method=request.method,
-        endpoint=endpoint
-    ).observe(duration)
-
-    return response
-
-
 # Metrics endpoint
 @app.get("/metrics")
 async def metrics():
@@ -200,7 +151,11 @@ async def metrics():
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "company-service"}
+    return {
+        "status": "healthy",
+        "service": "company-service",
+        "middleware": {stage.name: stage.get_stats() for stage in middleware_stages},
+    }
 
 
 @app.get("/ready", tags=["Health"])
@@ -300,6 +255,12 @@ app.include_router(
     tags=["Audit Logs"]
 )
 
+app.include_router(
+    search.router,
+    prefix="/search",
+    tags=["Search"]
+)
+
 app.include_router(
     marketing_person_assignments.router,
     prefix="/api/v1/marketing-person-assignments",
@@ -313,6 +274,12 @@ app.include_router(
     tags=["Internal"]
 )
 
+app.include_router(
+    resource_status.router,
+    prefix="/api/v1/internal",
+    tags=["Internal"]
+)
+
 
 # Exception handlers
 @app.exception_handler(HTTPException)
@@ -2,28 +2,14 @@
 Middleware module for Company Service
 """
 
-from .auth import (
-    AuthenticationMiddleware,
-    RateLimitMiddleware,
-    SecurityHeadersMiddleware,
-    AuditLoggingMiddleware,
-)
+from .auth import RateLimitMiddleware
 from .tenant import (
-    TenantIsolationMiddleware,
-    TenantContextMiddleware,
     BranchAccessMiddleware,
     CustomerAccessMiddleware,
 )
-from .tenant_status import CompanyTenantStatusMiddleware
 
 __all__ = [
-    "AuthenticationMiddleware",
     "RateLimitMiddleware",
-    "SecurityHeadersMiddleware",
-    "AuditLoggingMiddleware",
-    "TenantIsolationMiddleware",
-    "TenantContextMiddleware",
     "BranchAccessMiddleware",
     "CustomerAccessMiddleware",
-    "CompanyTenantStatusMiddleware",
-]
\ No newline at end of file
+]
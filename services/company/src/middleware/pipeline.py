@@ -0,0 +1,120 @@
+"""
+Fused middleware pipeline for Company Service
+
+Authentication, tenant isolation and status, audit logging, metrics and
+security headers run as stages of one pure ASGI middleware (``shared.asgi``)
+instead of a stack of ``BaseHTTPMiddleware`` layers.
+"""
+import logging
+from typing import List
+
+from fastapi import HTTPException
+
+from shared.asgi import (
+    AuditStage,
+    AuthStage,
+    MetricsStage,
+    Reject,
+    RequestContext,
+    SecurityHeadersStage,
+    Stage,
+    TenantStage,
+)
+from ..security import (
+    verify_token,
+    extract_token_from_header,
+    log_authentication_event,
+    TokenExpiredError,
+    TokenInvalidError,
+)
+from .tenant import check_tenant_access
+from .tenant_status import TenantStatusCheck
+
+logger = logging.getLogger(__name__)
+
+BEARER_CHALLENGE = {"WWW-Authenticate": "Bearer"}
+
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "X-Permitted-Cross-Domain-Policies": "none",
+}
+
+# Prevent caching of API responses
+API_HEADERS = {
+    "Cache-Control": "no-cache, no-store, must-revalidate",
+    "Pragma": "no-cache",
+    "Expires": "0",
+}
+
+tenant_status = TenantStatusCheck()
+
+
+def authenticate(ctx: RequestContext, authorization: str) -> dict:
+    """Verify the bearer token and return the request state it grants"""
+    try:
+        token = extract_token_from_header(authorization)
+        token_data = verify_token(token)
+    except HTTPException as e:
+        raise Reject(e.status_code, e.detail, e.headers)
+    except TokenExpiredError:
+        log_authentication_event("TOKEN_EXPIRED", request=ctx.request, success=False, reason="Token has expired")
+        raise Reject(401, "Token has expired", BEARER_CHALLENGE)
+    except TokenInvalidError as e:
+        log_authentication_event("TOKEN_INVALID", request=ctx.request, success=False, reason=str(e))
+        raise Reject(401, "Invalid token", BEARER_CHALLENGE)
+    except Exception as e:
+        logger.error(f"Authentication middleware error: {str(e)}")
+        log_authentication_event("AUTH_ERROR", request=ctx.request, success=False, reason=f"Internal error: {str(e)}")
+        raise
+
+    log_authentication_event("TOKEN_VALIDATED", token_data=token_data, request=ctx.request, success=True)
+    return {
+        "user_id": token_data.user_id,
+        "tenant_id": token_data.tenant_id,
+        "role_id": token_data.role_id,
+        "permissions": token_data.permissions,
+        "is_super_user": token_data.is_super_user(),
+    }
+
+
+def missing_token(ctx: RequestContext):
+    log_authentication_event(
+        "MISSING_TOKEN",
+        request=ctx.request,
+        success=False,
+        reason="Missing Authorization header"
+    )
+
+
+async def check_tenant(ctx: RequestContext, tenant_id: str) -> None:
+    """Tenant isolation first, then the (cached) tenant status lookup"""
+    check_tenant_access(ctx, tenant_id)
+    await tenant_status(ctx, tenant_id)
+
+
+def build_pipeline_stages(settings, requests_total, request_duration) -> List[Stage]:
+    """
+    Stages in execution order
+
+    Args:
+        settings: Company settings
+        requests_total: Request counter (method, endpoint, status_code)
+        request_duration: Request duration histogram (method, endpoint)
+    """
+    stages: List[Stage] = [
+        AuthStage(authenticate, on_missing=missing_token),
+        # Tokens without a tenant are passed on, as before, for the endpoints to authorize
+        TenantStage(require_tenant=False, check=check_tenant, response_header=False),
+    ]
+    if settings.AUDIT_LOG_ENABLED:
+        stages.append(AuditStage(
+            "company_audit",
+            sample_rate=settings.AUDIT_SAMPLE_RATE,
+            buffer_size=settings.AUDIT_REQUEST_BUFFER_SIZE,
+        ))
+    stages.append(MetricsStage(requests_total, request_duration))
+    stages.append(SecurityHeadersStage(SECURITY_HEADERS, api_headers=API_HEADERS))
+    return stages
@@ -1,5 +1,5 @@
 """
-Tenant isolation middleware for Company Service
+Tenant isolation for Company Service
 """
 from typing import Optional
 from fastapi import Request, HTTPException, status
@@ -7,210 +7,63 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 import logging
 
-from ..security import log_security_event, TenantAccessError
+from shared.asgi import Reject, RequestContext
 
-logger = logging.getLogger(__name__)
-
-
-class TenantIsolationMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to enforce tenant isolation for multi-tenant architecture
-    """
-
-    def __init__(self, app):
-        super().__init__(app)
-
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """
-        Process request through tenant isolation middleware
-
-        Args:
-            request: Incoming request
-            call_next: Next middleware in chain
-
-        Returns:
-            HTTP response
-        """
-        # Skip tenant isolation for health checks, docs, and internal endpoints
-        skip_paths = [
-            "/health",
-            "/ready",
-            "/metrics",
-            "/docs",
-            "/openapi.json",
-            "/redoc",
-        ]
-
-        # Check exact match first
-        if request.url.path in skip_paths:
-            return await call_next(request)
+from ..security import log_security_event
 
-        # Skip internal endpoints (prefix match)
-        if request.url.path.startswith("/api/v1/internal"):
-            return await call_next(request)
-
-        # Ensure request has user context (from authentication middleware)
-        if not hasattr(request.state, 'tenant_id'):
-            logger.error("Request missing tenant context")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Authentication required",
-            )
-
-        tenant_id = request.state.tenant_id
-        user_id = getattr(request.state, 'user_id', None)
-        is_super_user = getattr(request.state, 'is_super_user', False)
-
-        # Set tenant context for database operations
-        request.state.current_tenant_id = tenant_id
-
-        # For non-super users, validate tenant access for resource operations
-        if not is_super_user and self._is_resource_operation(request):
-            await self._validate_tenant_access(request, tenant_id, user_id)
-
-        return await call_next(request)
-
-    def _is_resource_operation(self, request: Request) -> bool:
-        """
-        Check if the request is a resource operation that needs tenant validation
-
-        Args:
-            request: Incoming request
-
-        Returns:
-            True if resource operation, False otherwise
-        """
-        # Resource operations that need tenant validation
-        resource_patterns = [
-            "/branches/",
-            "/customers/",
-            "/vehicles/",
-            "/products/",
-            "/product-categories/",
-            "/service-zones/",
-            "/pricing-rules/",
-        ]
-
-        # Check if path matches any resource pattern
-        for pattern in resource_patterns:
-            if request.url.path.startswith(pattern):
-                return True
-
-        return False
-
-    async def _validate_tenant_access(
-        self,
-        request: Request,
-        user_tenant_id: str,
-        user_id: str
-    ) -> None:
-        """
-        Validate that the user can access the requested tenant resource
-
-        Args:
-            request: Incoming request
-            user_tenant_id: User's tenant ID
-            user_id: User's ID
-
-        Raises:
-            HTTPException: If tenant access is invalid
-        """
-        # Extract resource tenant ID from request path or query params
-        resource_tenant_id = self._extract_resource_tenant_id(request)
-
-        if resource_tenant_id and resource_tenant_id != user_tenant_id:
-            logger.warning(
-                f"Tenant access denied: User {user_id} from tenant {user_tenant_id} "
-                f"attempting to access resource from tenant {resource_tenant_id}"
-            )
-
-            log_security_event(
-                "TENANT_ACCESS_DENIED",
-                f"User {user_id} denied access to tenant {resource_tenant_id}",
-                user_id=user_id,
-                tenant_id=user_tenant_id,
-                details={
-                    "resource_tenant_id": resource_tenant_id,
-                    "request_path": request.url.path,
-                    "request_method": request.method,
-                }
-            )
-
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied: Cannot access resources from other tenants"
-            )
-
-    def _extract_resource_tenant_id(self, request: Request) -> Optional[str]:
-        """
-        Extract tenant ID from request (path, query params, or body)
-
-        Args:
-            request: Incoming request
-
-        Returns:
-            Tenant ID if found, None otherwise
-        """
-        # Check query parameters first
-        if "tenant_id" in request.query_params:
-            return request.query_params["tenant_id"]
-
-        # Check path parameters for specific patterns
-        # This is a simplified approach - in practice, you might need
-        # more sophisticated path parameter extraction
-        path_parts = request.url.path.strip("/").split("/")
-
-        # For paths like /api/v1/branches/{branch_id}
-        if len(path_parts) >= 4:
-            # Extract resource ID from path (simplified)
-            # In a real implementation, you would query the database
-            # to get the tenant_id for this resource
-            resource_id = path_parts[3]
+logger = logging.getLogger(__name__)
 
-            # This is a placeholder - you should implement proper
-            # resource-to-tenant lookup based on your URL structure
-            # and database schema
-            return None
 
-        return None
+# Resource operations that need tenant validation
+RESOURCE_PATTERNS = (
+    "/branches/",
+    "/customers/",
+    "/vehicles/",
+    "/products/",
+    "/product-categories/",
+    "/service-zones/",
+    "/pricing-rules/",
+)
 
 
-class TenantContextMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to add tenant context to database sessions
+def check_tenant_access(ctx: RequestContext, tenant_id: str) -> None:
     """
+    Enforce tenant isolation for resource operations of non-super users
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """
-        Add tenant context to request state for database operations
-
-        Args:
-            request: Incoming request
-            call_next: Next middleware in chain
+    Args:
+        ctx: Pipeline request context (authenticated)
+        tenant_id: User's tenant ID
 
-        Returns:
-            HTTP response
-        """
-        # Skip for non-API paths
-        if not request.url.path.startswith("/api/"):
-            return await call_next(request)
-
-        # Ensure tenant context is available
-        if hasattr(request.state, 'current_tenant_id'):
-            tenant_id = request.state.current_tenant_id
-        elif hasattr(request.state, 'tenant_id'):
-            tenant_id = request.state.tenant_id
-        else:
-            tenant_id = None
-
-        # Add tenant context to request for database operations
-        request.state.db_context = {
-            "tenant_id": tenant_id,
-            "is_super_user": getattr(request.state, 'is_super_user', False),
-            "user_id": getattr(request.state, 'user_id', None),
-        }
-
-        return await call_next(request)
+    Raises:
+        Reject: If the request targets another tenant's resources
+    """
+    state = ctx.state
+    if state.get("is_super_user", False) or not ctx.path.startswith(RESOURCE_PATTERNS):
+        return
+
+    # Extract resource tenant ID from query params
+    resource_tenant_id = ctx.request.query_params.get("tenant_id")
+
+    if resource_tenant_id and resource_tenant_id != tenant_id:
+        user_id = state.get("user_id")
+        logger.warning(
+            f"Tenant access denied: User {user_id} from tenant {tenant_id} "
+            f"attempting to access resource from tenant {resource_tenant_id}"
+        )
+
+        log_security_event(
+            "TENANT_ACCESS_DENIED",
+            f"User {user_id} denied access to tenant {resource_tenant_id}",
+            user_id=user_id,
+            tenant_id=tenant_id,
+            details={
+                "resource_tenant_id": resource_tenant_id,
+                "request_path": ctx.path,
+                "request_method": ctx.method,
+            }
+        )
+
+        raise Reject(403, "Access denied: Cannot access resources from other tenants")
 
 
 class BranchAccessMiddleware(BaseHTTPMiddleware):
@@ -1,56 +1,35 @@
 """
-Tenant status validation middleware for Company Service
+Tenant status validation for Company Service
 """
 import time
 import logging
-from typing import Optional
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
 import httpx
 
+from shared.asgi import Reject, RequestContext
+
 from ..config_local import settings
 
 logger = logging.getLogger(__name__)
 
 
-class CompanyTenantStatusMiddleware(BaseHTTPMiddleware):
+class TenantStatusCheck:
     """
-    Middleware to validate tenant status by calling auth service
+    Pipeline tenant check validating tenant status by calling auth service
     Blocks requests from inactive tenants
     """
 
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self):
         self._tenant_status_cache = {}
         self._cache_ttl = 60
         self._auth_service_url = settings.AUTH_SERVICE_URL
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, ctx: RequestContext, tenant_id: str) -> None:
         """
         Validate tenant status before processing request
         """
-        # Skip tenant validation for public endpoints
-        skip_paths = [
-            "/health",
-            "/ready",
-            "/metrics",
-            "/docs",
-            "/openapi.json",
-            "/redoc",
-            "/api/v1/internal",  # Skip internal endpoints for inter-service communication
-        ]
-
-        if request.url.path in skip_paths:
-            return await call_next(request)
-
-        # Get tenant_id from request state (set by authentication middleware)
-        tenant_id = getattr(request.state, 'tenant_id', None)
-        is_superuser = getattr(request.state, 'is_super_user', False)
-
-        # Skip for super admins or if no tenant_id
-        if is_superuser or not tenant_id:
-            return await call_next(request)
+        # Skip for super admins
+        if ctx.state.get("is_super_user", False):
+            return
 
         # Check tenant status via auth service
         is_active = await self._get_tenant_status_from_auth(tenant_id)
@@ -58,14 +37,9 @@ class CompanyTenantStatusMiddleware(BaseHTTPMiddleware):
         if not is_active:
             logger.warning(
                 f"Blocked request from inactive tenant {tenant_id} "
-                f"path={request.url.path}"
-            )
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Your company account has been deactivated. Please contact support."
+                f"path={ctx.path}"
             )
-
-        return await call_next(request)
+            raise Reject(403, "Your company account has been deactivated. Please contact support.")
 
     async def _get_tenant_status_from_auth(self, tenant_id: str) -> bool:
         """
@@ -98,14 +72,19 @@ class CompanyTenantStatusMiddleware(BaseHTTPMiddleware):
                     }
 
                     return is_active
+                elif response.status_code >= 500:
+                    # Transient auth service failure: fail open, and do not cache it
+                    logger.error(f"Auth service error getting tenant status: {response.status_code}")
+                    return True
                 else:
-                    # If auth service returns error, assume inactive for safety
+                    # Unknown tenant or refused lookup, assume inactive for safety
                     logger.error(f"Failed to get tenant status from auth service: {response.status_code}")
                     return False
 
         except Exception as e:
             logger.error(f"Error checking tenant status: {e}")
             # Fail open for safety - don't block requests on auth service failure
+            # (timeouts, connection errors); the result is not cached
             return True
 
     def invalidate_tenant_cache(self, tenant_id: str):
@@ -0,0 +1,61 @@
+"""
+Migration 024: Add pg_trgm search indexes for customers, employees, branches, products and business types
+"""
+from sqlalchemy import text
+from src.database import AsyncSessionLocal
+from src.services.search import SEARCHABLE_ENTITIES, trigram_index_ddl
+import logging
+
+logger = logging.getLogger(__name__)
+
+async def upgrade():
+    """Enable pg_trgm and create trigram/prefix indexes used by src.services.search"""
+    async with AsyncSessionLocal() as session:
+        try:
+            await session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
+            await session.commit()
+            logger.info("Enabled pg_trgm extension")
+
+            for name, entity in SEARCHABLE_ENTITIES.items():
+                for statement in trigram_index_ddl(entity):
+                    await session.execute(text(statement))
+                await session.commit()
+                logger.info(f"Created search indexes for {name}")
+
+            # Refresh planner statistics for the new expression indexes
+            for entity in SEARCHABLE_ENTITIES.values():
+                await session.execute(text(f"ANALYZE {entity.table};"))
+            await session.commit()
+
+            logger.info("Migration 024 complete: Added search indexes")
+            return {"success": True, "message": "Added search indexes"}
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Migration 024 failed: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+
+async def downgrade():
+    """Drop search indexes (the pg_trgm extension is left installed)"""
+    async with AsyncSessionLocal() as session:
+        try:
+            for entity in SEARCHABLE_ENTITIES.values():
+                await session.execute(text(f"DROP INDEX IF EXISTS idx_{entity.table}_search_trgm;"))
+                for column in entity.prefix_columns:
+                    await session.execute(text(f"DROP INDEX IF EXISTS idx_{entity.table}_{column}_prefix;"))
+            await session.commit()
+            logger.info("Migration 024 downgrade complete: Removed search indexes")
+            return {"success": True, "message": "Removed search indexes"}
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Migration 024 downgrade failed: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+
+if __name__ == "__main__":
+    import asyncio
+    result = asyncio.run(upgrade())
+    if result.get("success"):
+        print("✓ Migration completed successfully")
+    else:
+        print(f"✗ Migration failed: {result.get('error')}")
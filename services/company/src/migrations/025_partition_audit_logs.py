@@ -0,0 +1,199 @@
+"""
+Migration 025: Convert audit_logs to monthly range partitions with composite indexes
+
+The existing table is renamed, a partitioned audit_logs with the same columns
+is created, rows are copied month by month, a DEFAULT partition catches rows
+outside the monthly ranges and the old table is dropped once the row counts
+match. Everything runs in one transaction and audit writes are
+blocked meanwhile, so run it in a maintenance window on large tables.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+from src.database import AsyncSessionLocal, AuditLog
+from src.config_local import settings
+from src.services.audit_partitions import (
+    add_months,
+    create_default_partition_sql,
+    create_partition_sql,
+    is_partitioned,
+    month_start,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+LEGACY_TABLE = "audit_logs_legacy"
+
+
+async def _column_exists(session, table: str, column: str) -> bool:
+    result = await session.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column)"
+        ),
+        {"table": table, "column": column}
+    )
+    return bool(result.scalar())
+
+
+async def _create_indexes(session):
+    """Composite indexes declared on AuditLog, plus the TMS status change index"""
+    for index in AuditLog.__table__.indexes:
+        ddl = CreateIndex(index, if_not_exists=True).compile(dialect=postgresql.dialect())
+        await session.execute(text(str(ddl)))
+
+    # Latest status change per trip/order (TMS fetch_latest_trip_status_change)
+    if await _column_exists(session, "audit_logs", "action_timestamp"):
+        await session.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_audit_logs_status_change "
+            "ON audit_logs (entity_type, entity_id, action, action_timestamp DESC) "
+            "WHERE action = 'status_change'"
+        ))
+
+
+async def _copy_security(session, source: str):
+    """Carry over row level security, policies and the updated_at trigger"""
+    rls_enabled = (await session.execute(
+        text("SELECT relrowsecurity FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+        {"table": source}
+    )).scalar()
+    if rls_enabled:
+        await session.execute(text("ALTER TABLE audit_logs ENABLE ROW LEVEL SECURITY"))
+
+    policies = (await session.execute(
+        text(
+            "SELECT policyname, permissive, roles, cmd, qual, with_check FROM pg_policies "
+            "WHERE schemaname = current_schema() AND tablename = :table"
+        ),
+        {"table": source}
+    )).all()
+    for policy in policies:
+        roles = ", ".join(policy.roles)
+        statement = (
+            f"CREATE POLICY {policy.policyname} ON audit_logs AS {policy.permissive} "
+            f"FOR {policy.cmd} TO {roles}"
+        )
+        if policy.qual:
+            statement += f" USING ({policy.qual})"
+        if policy.with_check:
+            statement += f" WITH CHECK ({policy.with_check})"
+        await session.execute(text(statement))
+
+    has_trigger_function = (await session.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_proc WHERE proname = 'update_updated_at_column')")
+    )).scalar()
+    if has_trigger_function and await _column_exists(session, "audit_logs", "updated_at"):
+        await session.execute(text(
+            "CREATE TRIGGER update_audit_logs_updated_at BEFORE UPDATE ON audit_logs "
+            "FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()"
+        ))
+
+
+async def upgrade():
+    """Partition audit_logs by month on created_at"""
+    async with AsyncSessionLocal() as session:
+        try:
+            if await is_partitioned(session):
+                await session.execute(text(create_default_partition_sql()))
+                await _create_indexes(session)
+                await session.commit()
+                logger.info("Migration 025: audit_logs already partitioned, default partition and indexes verified")
+                return {"success": True, "message": "audit_logs already partitioned"}
+
+            await session.execute(text("LOCK TABLE audit_logs IN ACCESS EXCLUSIVE MODE"))
+            await session.execute(text(f"ALTER TABLE audit_logs RENAME TO {LEGACY_TABLE}"))
+            await session.execute(text(
+                f"UPDATE {LEGACY_TABLE} SET created_at = now() WHERE created_at IS NULL"
+            ))
+
+            await session.execute(text(
+                f"CREATE TABLE audit_logs (LIKE {LEGACY_TABLE} INCLUDING DEFAULTS INCLUDING COMMENTS) "
+                f"PARTITION BY RANGE (created_at)"
+            ))
+            await session.execute(text("ALTER TABLE audit_logs ALTER COLUMN created_at SET NOT NULL"))
+            await session.execute(text("ALTER TABLE audit_logs ALTER COLUMN created_at SET DEFAULT now()"))
+            await session.execute(text("ALTER TABLE audit_logs ADD PRIMARY KEY (id, created_at)"))
+
+            bounds = (await session.execute(
+                text(f"SELECT min(created_at), max(created_at), count(*) FROM {LEGACY_TABLE}")
+            )).one()
+            today = datetime.now(timezone.utc).date()
+            first_month = month_start(bounds[0].date()) if bounds[0] else month_start(today)
+            last_month = max(
+                month_start(bounds[1].date()) if bounds[1] else month_start(today),
+                add_months(month_start(today), settings.AUDIT_PARTITION_MONTHS_AHEAD)
+            )
+
+            month = first_month
+            while month <= last_month:
+                await session.execute(text(create_partition_sql(month)))
+                await session.execute(
+                    text(
+                        f"INSERT INTO audit_logs SELECT * FROM {LEGACY_TABLE} "
+                        f"WHERE created_at >= :start AND created_at < :end"
+                    ),
+                    {"start": month, "end": add_months(month, 1)}
+                )
+                month = add_months(month, 1)
+            await session.execute(text(create_default_partition_sql()))
+            logger.info(f"Copied audit logs from {first_month} to {last_month}")
+
+            copied = (await session.execute(text("SELECT count(*) FROM audit_logs"))).scalar()
+            if copied != bounds[2]:
+                raise RuntimeError(f"Copied {copied} of {bounds[2]} audit logs")
+
+            # Build indexes after the bulk copy; index names are freed with the old table
+            await _copy_security(session, LEGACY_TABLE)
+            await session.execute(text(f"DROP TABLE {LEGACY_TABLE}"))
+            await _create_indexes(session)
+            await session.commit()
+
+            await session.execute(text("ANALYZE audit_logs"))
+            await session.commit()
+
+            logger.info("Migration 025 complete: audit_logs partitioned by month")
+            return {"success": True, "message": f"Partitioned {copied} audit logs by month"}
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Migration 025 failed: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+
+async def downgrade():
+    """Convert audit_logs back into a single, unpartitioned table"""
+    async with AsyncSessionLocal() as session:
+        try:
+            if not await is_partitioned(session):
+                return {"success": True, "message": "audit_logs is not partitioned"}
+
+            await session.execute(text("LOCK TABLE audit_logs IN ACCESS EXCLUSIVE MODE"))
+            await session.execute(text(
+                "CREATE TABLE audit_logs_unpartitioned "
+                "(LIKE audit_logs INCLUDING DEFAULTS INCLUDING COMMENTS)"
+            ))
+            await session.execute(text("INSERT INTO audit_logs_unpartitioned SELECT * FROM audit_logs"))
+            await session.execute(text("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned"))
+            await session.execute(text("ALTER TABLE audit_logs_unpartitioned RENAME TO audit_logs"))
+            await session.execute(text("ALTER TABLE audit_logs ADD PRIMARY KEY (id)"))
+            await _copy_security(session, "audit_logs_partitioned")
+            await session.execute(text("DROP TABLE audit_logs_partitioned"))
+            await _create_indexes(session)
+            await session.commit()
+            logger.info("Migration 025 downgrade complete: audit_logs unpartitioned")
+            return {"success": True, "message": "audit_logs unpartitioned"}
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Migration 025 downgrade failed: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+
+if __name__ == "__main__":
+    import asyncio
+    result = asyncio.run(upgrade())
+    if result.get("success"):
+        print("✓ Migration completed successfully")
+    else:
+        print(f"✗ Migration failed: {result.get('error')}")
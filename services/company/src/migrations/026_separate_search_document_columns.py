@@ -0,0 +1,50 @@
+"""
+Migration 026: Rebuild the trigram search indexes on the separated search document
+
+The search document now joins its columns with a unit separator instead of a
+space, so a term can no longer match across two columns. The trigram indexes
+created by migration 024 are dropped and recreated on the new expression, which
+must match the one used by src.services.search for the planner to use them.
+"""
+from sqlalchemy import text
+from src.database import AsyncSessionLocal
+from src.services.search import SEARCHABLE_ENTITIES, trigram_index_ddl
+import logging
+
+logger = logging.getLogger(__name__)
+
+async def upgrade():
+    """Recreate the trigram indexes with the current search document expression"""
+    async with AsyncSessionLocal() as session:
+        try:
+            for name, entity in SEARCHABLE_ENTITIES.items():
+                await session.execute(text(f"DROP INDEX IF EXISTS idx_{entity.table}_search_trgm;"))
+                for statement in trigram_index_ddl(entity):
+                    await session.execute(text(statement))
+                await session.commit()
+                logger.info(f"Rebuilt search indexes for {name}")
+
+            for entity in SEARCHABLE_ENTITIES.values():
+                await session.execute(text(f"ANALYZE {entity.table};"))
+            await session.commit()
+
+            logger.info("Migration 026 complete: Rebuilt search indexes")
+            return {"success": True, "message": "Rebuilt search indexes"}
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Migration 026 failed: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+
+async def downgrade():
+    """Nothing to undo: the indexes always follow src.services.search"""
+    return {"success": True, "message": "No changes"}
+
+
+if __name__ == "__main__":
+    import asyncio
+    result = asyncio.run(upgrade())
+    if result.get("success"):
+        print("✓ Migration completed successfully")
+    else:
+        print(f"✗ Migration failed: {result.get('error')}")
@@ -1157,6 +1157,16 @@ class UserPasswordChange(BaseSchema):
 
 
 # Generic response schemas
+class BulkUserUpdateResponse(BaseSchema):
+    """Schema for bulk user update response with per-row errors"""
+    total: int
+    successful: int
+    failed: int
+    failed_ids: List[str]
+    errors: List[Dict[str, Any]]
+    items: List[EmployeeProfile]
+
+
 class PaginatedResponse(BaseSchema):
     """Schema for paginated responses"""
     items: List[Any]
@@ -1166,6 +1176,45 @@ class PaginatedResponse(BaseSchema):
     pages: int
 
 
+class BatchLookupRequest(BaseSchema):
+    """Schema for fetching many records by ID in one request"""
+    ids: List[UUID] = Field(..., min_length=1, max_length=500)
+
+
+class VehicleStatusChange(BaseSchema):
+    """New status for a vehicle, by ID or plate number"""
+    vehicle_id: Optional[UUID] = None
+    plate_number: Optional[str] = None
+    status: VehicleStatus
+
+
+class DriverStatusChange(BaseSchema):
+    """New status for a driver, by auth user ID or driver profile ID"""
+    user_id: Optional[str] = None
+    driver_id: Optional[str] = None
+    status: str = Field(..., pattern="^(available|assigned|unavailable|on_trip|on_leave)$")
+
+
+class ResourceStatusBatchRequest(BaseSchema):
+    """Vehicle and driver status changes applied together (TMS trip transitions)"""
+    vehicles: List[VehicleStatusChange] = Field(default_factory=list, max_length=100)
+    drivers: List[DriverStatusChange] = Field(default_factory=list, max_length=100)
+
+
+class ResourceStatusBatchResponse(BaseSchema):
+    """Resulting statuses, with the IDs callers can cache"""
+    vehicles: List[Dict[str, Any]]
+    drivers: List[Dict[str, Any]]
+    not_found: List[str]
+
+
+class GlobalSearchResponse(BaseSchema):
+    """Schema for ranked search across several entity types"""
+    query: str
+    results: Dict[str, List[Dict[str, Any]]]
+    total: int
+
+
 # Enhanced Profile Management Schemas
 
 class ProfileCompletionResponse(BaseSchema):
@@ -1317,6 +1366,17 @@ class AuditLogCreate(BaseSchema):
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
     service_name: str
+    created_at: Optional[datetime] = None  # When the event happened, if buffered by the sender
+
+
+class AuditLogBatchCreate(BaseSchema):
+    """Schema for creating many audit logs in one request"""
+    logs: List[AuditLogCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class AuditLogBatchResponse(BaseSchema):
+    """Schema for bulk audit log creation response"""
+    inserted: int
 
 
 class AuditLogResponse(BaseSchema):
@@ -1381,4 +1441,5 @@ class AuditLogSummaryResponse(BaseSchema):
 # Update forward references
 ProductCategory.model_rebuild()
 CompanyRole.model_rebuild()
-EmployeeProfile.model_rebuild()
\ No newline at end of file
+EmployeeProfile.model_rebuild()
+BulkUserUpdateResponse.model_rebuild()
\ No newline at end of file
@@ -10,6 +10,7 @@ from .dependencies import (
     require_permissions,
     require_any_permission,
     require_tenant_access,
+    require_service_token,
     require_self_or_permission,
     require_role,
     is_active_user,
@@ -126,6 +127,7 @@ __all__ = [
     "require_permissions",
     "require_any_permission",
     "require_tenant_access",
+    "require_service_token",
     "require_self_or_permission",
     "require_role",
     "is_active_user",
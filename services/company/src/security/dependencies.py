@@ -201,6 +201,32 @@ def require_tenant_access() -> Callable:
     return tenant_checker
 
 
+def require_service_token(
+    token_data: TokenData = Depends(get_current_token_data)
+) -> TokenData:
+    """
+    Dependency accepting only the service tokens other services sign for
+    inter-service calls (e.g. the buffered audit shippers)
+
+    Args:
+        token_data: Token data from authentication
+
+    Returns:
+        TokenData of the calling service
+
+    Raises:
+        HTTPException: If the token is not a service token
+    """
+    if token_data.role != "service" or not str(token_data.user_id).startswith("service:"):
+        logger.warning(f"Rejected non-service token from {token_data.user_id}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Service token required"
+        )
+
+    return token_data
+
+
 def require_self_or_permission(
     resource_user_id_param: str = "user_id",
     required_permissions: List[str] = None
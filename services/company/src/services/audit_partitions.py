@@ -0,0 +1,286 @@
+"""
+Monthly range partitions of ``audit_logs``
+
+``audit_logs`` is partitioned by ``created_at`` into one partition per month,
+named ``audit_logs_yYYYYmMM``, plus an ``audit_logs_default`` DEFAULT partition
+that catches rows outside the pre-created months (client clock skew, replayed
+spill files) so one such row cannot fail a whole batch insert. Indexes are
+declared on the parent (see ``AuditLog.__table_args__``) and cascade to every
+partition.
+
+The company service owns the partition lifecycle. ``audit_partition_manager``
+runs a maintenance pass on startup and then daily:
+
+- partitions are created ahead of time for the current and the next
+  ``AUDIT_PARTITION_MONTHS_AHEAD`` months, so inserts never miss a partition
+- partitions whose whole month is older than ``AUDIT_RETENTION_MONTHS`` are
+  detached (and dropped when ``AUDIT_RETENTION_DROP`` is set), which is a
+  metadata-only operation instead of a large DELETE
+- rows of ``audit_logs_default`` older than the same cutoff are deleted, since
+  the default partition is never detached
+
+Replicas coordinate through a Postgres advisory lock, so only one of them
+runs a pass at a time.
+"""
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config_local import settings
+from src.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+AUDIT_TABLE = "audit_logs"
+DEFAULT_PARTITION = f"{AUDIT_TABLE}_default"
+PARTITION_NAME_PATTERN = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+MAINTENANCE_INTERVAL_SECONDS = 24 * 60 * 60
+
+# Arbitrary, stable key for pg_try_advisory_lock
+MAINTENANCE_LOCK_KEY = 0x41554449  # "AUDI"
+
+
+def month_start(value: date) -> date:
+    """First day of the month containing ``value``"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """First day of the month ``months`` after the month of ``value``"""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Partition table name for a month"""
+    return f"{AUDIT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Month covered by a partition, or None if the name is not a monthly partition"""
+    match = PARTITION_NAME_PATTERN.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_sql(month: date) -> str:
+    """DDL creating the partition for a month if it does not exist"""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+        f"PARTITION OF {AUDIT_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def create_default_partition_sql() -> str:
+    """DDL creating the DEFAULT partition if it does not exist"""
+    return f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {AUDIT_TABLE} DEFAULT"
+
+
+async def is_partitioned(db: AsyncSession) -> bool:
+    """True when audit_logs is a partitioned table"""
+    result = await db.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = :table AND c.relnamespace = current_schema()::regnamespace)"
+        ),
+        {"table": AUDIT_TABLE}
+    )
+    return bool(result.scalar())
+
+
+async def list_partitions(db: AsyncSession) -> List[str]:
+    """Names of the partitions currently attached to audit_logs"""
+    result = await db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = :table AND parent.relnamespace = current_schema()::regnamespace "
+            "ORDER BY child.relname"
+        ),
+        {"table": AUDIT_TABLE}
+    )
+    return [row[0] for row in result]
+
+
+async def create_partition(db: AsyncSession, month: date, has_default: bool = True):
+    """
+    Create the partition for a month
+
+    Postgres refuses a new partition while the DEFAULT partition holds rows of
+    its range, so those rows are moved into the new table before it is attached.
+    """
+    start, end = month, add_months(month, 1)
+    stray = False
+    if has_default:
+        stray = (await db.execute(
+            text(
+                f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+                f"WHERE created_at >= :start AND created_at < :end)"
+            ),
+            {"start": start, "end": end}
+        )).scalar()
+    if not stray:
+        await db.execute(text(create_partition_sql(month)))
+        return
+
+    name = partition_name(month)
+    await db.execute(text(f"CREATE TABLE {name} (LIKE {AUDIT_TABLE} INCLUDING DEFAULTS)"))
+    await db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE created_at >= :start AND created_at < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"start": start, "end": end}
+    )
+    await db.execute(text(
+        f"ALTER TABLE {AUDIT_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    logger.info(f"Moved audit logs of {month:%Y-%m} from {DEFAULT_PARTITION} into {name}")
+
+
+async def ensure_partitions(db: AsyncSession, first_month: date, last_month: date) -> List[str]:
+    """Create the monthly partitions from ``first_month`` to ``last_month`` inclusive"""
+    existing = set(await list_partitions(db))
+    has_default = DEFAULT_PARTITION in existing
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        name = partition_name(month)
+        if name not in existing:
+            await create_partition(db, month, has_default)
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+async def detach_expired_partitions(db: AsyncSession, cutoff: date, drop: bool = False) -> List[str]:
+    """Detach (or drop) partitions whose whole month lies before ``cutoff``"""
+    removed = []
+    for name in await list_partitions(db):
+        month = partition_month(name)
+        if month is None or add_months(month, 1) > cutoff:
+            continue
+        await db.execute(text(f"ALTER TABLE {AUDIT_TABLE} DETACH PARTITION {name}"))
+        if drop:
+            await db.execute(text(f"DROP TABLE {name}"))
+        removed.append(name)
+    return removed
+
+
+async def delete_expired_default_rows(db: AsyncSession, cutoff: date) -> int:
+    """Delete rows of the DEFAULT partition created before ``cutoff``"""
+    result = await db.execute(
+        text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :cutoff"),
+        {"cutoff": cutoff}
+    )
+    return result.rowcount
+
+
+class AuditPartitionManager:
+    """Creates upcoming audit_logs partitions and retires expired ones"""
+
+    def __init__(self, months_ahead: int = 3, retention_months: int = 24, drop_expired: bool = False):
+        self._months_ahead = months_ahead
+        self._retention_months = retention_months
+        self._drop_expired = drop_expired
+        self._task: Optional[asyncio.Task] = None
+        self._last_run: Dict[str, Any] = {}
+
+    async def initialize(self):
+        """Run a maintenance pass now and schedule one daily"""
+        await self.run_maintenance()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_periodically())
+
+    async def shutdown(self):
+        """Stop the maintenance task"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Outcome of the last maintenance pass"""
+        return dict(self._last_run)
+
+    async def run_maintenance(self, today: Optional[date] = None) -> Dict[str, Any]:
+        """Create upcoming partitions and retire expired ones; failures are logged"""
+        today = today or datetime.now(timezone.utc).date()
+        current = month_start(today)
+        outcome: Dict[str, Any] = {"ran_at": datetime.now(timezone.utc).isoformat()}
+
+        async with AsyncSessionLocal() as db:
+            try:
+                locked = (await db.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"),
+                    {"key": MAINTENANCE_LOCK_KEY}
+                )).scalar()
+                if not locked:
+                    outcome["skipped"] = "maintenance running on another replica"
+                elif not await is_partitioned(db):
+                    outcome["skipped"] = "audit_logs is not partitioned, run migration 025"
+                else:
+                    await db.execute(text(create_default_partition_sql()))
+                    outcome["created"] = await ensure_partitions(
+                        db, current, add_months(current, self._months_ahead)
+                    )
+                    outcome["retired"] = []
+                    outcome["default_rows_expired"] = 0
+                    if self._retention_months > 0:
+                        cutoff = add_months(current, -self._retention_months)
+                        outcome["retired"] = await detach_expired_partitions(
+                            db, cutoff, drop=self._drop_expired
+                        )
+                        outcome["default_rows_expired"] = await delete_expired_default_rows(db, cutoff)
+                    outcome["default_rows"] = (await db.execute(
+                        text(f"SELECT count(*) FROM {DEFAULT_PARTITION}")
+                    )).scalar()
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                outcome["error"] = str(e)
+                logger.error(f"Audit partition maintenance failed: {e}")
+
+        if outcome.get("created") or outcome.get("retired"):
+            logger.info(
+                f"Audit partitions created: {outcome['created']}, "
+                f"{'dropped' if self._drop_expired else 'detached'}: {outcome['retired']}"
+            )
+        if outcome.get("default_rows_expired"):
+            logger.info(f"Deleted {outcome['default_rows_expired']} expired audit logs from {DEFAULT_PARTITION}")
+        if outcome.get("default_rows"):
+            logger.warning(
+                f"{outcome['default_rows']} audit logs outside the monthly partitions are in {DEFAULT_PARTITION}"
+            )
+        if outcome.get("skipped"):
+            logger.info(f"Audit partition maintenance skipped: {outcome['skipped']}")
+
+        self._last_run = outcome
+        return outcome
+
+    async def _run_periodically(self):
+        while True:
+            await asyncio.sleep(MAINTENANCE_INTERVAL_SECONDS)
+            await self.run_maintenance()
+
+
+# Global singleton instance
+audit_partition_manager = AuditPartitionManager(
+    months_ahead=settings.AUDIT_PARTITION_MONTHS_AHEAD,
+    retention_months=settings.AUDIT_RETENTION_MONTHS,
+    drop_expired=settings.AUDIT_RETENTION_DROP
+)
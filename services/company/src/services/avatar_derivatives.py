@@ -0,0 +1,82 @@
+"""
+Background thumbnail/preview generation for profile avatars
+
+``avatar_derivatives.schedule`` queues rendering of an uploaded avatar in a
+process pool (image decoding and resampling are CPU bound and would otherwise
+stall the event loop). The WebP variants are written next to the original
+under predictable names, so their URLs can be returned with the upload
+response and become available a moment later.
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Set
+
+from src.config_local import settings
+from src.utils.image_derivatives import render_derivative_files
+
+logger = logging.getLogger(__name__)
+
+
+class AvatarDerivatives:
+    """Renders avatar derivatives in a process pool, off the request path"""
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats = {"generated": 0, "failed": 0}
+
+    async def initialize(self):
+        """Start the worker processes"""
+        if not settings.IMAGE_DERIVATIVES_ENABLED or self._executor:
+            return
+        workers = max(1, settings.IMAGE_DERIVATIVE_WORKERS)
+        # spawn: never fork a process that is running an event loop and threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        logger.info(f"Avatar derivative rendering started with {workers} worker(s)")
+
+    async def shutdown(self, timeout: float = 10.0):
+        """Let running jobs finish briefly, then stop the workers"""
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+            for task in self._tasks:
+                task.cancel()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def schedule(self, source_path: str) -> bool:
+        """Queue rendering of an avatar file; False when the pipeline is off"""
+        if self._executor is None:
+            return False
+
+        task = asyncio.create_task(self._render(source_path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "pending": len(self._tasks),
+            "enabled": self._executor is not None,
+        }
+
+    async def _render(self, source_path: str):
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, render_derivative_files, source_path)
+            self.stats["generated"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.warning(f"Failed to render avatar derivatives for {source_path}: {str(e)}")
+
+
+# Global singleton instance, started by the application lifespan
+avatar_derivatives = AvatarDerivatives()
@@ -0,0 +1,90 @@
+"""
+Company entity change events for services that keep copies of company data
+
+The orders service stores copies of customers and products on its orders.
+Whenever a customer or product is updated, the new state is published on the
+``company:changes`` channel so open orders can refresh their snapshots
+without calling back into this service. Vehicle and driver changes are
+published the same way for the TMS resource directory (plate/user ID to ID
+and status).
+
+Every event is also appended to the ``company:changes:stream`` Redis stream
+(capped at about COMPANY_CHANGES_STREAM_MAXLEN entries). Pub/sub reaches every
+replica of a subscriber, which suits per-process caches; the stream is read
+through a consumer group, so each event is handled once per consuming service
+and events published while it is down are read when it comes back.
+"""
+import json
+import logging
+from typing import Any, Dict, Optional
+
+import redis.asyncio as redis
+
+from src.config_local import settings
+
+logger = logging.getLogger(__name__)
+
+COMPANY_CHANGES_CHANNEL = "company:changes"
+COMPANY_CHANGES_STREAM = "company:changes:stream"
+COMPANY_CHANGES_STREAM_MAXLEN = 100000
+
+
+class ChangeEventPublisher:
+    """Publishes company entity changes over Redis pub/sub and a Redis stream"""
+
+    def __init__(self, redis_url: Optional[str]):
+        self._redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+
+    async def initialize(self):
+        """Connect to Redis"""
+        if not self._redis_url or self._redis:
+            return
+        try:
+            self._redis = redis.from_url(
+                self._redis_url,
+                encoding="utf-8",
+                decode_responses=True
+            )
+        except Exception as e:
+            logger.warning(f"Change events disabled, Redis unavailable: {e}")
+            self._redis = None
+
+    async def shutdown(self):
+        """Close the Redis connection"""
+        if self._redis:
+            await self._redis.close()
+            self._redis = None
+
+    async def publish(self, entity: str, tenant_id: str, data: Dict[str, Any]):
+        """Publish the new state of an entity; failures are logged, never raised"""
+        if not self._redis:
+            return
+        event = json.dumps({"entity": entity, "tenant_id": tenant_id, "data": data}, default=str)
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.publish(COMPANY_CHANGES_CHANNEL, event)
+                pipe.xadd(
+                    COMPANY_CHANGES_STREAM,
+                    {"event": event},
+                    maxlen=COMPANY_CHANGES_STREAM_MAXLEN,
+                    approximate=True
+                )
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to publish {entity} change event: {e}")
+
+
+def vehicle_change(vehicle, deleted: bool = False) -> Dict[str, Any]:
+    """Vehicle change event data"""
+    status = getattr(vehicle.status, "value", vehicle.status)
+    return {"id": str(vehicle.id), "plate_number": vehicle.plate_number, "status": status, "deleted": deleted}
+
+
+def driver_change(driver, user_id: Optional[str], deleted: bool = False) -> Dict[str, Any]:
+    """Driver change event data; ``user_id`` is the auth user the profile belongs to"""
+    return {"id": str(driver.id), "user_id": user_id, "status": driver.current_status, "deleted": deleted}
+
+
+# Global singleton instance
+change_events = ChangeEventPublisher(redis_url=settings.REDIS_URL)
@@ -0,0 +1,122 @@
+"""
+Per-tenant snapshot of the profile statistics dashboard
+
+The statistics are computed with a single aggregate query, but HR dashboards
+poll them far more often than profiles change. Snapshots are kept per tenant
+and dropped whenever a session commits a write to one of the tables the
+statistics are built from; the TTL only bounds staleness for writes made by
+other replicas.
+"""
+import time
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.database import (
+    Branch,
+    BranchManagerProfile,
+    DriverProfile,
+    EmployeeDocument,
+    EmployeeProfile,
+    FinanceManagerProfile,
+    LogisticsManagerProfile,
+)
+
+TRACKED_MODELS = (
+    EmployeeProfile,
+    EmployeeDocument,
+    DriverProfile,
+    FinanceManagerProfile,
+    BranchManagerProfile,
+    LogisticsManagerProfile,
+    Branch,
+)
+
+ALL_TENANTS = "*"
+_SESSION_INFO_KEY = "profile_stats_dirty_tenants"
+
+
+class ProfileStatsSnapshot:
+    """Generation-stamped cache of computed statistics per tenant"""
+
+    def __init__(self, ttl: int = 60):
+        self._ttl = ttl
+        # tenant_id -> {"stats": dict, "generation": int, "expires_at": float}
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._generations: Dict[str, int] = {}
+        self._global_generation = 0
+
+    def generation(self, tenant_id: str) -> int:
+        """Current generation of a tenant; read it before computing a snapshot"""
+        return self._global_generation + self._generations.get(tenant_id, 0)
+
+    def get(self, tenant_id: str) -> Optional[Dict[str, Any]]:
+        """Return the tenant's snapshot if it is still current"""
+        snapshot = self._snapshots.get(tenant_id)
+        if (
+            snapshot is None
+            or time.monotonic() >= snapshot["expires_at"]
+            or snapshot["generation"] != self.generation(tenant_id)
+        ):
+            return None
+        return snapshot["stats"]
+
+    def set(self, tenant_id: str, stats: Dict[str, Any], generation: int):
+        """
+        Store a snapshot computed at ``generation``.
+
+        Snapshots computed before a concurrent write committed are discarded.
+        """
+        if generation != self.generation(tenant_id):
+            return
+        self._snapshots[tenant_id] = {
+            "stats": stats,
+            "generation": generation,
+            "expires_at": time.monotonic() + self._ttl
+        }
+
+    def invalidate(self, tenant_id: Optional[str] = None):
+        """Drop the snapshot of a tenant, or of every tenant when tenant_id is None"""
+        if tenant_id is None or tenant_id == ALL_TENANTS:
+            self._global_generation += 1
+            self._snapshots.clear()
+            return
+        self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+        self._snapshots.pop(tenant_id, None)
+
+
+# Global singleton instance
+profile_stats_snapshot = ProfileStatsSnapshot()
+
+
+def _mark_dirty(session: Session, tenant_id: Optional[str]):
+    session.info.setdefault(_SESSION_INFO_KEY, set()).add(tenant_id or ALL_TENANTS)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_writes(session: Session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, TRACKED_MODELS):
+            _mark_dirty(session, getattr(obj, "tenant_id", None))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_writes(orm_execute_state):
+    # Bulk UPDATE/DELETE statements bypass the flush; the affected tenants
+    # are not known here, so every snapshot is dropped on commit
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, TRACKED_MODELS):
+        _mark_dirty(orm_execute_state.session, ALL_TENANTS)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session):
+    tenant_ids: Set[str] = session.info.pop(_SESSION_INFO_KEY, set())
+    if ALL_TENANTS in tenant_ids:
+        profile_stats_snapshot.invalidate()
+        return
+    for tenant_id in tenant_ids:
+        profile_stats_snapshot.invalidate(tenant_id)
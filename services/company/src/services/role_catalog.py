@@ -0,0 +1,162 @@
+"""
+Per-tenant role catalog cache for auth service roles
+
+Roles are owned by the auth service and only change rarely, yet employee
+responses need the role of every row. The catalog downloads a tenant's role
+list once, indexes it by ID and serves all lookups from memory until the TTL
+expires or the auth service publishes a newer catalog version on the
+``roles:invalidate`` channel.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+import redis.asyncio as redis
+
+from src.config_local import settings
+
+logger = logging.getLogger(__name__)
+
+ROLE_CATALOG_CHANNEL = "roles:invalidate"
+
+
+class RoleCatalog:
+    """Versioned, per-tenant cache of auth service roles indexed by role ID"""
+
+    def __init__(self, auth_service_url: str, redis_url: Optional[str], ttl: int = 300):
+        self._auth_service_url = auth_service_url
+        self._redis_url = redis_url
+        self._ttl = ttl
+        # tenant_id -> {"roles": {role_id: role}, "version": int, "expires_at": float}
+        self._catalogs: Dict[str, Dict[str, Any]] = {}
+        # Latest catalog version announced by the auth service per tenant
+        self._versions: Dict[str, int] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._redis: Optional[redis.Redis] = None
+        self._pubsub = None
+        self._listener_task: Optional[asyncio.Task] = None
+
+    async def initialize(self):
+        """Subscribe to role catalog change events from the auth service"""
+        if not self._redis_url or self._redis:
+            return
+        try:
+            self._redis = redis.from_url(
+                self._redis_url,
+                encoding="utf-8",
+                decode_responses=True
+            )
+            self._pubsub = self._redis.pubsub()
+            await self._pubsub.subscribe(ROLE_CATALOG_CHANNEL)
+            self._listener_task = asyncio.create_task(self._invalidation_listener())
+        except Exception as e:
+            logger.warning(f"Role catalog running TTL-only, Redis unavailable: {e}")
+            self._redis = None
+            self._pubsub = None
+
+    async def shutdown(self):
+        """Stop the listener and close the Redis connection"""
+        if self._listener_task:
+            self._listener_task.cancel()
+            self._listener_task = None
+        if self._pubsub:
+            try:
+                await self._pubsub.unsubscribe(ROLE_CATALOG_CHANNEL)
+                await self._pubsub.close()
+            except Exception:
+                pass
+            self._pubsub = None
+        if self._redis:
+            await self._redis.close()
+            self._redis = None
+
+    async def get_roles(self, tenant_id: str, auth_token: Optional[str]) -> Dict[int, dict]:
+        """
+        Get the role catalog of a tenant indexed by role ID.
+
+        Concurrent misses for the same tenant share a single download. Returns
+        the last known catalog (or an empty one) if the auth service fails.
+        """
+        catalog = self._catalogs.get(tenant_id)
+        if self._is_fresh(tenant_id, catalog):
+            return catalog["roles"]
+
+        lock = self._locks.setdefault(tenant_id, asyncio.Lock())
+        async with lock:
+            catalog = self._catalogs.get(tenant_id)
+            if self._is_fresh(tenant_id, catalog):
+                return catalog["roles"]
+
+            # Stamp with the version known before the download so an
+            # invalidation arriving mid-flight still forces a refetch
+            version = self._versions.get(tenant_id, 0)
+            roles = await self._fetch_roles(auth_token)
+            if roles is None:
+                return catalog["roles"] if catalog else {}
+
+            self._catalogs[tenant_id] = {
+                "roles": {role["id"]: role for role in roles},
+                "version": version,
+                "expires_at": time.monotonic() + self._ttl
+            }
+            return self._catalogs[tenant_id]["roles"]
+
+    def invalidate(self, tenant_id: Optional[str] = None, version: Optional[int] = None):
+        """Mark a tenant's catalog (or every catalog when tenant_id is None) as stale"""
+        tenant_ids = [tenant_id] if tenant_id else list(self._catalogs.keys())
+        for tid in tenant_ids:
+            self._versions[tid] = max(
+                self._versions.get(tid, 0) + 1,
+                version or 0
+            )
+
+    def _is_fresh(self, tenant_id: str, catalog: Optional[Dict[str, Any]]) -> bool:
+        return (
+            catalog is not None
+            and time.monotonic() < catalog["expires_at"]
+            and catalog["version"] >= self._versions.get(tenant_id, 0)
+        )
+
+    async def _fetch_roles(self, auth_token: Optional[str]) -> Optional[list]:
+        headers = {"Accept": "application/json"}
+        if auth_token:
+            headers["Authorization"] = f"Bearer {auth_token}"
+
+        try:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.get(
+                    f"{self._auth_service_url}/api/v1/roles/",
+                    headers=headers
+                )
+            if response.status_code == 200:
+                return response.json()
+            logger.warning(f"Auth service returned status {response.status_code} when fetching roles")
+        except Exception as e:
+            logger.error(f"Failed to fetch roles from auth service: {e}")
+        return None
+
+    async def _invalidation_listener(self):
+        try:
+            async for message in self._pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                try:
+                    event = json.loads(message["data"])
+                    self.invalidate(event.get("tenant_id"), event.get("version"))
+                except (json.JSONDecodeError, TypeError) as e:
+                    logger.error(f"Invalid role catalog event: {e}")
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Role catalog listener stopped: {e}")
+
+
+# Global singleton instance
+role_catalog = RoleCatalog(
+    auth_service_url=settings.AUTH_SERVICE_URL,
+    redis_url=settings.REDIS_URL,
+    ttl=getattr(settings, "ROLE_CATALOG_TTL", 300)
+)
@@ -0,0 +1,188 @@
+"""
+Indexed text search for company entities
+
+Searchable entities are registered once with the columns that make up their
+search document. The same registry drives the SQL used by queries and the
+DDL of the ``pg_trgm`` GIN indexes created by migration 024, so the planner
+can always match the query expression to the index:
+
+- terms of 3+ characters use ``document LIKE '%term%'`` served by the
+  trigram GIN index on the lowered, concatenated document; columns are
+  joined with a separator that is stripped from terms, so a match never
+  spans two columns
+- shorter terms cannot use trigrams and fall back to per-column substring
+  matches, as the ``ilike`` filters did
+- ranked results order prefix hits (``text_pattern_ops`` btree indexes on
+  the identifying columns) first, then by trigram similarity
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import String, case, func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import Branch, BusinessTypeModel, Customer, EmployeeProfile, Product
+
+MIN_TRIGRAM_LENGTH = 3
+# Joins document columns (ASCII unit separator); removed from search terms
+DOCUMENT_SEPARATOR = "\x1f"
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+
+
+@dataclass(frozen=True)
+class SearchableEntity:
+    """Search configuration for one table"""
+    model: Any
+    document_columns: List[str]  # Concatenated into the trigram document
+    prefix_columns: List[str]  # Identifying columns ranked first on a prefix hit
+    label_columns: List[str]  # Columns shown in ranked search results
+    read_permissions: List[str]
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+
+SEARCHABLE_ENTITIES: Dict[str, SearchableEntity] = {
+    "customers": SearchableEntity(
+        model=Customer,
+        document_columns=["name", "code", "email", "phone"],
+        prefix_columns=["name", "code"],
+        label_columns=["name", "code"],
+        read_permissions=["customers:read_all", "customers:read"],
+    ),
+    "employees": SearchableEntity(
+        model=EmployeeProfile,
+        document_columns=["first_name", "last_name", "email", "employee_code", "phone"],
+        prefix_columns=["first_name", "last_name", "employee_code"],
+        label_columns=["first_name", "last_name", "employee_code"],
+        read_permissions=["users:read_all", "users:read"],
+    ),
+    "branches": SearchableEntity(
+        model=Branch,
+        document_columns=["name", "code", "city"],
+        prefix_columns=["name", "code"],
+        label_columns=["name", "code"],
+        read_permissions=["branches:read_all", "branches:read"],
+    ),
+    "products": SearchableEntity(
+        model=Product,
+        document_columns=["name", "code", "description"],
+        prefix_columns=["name", "code"],
+        label_columns=["name", "code"],
+        read_permissions=["products:read_all", "products:read"],
+    ),
+    "business_types": SearchableEntity(
+        model=BusinessTypeModel,
+        document_columns=["name", "code", "description"],
+        prefix_columns=["name", "code"],
+        label_columns=["name", "code"],
+        read_permissions=["customers:read_all", "customers:read"],
+    ),
+}
+
+
+def document_sql(entity: SearchableEntity, qualify: bool = True) -> str:
+    """SQL for the lowered search document; must match the index expression"""
+    prefix = f"{entity.table}." if qualify else ""
+    parts = [f"coalesce({prefix}{column}, '')" for column in entity.document_columns]
+    return "lower(" + " || E'\\x1f' || ".join(parts) + ")"
+
+
+def trigram_index_ddl(entity: SearchableEntity) -> List[str]:
+    """DDL for the trigram and prefix indexes backing an entity's search"""
+    statements = [
+        f"CREATE INDEX IF NOT EXISTS idx_{entity.table}_search_trgm "
+        f"ON {entity.table} USING gin (({document_sql(entity, qualify=False)}) gin_trgm_ops)"
+    ]
+    for column in entity.prefix_columns:
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS idx_{entity.table}_{column}_prefix "
+            f"ON {entity.table} (tenant_id, lower({column}) text_pattern_ops)"
+        )
+    return statements
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def normalize_term(term: Optional[str]) -> str:
+    """Lowercase and trim a user supplied search term"""
+    return (term or "").replace(DOCUMENT_SEPARATOR, "").strip().lower()
+
+
+def search_filter(name: str, term: str):
+    """
+    WHERE clause matching ``term`` against an entity, using the indexed paths.
+
+    Drop-in replacement for OR-ed ``ilike('%term%')`` filters.
+    """
+    entity = SEARCHABLE_ENTITIES[name]
+    term = normalize_term(term)
+    pattern = escape_like(term)
+
+    if len(term) < MIN_TRIGRAM_LENGTH:
+        # Too short for trigrams: substring match on each searchable column
+        return or_(*[
+            func.lower(getattr(entity.model, column)).like(f"%{pattern}%")
+            for column in entity.document_columns
+        ])
+
+    document = literal_column(document_sql(entity), type_=String)
+    return document.like(f"%{pattern}%")
+
+
+def search_rank(name: str, term: str):
+    """Ranking expression: prefix hits first, then trigram similarity"""
+    entity = SEARCHABLE_ENTITIES[name]
+    term = normalize_term(term)
+    pattern = escape_like(term)
+
+    prefix_hit = case(
+        (or_(*[
+            func.lower(getattr(entity.model, column)).like(f"{pattern}%")
+            for column in entity.prefix_columns
+        ]), 1.0),
+        else_=0.0
+    )
+    document = literal_column(document_sql(entity), type_=String)
+    return prefix_hit + func.similarity(document, term)
+
+
+async def search_entities(
+    db: AsyncSession,
+    tenant_id: str,
+    term: str,
+    entity_names: List[str],
+    limit: int = DEFAULT_SEARCH_LIMIT
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Run a ranked, limited search over several entities of a tenant"""
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    results: Dict[str, List[Dict[str, Any]]] = {}
+
+    for name in entity_names:
+        entity = SEARCHABLE_ENTITIES[name]
+        rank = search_rank(name, term).label("rank")
+        columns = [getattr(entity.model, column) for column in entity.label_columns]
+
+        query = (
+            select(entity.model.id, *columns, rank)
+            .where(entity.model.tenant_id == tenant_id)
+            .where(search_filter(name, term))
+            .order_by(rank.desc())
+            .limit(limit)
+        )
+        rows = (await db.execute(query)).all()
+        results[name] = [
+            {
+                "id": str(row.id),
+                **{column: getattr(row, column) for column in entity.label_columns},
+                "rank": round(float(row.rank), 4)
+            }
+            for row in rows
+        ]
+
+    return results
@@ -14,6 +14,7 @@ from .tenant import (
     create_tenant_audit_fields,
     TenantValidators,
 )
+from .uploads import save_upload
 
 __all__ = [
     "add_tenant_filter",
@@ -26,4 +27,5 @@ __all__ = [
     "check_resource_ownership",
     "create_tenant_audit_fields",
     "TenantValidators",
+    "save_upload",
 ]
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Resized image derivatives for uploaded avatars
+
+Avatars are re-encoded as small WebP files next to the original so profile
+lists and headers do not download multi-megabyte photos. Rendering is CPU
+bound and runs in a worker process (see ``src.services.avatar_derivatives``),
+so the functions here are plain, picklable module-level functions.
+"""
+import os
+from typing import Any, Dict
+
+from PIL import Image, ImageOps
+
+# Derivative name -> longest edge in pixels and WebP quality
+AVATAR_DERIVATIVE_SPECS: Dict[str, Dict[str, int]] = {
+    "thumbnail": {"max_size": 128, "quality": 75},
+    "preview": {"max_size": 512, "quality": 80},
+}
+
+DERIVATIVE_FORMAT = "WEBP"
+DERIVATIVE_EXTENSION = ".webp"
+
+# Decompression bomb guard: refuse images above ~50 megapixels
+MAX_IMAGE_PIXELS = 50_000_000
+
+
+def derivative_path(path: str, name: str) -> str:
+    """Path of a derivative, next to its original"""
+    root, _ = os.path.splitext(path)
+    return f"{root}_{name}{DERIVATIVE_EXTENSION}"
+
+
+def render_derivative_files(
+    source_path: str,
+    specs: Dict[str, Dict[str, int]] = AVATAR_DERIVATIVE_SPECS
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Render every derivative of an image file and write it next to the source.
+
+    Runs in a worker process. EXIF orientation is applied, JPEGs are decoded
+    at a reduced scale when possible, and each smaller derivative is resampled
+    from the next larger one rather than from the original.
+
+    Returns:
+        Derivative name -> {"path", "size", "width", "height"}
+    """
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    largest = max(spec["max_size"] for spec in specs.values())
+    rendered: Dict[str, Dict[str, Any]] = {}
+
+    with Image.open(source_path) as original:
+        # JPEG only: let the decoder downscale by a power of two
+        original.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        source = image
+        for name, spec in sorted(specs.items(), key=lambda item: -item[1]["max_size"]):
+            derived = source.copy()
+            derived.thumbnail(
+                (spec["max_size"], spec["max_size"]),
+                Image.Resampling.LANCZOS,
+                reducing_gap=3.0
+            )
+            path = derivative_path(source_path, name)
+            # Write to a temporary name so readers never see a partial file
+            temp_path = f"{path}.tmp"
+            derived.save(temp_path, DERIVATIVE_FORMAT, quality=spec["quality"], method=4)
+            os.replace(temp_path, path)
+            rendered[name] = {
+                "path": path,
+                "size": os.path.getsize(path),
+                "width": derived.width,
+                "height": derived.height,
+            }
+            source = derived
+
+    return rendered
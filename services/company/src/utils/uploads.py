@@ -0,0 +1,56 @@
+"""
+Chunked saving of uploaded files
+
+Uploads are copied from the multipart spool to their destination in chunks,
+with the size limit enforced while copying and the SHA-256 hash computed on
+the way, so a file is never held in memory as a whole.
+"""
+import hashlib
+from pathlib import Path
+from typing import Tuple, Union
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def save_upload(
+    file: UploadFile,
+    destination: Union[str, Path],
+    max_size: int,
+    too_large_detail: str = "File too large"
+) -> Tuple[int, str]:
+    """
+    Stream an upload to ``destination``.
+
+    Returns:
+        Tuple of (file_size, sha256 hex digest)
+
+    Raises:
+        HTTPException 400 as soon as the upload exceeds ``max_size``; the
+        partial file is removed.
+    """
+    destination = Path(destination)
+    sha256_hash = hashlib.sha256()
+    file_size = 0
+
+    await file.seek(0)
+    buffer = await run_in_threadpool(open, destination, "wb")
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            file_size += len(chunk)
+            if file_size > max_size:
+                raise HTTPException(status_code=400, detail=too_large_detail)
+            sha256_hash.update(chunk)
+            await run_in_threadpool(buffer.write, chunk)
+    except BaseException:
+        buffer.close()
+        destination.unlink(missing_ok=True)
+        raise
+    buffer.close()
+
+    return file_size, sha256_hash.hexdigest()
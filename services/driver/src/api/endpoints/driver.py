@@ -1,9 +1,13 @@
 """API endpoints for driver operations using TMS Service."""
 
-from typing import Optional, Dict, Any
+import hashlib
+import json
+from typing import Optional, Dict, Any, AsyncIterator
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File, Form
-from src.services.driver_service import DriverService
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from src.services.driver_service import DriverService, InvalidSyncCursor
 from src.services.audit_client import AuditClient
 from src.config import settings
 from src.security import (
@@ -13,8 +17,9 @@ from src.security import (
     require_permissions,
     require_any_permission
 )
-from src.schemas import TripPause, TripResume
+from src.schemas import TripPause, TripResume, DeliveryJournal
 from src.http_client import CompanyClient
+import httpx
 import logging
 
 logger = logging.getLogger(__name__)
@@ -30,6 +35,26 @@ def get_auth_token(request: Request) -> Optional[str]:
     return None
 
 
+# Delivery proof files are limited to 10MB; the multipart body may carry a
+# little more for the part headers and form fields
+DELIVERY_PROOF_MAX_FILE_SIZE = 10 * 1024 * 1024
+DELIVERY_PROOF_MAX_BODY_SIZE = DELIVERY_PROOF_MAX_FILE_SIZE + 64 * 1024
+
+
+class RequestBodyTooLarge(Exception):
+    """Raised while streaming a request body past its size limit"""
+
+
+async def _limited_body(request: Request, max_size: int) -> AsyncIterator[bytes]:
+    """Yield the raw request body, aborting once it exceeds ``max_size`` bytes"""
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_size:
+            raise RequestBodyTooLarge()
+        yield chunk
+
+
 def get_driver_service(request: Request) -> DriverService:
     """Get driver service instance with auth token"""
     auth_token = get_auth_token(request)
@@ -42,15 +67,19 @@ async def get_driver_trips(
     status: Optional[str] = Query(None, description="Filter by trip status"),
     trip_date: Optional[date] = Query(None, description="Filter by trip date"),
     driver_id: Optional[str] = Query(None, description="Filter by driver ID"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Trips per page; omit for every trip"),
+    compact: bool = Query(False, description="Return only the fields the trip list screen shows"),
     token_data: TokenData = Depends(require_any_permission(["driver:read", "driver:read_all", "trips:read", "trips:read_all"])),
     tenant_id: str = Depends(get_current_tenant_id),
     user_id: str = Depends(get_current_user_id)
 ):
     """
-    Get all trips assigned to the current driver.
+    Get the trips assigned to the current driver, newest first.
 
-    This endpoint returns a list of trips assigned to the driver,
-    optionally filtered by status and/or date.
+    This endpoint returns the trips assigned to the driver, optionally
+    filtered by status and/or date. With ``limit`` it returns one page:
+    pass the returned next_cursor as cursor to fetch the following page.
     """
     try:
         # Get driver service instance with auth token
@@ -59,7 +88,10 @@ async def get_driver_trips(
             status=status,
             trip_date=trip_date,
             company_id=tenant_id,  # Use tenant_id as company_id
-            driver_id=driver_id or user_id  # Use the driver_id from query or user_id from token
+            driver_id=driver_id or user_id,  # Use the driver_id from query or user_id from token
+            cursor=cursor,
+            limit=limit,
+            compact=compact
         )
         return response
     except Exception as e:
@@ -92,6 +124,53 @@ async def get_current_trip(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _sync_etag(changes: Dict[str, Any]) -> str:
+    """ETag over the changes only, so an unchanged delta matches whatever the cursor"""
+    payload = {key: value for key, value in changes.items() if key != "cursor"}
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode()
+    ).hexdigest()
+    # Weak: the same changes may be sent gzip-compressed or not
+    return f'W/"{digest[:32]}"'
+
+
+@router.get("/sync")
+async def sync_driver_trips(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="cursor of the previous sync; omit for a full snapshot"),
+    token_data: TokenData = Depends(require_any_permission(["driver:read", "driver:read_all", "trips:read", "trips:read_all"])),
+    tenant_id: str = Depends(get_current_tenant_id),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    Get only what changed on the driver's trips since the last sync.
+
+    Returns changed trips, stops, item assignments and delivery proofs, plus
+    the trips, stops and item assignments to delete (apply deletions first),
+    and the cursor for the next sync. Without a cursor, or with one older
+    than DRIVER_SYNC_RETENTION_DAYS, the response is a full snapshot
+    (``full: true``) that replaces the device's data.
+
+    Send the previous ETag in If-None-Match: when nothing changed the
+    response is a bodyless 304 and the device keeps its cursor. Responses
+    are gzip-compressed for clients that accept it.
+    """
+    try:
+        driver_service = get_driver_service(request)
+        changes = await driver_service.sync(cursor=cursor, company_id=tenant_id)
+    except InvalidSyncCursor:
+        raise HTTPException(status_code=400, detail="Invalid sync cursor")
+    except Exception as e:
+        logger.error(f"Error syncing driver trips: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    etag = _sync_etag(changes)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=jsonable_encoder(changes), headers=headers)
+
+
 @router.get("/trips/{trip_id}")
 async def get_trip_detail(
     trip_id: str,
@@ -297,15 +376,74 @@ async def mark_order_delivered(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/trips/{trip_id}/orders/{order_id}/upload-document")
+@router.post("/journal")
+async def submit_delivery_journal(
+    journal: DeliveryJournal,
+    token_data: TokenData = Depends(require_permissions(["driver:update"])),
+    tenant_id: str = Depends(get_current_tenant_id),
+    driver_service=Depends(get_driver_service)
+):
+    """
+    Apply delivery events recorded while offline, in one request.
+
+    Accepts delivery status changes, deliveries, and trip pause/resume in the
+    order they happened. Every event carries a device-generated ``event_id``:
+    re-sending a journal after a lost response is safe, already applied
+    events come back marked ``duplicate``. Invalid events are rejected
+    individually; the result lists each event's outcome. Results marked
+    ``orders_sync_pending`` mean the order item statuses did not reach the
+    orders service yet; send the journal again later to retry.
+
+    Delivery proofs are still uploaded through the upload-document endpoint.
+    """
+    try:
+        return await driver_service.submit_journal(
+            events=[event.model_dump(mode="json", exclude_none=True) for event in journal.events],
+            company_id=tenant_id  # Use tenant_id as company_id
+        )
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code < 500:
+            try:
+                detail = e.response.json().get("detail", e.response.text)
+            except ValueError:
+                detail = e.response.text
+            raise HTTPException(status_code=e.response.status_code, detail=detail)
+        logger.error(f"Error submitting delivery journal: {str(e)}")
+        raise HTTPException(status_code=502, detail="TMS service error")
+    except Exception as e:
+        logger.error(f"Error submitting delivery journal: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/trips/{trip_id}/orders/{order_id}/upload-document",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["file"],
+                        "properties": {
+                            "file": {"type": "string", "format": "binary"},
+                            "document_type": {"type": "string", "default": "delivery_proof"},
+                            "title": {"type": "string", "default": "Delivery Proof"},
+                            "description": {
+                                "type": "string",
+                                "default": "Document uploaded by driver upon delivery"
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
 async def upload_delivery_document(
     request: Request,
     trip_id: str,
     order_id: str,
-    file: UploadFile = File(...),
-    document_type: str = Form(default="delivery_proof"),
-    title: str = Form(default="Delivery Proof"),
-    description: str = Form(default="Document uploaded by driver upon delivery"),
     token_data: TokenData = Depends(require_permissions(["driver:update"])),
     tenant_id: str = Depends(get_current_tenant_id),
     user_id: str = Depends(get_current_user_id),
@@ -315,7 +453,10 @@ async def upload_delivery_document(
     Upload delivery proof document for an order.
 
     This endpoint allows drivers to upload delivery confirmation documents
-    (photos, PDFs, etc.) when delivering an order.
+    (photos, PDFs, etc.) when delivering an order. The multipart body
+    (file, document_type, title, description) is streamed through to the
+    orders service as it arrives, which validates the file type, hashes and
+    stores the file; the size limit is enforced while streaming.
     """
     # Get authorization header for audit client
     auth_headers = {}
@@ -330,41 +471,34 @@ async def upload_delivery_document(
         if not order_id or order_id == "undefined" or order_id.strip() == "":
             raise HTTPException(status_code=400, detail="Invalid order ID")
 
-        # Validate file type - allow images and PDFs
-        allowed_mime_types = [
-            "application/pdf",
-            "image/jpeg",
-            "image/png",
-            "image/jpg",
-            "image/gif",
-            "image/webp"
-        ]
-
-        if file.content_type not in allowed_mime_types:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File type {file.content_type} is not allowed. Allowed types: PDF, JPEG, PNG, GIF, WebP"
-            )
+        content_type = request.headers.get("content-type", "")
+        if not content_type.startswith("multipart/form-data"):
+            raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload with a file field")
 
-        # Validate file size (max 10MB)
-        max_file_size = 10 * 1024 * 1024  # 10MB
-        file_content = await file.read()
-        if len(file_content) > max_file_size:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size exceeds maximum limit of 10MB"
-            )
+        # Reject oversized uploads up front when the length is declared
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > DELIVERY_PROOF_MAX_BODY_SIZE:
+            raise HTTPException(status_code=400, detail="File size exceeds maximum limit of 10MB")
 
-        # Upload document via orders service
-        result = await driver_service.upload_delivery_proof(
-            order_id=order_id,
-            file_content=file_content,
-            filename=file.filename,
-            content_type=file.content_type,
-            document_type=document_type,
-            title=title,
-            description=description
-        )
+        # Stream the upload through to the orders service
+        try:
+            result = await driver_service.upload_delivery_proof(
+                order_id=order_id,
+                body=_limited_body(request, DELIVERY_PROOF_MAX_BODY_SIZE),
+                content_type=content_type,
+                content_length=content_length
+            )
+        except RequestBodyTooLarge:
+            raise HTTPException(status_code=400, detail="File size exceeds maximum limit of 10MB")
+        except httpx.HTTPStatusError as e:
+            # Surface the orders service's validation errors (file type, size)
+            if e.response.status_code < 500:
+                try:
+                    detail = e.response.json().get("detail", e.response.text)
+                except ValueError:
+                    detail = e.response.text
+                raise HTTPException(status_code=e.response.status_code, detail=detail)
+            raise
 
         # Check if trip should be completed (all orders delivered)
         # This triggers automatic trip completion when all orders have delivery documents
@@ -400,8 +534,8 @@ async def upload_delivery_document(
             new_values={
                 "order_id": order_id,
                 "trip_id": trip_id,
-                "document_type": document_type,
-                "file_name": file.filename
+                "document_type": result.get("document_type"),
+                "file_name": result.get("file_name")
             }
         )
         await audit_client.close()
@@ -36,6 +36,17 @@ class Settings(BaseSettings):
     COMPANY_API_URL: str = os.getenv("COMPANY_API_URL", "http://company-service:8002")
     COMPANY_API_TIMEOUT: int = int(os.getenv("COMPANY_API_TIMEOUT", "30"))
 
+    # Connection pool shared by the TMS/Orders/Company clients (per service)
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+
+    # Responses smaller than this are sent uncompressed
+    GZIP_MINIMUM_SIZE: int = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+
+    # Sync cursors older than this get a full snapshot; TMS and Orders keep
+    # deletions for DRIVER_SYNC_TOMBSTONE_RETENTION_DAYS, which must not be shorter
+    DRIVER_SYNC_RETENTION_DAYS: int = int(os.getenv("DRIVER_SYNC_RETENTION_DAYS", "30"))
+
     # Redis Configuration
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://redis:6379")
 
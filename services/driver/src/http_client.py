@@ -1,13 +1,47 @@
 """HTTP client for communicating with TMS and Orders Services"""
 
 import httpx
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 from src.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class SharedHTTPClients:
+    """
+    One pooled ``httpx.AsyncClient`` per upstream service
+
+    ``TMSClient``/``OrdersClient``/``CompanyClient`` are created per request
+    (they carry the caller's token), so the connection pools live here and
+    keep-alive connections are reused across requests instead of a new TCP
+    connection for every call. Closed on application shutdown.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+            self._clients[name] = client
+        return client
+
+    async def close(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+http_clients = SharedHTTPClients()
+
+
 class TMSClient:
     """Client for communicating with TMS Service"""
 
@@ -40,35 +74,39 @@ class TMSClient:
 
         logger.info(f"TMS Request: {method} {url}")
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    params=params,
-                    json=json
-                )
-                logger.info(f"TMS Response: Status {response.status_code}")
-                if response.status_code >= 400:
-                    logger.error(f"TMS API error response: {response.text}")
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                logger.error(f"TMS API error: {e.response.status_code} - {e.response.text}")
-                raise
-            except httpx.RequestError as e:
-                logger.error(f"TMS API request error: {str(e)}")
-                raise
+        client = http_clients.get("tms")
+        try:
+            response = await client.request(
+                method=method,
+                url=url,
+                headers=headers,
+                params=params,
+                json=json,
+                timeout=self.timeout
+            )
+            logger.info(f"TMS Response: Status {response.status_code}")
+            if response.status_code >= 400:
+                logger.error(f"TMS API error response: {response.text}")
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"TMS API error: {e.response.status_code} - {e.response.text}")
+            raise
+        except httpx.RequestError as e:
+            logger.error(f"TMS API request error: {str(e)}")
+            raise
 
     async def get_driver_trips(
         self,
         driver_id: str,
         status: Optional[str] = None,
         trip_date: Optional[str] = None,
-        company_id: Optional[str] = None
+        company_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        compact: bool = False
     ) -> Dict[str, Any]:
-        """Get trips for a driver"""
+        """Get one page of trips for a driver"""
         params = {"driver_id": driver_id}
         if status:
             params["status"] = status
@@ -76,6 +114,12 @@ class TMSClient:
             params["trip_date"] = trip_date
         if company_id:
             params["company_id"] = company_id
+        if cursor:
+            params["cursor"] = cursor
+        if limit:
+            params["limit"] = limit
+        if compact:
+            params["compact"] = "true"
 
         return await self._make_request(
             "GET",
@@ -98,6 +142,24 @@ class TMSClient:
             params=params
         )
 
+    async def get_driver_sync(
+        self,
+        since: Optional[int] = None,
+        company_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get trips and stops changed since a TMS sync cursor (driver_id extracted from JWT by TMS service)"""
+        params = {}
+        if since is not None:
+            params["since"] = since
+        if company_id:
+            params["company_id"] = company_id
+
+        return await self._make_request(
+            "GET",
+            "/api/v1/driver/sync",
+            params=params
+        )
+
     async def get_trip_detail(
         self,
         trip_id: str,
@@ -189,6 +251,24 @@ class TMSClient:
         )
 
 
+    async def submit_driver_journal(
+        self,
+        events: List[Dict[str, Any]],
+        driver_id: str,
+        company_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Apply a batch of driver journal events"""
+        params = {"driver_id": driver_id}
+        if company_id:
+            params["company_id"] = company_id
+
+        return await self._make_request(
+            "POST",
+            "/api/v1/driver/journal",
+            params=params,
+            json={"events": events}
+        )
+
 # Create global client instance
 tms_client = TMSClient()
 
@@ -208,13 +288,15 @@ class OrdersClient:
         params: Optional[Dict[str, Any]] = None,
         json: Optional[Dict[str, Any]] = None,
         files: Optional[Dict[str, Any]] = None,
-        data: Optional[Dict[str, Any]] = None
+        data: Optional[Dict[str, Any]] = None,
+        content: Optional[AsyncIterator[bytes]] = None,
+        extra_headers: Optional[Dict[str, str]] = None
     ) -> Dict[str, Any]:
         """Make HTTP request to Orders service"""
         url = f"{self.base_url}{endpoint}"
 
         # Prepare headers
-        headers = {}
+        headers = dict(extra_headers or {})
 
         # Add Authorization header if token is available
         if self.auth_token:
@@ -224,76 +306,92 @@ class OrdersClient:
             logger.warning("No auth_token available for Orders request")
 
         # Don't set Content-Type for multipart/form-data (it will be set automatically)
-        if files is None:
+        if files is None and content is None:
             headers["Content-Type"] = "application/json"
 
         logger.info(f"Orders Request: {method} {url}")
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    params=params,
-                    json=json,
-                    files=files,
-                    data=data
-                )
-                logger.info(f"Orders Response: Status {response.status_code}")
-                if response.status_code >= 400:
-                    logger.error(f"Orders API error response: {response.text}")
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Orders API error: {e.response.status_code} - {e.response.text}")
-                raise
-            except httpx.RequestError as e:
-                logger.error(f"Orders API request error: {str(e)}")
-                raise
+        client = http_clients.get("orders")
+        try:
+            response = await client.request(
+                method=method,
+                url=url,
+                headers=headers,
+                params=params,
+                json=json,
+                files=files,
+                data=data,
+                content=content,
+                timeout=self.timeout
+            )
+            logger.info(f"Orders Response: Status {response.status_code}")
+            if response.status_code >= 400:
+                logger.error(f"Orders API error response: {response.text}")
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Orders API error: {e.response.status_code} - {e.response.text}")
+            raise
+        except httpx.RequestError as e:
+            logger.error(f"Orders API request error: {str(e)}")
+            raise
 
     async def upload_delivery_proof(
         self,
         order_id: str,
-        file_content: bytes,
-        filename: str,
+        body: AsyncIterator[bytes],
         content_type: str,
-        document_type: str = "delivery_proof",
-        title: str = "Delivery Proof",
-        description: str = "Document uploaded by driver upon delivery"
+        content_length: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Upload delivery proof document to orders service
+        Stream a delivery proof multipart body to orders service
+
+        The driver's multipart request (file, document_type, title,
+        description) is forwarded unchanged as it arrives, so the file is
+        never buffered in this service.
 
         Args:
             order_id: The order ID
-            file_content: File content as bytes
-            filename: Original filename
-            content_type: MIME type of the file
-            document_type: Type of document (default: delivery_proof)
-            title: Document title
-            description: Document description
+            body: Async iterator over the raw multipart body
+            content_type: Content-Type of the body, including the boundary
+            content_length: Content-Length of the body, if known
 
         Returns:
             Document metadata from orders service
         """
-        from io import BytesIO
-
-        # Prepare multipart form data
-        files = {
-            "file": (filename, BytesIO(file_content), content_type)
-        }
-        data = {
-            "document_type": document_type,
-            "title": title,
-            "description": description
-        }
+        headers = {"Content-Type": content_type}
+        if content_length:
+            headers["Content-Length"] = content_length
 
         return await self._make_request(
             "POST",
             f"/api/v1/orders/{order_id}/documents/delivery-proof",
-            files=files,
-            data=data
+            content=body,
+            extra_headers=headers
+        )
+
+    async def get_trip_sync_changes(
+        self,
+        trip_ids: List[str],
+        since: Optional[str] = None,
+        full_trip_ids: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get item assignments and delivery proofs of trips changed since a cursor
+
+        Args:
+            trip_ids: Trips to sync
+            since: Cursor returned by the previous call (None for everything)
+            full_trip_ids: Trips to send in full regardless of since
+
+        Returns:
+            Changed item assignments and documents, the assignments removed
+            from these trips, and the next cursor
+        """
+        return await self._make_request(
+            "POST",
+            "/api/v1/orders/trip-item-assignments/changes",
+            json={"trip_ids": trip_ids, "since": since, "full_trip_ids": full_trip_ids or []}
         )
 
     async def get_delivery_documents(
@@ -351,26 +449,27 @@ class CompanyClient:
 
         logger.info(f"Company Request: {method} {url}")
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    params=params,
-                    json=json
-                )
-                logger.info(f"Company Response: Status {response.status_code}")
-                if response.status_code >= 400:
-                    logger.error(f"Company API error response: {response.text}")
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Company API error: {e.response.status_code} - {e.response.text}")
-                raise
-            except httpx.RequestError as e:
-                logger.error(f"Company API request error: {str(e)}")
-                raise
+        client = http_clients.get("company")
+        try:
+            response = await client.request(
+                method=method,
+                url=url,
+                headers=headers,
+                params=params,
+                json=json,
+                timeout=self.timeout
+            )
+            logger.info(f"Company Response: Status {response.status_code}")
+            if response.status_code >= 400:
+                logger.error(f"Company API error response: {response.text}")
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Company API error: {e.response.status_code} - {e.response.text}")
+            raise
+        except httpx.RequestError as e:
+            logger.error(f"Company API request error: {str(e)}")
+            raise
 
     async def get_vehicle_id_by_plate(
         self,
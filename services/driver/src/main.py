@@ -2,15 +2,19 @@
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import structlog
-import time
 import uvicorn
 
 from src.config import settings
+from src.services.permission_cache import permission_cache
+from src.services.audit_client import audit_shipper
+from src.http_client import http_clients
 from src.api.endpoints import driver as driver_router, tenant_cleanup
-from src.middleware.auth import AuthenticationMiddleware
+from src.middleware.pipeline import build_pipeline_stages
+from shared.asgi import FusedMiddleware
 
 # Configure structured logging
 structlog.configure(
@@ -41,10 +45,19 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Driver Service", version=settings.VERSION)
     logger.info("Driver Service started successfully - connecting to TMS service at %s", settings.TMS_API_URL)
 
+    # Shared permission cache with push invalidation from the auth service
+    await permission_cache.initialize()
+
+    # Background delivery of buffered audit events
+    await audit_shipper.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Driver Service")
+    await audit_shipper.stop()
+    await permission_cache.shutdown()
+    await http_clients.close()
 
 
 # Create FastAPI application
@@ -66,10 +79,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add authentication middleware
-app.add_middleware(
-    AuthenticationMiddleware
-)
+# Authentication and request logging (with X-Process-Time) as one pure ASGI middleware
+middleware_stages = build_pipeline_stages()
+app.add_middleware(FusedMiddleware, stages=middleware_stages)
+
+# Compress larger responses (trip details, sync deltas) for field devices on poor connections
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
 
 
 # Exception handlers
@@ -111,33 +126,6 @@ async def general_exception_handler(request: Request, exc: Exception):
     )
 
 
-# Middleware for logging
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all HTTP requests."""
-    start_time = time.time()
-
-    # Process request
-    response = await call_next(request)
-
-    # Calculate duration
-    process_time = time.time() - start_time
-
-    # Log request
-    logger.info(
-        "HTTP request processed",
-        method=request.method,
-        path=request.url.path,
-        status_code=response.status_code,
-        process_time=process_time
-    )
-
-    # Add processing time header
-    response.headers["X-Process-Time"] = str(process_time)
-
-    return response
-
-
 # Health check endpoint
 @app.get("/health", tags=["Health"])
 async def health_check():
@@ -146,7 +134,9 @@ async def health_check():
         "status": "healthy",
         "service": settings.SERVICE_NAME,
         "version": settings.VERSION,
-        "driver_id": settings.DRIVER_ID
+        "driver_id": settings.DRIVER_ID,
+        "audit": audit_shipper.get_stats(),
+        "middleware": {stage.name: stage.get_stats() for stage in middleware_stages},
     }
 
 
@@ -1,5 +1,5 @@
 """Middleware for Driver Service."""
 
-from .auth import AuthenticationMiddleware
+from .pipeline import build_pipeline_stages
 
-__all__ = ["AuthenticationMiddleware"]
\ No newline at end of file
+__all__ = ["build_pipeline_stages"]
@@ -0,0 +1,90 @@
+"""
+Fused middleware pipeline for Driver Service
+
+Authentication and request logging run as stages of one pure ASGI middleware
+(``shared.asgi``) instead of a ``BaseHTTPMiddleware`` layer plus an
+``@app.middleware("http")`` hook.
+"""
+from typing import List
+
+import structlog
+
+from shared.asgi import AuthStage, RawHeaders, Reject, RequestContext, Stage
+
+from src.security import (
+    verify_token,
+    extract_token_from_header,
+    log_authentication_event,
+)
+from src.security.exceptions import (
+    RateLimitExceededError,
+    TokenExpiredError,
+    TokenInvalidError,
+)
+
+logger = structlog.get_logger()
+
+
+def authenticate(ctx: RequestContext, authorization: str) -> dict:
+    """Verify the bearer token and return the request state it grants"""
+    token = extract_token_from_header(authorization)
+    if not token:
+        log_authentication_event("INVALID_TOKEN_FORMAT", details=f"Path: {ctx.path}")
+        raise Reject(401, "Invalid authorization header format")
+
+    try:
+        token_data = verify_token(token)
+    except TokenExpiredError:
+        log_authentication_event("TOKEN_EXPIRED", details=f"Path: {ctx.path}")
+        raise Reject(401, "Token has expired")
+    except TokenInvalidError:
+        log_authentication_event("TOKEN_INVALID", details=f"Path: {ctx.path}")
+        raise Reject(401, "Invalid token")
+    except RateLimitExceededError:
+        log_authentication_event("RATE_LIMIT_EXCEEDED", details=f"Path: {ctx.path}")
+        raise Reject(429, "Rate limit exceeded")
+    except Exception as e:
+        log_authentication_event("AUTH_ERROR", details=f"Path: {ctx.path}, Error: {str(e)}")
+        raise Reject(500, "Authentication error")
+
+    log_authentication_event(
+        "TOKEN_VALIDATED",
+        user_id=token_data.sub,
+        details=f"Tenant: {token_data.tenant_id}, Permissions: {len(token_data.permissions)}"
+    )
+    return {
+        "user_id": token_data.sub,
+        "tenant_id": token_data.tenant_id,
+        "permissions": token_data.permissions,
+        "token_data": token_data,
+    }
+
+
+def missing_token(ctx: RequestContext):
+    log_authentication_event("MISSING_TOKEN", details=f"Path: {ctx.path}")
+
+
+class RequestLogStage(Stage):
+    """Logs every request and adds its processing time as ``X-Process-Time``"""
+
+    name = "request_log"
+
+    def on_response(self, ctx: RequestContext, headers: RawHeaders) -> None:
+        headers.append((b"x-process-time", str(ctx.duration).encode("latin-1")))
+
+    def on_complete(self, ctx: RequestContext) -> None:
+        logger.info(
+            "HTTP request processed",
+            method=ctx.method,
+            path=ctx.path,
+            status_code=ctx.status_code,
+            process_time=ctx.duration
+        )
+
+
+def build_pipeline_stages() -> List[Stage]:
+    """Stages in execution order"""
+    return [
+        AuthStage(authenticate, on_missing=missing_token),
+        RequestLogStage(),
+    ]
@@ -244,5 +244,30 @@ class TripResume(BaseSchema):
     note: Optional[str] = Field(None, max_length=2000, description="Resume notes")
 
 
+class JournalEventType(str, Enum):
+    """Delivery journal event types."""
+    DELIVERY_STATUS = "delivery_status"
+    DELIVER = "deliver"
+    PAUSE = "pause"
+    RESUME = "resume"
+
+
+class DeliveryJournalEvent(BaseSchema):
+    """Driver action captured on the device, possibly while offline."""
+    event_id: str = Field(..., min_length=1, max_length=64, description="Device-generated id; re-sent events are not applied twice")
+    trip_id: str
+    type: JournalEventType
+    order_id: Optional[str] = None
+    status: Optional[DeliveryStatus] = None
+    reason: Optional[str] = Field(None, max_length=500)
+    note: Optional[str] = Field(None, max_length=2000)
+    occurred_at: Optional[datetime] = None
+
+
+class DeliveryJournal(BaseSchema):
+    """Ordered driver actions to apply in one request."""
+    events: List[DeliveryJournalEvent] = Field(..., min_length=1, max_length=500)
+
+
 # Update forward references
 TripResponse.model_rebuild()
\ No newline at end of file
@@ -1,9 +1,25 @@
 """
 Audit Client for sending audit events to Company Service (Driver)
+
+Events are not sent inline. ``AuditClient.log_event`` only appends to the
+in-process ``audit_shipper`` buffer, which ships batches to the Company
+service's bulk endpoint in the background, flushing when a batch fills up
+or every flush interval. Memory is bounded: when the buffer is full, or the
+Company service is unreachable, events are spilled to JSONL files on local
+disk and replayed once delivery succeeds again.
 """
+import asyncio
+import glob
+import json
 import logging
-from typing import Optional, Dict, Any
+import os
+import socket
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List
 from httpx import AsyncClient, HTTPError
+from jose import jwt
 from src.config import settings
 
 logger = logging.getLogger(__name__)
@@ -12,17 +28,414 @@ logger = logging.getLogger(__name__)
 COMPANY_SERVICE_URL = "http://company-service:8002"
 AUTH_SERVICE_URL = "http://auth-service:8001"
 
+SERVICE_NAME = "driver"
+
+# Role of the short-lived service tokens the Company service accepts for batches
+SERVICE_TOKEN_ROLE = "service"
+SERVICE_TOKEN_TTL_SECONDS = 600
+
+# Fields AuditLogCreate requires; events without them can never be accepted
+REQUIRED_EVENT_FIELDS = (
+    "tenant_id", "user_id", "action", "module", "entity_type", "entity_id", "description", "service_name"
+)
+
 # Cache for user details to avoid repeated lookups
 _user_cache: Dict[str, Dict[str, str]] = {}
 
 
+async def _fetch_user_details(client: AsyncClient, user_id: str, auth_headers: dict) -> Dict[str, str]:
+    """
+    Fetch user details from auth service
+
+    Args:
+        client: HTTP client to use
+        user_id: ID of the user to fetch details for
+        auth_headers: Authorization headers of the request that logged the event
+
+    Returns:
+        Dictionary with user_name, user_email and user_role
+    """
+    # Check cache first
+    if user_id in _user_cache:
+        return _user_cache[user_id]
+
+    try:
+        response = await client.get(
+            f"{AUTH_SERVICE_URL}/api/v1/users/{user_id}",
+            headers=auth_headers
+        )
+
+        if response.status_code == 200:
+            user_data = response.json()
+            user_details = {
+                "user_name": user_data.get("full_name") or user_data.get("username", ""),
+                "user_email": user_data.get("email", ""),
+                "user_role": user_data.get("role_name", "")
+            }
+            # Cache the result
+            _user_cache[user_id] = user_details
+            return user_details
+        else:
+            logger.warning(f"Failed to fetch user details: {response.status_code}")
+            return {"user_name": "", "user_email": "", "user_role": ""}
+    except Exception as e:
+        logger.error(f"Error fetching user details: {str(e)}")
+        return {"user_name": "", "user_email": "", "user_role": ""}
+
+
+class AuditShipper:
+    """
+    Buffered, batching shipper of audit events to the Company service
+
+    - events are buffered in memory, up to ``max_buffer`` events
+    - a background task flushes every ``flush_interval`` seconds, or as soon
+      as ``batch_size`` events are waiting, via POST /audit/logs/batch,
+      authenticated with a short-lived service token
+    - a rejected batch (400/413/422) is split until the invalid events are
+      isolated; only those are dropped. Any other failure (401/403/429, 5xx,
+      network) is retried
+    - overflow and failed batches are spilled to ``spill_dir`` (bounded by
+      ``spill_max_bytes``) and replayed after the next successful delivery
+    - ``get_stats`` exposes delivery metrics
+    """
+
+    def __init__(
+        self,
+        service_name: str,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10000,
+        spill_dir: Optional[str] = None,
+        spill_max_bytes: int = 50 * 1024 * 1024
+    ):
+        self._service_name = service_name
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_buffer = max_buffer
+        self._spill_dir = spill_dir or os.path.join("/tmp", "audit-spill", service_name)
+        self._spill_max_bytes = spill_max_bytes
+        self._spill_path = os.path.join(self._spill_dir, f"{os.getpid()}.jsonl")
+        self._buffer: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[AsyncClient] = None
+        self._service_token: Optional[str] = None
+        self._service_token_expires = 0.0
+        self._stats = {
+            "enqueued": 0,
+            "delivered": 0,
+            "rejected": 0,
+            "batches_sent": 0,
+            "batches_failed": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "dropped": 0,
+            "last_flush_at": None,
+            "last_error": None,
+        }
+
+    async def start(self):
+        """Start the background flusher; spilled events are replayed first"""
+        self._ensure_started()
+
+    async def stop(self):
+        """Stop the flusher, deliver what is buffered and spill any remainder"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        try:
+            await asyncio.wait_for(self.flush(), timeout=5.0)
+        except Exception as e:
+            logger.warning(f"Final audit flush incomplete: {e}")
+
+        if self._buffer:
+            self._spill(self._drain(len(self._buffer)))
+
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    def enqueue(self, event: Dict[str, Any]) -> bool:
+        """
+        Buffer an event for delivery without blocking.
+
+        Returns False only if the event had to be dropped.
+        """
+        self._ensure_started()
+        self._stats["enqueued"] += 1
+
+        if len(self._buffer) >= self._max_buffer:
+            event.pop("_auth_headers", None)
+            return self._spill([event]) > 0
+
+        self._buffer.append(event)
+        if len(self._buffer) >= self._batch_size and self._wakeup:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> int:
+        """Deliver everything currently buffered; returns the number delivered"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        delivered = 0
+        async with self._flush_lock:
+            while self._buffer:
+                batch = self._drain(self._batch_size)
+                await self._resolve_user_details(batch)
+                unsent = await self._send(batch)
+                if unsent:
+                    # Company service unavailable: park the buffer on disk
+                    self._spill(unsent + self._drain(len(self._buffer)))
+                    break
+                delivered += len(batch)
+            else:
+                await self._replay_spilled()
+
+            self._stats["last_flush_at"] = datetime.now(timezone.utc).isoformat()
+        return delivered
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get delivery metrics"""
+        return {
+            **self._stats,
+            "buffered": len(self._buffer),
+            "spill_bytes": self._spill_bytes(),
+            "running": self._task is not None and not self._task.done(),
+        }
+
+    def _ensure_started(self):
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._wakeup = asyncio.Event()
+        self._flush_lock = self._flush_lock or asyncio.Lock()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        self._claim_stale_replays()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Audit flush failed: {e}")
+
+    def _drain(self, count: int) -> List[Dict[str, Any]]:
+        return [self._buffer.popleft() for _ in range(min(count, len(self._buffer)))]
+
+    def _get_client(self) -> AsyncClient:
+        if self._client is None:
+            self._client = AsyncClient(timeout=10.0)
+        return self._client
+
+    async def _resolve_user_details(self, events: List[Dict[str, Any]]):
+        """Fill in missing user details; the auth headers never leave memory"""
+        for event in events:
+            auth_headers = event.pop("_auth_headers", None)
+            if event.get("user_name") and event.get("user_email") and event.get("user_role"):
+                continue
+            if auth_headers is None or not event.get("user_id"):
+                continue
+            user_details = await _fetch_user_details(self._get_client(), event["user_id"], auth_headers)
+            for field in ("user_name", "user_email", "user_role"):
+                if not event.get(field):
+                    event[field] = user_details.get(field, "")
+
+    def _service_headers(self) -> Dict[str, str]:
+        """Authorization with a short-lived service token, renewed before it expires"""
+        now = time.time()
+        if self._service_token is None or now > self._service_token_expires - 60:
+            expires = datetime.now(timezone.utc) + timedelta(seconds=SERVICE_TOKEN_TTL_SECONDS)
+            self._service_token = jwt.encode(
+                {
+                    # Per host, so replicas are rate limited separately
+                    "sub": f"service:{self._service_name}:{socket.gethostname()}",
+                    "role_id": 0,
+                    "role": SERVICE_TOKEN_ROLE,
+                    "exp": expires,
+                },
+                settings.GLOBAL_JWT_SECRET,
+                algorithm=settings.GLOBAL_JWT_ALGORITHM
+            )
+            self._service_token_expires = now + SERVICE_TOKEN_TTL_SECONDS
+        return {"Authorization": f"Bearer {self._service_token}"}
+
+    def _valid_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop events missing required fields, which no retry can deliver"""
+        valid = [event for event in events if all(event.get(field) is not None for field in REQUIRED_EVENT_FIELDS)]
+        if len(valid) < len(events):
+            self._stats["rejected"] += len(events) - len(valid)
+            logger.error(f"Dropped {len(events) - len(valid)} audit events missing required fields")
+        return valid
+
+    async def _send(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """POST a batch; returns the events still to be delivered (empty once settled)"""
+        events = self._valid_events(events)
+        if not events:
+            return []
+        try:
+            response = await self._get_client().post(
+                f"{COMPANY_SERVICE_URL}/audit/logs/batch",
+                json={"logs": events},
+                headers=self._service_headers()
+            )
+        except HTTPError as e:
+            self._record_failure(f"HTTP error sending audit logs: {str(e)}")
+            return events
+
+        if response.status_code == 201:
+            self._stats["delivered"] += len(events)
+            self._stats["batches_sent"] += 1
+            return []
+        if response.status_code in (400, 413, 422):
+            # Retrying an invalid payload can never succeed: split the batch
+            # until the offending events are isolated and drop only those
+            if len(events) == 1:
+                self._stats["rejected"] += 1
+                logger.error(f"Audit event rejected: {response.status_code} - {response.text}")
+                return []
+            middle = len(events) // 2
+            return await self._send(events[:middle]) + await self._send(events[middle:])
+
+        # Authentication, rate limiting and server errors are retried
+        self._record_failure(f"Failed to create audit logs: {response.status_code} - {response.text}")
+        return events
+
+    def _record_failure(self, message: str):
+        self._stats["batches_failed"] += 1
+        self._stats["last_error"] = message
+        logger.warning(message)
+
+    def _spill_bytes(self) -> int:
+        total = 0
+        for path in glob.glob(os.path.join(self._spill_dir, "*")):
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        return total
+
+    def _spill(self, events: List[Dict[str, Any]]) -> int:
+        """Append events to this process's spill file; returns the number written"""
+        if not events:
+            return 0
+        for event in events:
+            event.pop("_auth_headers", None)
+        try:
+            os.makedirs(self._spill_dir, exist_ok=True)
+            written = 0
+            budget = self._spill_max_bytes - self._spill_bytes()
+            with open(self._spill_path, "a", encoding="utf-8") as spill_file:
+                for event in events:
+                    line = json.dumps(event, default=str) + "\n"
+                    if len(line) > budget:
+                        break
+                    spill_file.write(line)
+                    budget -= len(line)
+                    written += 1
+        except OSError as e:
+            logger.error(f"Failed to spill audit events: {e}")
+            written = 0
+
+        self._stats["spilled"] += written
+        if written < len(events):
+            self._stats["dropped"] += len(events) - written
+            logger.error(f"Dropped {len(events) - written} audit events: spill space exhausted")
+        return written
+
+    def _claim_stale_replays(self):
+        """Take over replay files left behind by processes that have exited"""
+        for path in glob.glob(os.path.join(self._spill_dir, "*.replay-*")):
+            try:
+                pid = int(path.rsplit("-", 1)[1])
+                os.kill(pid, 0)
+                continue  # Owner is still alive
+            except (ValueError, ProcessLookupError):
+                pass
+            except PermissionError:
+                continue
+            try:
+                os.replace(path, path.rsplit(".replay-", 1)[0] + ".jsonl")
+            except OSError:
+                pass
+
+    async def _replay_spilled(self):
+        """Replay spill files of this and exited processes in batches"""
+        for path in glob.glob(os.path.join(self._spill_dir, "*.jsonl")):
+            replay_path = f"{path[:-len('.jsonl')]}.replay-{os.getpid()}"
+            try:
+                # Atomic claim; another worker may win the race
+                os.rename(path, replay_path)
+            except OSError:
+                continue
+
+            remainder: List[str] = []
+            with open(replay_path, encoding="utf-8") as replay_file:
+                batch: List[Dict[str, Any]] = []
+                for line in replay_file:
+                    if remainder:
+                        remainder.append(line)
+                        continue
+                    try:
+                        batch.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+                    if len(batch) >= self._batch_size:
+                        unsent = await self._send(batch)
+                        if unsent:
+                            remainder = [json.dumps(event) + "\n" for event in unsent]
+                        else:
+                            self._stats["replayed"] += len(batch)
+                        batch = []
+                if batch and not remainder:
+                    unsent = await self._send(batch)
+                    if unsent:
+                        remainder = [json.dumps(event) + "\n" for event in unsent]
+                    else:
+                        self._stats["replayed"] += len(batch)
+
+            if remainder:
+                with open(self._spill_path, "a", encoding="utf-8") as spill_file:
+                    spill_file.writelines(remainder)
+            os.remove(replay_path)
+            if remainder:
+                return
+
+
+# Global singleton instance
+audit_shipper = AuditShipper(
+    service_name=SERVICE_NAME,
+    batch_size=getattr(settings, "AUDIT_BATCH_SIZE", 100),
+    flush_interval=getattr(settings, "AUDIT_FLUSH_INTERVAL", 1.0),
+    max_buffer=getattr(settings, "AUDIT_BUFFER_MAX_EVENTS", 10000),
+    spill_dir=getattr(settings, "AUDIT_SPILL_DIR", None),
+    spill_max_bytes=getattr(settings, "AUDIT_SPILL_MAX_BYTES", 50 * 1024 * 1024)
+)
+
+
 class AuditClient:
     """
     Client for sending audit logs to Company service
 
-    This client provides a non-blocking way to send audit events.
-    If the audit log fails to send, it logs the error but doesn't
-    affect the main business logic.
+    This client provides a non-blocking way to send audit events: events are
+    handed to the buffered ``audit_shipper`` and delivered in the background,
+    so audit logging adds no round trip to the request.
     """
 
     def __init__(self, auth_headers: dict):
@@ -34,45 +447,6 @@ class AuditClient:
                          (typically {"Authorization": "Bearer <token>"})
         """
         self.auth_headers = auth_headers
-        self.client = AsyncClient(timeout=10.0)
-        self.auth_client = AsyncClient(timeout=5.0)
-
-    async def _fetch_user_details(self, user_id: str) -> Dict[str, str]:
-        """
-        Fetch user details from auth service
-
-        Args:
-            user_id: ID of the user to fetch details for
-
-        Returns:
-            Dictionary with user_name and user_email
-        """
-        # Check cache first
-        if user_id in _user_cache:
-            return _user_cache[user_id]
-
-        try:
-            response = await self.auth_client.get(
-                f"{AUTH_SERVICE_URL}/api/v1/users/{user_id}",
-                headers=self.auth_headers
-            )
-
-            if response.status_code == 200:
-                user_data = response.json()
-                user_details = {
-                    "user_name": user_data.get("full_name") or user_data.get("username", ""),
-                    "user_email": user_data.get("email", ""),
-                    "user_role": user_data.get("role_name", "")
-                }
-                # Cache the result
-                _user_cache[user_id] = user_details
-                return user_details
-            else:
-                logger.warning(f"Failed to fetch user details: {response.status_code}")
-                return {"user_name": "", "user_email": "", "user_role": ""}
-        except Exception as e:
-            logger.error(f"Error fetching user details: {str(e)}")
-            return {"user_name": "", "user_email": "", "user_role": ""}
 
     async def log_event(
         self,
@@ -96,7 +470,7 @@ class AuditClient:
         user_agent: Optional[str] = None
     ) -> bool:
         """
-        Send audit log to Company service
+        Queue an audit log for delivery to Company service
 
         Args:
             tenant_id: Tenant ID
@@ -119,18 +493,8 @@ class AuditClient:
             user_agent: Browser/client info
 
         Returns:
-            True if successful, False otherwise (non-blocking)
+            True if the event was queued, False if it had to be dropped (non-blocking)
         """
-        # Fetch user details if not provided
-        if not user_name or not user_email or not user_role:
-            user_details = await self._fetch_user_details(user_id)
-            if not user_name:
-                user_name = user_details.get("user_name", "")
-            if not user_email:
-                user_email = user_details.get("user_email", "")
-            if not user_role:
-                user_role = user_details.get("user_role", "")
-
         try:
             payload = {
                 "tenant_id": tenant_id,
@@ -151,33 +515,18 @@ class AuditClient:
                 "reason": reason,
                 "ip_address": ip_address,
                 "user_agent": user_agent,
-                "service_name": "driver"
+                "service_name": SERVICE_NAME,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                # Used to look up missing user details at flush time
+                "_auth_headers": dict(self.auth_headers or {})
             }
-
-            response = await self.client.post(
-                f"{COMPANY_SERVICE_URL}/audit/logs",
-                json=payload,
-                headers=self.auth_headers
-            )
-
-            if response.status_code == 201:
-                logger.debug(f"Audit log created: {action} on {entity_type} {entity_id}")
-                return True
-            else:
-                logger.warning(
-                    f"Failed to create audit log: {response.status_code} - {response.text}"
-                )
-                return False
-
-        except HTTPError as e:
-            logger.error(f"HTTP error sending audit log: {str(e)}")
-            return False
+            return audit_shipper.enqueue(payload)
         except Exception as e:
             # Don't let audit logging failures break the main flow
-            logger.error(f"Error sending audit log: {str(e)}")
+            logger.error(f"Error queueing audit log: {str(e)}")
             return False
 
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
-        await self.auth_client.aclose()
+        """Nothing to release; events are delivered by the shared shipper"""
+        return None
+
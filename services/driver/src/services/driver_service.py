@@ -1,7 +1,9 @@
 """Business logic layer for Driver Service using TMS Service API"""
 
-from typing import Optional, Dict, Any, List
-from datetime import date
+import base64
+import json
+from typing import Optional, Dict, Any, List, AsyncIterator
+from datetime import date, datetime, timedelta, timezone
 from src.http_client import TMSClient, OrdersClient
 from src.config import settings
 from src.security.auth import verify_token
@@ -10,6 +12,44 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class InvalidSyncCursor(ValueError):
+    """Raised for a sync cursor this service did not issue"""
+
+
+def encode_sync_cursor(trips_version: Optional[int], orders_since: Optional[str]) -> str:
+    """Opaque sync cursor: TMS trip version and Orders change timestamp"""
+    raw = json.dumps({"v": trips_version, "t": orders_since}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_sync_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if position.get("v") is not None and not isinstance(position["v"], int):
+            raise ValueError("invalid trip version")
+        return position
+    except (ValueError, TypeError, AttributeError):
+        raise InvalidSyncCursor(cursor)
+
+
+def sync_cursor_expired(position: Dict[str, Any]) -> bool:
+    """
+    Whether a cursor is older than the deletions TMS and Orders still keep
+
+    Tombstones are pruned after DRIVER_SYNC_RETENTION_DAYS, so a device
+    syncing from an older cursor could miss deletions and needs a full sync.
+    """
+    if not position.get("t"):
+        return False
+    try:
+        since = datetime.fromisoformat(position["t"])
+    except (TypeError, ValueError):
+        raise InvalidSyncCursor(position["t"])
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return since < datetime.now(timezone.utc) - timedelta(days=settings.DRIVER_SYNC_RETENTION_DAYS)
+
+
 class DriverService:
     """Service class for driver operations using TMS Service API"""
 
@@ -41,16 +81,22 @@ class DriverService:
         status: Optional[str] = None,
         trip_date: Optional[date] = None,
         company_id: Optional[str] = None,
-        driver_id: Optional[str] = None
+        driver_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        compact: bool = False
     ) -> Dict[str, Any]:
         """
-        Get all trips assigned to the current driver.
+        Get the trips assigned to the current driver, or one page of them.
 
         Args:
             status: Optional status filter
             trip_date: Optional date filter
             company_id: Optional company ID filter
             driver_id: Optional driver ID (uses authenticated user if not provided)
+            cursor: next_cursor of the previous page
+            limit: Trips per page (every trip if not provided)
+            compact: Return only the fields the trip list screen shows
 
         Returns:
             DriverTripListResponse from TMS service
@@ -63,7 +109,10 @@ class DriverService:
                 driver_id=effective_driver_id,
                 status=status,
                 trip_date=trip_date_str,
-                company_id=company_id or self.company_id or self.company_id
+                company_id=company_id or self.company_id or self.company_id,
+                cursor=cursor,
+                limit=limit,
+                compact=compact
             )
             return result
         except Exception as e:
@@ -172,6 +221,75 @@ class DriverService:
             logger.error(f"Error getting current active trip: {str(e)}")
             raise
 
+    async def sync(
+        self,
+        cursor: Optional[str] = None,
+        company_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get everything that changed on the driver's trips since a sync cursor.
+
+        Trips, stops and deletions come from TMS; item assignments and
+        delivery proofs of the driver's open trips from Orders. Trips that
+        changed are sent with all their assignments and documents, so trips
+        newly assigned to the driver arrive complete.
+
+        Args:
+            cursor: Cursor from the previous sync (None for a full snapshot)
+            company_id: Optional company ID filter
+
+        Returns:
+            Changes and the cursor for the next sync
+
+        Raises:
+            InvalidSyncCursor: If the cursor was not issued by this service
+        """
+        position = decode_sync_cursor(cursor) if cursor else {}
+        if sync_cursor_expired(position):
+            logger.info(f"Sync cursor of driver {self.driver_id} expired, sending a full snapshot")
+            position = {}
+
+        trip_changes = await self.tms_client.get_driver_sync(
+            since=position.get("v"),
+            company_id=company_id or self.company_id
+        )
+        changed_trip_ids = [trip["id"] for trip in trip_changes["trips"]]
+        trip_ids = sorted(set(trip_changes["active_trip_ids"]) | set(changed_trip_ids))
+
+        orders_since = position.get("t")
+        item_assignments: List[Dict[str, Any]] = []
+        deleted_item_assignments: List[Dict[str, Any]] = []
+        documents: List[Dict[str, Any]] = []
+        items_unavailable = False
+        try:
+            order_changes = await self.orders_client.get_trip_sync_changes(
+                trip_ids=trip_ids,
+                since=orders_since,
+                full_trip_ids=changed_trip_ids
+            )
+            item_assignments = order_changes["item_assignments"]
+            deleted_item_assignments = order_changes.get("deleted_item_assignments", [])
+            documents = order_changes["documents"]
+            orders_since = order_changes["cursor"]
+        except Exception as e:
+            # Trips still sync, but the cursor stays put so the next sync retries
+            # the whole delta, including the assignments of trips new to the device
+            logger.error(f"Error getting item assignment changes: {str(e)}")
+            items_unavailable = True
+
+        trips_version = position.get("v") if items_unavailable else trip_changes["cursor"]
+        return {
+            "cursor": encode_sync_cursor(trips_version, orders_since),
+            "full": trip_changes["full"],
+            "trips": trip_changes["trips"],
+            "stops": trip_changes["stops"],
+            "item_assignments": item_assignments,
+            "documents": documents,
+            "deleted": trip_changes["deleted"],
+            "deleted_item_assignments": deleted_item_assignments,
+            "items_unavailable": items_unavailable
+        }
+
     async def get_order_status(
         self,
         trip_id: str,
@@ -230,27 +348,46 @@ class DriverService:
             logger.error(f"Error marking order {order_id} as delivered: {str(e)}")
             raise
 
+    async def submit_journal(
+        self,
+        events: List[Dict[str, Any]],
+        company_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Apply delivery journal events captured on the device.
+
+        Args:
+            events: Journal events in the order they happened
+            company_id: Optional company ID filter
+
+        Returns:
+            Per-event outcome from TMS service, in submission order
+        """
+        try:
+            return await self.tms_client.submit_driver_journal(
+                events=events,
+                driver_id=self.driver_id,
+                company_id=company_id or self.company_id
+            )
+        except Exception as e:
+            logger.error(f"Error submitting delivery journal ({len(events)} events): {str(e)}")
+            raise
+
     async def upload_delivery_proof(
         self,
         order_id: str,
-        file_content: bytes,
-        filename: str,
+        body: AsyncIterator[bytes],
         content_type: str,
-        document_type: str = "delivery_proof",
-        title: str = "Delivery Proof",
-        description: str = "Document uploaded by driver upon delivery"
+        content_length: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Upload delivery proof document for an order.
+        Stream a delivery proof upload through to the orders service.
 
         Args:
             order_id: The order ID
-            file_content: File content as bytes
-            filename: Original filename
-            content_type: MIME type of the file
-            document_type: Type of document (default: delivery_proof)
-            title: Document title
-            description: Document description
+            body: Async iterator over the raw multipart request body
+            content_type: Content-Type of the body, including the boundary
+            content_length: Content-Length of the body, if known
 
         Returns:
             Document metadata from orders service
@@ -258,12 +395,9 @@ class DriverService:
         try:
             result = await self.orders_client.upload_delivery_proof(
                 order_id=order_id,
-                file_content=file_content,
-                filename=filename,
+                body=body,
                 content_type=content_type,
-                document_type=document_type,
-                title=title,
-                description=description
+                content_length=content_length
             )
             return result
         except Exception as e:
@@ -9,7 +9,7 @@ from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc, func, cast, String as SQLString
+from sqlalchemy import select, update, insert, and_, or_, desc, func, cast, String as SQLString
 
 from src.database import get_db
 from src.models.approval import ApprovalAction, ApprovalAudit, ApprovalType, ApprovalStatus
@@ -91,6 +91,44 @@ async def update_order_status_in_service(
             )
 
 
+async def update_orders_status_in_service_bulk(
+    order_ids: List[str],
+    approved: bool,
+    reason: Optional[str] = None,
+    headers: dict = None
+) -> dict:
+    """
+    Approve or reject several orders in Orders Service with one call.
+    Returns ``{"reviewed": [...], "failed": [...]}``; the reviewed entries
+    carry the order details recorded on the approval actions.
+    """
+    async with AsyncClient(timeout=60.0) as client:
+        try:
+            response = await client.post(
+                f"{ORDERS_SERVICE_URL}/api/v1/orders/finance-approval/bulk",
+                json={
+                    "order_ids": order_ids,
+                    "approved": approved,
+                    "reason": reason
+                },
+                headers=headers or {}
+            )
+        except Exception as e:
+            logger.error(f"Error updating order statuses in Orders Service: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Orders service unavailable"
+            )
+
+    if response.status_code == 200:
+        return response.json()
+    logger.error(f"Failed to update order statuses in Orders Service: {response.status_code}")
+    raise HTTPException(
+        status_code=response.status_code,
+        detail=f"Failed to update orders: {response.text}"
+    )
+
+
 async def get_order_details_from_service(
     order_id: str,
     headers: dict = None
@@ -312,7 +350,11 @@ async def bulk_approve_or_reject_orders(
 ):
     """
     Approve or reject multiple orders in bulk.
-    Processes each order and returns summary of results.
+
+    Orders already processed in finance are skipped, the rest move in Orders
+    Service with one bulk call, and the approval actions and audit entries of
+    the orders it moved are written with multi-row inserts in one commit.
+    Returns the per-order results.
     """
     # Get authorization header from the request
     auth_headers = {}
@@ -324,6 +366,8 @@ async def bulk_approve_or_reject_orders(
     # Get IP address and user agent for audit
     ip_address = request.client.host if request and request.client else None
     user_agent = request.headers.get("user-agent") if request else None
+    user_name = request.state.user_name if request and hasattr(request.state, 'user_name') else None
+    user_role = request.state.user_role if request and hasattr(request.state, 'user_role') else None
 
     if not bulk_data.order_ids:
         raise HTTPException(
@@ -331,83 +375,137 @@ async def bulk_approve_or_reject_orders(
             detail="No order IDs provided"
         )
 
-    approval_actions = []
+    order_ids = list(dict.fromkeys(bulk_data.order_ids))
+    new_status = ApprovalStatus.APPROVED if bulk_data.approved else ApprovalStatus.REJECTED
     failed_orders = []
-    approved_count = 0
-    rejected_count = 0
 
-    for order_id in bulk_data.order_ids:
-        try:
-            # Similar logic to single approval, but simplified for bulk processing
-            approval_action = ApprovalAction(
-                tenant_id=tenant_id,
-                order_id=order_id,
-                approval_type=ApprovalType.FINANCE,
-                status=ApprovalStatus.APPROVED if bulk_data.approved else ApprovalStatus.REJECTED,
-                approver_id=user_id,
-                approver_name=request.state.user_name if request and hasattr(request.state, 'user_name') else None,
-                approval_reason=bulk_data.reason if bulk_data.approved else None,
-                rejection_reason=bulk_data.reason if not bulk_data.approved else None,
-                requested_by=user_id,
-                created_at=datetime.utcnow(),
-                approved_at=datetime.utcnow()
+    # Existing finance approvals of all requested orders in one query
+    existing_result = await db.execute(
+        select(ApprovalAction).where(
+            and_(
+                ApprovalAction.order_id.in_(order_ids),
+                ApprovalAction.tenant_id == tenant_id,
+                cast(ApprovalAction.approval_type, SQLString) == ApprovalType.FINANCE.value,
+                ApprovalAction.is_active == True
             )
+        )
+    )
+    existing_approvals = {approval.order_id: approval for approval in existing_result.scalars().all()}
 
-            db.add(approval_action)
-            await db.flush()  # Get the ID without committing
-            await db.refresh(approval_action)
+    pending_order_ids = []
+    for order_id in order_ids:
+        existing_approval = existing_approvals.get(order_id)
+        if existing_approval and existing_approval.status != ApprovalStatus.PENDING:
+            failed_orders.append({
+                "order_id": order_id,
+                "error": "Order has already been processed"
+            })
+        else:
+            pending_order_ids.append(order_id)
 
-            # Create audit entry
-            await create_approval_audit_entry(
-                db=db,
-                approval_action_id=approval_action.id,
-                action="approved" if bulk_data.approved else "rejected",
-                old_status=ApprovalStatus.PENDING,
-                new_status=approval_action.status,
-                user_id=user_id,
-                user_name=request.state.user_name if request and hasattr(request.state, 'user_name') else None,
-                user_role=request.state.user_role if request and hasattr(request.state, 'user_role') else None,
+    reviewed_orders = []
+    if pending_order_ids:
+        try:
+            service_result = await update_orders_status_in_service_bulk(
+                order_ids=pending_order_ids,
+                approved=bulk_data.approved,
                 reason=bulk_data.reason,
-                notes=bulk_data.notes,
-                ip_address=ip_address,
-                user_agent=user_agent
+                headers=auth_headers
+            )
+            reviewed_orders = service_result.get("reviewed", [])
+            failed_orders.extend(service_result.get("failed", []))
+        except HTTPException as e:
+            logger.error(f"Failed to update orders in Orders Service: {e.detail}")
+            failed_orders.extend(
+                {"order_id": order_id, "error": f"Failed to update order status: {e.detail}"}
+                for order_id in pending_order_ids
             )
 
-            # Try to update order status in Orders Service
-            try:
-                await update_order_status_in_service(
-                    order_id=order_id,
-                    status="finance_approved" if bulk_data.approved else "finance_rejected",
-                    approved=bulk_data.approved,
-                    reason=bulk_data.reason,
-                    notes=bulk_data.notes,
-                    headers=auth_headers
+    approval_actions = []
+    if reviewed_orders:
+        now = datetime.utcnow()
+        decision = {
+            "status": new_status.value,
+            "approver_id": user_id,
+            "approver_name": user_name,
+            "approval_reason": bulk_data.reason if bulk_data.approved else None,
+            "rejection_reason": bulk_data.reason if not bulk_data.approved else None,
+            "updated_at": now,
+            "approved_at": now
+        }
+
+        try:
+            # Pending approvals of the reviewed orders are completed in place
+            pending_ids = [
+                existing_approvals[order["order_id"]].id
+                for order in reviewed_orders
+                if order["order_id"] in existing_approvals
+            ]
+            if pending_ids:
+                updated_result = await db.execute(
+                    update(ApprovalAction)
+                    .where(ApprovalAction.id.in_(pending_ids))
+                    .values(**decision)
+                    .returning(ApprovalAction)
                 )
-            except Exception as e:
-                # Log the error but continue processing other orders
-                logger.error(f"Failed to update order {order_id} in Orders Service: {str(e)}")
-                failed_orders.append({
-                    "order_id": order_id,
-                    "error": f"Failed to update order status: {str(e)}"
-                })
-                continue
-
-            approval_actions.append(ApprovalActionResponse.model_validate(approval_action))
-
-            if bulk_data.approved:
-                approved_count += 1
-            else:
-                rejected_count += 1
+                approval_actions.extend(updated_result.scalars().all())
+
+            new_actions = [
+                {
+                    "id": str(uuid4()),
+                    "tenant_id": tenant_id,
+                    "order_id": order["order_id"],
+                    "approval_type": ApprovalType.FINANCE.value,
+                    "order_amount": order.get("total_amount"),
+                    "customer_id": order.get("customer_id"),
+                    "customer_name": order.get("customer_name"),
+                    "order_priority": order.get("priority"),
+                    "payment_type": order.get("payment_type"),
+                    "requested_by": order.get("created_by") or user_id,
+                    "created_at": now,
+                    "is_active": True,
+                    **decision
+                }
+                for order in reviewed_orders
+                if order["order_id"] not in existing_approvals
+            ]
+            if new_actions:
+                inserted_result = await db.execute(
+                    insert(ApprovalAction).returning(ApprovalAction),
+                    new_actions
+                )
+                approval_actions.extend(inserted_result.scalars().all())
+
+            await db.execute(insert(ApprovalAudit), [
+                {
+                    "approval_action_id": approval_action.id,
+                    "action": "approved" if bulk_data.approved else "rejected",
+                    "old_status": ApprovalStatus.PENDING.value,
+                    "new_status": new_status.value,
+                    "user_id": user_id,
+                    "user_name": user_name,
+                    "user_role": user_role,
+                    "reason": bulk_data.reason,
+                    "notes": bulk_data.notes,
+                    "ip_address": ip_address,
+                    "user_agent": user_agent,
+                    "created_at": now
+                }
+                for approval_action in approval_actions
+            ])
 
+            await db.commit()
         except Exception as e:
-            logger.error(f"Failed to process approval for order {order_id}: {str(e)}")
-            failed_orders.append({
-                "order_id": order_id,
-                "error": str(e)
-            })
+            # The orders have moved in Orders Service; only the finance records are missing
+            logger.error(f"Failed to record bulk approval actions: {str(e)}")
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Orders were updated but their approval records could not be saved"
+            )
 
-    # Commit all successful transactions
-    await db.commit()
+    approved_count = len(approval_actions) if bulk_data.approved else 0
+    rejected_count = len(approval_actions) if not bulk_data.approved else 0
 
     logger.info(f"Bulk approval completed: {approved_count} approved, {rejected_count} rejected, {len(failed_orders)} failed")
 
@@ -416,7 +514,7 @@ async def bulk_approve_or_reject_orders(
         approved_orders=approved_count,
         rejected_orders=rejected_count,
         failed_orders=failed_orders,
-        approval_actions=approval_actions
+        approval_actions=[ApprovalActionResponse.model_validate(action) for action in approval_actions]
     )
 
 
@@ -2,15 +2,17 @@
 Finance reports API endpoints
 Provides financial analytics and reporting capabilities
 """
+import asyncio
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, desc, cast, String as SQLString
+from sqlalchemy import select, func, and_, or_, desc, cast, DateTime
 from httpx import AsyncClient, ConnectError, TimeoutException
 
 from src.database import get_db
-from src.models.approval import ApprovalAction, ApprovalStatus, ApprovalType
+from src.models.approval import ApprovalStatus
+from src.services.approval_rollups import approval_facts
 from src.security import (
     TokenData,
     require_any_permission,
@@ -25,36 +27,71 @@ ORDERS_SERVICE_URL = "http://orders-service:8003"
 router = APIRouter()
 
 
-async def fetch_orders_by_status_from_service(status: str, headers: dict = None) -> dict:
-    """Fetch orders by status from Orders Service"""
-    logger.info(f"FINANCE REPORTS - Fetching {status} orders from orders service")
+async def fetch_order_aggregates_from_service(statuses: List[str], headers: dict = None) -> dict:
+    """Fetch order counts and amounts grouped by status and payment type from Orders Service"""
+    logger.info(f"FINANCE REPORTS - Fetching order aggregates for {statuses} from orders service")
     async with AsyncClient(timeout=10.0) as client:
         try:
             response = await client.get(
-                f"{ORDERS_SERVICE_URL}/api/v1/orders/",
-                params={"status": status, "per_page": 100},  # max per_page is 100
+                f"{ORDERS_SERVICE_URL}/api/v1/orders/aggregate",
+                params={"status": statuses},
                 headers=headers or {},
                 follow_redirects=True
             )
             if response.status_code == 200:
                 data = response.json()
-                logger.info(f"FINANCE REPORTS - Fetched {status} orders: total={data.get('total', 0)}, items_count={len(data.get('items', []))}")
+                logger.info(f"FINANCE REPORTS - Fetched order aggregates: total_count={data.get('total_count', 0)}, groups={len(data.get('groups', []))}")
                 return data
             elif response.status_code == 401:
-                logger.warning(f"FINANCE REPORTS - Authorization failed when fetching {status} orders - returning empty")
-                return {"items": [], "total": 0}
+                logger.warning("FINANCE REPORTS - Authorization failed when fetching order aggregates - returning empty")
+                return {"groups": [], "total_count": 0, "total_amount": 0}
             else:
-                logger.warning(f"FINANCE REPORTS - Failed to fetch {status} orders: {response.status_code} - {response.text}")
-                return {"items": [], "total": 0}
+                logger.warning(f"FINANCE REPORTS - Failed to fetch order aggregates: {response.status_code} - {response.text}")
+                return {"groups": [], "total_count": 0, "total_amount": 0}
         except ConnectError as e:
-            logger.warning(f"FINANCE REPORTS - Connection error fetching {status} orders (service may be starting): {str(e)}")
-            return {"items": [], "total": 0}
+            logger.warning(f"FINANCE REPORTS - Connection error fetching order aggregates (service may be starting): {str(e)}")
+            return {"groups": [], "total_count": 0, "total_amount": 0}
         except TimeoutException as e:
-            logger.warning(f"FINANCE REPORTS - Timeout fetching {status} orders: {str(e)}")
-            return {"items": [], "total": 0}
+            logger.warning(f"FINANCE REPORTS - Timeout fetching order aggregates: {str(e)}")
+            return {"groups": [], "total_count": 0, "total_amount": 0}
         except Exception as e:
-            logger.error(f"FINANCE REPORTS - Error fetching {status} orders: {str(e)}")
-            return {"items": [], "total": 0}
+            logger.error(f"FINANCE REPORTS - Error fetching order aggregates: {str(e)}")
+            return {"groups": [], "total_count": 0, "total_amount": 0}
+
+
+async def _get_approval_dashboard_stats(
+    db: AsyncSession,
+    tenant_id: str,
+    start_date: datetime,
+    end_date: datetime
+):
+    """Daily approval trends and top approvers of the finance approvals in the period"""
+    facts = approval_facts(tenant_id, start_date, end_date)
+
+    # Get daily approval trends
+    daily_trends_query = select(
+        facts.c.day.label('date'),
+        facts.c.status,
+        func.sum(facts.c.order_count).label('count'),
+        func.sum(facts.c.order_amount).label('amount')
+    ).group_by(facts.c.day, facts.c.status).order_by(facts.c.day)
+
+    daily_trends_result = await db.execute(daily_trends_query)
+    daily_trends = daily_trends_result.all()
+
+    # Get top approvers
+    top_approvers_query = select(
+        func.max(facts.c.approver_name).label('approver_name'),
+        func.sum(facts.c.order_count).label('approvals_count'),
+        func.sum(facts.c.order_amount).label('total_amount')
+    ).where(facts.c.approver_id.isnot(None)).group_by(facts.c.approver_id).order_by(
+        desc(func.sum(facts.c.order_count))
+    ).limit(10)
+
+    top_approvers_result = await db.execute(top_approvers_query)
+    top_approvers = top_approvers_result.all()
+
+    return daily_trends, top_approvers
 
 
 @router.get("/dashboard/summary")
@@ -67,6 +104,10 @@ async def get_dashboard_summary(
 ):
     """
     Get financial dashboard summary with key metrics
+
+    Order counts and amounts come from one aggregate call to the Orders
+    service, made while the approval trends are read from the finance
+    database.
     """
     # Log user info for debugging
     logger.info(f"FINANCE REPORTS - User: {token_data.user_id}, Role: {token_data.role}, Tenant: {tenant_id}")
@@ -86,115 +127,37 @@ async def get_dashboard_summary(
             logger.warning(f"FINANCE REPORTS - No auth header found in request!")
 
     try:
-        # Get approval statistics
-        approval_stats_query = select(
-            ApprovalAction.status,
-            func.count(ApprovalAction.id).label('count'),
-            func.sum(ApprovalAction.order_amount).label('total_amount')
-        ).where(
-            and_(
-                ApprovalAction.tenant_id == tenant_id,
-                cast(ApprovalAction.approval_type, SQLString) == ApprovalType.FINANCE.value,
-                ApprovalAction.created_at >= start_date,
-                ApprovalAction.created_at <= end_date,
-                ApprovalAction.is_active == True
-            )
-        ).group_by(ApprovalAction.status)
-
-        approval_stats_result = await db.execute(approval_stats_query)
-        approval_stats = approval_stats_result.all()
-
-        # Convert to dict for easier access
-        stats_dict = {status: {"count": 0, "amount": 0} for status in ApprovalStatus}
-        for stat in approval_stats:
-            stats_dict[stat.status] = {
-                "count": stat.count,
-                "amount": float(stat.total_amount) if stat.total_amount else 0
-            }
-
-        # Get daily approval trends
-        daily_trends_query = select(
-            func.date(ApprovalAction.created_at).label('date'),
-            ApprovalAction.status,
-            func.count(ApprovalAction.id).label('count'),
-            func.sum(ApprovalAction.order_amount).label('amount')
-        ).where(
-            and_(
-                ApprovalAction.tenant_id == tenant_id,
-                cast(ApprovalAction.approval_type, SQLString) == ApprovalType.FINANCE.value,
-                ApprovalAction.created_at >= start_date,
-                ApprovalAction.created_at <= end_date,
-                ApprovalAction.is_active == True
-            )
-        ).group_by(
-            func.date(ApprovalAction.created_at),
-            ApprovalAction.status
-        ).order_by(func.date(ApprovalAction.created_at))
-
-        daily_trends_result = await db.execute(daily_trends_query)
-        daily_trends = daily_trends_result.all()
-
-        # Get top approvers
-        top_approvers_query = select(
-            ApprovalAction.approver_name,
-            func.count(ApprovalAction.id).label('approvals_count'),
-            func.sum(ApprovalAction.order_amount).label('total_amount')
-        ).where(
-            and_(
-                ApprovalAction.tenant_id == tenant_id,
-                cast(ApprovalAction.approval_type, SQLString) == ApprovalType.FINANCE.value,
-                ApprovalAction.created_at >= start_date,
-                ApprovalAction.created_at <= end_date,
-                ApprovalAction.approver_id.isnot(None),
-                ApprovalAction.is_active == True
-            )
-        ).group_by(ApprovalAction.approver_id, ApprovalAction.approver_name).order_by(
-            desc(func.count(ApprovalAction.id))
-        ).limit(10)
-
-        top_approvers_result = await db.execute(top_approvers_query)
-        top_approvers = top_approvers_result.all()
-
-        # Get pending approvals count and amount
-        pending_query = select(
-            func.count(ApprovalAction.id).label('count'),
-            func.sum(ApprovalAction.order_amount).label('amount')
-        ).where(
-            and_(
-                ApprovalAction.tenant_id == tenant_id,
-                cast(ApprovalAction.approval_type, SQLString) == ApprovalType.FINANCE.value,
-                cast(ApprovalAction.status, SQLString) == ApprovalStatus.PENDING.value,
-                ApprovalAction.is_active == True
-            )
+        # Real-time order counts from Orders Service (with role-based filtering)
+        order_aggregates, (daily_trends, top_approvers) = await asyncio.gather(
+            fetch_order_aggregates_from_service(
+                ["submitted", "finance_approved", "finance_rejected"], auth_headers
+            ),
+            _get_approval_dashboard_stats(db, tenant_id, start_date, end_date)
         )
 
-        pending_result = await db.execute(pending_query)
-        pending_stats = pending_result.first()
-
-        # Fetch real-time order counts from Orders Service with role-based filtering
-        pending_orders_data = await fetch_orders_by_status_from_service("submitted", auth_headers)
-        real_pending_count = pending_orders_data.get("total", 0)
-        pending_items = pending_orders_data.get("items", [])
-        real_pending_amount = sum(
-            order.get("total_amount", 0) or 0
-            for order in pending_items
-        )
-
-        approved_orders_data = await fetch_orders_by_status_from_service("finance_approved", auth_headers)
-        real_approved_count = approved_orders_data.get("total", 0)
-        approved_items = approved_orders_data.get("items", [])
-        real_approved_amount = sum(
-            order.get("total_amount", 0) or 0
-            for order in approved_items
-        )
+        by_status = {
+            status: {"count": 0, "amount": 0.0}
+            for status in ("submitted", "finance_approved", "finance_rejected")
+        }
+        by_payment_type: Dict[str, Dict[str, Any]] = {}
+        for group in order_aggregates.get("groups", []):
+            totals = by_status.get(group["status"])
+            if totals is None:
+                continue
+            totals["count"] += group["count"]
+            totals["amount"] += group["total_amount"] or 0
+            payment = by_payment_type.setdefault(
+                group.get("payment_type") or "unspecified", {"count": 0, "amount": 0.0}
+            )
+            payment["count"] += group["count"]
+            payment["amount"] += group["total_amount"] or 0
 
-        rejected_orders_data = await fetch_orders_by_status_from_service("finance_rejected", auth_headers)
-        real_rejected_count = rejected_orders_data.get("total", 0)
-        rejected_items = rejected_orders_data.get("items", [])
-        real_rejected_amount = sum(
-            order.get("total_amount", 0) or 0
-            for order in rejected_items
-        )
+        real_pending_count = by_status["submitted"]["count"]
+        real_pending_amount = by_status["submitted"]["amount"]
+        real_approved_count = by_status["finance_approved"]["count"]
+        real_approved_amount = by_status["finance_approved"]["amount"]
+        real_rejected_count = by_status["finance_rejected"]["count"]
+        real_rejected_amount = by_status["finance_rejected"]["amount"]
 
         logger.info(f"Dashboard Summary - Orders from Orders Service (with role-based filtering):")
         logger.info(f"  PENDING: count={real_pending_count}, amount={real_pending_amount}")
@@ -220,11 +183,19 @@ async def get_dashboard_summary(
                     real_approved_count / (real_approved_count + real_rejected_count)
                 ) if (real_approved_count + real_rejected_count) > 0 else 0
             },
+            "payment_types": [
+                {
+                    "payment_type": payment_type,
+                    "count": totals["count"],
+                    "amount": totals["amount"]
+                }
+                for payment_type, totals in sorted(by_payment_type.items())
+            ],
             "daily_trends": [
                 {
                     "date": str(trend.date),
                     "status": trend.status,
-                    "count": trend.count,
+                    "count": int(trend.count),
                     "amount": float(trend.amount) if trend.amount else 0
                 }
                 for trend in daily_trends
@@ -232,7 +203,7 @@ async def get_dashboard_summary(
             "top_approvers": [
                 {
                     "approver_name": approver.approver_name,
-                    "approvals_count": approver.approvals_count,
+                    "approvals_count": int(approver.approvals_count),
                     "total_amount": float(approver.total_amount) if approver.total_amount else 0
                 }
                 for approver in top_approvers
@@ -262,72 +233,58 @@ async def get_approval_performance_report(
 ):
     """
     Get approval performance metrics and statistics
+
+    Read from the daily approval rollups; approvals count on their decision day.
     """
     try:
-        # Build base query
-        base_conditions = [
-            ApprovalAction.tenant_id == tenant_id,
-            cast(ApprovalAction.approval_type, SQLString) == ApprovalType.FINANCE.value,
-            ApprovalAction.is_active == True
-        ]
+        facts = approval_facts(tenant_id, date_from, date_to)
 
+        base_conditions = []
         if approver_id:
-            base_conditions.append(ApprovalAction.approver_id == approver_id)
-        if date_from:
-            base_conditions.append(ApprovalAction.created_at >= date_from)
-        if date_to:
-            base_conditions.append(ApprovalAction.created_at <= date_to)
+            base_conditions.append(facts.c.approver_id == approver_id)
 
         # Get approval time statistics
         approval_time_query = select(
-            ApprovalAction.approver_id,
-            ApprovalAction.approver_name,
-            func.count(ApprovalAction.id).label('total_approvals'),
-            func.avg(
-                func.extract('epoch', ApprovalAction.approved_at - ApprovalAction.created_at)
+            facts.c.approver_id,
+            func.max(facts.c.approver_name).label('approver_name'),
+            func.sum(facts.c.timed_count).label('total_approvals'),
+            (
+                func.sum(facts.c.approval_seconds_sum) / func.nullif(func.sum(facts.c.timed_count), 0)
             ).label('avg_approval_time_seconds'),
-            func.min(
-                func.extract('epoch', ApprovalAction.approved_at - ApprovalAction.created_at)
-            ).label('min_approval_time_seconds'),
-            func.max(
-                func.extract('epoch', ApprovalAction.approved_at - ApprovalAction.created_at)
-            ).label('max_approval_time_seconds')
+            func.min(facts.c.approval_seconds_min).label('min_approval_time_seconds'),
+            func.max(facts.c.approval_seconds_max).label('max_approval_time_seconds')
         ).where(
             and_(
                 *base_conditions,
-                cast(ApprovalAction.status, SQLString) == ApprovalStatus.APPROVED.value,
-                ApprovalAction.approved_at.isnot(None)
+                facts.c.status == ApprovalStatus.APPROVED.value,
+                facts.c.timed_count > 0
             )
-        ).group_by(ApprovalAction.approver_id, ApprovalAction.approver_name)
+        ).group_by(facts.c.approver_id)
 
         approval_time_result = await db.execute(approval_time_query)
         approval_time_stats = approval_time_result.all()
 
         # Get approval breakdown by status
         status_breakdown_query = select(
-            ApprovalAction.status,
-            func.count(ApprovalAction.id).label('count'),
-            func.sum(ApprovalAction.order_amount).label('total_amount')
-        ).where(and_(*base_conditions)).group_by(ApprovalAction.status)
+            facts.c.status,
+            func.sum(facts.c.order_count).label('count'),
+            func.sum(facts.c.order_amount).label('total_amount')
+        ).where(*base_conditions).group_by(facts.c.status)
 
         status_breakdown_result = await db.execute(status_breakdown_query)
         status_breakdown = status_breakdown_result.all()
 
         # Get daily approval volumes
         daily_volume_query = select(
-            func.date(ApprovalAction.created_at).label('date'),
-            func.count(ApprovalAction.id).label('total'),
-            func.sum(func.case(
-                (cast(ApprovalAction.status, SQLString) == ApprovalStatus.APPROVED.value, 1),
-                else_=0
-            )).label('approved'),
-            func.sum(func.case(
-                (cast(ApprovalAction.status, SQLString) == ApprovalStatus.REJECTED.value, 1),
-                else_=0
-            )).label('rejected')
-        ).where(and_(*base_conditions)).group_by(
-            func.date(ApprovalAction.created_at)
-        ).order_by(func.date(ApprovalAction.created_at))
+            facts.c.day.label('date'),
+            func.sum(facts.c.order_count).label('total'),
+            func.coalesce(
+                func.sum(facts.c.order_count).filter(facts.c.status == ApprovalStatus.APPROVED.value), 0
+            ).label('approved'),
+            func.coalesce(
+                func.sum(facts.c.order_count).filter(facts.c.status == ApprovalStatus.REJECTED.value), 0
+            ).label('rejected')
+        ).where(*base_conditions).group_by(facts.c.day).order_by(facts.c.day)
 
         daily_volume_result = await db.execute(daily_volume_query)
         daily_volume = daily_volume_result.all()
@@ -337,7 +294,7 @@ async def get_approval_performance_report(
                 {
                     "approver_id": stat.approver_id,
                     "approver_name": stat.approver_name,
-                    "total_approvals": stat.total_approvals,
+                    "total_approvals": int(stat.total_approvals),
                     "avg_approval_time_minutes": float(stat.avg_approval_time_seconds) / 60 if stat.avg_approval_time_seconds else 0,
                     "min_approval_time_minutes": float(stat.min_approval_time_seconds) / 60 if stat.min_approval_time_seconds else 0,
                     "max_approval_time_minutes": float(stat.max_approval_time_seconds) / 60 if stat.max_approval_time_seconds else 0
@@ -347,7 +304,7 @@ async def get_approval_performance_report(
             "status_breakdown": [
                 {
                     "status": breakdown.status,
-                    "count": breakdown.count,
+                    "count": int(breakdown.count),
                     "total_amount": float(breakdown.total_amount) if breakdown.total_amount else 0
                 }
                 for breakdown in status_breakdown
@@ -355,7 +312,7 @@ async def get_approval_performance_report(
             "daily_volume": [
                 {
                     "date": str(volume.date),
-                    "total": volume.total,
+                    "total": int(volume.total),
                     "approved": int(volume.approved),
                     "rejected": int(volume.rejected)
                 }
@@ -384,30 +341,25 @@ async def get_financial_summary_report(
 ):
     """
     Get financial summary report with revenue and approval statistics
+
+    Read from the daily approval rollups of the approved orders.
     """
     try:
+        facts = approval_facts(tenant_id, date_from, date_to)
+
         # Build base conditions
-        base_conditions = [
-            ApprovalAction.tenant_id == tenant_id,
-            cast(ApprovalAction.approval_type, SQLString) == ApprovalType.FINANCE.value,
-            cast(ApprovalAction.status, SQLString) == ApprovalStatus.APPROVED.value,
-            ApprovalAction.is_active == True
-        ]
+        base_conditions = [facts.c.status == ApprovalStatus.APPROVED.value]
 
         if customer_id:
-            base_conditions.append(ApprovalAction.customer_id == customer_id)
+            base_conditions.append(facts.c.customer_id == customer_id)
         if payment_type:
-            base_conditions.append(ApprovalAction.payment_type == payment_type)
-        if date_from:
-            base_conditions.append(ApprovalAction.approved_at >= date_from)
-        if date_to:
-            base_conditions.append(ApprovalAction.approved_at <= date_to)
+            base_conditions.append(facts.c.payment_type == payment_type)
 
         # Get total approved amounts
         total_approved_query = select(
-            func.count(ApprovalAction.id).label('order_count'),
-            func.sum(ApprovalAction.order_amount).label('total_order_amount'),
-            func.sum(ApprovalAction.approved_amount).label('total_approved_amount')
+            func.coalesce(func.sum(facts.c.order_count), 0).label('order_count'),
+            func.sum(facts.c.order_amount).label('total_order_amount'),
+            func.sum(facts.c.approved_amount).label('total_approved_amount')
         ).where(and_(*base_conditions))
 
         total_approved_result = await db.execute(total_approved_query)
@@ -415,41 +367,37 @@ async def get_financial_summary_report(
 
         # Get breakdown by customer
         customer_breakdown_query = select(
-            ApprovalAction.customer_id,
-            ApprovalAction.customer_name,
-            func.count(ApprovalAction.id).label('order_count'),
-            func.sum(ApprovalAction.order_amount).label('total_amount')
+            facts.c.customer_id,
+            func.max(facts.c.customer_name).label('customer_name'),
+            func.sum(facts.c.order_count).label('order_count'),
+            func.sum(facts.c.order_amount).label('total_amount')
         ).where(and_(*base_conditions)).group_by(
-            ApprovalAction.customer_id, ApprovalAction.customer_name
-        ).order_by(desc(func.sum(ApprovalAction.order_amount))).limit(20)
+            facts.c.customer_id
+        ).order_by(desc(func.sum(facts.c.order_amount))).limit(20)
 
         customer_breakdown_result = await db.execute(customer_breakdown_query)
         customer_breakdown = customer_breakdown_result.all()
 
         # Get breakdown by payment type
         payment_type_breakdown_query = select(
-            ApprovalAction.payment_type,
-            func.count(ApprovalAction.id).label('order_count'),
-            func.sum(ApprovalAction.order_amount).label('total_amount')
-        ).where(and_(*base_conditions)).group_by(ApprovalAction.payment_type)
+            facts.c.payment_type,
+            func.sum(facts.c.order_count).label('order_count'),
+            func.sum(facts.c.order_amount).label('total_amount')
+        ).where(and_(*base_conditions)).group_by(facts.c.payment_type)
 
         payment_type_breakdown_result = await db.execute(payment_type_breakdown_query)
         payment_type_breakdown = payment_type_breakdown_result.all()
 
         # Get time series data based on group_by parameter
         if group_by == "day":
-            time_series_func = func.date(ApprovalAction.approved_at)
-        elif group_by == "week":
-            time_series_func = func.date_trunc('week', ApprovalAction.approved_at)
-        elif group_by == "month":
-            time_series_func = func.date_trunc('month', ApprovalAction.approved_at)
-        else:  # quarter
-            time_series_func = func.date_trunc('quarter', ApprovalAction.approved_at)
+            time_series_func = facts.c.day
+        else:  # week, month or quarter
+            time_series_func = func.date_trunc(group_by, cast(facts.c.day, DateTime))
 
         time_series_query = select(
             time_series_func.label('period'),
-            func.count(ApprovalAction.id).label('order_count'),
-            func.sum(ApprovalAction.order_amount).label('total_amount')
+            func.sum(facts.c.order_count).label('order_count'),
+            func.sum(facts.c.order_amount).label('total_amount')
         ).where(and_(*base_conditions)).group_by(time_series_func).order_by(time_series_func)
 
         time_series_result = await db.execute(time_series_query)
@@ -457,7 +405,7 @@ async def get_financial_summary_report(
 
         return {
             "summary": {
-                "total_orders": total_approved.order_count if total_approved else 0,
+                "total_orders": int(total_approved.order_count) if total_approved else 0,
                 "total_order_amount": float(total_approved.total_order_amount) if total_approved and total_approved.total_order_amount else 0,
                 "total_approved_amount": float(total_approved.total_approved_amount) if total_approved and total_approved.total_approved_amount else 0
             },
@@ -465,7 +413,7 @@ async def get_financial_summary_report(
                 {
                     "customer_id": breakdown.customer_id,
                     "customer_name": breakdown.customer_name,
-                    "order_count": breakdown.order_count,
+                    "order_count": int(breakdown.order_count),
                     "total_amount": float(breakdown.total_amount) if breakdown.total_amount else 0
                 }
                 for breakdown in customer_breakdown
@@ -473,7 +421,7 @@ async def get_financial_summary_report(
             "payment_type_breakdown": [
                 {
                     "payment_type": breakdown.payment_type,
-                    "order_count": breakdown.order_count,
+                    "order_count": int(breakdown.order_count),
                     "total_amount": float(breakdown.total_amount) if breakdown.total_amount else 0
                 }
                 for breakdown in payment_type_breakdown
@@ -481,7 +429,7 @@ async def get_financial_summary_report(
             "time_series": [
                 {
                     "period": str(ts.period),
-                    "order_count": ts.order_count,
+                    "order_count": int(ts.order_count),
                     "total_amount": float(ts.total_amount) if ts.total_amount else 0
                 }
                 for ts in time_series
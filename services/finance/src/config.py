@@ -56,6 +56,8 @@ class FinanceSettings(BaseSettings):
 
     # Audit settings
     AUDIT_LOG_ENABLED: bool = True
+    AUDIT_SAMPLE_RATE: float = 1.0  # Sensitive routes (approvals, payments) are always audited
+    AUDIT_REQUEST_BUFFER_SIZE: int = 10000
 
     # Rate limiting settings
     RATE_LIMIT_ENABLED: bool = True
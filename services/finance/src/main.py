@@ -10,11 +10,10 @@ from fastapi.responses import JSONResponse
 
 from src.config import FinanceSettings
 from src.database import engine, Base
-from src.middleware.auth import AuthenticationMiddleware
-from src.middleware.tenant import TenantIsolationMiddleware
-from src.middleware.audit import AuditLoggingMiddleware
+from src.services.permission_cache import permission_cache
 from src.middleware.rate_limit import RateLimitMiddleware
-from src.middleware.security import SecurityHeadersMiddleware
+from src.middleware.pipeline import build_pipeline_stages
+from shared.asgi import FusedMiddleware
 
 # Configure logging
 logging.basicConfig(
@@ -37,9 +36,13 @@ async def lifespan(app: FastAPI):
         await conn.run_sync(Base.metadata.create_all)
     logger.info("Database tables created/verified")
 
+    # Shared permission cache with push invalidation from the auth service
+    await permission_cache.initialize()
+
     yield
 
     logger.info("Shutting down Finance Service...")
+    await permission_cache.shutdown()
 
 
 # Create FastAPI app
@@ -102,25 +105,9 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
-# Add security middleware (order matters - middleware executes in reverse order of addition)
-# 1. Security headers (outermost - executes last)
-app.add_middleware(SecurityHeadersMiddleware)
-
-# 2. CORS (executes after security headers)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=getattr(settings, 'allowed_origins', ["*"]),
-    allow_credentials=True,
-    allow_methods=getattr(settings, 'allowed_methods', ["*"]),
-    allow_headers=getattr(settings, 'allowed_headers', ["*"]),
-    expose_headers=getattr(settings, 'expose_headers', []),
-)
-
-# 3. Audit logging (captures all requests)
-if getattr(settings, 'AUDIT_LOG_ENABLED', True):
-    app.add_middleware(AuditLoggingMiddleware)
-
-# 4. Rate limiting (if enabled) - Increased limits for 30-40 concurrent users
+# Add middleware (order matters - middleware executes in reverse order of addition)
+# 1. Rate limiting (innermost, so clients are identified by the authenticated user)
+#    Increased limits for 30-40 concurrent users
 if getattr(settings, 'RATE_LIMIT_ENABLED', True):
     app.add_middleware(
         RateLimitMiddleware,
@@ -128,24 +115,19 @@ if getattr(settings, 'RATE_LIMIT_ENABLED', True):
         window=60
     )
 
-# 5. Tenant context for database operations
-app.add_middleware(TenantIsolationMiddleware)
+# 2. Authentication, tenant isolation, audit logging (sampled; sensitive routes
+#    always captured) and security headers in one pure ASGI middleware
+middleware_stages = build_pipeline_stages(settings)
+app.add_middleware(FusedMiddleware, stages=middleware_stages)
 
-# 6. Authentication middleware (innermost - executes first)
+# 3. CORS (outermost)
 app.add_middleware(
-    AuthenticationMiddleware,
-    jwt_secret=settings.GLOBAL_JWT_SECRET,
-    jwt_algorithm=settings.GLOBAL_JWT_ALGORITHM,
-    skip_paths=[
-        "/health",
-        "/ready",
-        "/metrics",
-        "/docs",
-        "/openapi.json",
-        "/redoc",
-        "/favicon.ico",
-        "/api/v1/internal"  # Skip internal endpoints for inter-service communication
-    ]
+    CORSMiddleware,
+    allow_origins=getattr(settings, 'allowed_origins', ["*"]),
+    allow_credentials=True,
+    allow_methods=getattr(settings, 'allowed_methods', ["*"]),
+    allow_headers=getattr(settings, 'allowed_headers', ["*"]),
+    expose_headers=getattr(settings, 'expose_headers', []),
 )
 
 # Include API routers
@@ -172,7 +154,11 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "finance"}
+    return {
+        "status": "healthy",
+        "service": "finance",
+        "middleware": {stage.name: stage.get_stats() for stage in middleware_stages},
+    }
 
 
 @app.get("/metrics")
@@ -2,7 +2,6 @@
 Finance service middleware
 """
 from src.middleware.auth import (
-    AuthenticationMiddleware,
     TokenData,
     SecurityException,
     get_current_user_id,
@@ -10,20 +9,13 @@ from src.middleware.auth import (
     get_token_data,
 )
 
-from src.middleware.security import SecurityHeadersMiddleware
-from src.middleware.tenant import TenantIsolationMiddleware
-from src.middleware.audit import AuditLoggingMiddleware
 from src.middleware.rate_limit import RateLimitMiddleware
 
 __all__ = [
-    "AuthenticationMiddleware",
     "TokenData",
     "SecurityException",
     "get_current_user_id",
     "get_current_tenant_id",
     "get_token_data",
-    "SecurityHeadersMiddleware",
-    "TenantIsolationMiddleware",
-    "AuditLoggingMiddleware",
     "RateLimitMiddleware",
-]
\ No newline at end of file
+]
@@ -0,0 +1,125 @@
+"""
+Fused middleware pipeline for Finance Service
+
+Authentication, tenant isolation, audit logging and security headers run as
+stages of one pure ASGI middleware (``shared.asgi``) instead of a stack of
+``BaseHTTPMiddleware`` layers.
+"""
+import logging
+from typing import List, Optional
+
+from jose import JWTError, jwt
+
+from shared.asgi import (
+    AuditStage,
+    AuthStage,
+    Reject,
+    RequestContext,
+    SecurityHeadersStage,
+    Stage,
+    TenantStage,
+)
+
+logger = logging.getLogger(__name__)
+
+BEARER_CHALLENGE = {"WWW-Authenticate": "Bearer"}
+
+# Paths served without a token; internal endpoints still require one
+# (they are called with the caller's token)
+AUTH_SKIP_PATHS = [
+    "/health",
+    "/ready",
+    "/metrics",
+    "/docs",
+    "/openapi.json",
+    "/redoc",
+    "/favicon.ico",
+]
+
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "X-Permitted-Cross-Domain-Policies": "none",
+}
+
+# Prevent caching of API responses
+API_HEADERS = {
+    "Cache-Control": "no-store, no-cache, must-revalidate",
+    "Pragma": "no-cache",
+    "Expires": "0",
+}
+
+
+def extract_token(ctx: RequestContext) -> Optional[str]:
+    """Bearer header first, then the ``token`` query parameter, then the access_token cookie"""
+    auth_header = ctx.headers.get("authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        return auth_header[7:]
+
+    token = ctx.request.query_params.get("token")
+    if token:
+        return token
+
+    return ctx.request.cookies.get("access_token")
+
+
+def build_authenticate(jwt_secret: str, jwt_algorithm: str):
+    """Token verification for ``AuthStage`` with the service's JWT settings"""
+
+    def authenticate(ctx: RequestContext, token: str) -> dict:
+        try:
+            payload = jwt.decode(token, jwt_secret, algorithms=[jwt_algorithm])
+        except JWTError as e:
+            logger.error(f"JWT validation error: {str(e)}")
+            raise Reject(401, "Token validation failed", BEARER_CHALLENGE)
+
+        user_id = payload.get("sub")
+        tenant_id = payload.get("tenant_id")
+        if not user_id or not tenant_id:
+            logger.warning(f"Invalid token payload: {payload}")
+            raise Reject(401, "Missing required fields", BEARER_CHALLENGE)
+
+        logger.debug(f"Authenticated user: {user_id} for tenant: {tenant_id}")
+        return {
+            "user_id": user_id,
+            "tenant_id": tenant_id,
+            "user_role": payload.get("role"),
+            "role_id": payload.get("role_id"),
+            "permissions": payload.get("permissions", []),
+            "token_payload": payload,
+        }
+
+    return authenticate
+
+
+def missing_token(ctx: RequestContext):
+    logger.warning(f"No token provided for request: {ctx.path}")
+
+
+def build_pipeline_stages(settings) -> List[Stage]:
+    """
+    Stages in execution order
+
+    Args:
+        settings: Finance settings
+    """
+    stages: List[Stage] = [
+        AuthStage(
+            build_authenticate(settings.GLOBAL_JWT_SECRET, settings.GLOBAL_JWT_ALGORITHM or "HS256"),
+            on_missing=missing_token,
+            skip_paths=AUTH_SKIP_PATHS,
+            credentials=extract_token,
+        ),
+        # Tokens always carry a tenant here, so a request without one is rejected
+        TenantStage(require_tenant=True, response_header=False),
+    ]
+    if getattr(settings, 'AUDIT_LOG_ENABLED', True):
+        stages.append(AuditStage(
+            "finance_audit",
+            sample_rate=getattr(settings, 'AUDIT_SAMPLE_RATE', 1.0),
+            buffer_size=getattr(settings, 'AUDIT_REQUEST_BUFFER_SIZE', 10000),
+        ))
+    stages.append(SecurityHeadersStage(SECURITY_HEADERS, api_headers=API_HEADERS))
+    return stages
@@ -1,42 +0,0 @@
-"""
-Security headers middleware for Finance Service
-"""
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """
-    Security headers middleware for Finance Service
-    """
-
-    def __init__(self, app, secure_cookies: bool = True):
-        super().__init__(app)
-        self.secure_cookies = secure_cookies
-
-    async def dispatch(self, request: Request, call_next):
-        """
-        Process request through security headers middleware
-        """
-        response = await call_next(request)
-
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["X-Permitted-Cross-Domain-Policies"] = "none"
-
-        # Add HSTS header for HTTPS
-        if request.url.scheme == "https":
-            response.headers[
-                "Strict-Transport-Security"
-            ] = "max-age=31536000; includeSubDomains"
-
-        # Add cache control headers for API endpoints
-        if request.url.path.startswith("/api/"):
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
-
-        return response
\ No newline at end of file
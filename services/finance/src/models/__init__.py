@@ -1,11 +1,12 @@
 """
 Finance service models
 """
-from src.models.approval import ApprovalAction, ApprovalAudit, ApprovalType, ApprovalStatus
+from src.models.approval import ApprovalAction, ApprovalAudit, ApprovalDailyRollup, ApprovalType, ApprovalStatus
 
 __all__ = [
     "ApprovalAction",
     "ApprovalAudit",
+    "ApprovalDailyRollup",
     "ApprovalType",
     "ApprovalStatus"
 ]
\ No newline at end of file
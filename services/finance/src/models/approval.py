@@ -1,10 +1,10 @@
 """
 Finance approval models
 """
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 from sqlalchemy import (
-    String, Text, DateTime, Numeric, Integer, Boolean, ForeignKey, Enum
+    String, Text, Date, DateTime, Numeric, Integer, BigInteger, Float, Boolean, ForeignKey, Enum
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -244,4 +244,47 @@ class ApprovalAudit(Base):
     )
 
     def __repr__(self) -> str:
-        return f"<ApprovalAudit(approval_action_id={self.approval_action_id}, action={self.action})>"
\ No newline at end of file
+        return f"<ApprovalAudit(approval_action_id={self.approval_action_id}, action={self.action})>"
+
+class ApprovalDailyRollup(Base):
+    """
+    Daily totals of active finance approvals, maintained by triggers on approval_actions
+
+    One row per tenant, day (decision day in UTC, creation day while
+    pending), customer, payment type, status and approver.
+    """
+    __tablename__ = "finance_approval_daily_rollups"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True
+    )
+
+    # Rollup key
+    tenant_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    customer_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    payment_type: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    status: Mapped[str] = mapped_column(String(50), nullable=False)
+    approver_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+
+    # Latest names seen for the key
+    customer_name: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    approver_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+
+    # Totals
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    order_amount: Mapped[float] = mapped_column(Numeric(16, 2), nullable=False, default=0)
+    approved_amount: Mapped[float] = mapped_column(Numeric(16, 2), nullable=False, default=0)
+
+    # Approval times of approved rows with approved_at, in seconds
+    timed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    approval_seconds_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    approval_seconds_min: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    approval_seconds_max: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ApprovalDailyRollup(tenant_id={self.tenant_id}, day={self.day}, status={self.status})>"
@@ -28,7 +28,7 @@ class FinanceApprovalRequest(BaseModel):
 
 class BulkApprovalRequest(BaseModel):
     """Bulk approval request schema"""
-    order_ids: List[str] = Field(..., min_items=1, description="List of order IDs to approve/reject")
+    order_ids: List[str] = Field(..., min_items=1, max_items=500, description="List of order IDs to approve/reject")
     approved: bool = Field(..., description="Whether to approve or reject all orders")
     reason: Optional[str] = Field(None, description="Common reason for approval/rejection")
     notes: Optional[str] = Field(None, description="Additional notes")
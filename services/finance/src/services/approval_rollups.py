@@ -0,0 +1,140 @@
+"""
+Finance approval totals from the daily rollups plus a live edge
+
+``finance_approval_daily_rollups`` holds exact per-day totals of the active
+finance approvals; triggers on ``approval_actions`` keep it current in the
+writing transaction. Report ranges rarely start and end at midnight, so whole
+days inside a range are read from the rollups and only the rows of a partial
+first or last day are aggregated live from ``approval_actions`` into the
+same shape. Reports then group the combined rows like they grouped the raw
+approvals, at a cost that no longer grows with the history.
+
+An approval counts on its decision day in UTC (``approved_at``, or
+``created_at`` while pending), see ``finance_rollup_day`` in migration 035.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, cast, func, not_, select, union_all, String as SQLString
+
+from src.models.approval import ApprovalAction, ApprovalDailyRollup, ApprovalStatus, ApprovalType
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def rollup_day_range(
+    date_from: Optional[datetime],
+    date_to: Optional[datetime]
+) -> Tuple[Optional[date], Optional[date]]:
+    """First and last day lying wholly inside ``[date_from, date_to]``, None for an open end"""
+    first_day = None
+    if date_from is not None:
+        date_from = _as_utc(date_from)
+        first_day = date_from.date() if date_from.time() == time.min else date_from.date() + timedelta(days=1)
+
+    last_day = None
+    if date_to is not None:
+        date_to = _as_utc(date_to)
+        last_day = date_to.date() if date_to.time() == time.max else date_to.date() - timedelta(days=1)
+
+    return first_day, last_day
+
+
+def approval_facts(
+    tenant_id: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+):
+    """
+    Per-day finance approval totals of a tenant within ``[date_from, date_to]``
+
+    Returns a subquery with the rollup columns: day, customer_id,
+    customer_name, payment_type, status, approver_id, approver_name,
+    order_count, order_amount, approved_amount, timed_count,
+    approval_seconds_sum, approval_seconds_min and approval_seconds_max.
+    """
+    first_day, last_day = rollup_day_range(date_from, date_to)
+
+    rollup_conditions = [ApprovalDailyRollup.tenant_id == tenant_id]
+    if first_day is not None:
+        rollup_conditions.append(ApprovalDailyRollup.day >= first_day)
+    if last_day is not None:
+        rollup_conditions.append(ApprovalDailyRollup.day <= last_day)
+
+    rollups = select(
+        ApprovalDailyRollup.day,
+        ApprovalDailyRollup.customer_id,
+        ApprovalDailyRollup.customer_name,
+        ApprovalDailyRollup.payment_type,
+        ApprovalDailyRollup.status,
+        ApprovalDailyRollup.approver_id,
+        ApprovalDailyRollup.approver_name,
+        ApprovalDailyRollup.order_count,
+        ApprovalDailyRollup.order_amount,
+        ApprovalDailyRollup.approved_amount,
+        ApprovalDailyRollup.timed_count,
+        ApprovalDailyRollup.approval_seconds_sum,
+        ApprovalDailyRollup.approval_seconds_min,
+        ApprovalDailyRollup.approval_seconds_max
+    ).where(and_(*rollup_conditions))
+
+    starts_at_midnight = date_from is None or _as_utc(date_from).time() == time.min
+    ends_at_midnight = date_to is None or _as_utc(date_to).time() == time.max
+    if starts_at_midnight and ends_at_midnight:
+        return rollups.subquery()
+
+    # Live rows of the partial first/last day, grouped like the rollups
+    decided_at = func.coalesce(ApprovalAction.approved_at, ApprovalAction.created_at)
+    day = func.finance_rollup_day(ApprovalAction.approved_at, ApprovalAction.created_at)
+    timed = and_(
+        cast(ApprovalAction.status, SQLString) == ApprovalStatus.APPROVED.value,
+        ApprovalAction.approved_at.isnot(None)
+    )
+    approval_seconds = func.extract('epoch', ApprovalAction.approved_at - ApprovalAction.created_at)
+
+    live_conditions = [
+        ApprovalAction.tenant_id == tenant_id,
+        cast(ApprovalAction.approval_type, SQLString) == ApprovalType.FINANCE.value,
+        ApprovalAction.is_active == True
+    ]
+    # The day bounds let idx_approval_actions_tenant_rollup_day narrow the scan
+    if date_from is not None:
+        live_conditions.extend([day >= _as_utc(date_from).date(), decided_at >= date_from])
+    if date_to is not None:
+        live_conditions.extend([day <= _as_utc(date_to).date(), decided_at <= date_to])
+
+    covered_days = []
+    if first_day is not None:
+        covered_days.append(day >= first_day)
+    if last_day is not None:
+        covered_days.append(day <= last_day)
+    live_conditions.append(not_(and_(*covered_days)))
+
+    live = select(
+        day.label('day'),
+        ApprovalAction.customer_id,
+        func.max(ApprovalAction.customer_name).label('customer_name'),
+        ApprovalAction.payment_type,
+        cast(ApprovalAction.status, SQLString).label('status'),
+        ApprovalAction.approver_id,
+        func.max(ApprovalAction.approver_name).label('approver_name'),
+        func.count(ApprovalAction.id).label('order_count'),
+        func.coalesce(func.sum(ApprovalAction.order_amount), 0).label('order_amount'),
+        func.coalesce(func.sum(ApprovalAction.approved_amount), 0).label('approved_amount'),
+        func.count(ApprovalAction.id).filter(timed).label('timed_count'),
+        func.coalesce(func.sum(approval_seconds).filter(timed), 0).label('approval_seconds_sum'),
+        func.min(approval_seconds).filter(timed).label('approval_seconds_min'),
+        func.max(approval_seconds).filter(timed).label('approval_seconds_max')
+    ).where(and_(*live_conditions)).group_by(
+        day,
+        ApprovalAction.customer_id,
+        ApprovalAction.payment_type,
+        ApprovalAction.status,
+        ApprovalAction.approver_id
+    )
+
+    return union_all(rollups, live).subquery()
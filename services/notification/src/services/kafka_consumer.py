@@ -54,6 +54,22 @@ class NotificationKafkaConsumer:
             "priority": "high",
             "recipients": ["admin", "branch_manager"]
         },
+        "order.bulk_approved": {
+            "type": "order_event",
+            "category": "approved",
+            "title_template": "{{order_count}} Orders Approved",
+            "message_template": "{{order_count}} orders have been approved and are now ready for logistics processing: {{order_numbers}}",
+            "priority": "normal",
+            "recipients": ["admin", "branch_manager", "logistics_manager"]
+        },
+        "order.bulk_rejected": {
+            "type": "order_event",
+            "category": "rejected",
+            "title_template": "{{order_count}} Orders Rejected",
+            "message_template": "{{order_count}} orders were rejected: {{order_numbers}}. {% if reason %}Reason: {{reason}}{% endif %}",
+            "priority": "high",
+            "recipients": ["admin", "branch_manager"]
+        },
         "order.logistics_approved": {
             "type": "order_event",
             "category": "logistics_approved",
@@ -126,6 +142,14 @@ class NotificationKafkaConsumer:
             "priority": "high",
             "recipients": []  # Dynamically resolved from notify_roles field
         },
+        "order.bulk_admin_action": {
+            "type": "order_event",
+            "category": "admin_action",
+            "title_template": "Admin Action on {{order_count}} Orders",
+            "message_template": "Admin performed {{action}} on {{order_count}} orders: {{order_numbers}}",
+            "priority": "high",
+            "recipients": []  # Dynamically resolved from notify_roles field
+        },
         "order.due_day_reminder": {
             "type": "order_event",
             "category": "due_day_reminder",
@@ -0,0 +1,146 @@
+"""
+Benchmark the per-request overhead of the audit middleware
+
+Drives a minimal Starlette app directly through ASGI (no server, no network)
+and reports the latency added per request by:
+
+- the previous ``BaseHTTPMiddleware`` audit logging (reproduced below)
+- ``shared.asgi.AuditStage`` in a ``FusedMiddleware`` at full capture and sampled
+
+Audit loggers write to os.devnull so formatting/logging cost is included
+without flooding the terminal:
+
+    python scripts/benchmark_audit_middleware.py [--requests 20000] [--sample-rate 0.1]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add src and the repository root (for shared/) to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parents[3]))
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from shared.asgi import AuditStage, FusedMiddleware
+
+
+class LegacyAuditLoggingMiddleware(BaseHTTPMiddleware):
+    """The previous audit middleware: full request dicts, logged inline"""
+
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        request_data = {
+            "timestamp": time.time(),
+            "method": request.method,
+            "url": str(request.url),
+            "path": request.url.path,
+            "query_params": dict(request.query_params),
+            "client_ip": request.headers.get("x-forwarded-for") or (request.client.host if request.client else "unknown"),
+            "user_agent": request.headers.get("user-agent"),
+        }
+        audit_logger = logging.getLogger("orders_audit")
+        audit_logger.info(f"API Request: {request.method} {request.url.path}", extra={"request_data": request_data})
+        response = await call_next(request)
+        response_data = {"status_code": response.status_code, "duration_ms": round((time.time() - start_time) * 1000, 2)}
+        audit_logger.info(f"API Response: {response.status_code}", extra={"request_data": request_data, "response_data": response_data})
+        request.state.audit_data = {"request": request_data, "response": response_data}
+        return response
+
+
+async def list_orders(request: Request):
+    return JSONResponse({"items": [], "total": 0})
+
+
+def build_app(middleware=None, **options) -> Starlette:
+    app = Starlette(routes=[Route("/api/v1/orders/", list_orders)])
+    if middleware:
+        app.add_middleware(middleware, **options)
+    return app
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/api/v1/orders/",
+    "raw_path": b"/api/v1/orders/",
+    "root_path": "",
+    "query_string": b"page=1&per_page=20&status=pending",
+    "headers": [
+        (b"host", b"orders-service"),
+        (b"user-agent", b"benchmark/1.0"),
+        (b"x-forwarded-for", b"10.0.0.1"),
+        (b"authorization", b"Bearer token"),
+    ],
+    "client": ("127.0.0.1", 50000),
+    "server": ("orders-service", 8003),
+}
+
+
+async def run_requests(app, requests: int) -> List[float]:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    timings = []
+    for _ in range(requests):
+        scope = dict(SCOPE)
+        started = time.perf_counter()
+        await app(scope, receive, send)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def benchmark(requests: int, sample_rate: float):
+    devnull = logging.StreamHandler(open(os.devnull, "w"))
+    for name in ("orders_audit",):
+        audit_logger = logging.getLogger(name)
+        audit_logger.addHandler(devnull)
+        audit_logger.setLevel(logging.INFO)
+        audit_logger.propagate = False
+
+    cases = [
+        ("no audit middleware", build_app()),
+        ("BaseHTTPMiddleware (before)", build_app(LegacyAuditLoggingMiddleware)),
+        ("pure ASGI, sample 1.0", build_app(FusedMiddleware, stages=[AuditStage("orders_audit", sample_rate=1.0, flush_interval=0.05)])),
+        (f"pure ASGI, sample {sample_rate}", build_app(FusedMiddleware, stages=[AuditStage("orders_audit", sample_rate=sample_rate, flush_interval=0.05)])),
+    ]
+
+    print(f"{requests} requests per case\n")
+    print(f"{'case':<32} {'mean':>9} {'p50':>9} {'p99':>9} {'added':>9}")
+    baseline = None
+    for name, app in cases:
+        await run_requests(app, min(1000, requests))  # warm up
+        timings = await run_requests(app, requests)
+        mean = statistics.fmean(timings)
+        p99 = sorted(timings)[int(len(timings) * 0.99)]
+        baseline = mean if baseline is None else baseline
+        print(
+            f"{name:<32} {mean * 1e6:>7.1f}us {statistics.median(timings) * 1e6:>7.1f}us "
+            f"{p99 * 1e6:>7.1f}us {(mean - baseline) * 1e6:>+7.1f}us"
+        )
+        # Let the background writer drain before the next case
+        await asyncio.sleep(0.2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="Requests per case")
+    parser.add_argument("--sample-rate", type=float, default=0.1, help="Sample rate of the sampled case")
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.requests, args.sample_rate))
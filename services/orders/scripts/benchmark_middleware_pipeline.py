@@ -0,0 +1,268 @@
+"""
+Benchmark the fused middleware pipeline against the BaseHTTPMiddleware stack
+
+Drives a minimal Starlette app directly through ASGI (no server, no network)
+with a signed bearer token, ``--concurrency`` requests in flight, and reports
+requests/sec for:
+
+- the previous stack: authentication, tenant isolation, tenant header,
+  audit logging, security headers and metrics as separate
+  ``BaseHTTPMiddleware`` layers (reproduced below; the middleware classes
+  themselves have been removed from ``src.middleware``)
+- ``FusedMiddleware`` with the equivalent stages
+
+A streaming endpoint (100 chunks, like an SSE feed or a proxied download) is
+measured as well, since every ``BaseHTTPMiddleware`` layer re-streams the body:
+
+    python scripts/benchmark_middleware_pipeline.py [--requests 20000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add src and the repository root (for shared/) to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parents[3]))
+
+from prometheus_client import CollectorRegistry, Counter, Histogram
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from src.config_local import settings
+from shared.asgi import FusedMiddleware
+from src.middleware.pipeline import SECURITY_HEADERS, build_pipeline_stages
+from src.security import extract_token_from_header, log_authentication_event, verify_token
+from src.security.auth import create_access_token
+
+logger = logging.getLogger("orders_audit")
+
+
+def metrics():
+    registry = CollectorRegistry()
+    requests_total = Counter("bench_requests_total", "", ["method", "endpoint", "status_code"], registry=registry)
+    request_duration = Histogram("bench_request_duration_seconds", "", ["method", "endpoint"], registry=registry)
+    return requests_total, request_duration
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """The previous ``@app.middleware("http")`` metrics hook"""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.requests_total, self.request_duration = metrics()
+
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        endpoint = request.url.path.split("/")[-1] or "root"
+        self.requests_total.labels(method=request.method, endpoint=endpoint, status_code=str(response.status_code)).inc()
+        self.request_duration.labels(method=request.method, endpoint=endpoint).observe(time.time() - start_time)
+        return response
+
+
+class AuthenticationMiddleware(BaseHTTPMiddleware):
+    """The previous JWT authentication layer"""
+
+    async def dispatch(self, request, call_next):
+        token_data = verify_token(extract_token_from_header(request.headers.get("Authorization")))
+        request.state.user_id = token_data.user_id
+        request.state.tenant_id = token_data.tenant_id
+        request.state.role_id = token_data.role_id
+        request.state.permissions = token_data.permissions
+        request.state.is_super_user = token_data.is_super_user()
+        log_authentication_event("TOKEN_VALIDATED", token_data=token_data, request=request, success=True)
+        return await call_next(request)
+
+
+class TenantIsolationMiddleware(BaseHTTPMiddleware):
+    """The previous tenant isolation layer"""
+
+    async def dispatch(self, request, call_next):
+        tenant_id = getattr(request.state, "tenant_id", None)
+        request_tenant_id = request.headers.get("x-tenant-id")
+        if request_tenant_id and request_tenant_id != tenant_id:
+            return JSONResponse({"detail": "Tenant access denied"}, status_code=403)
+        request.state.validated_tenant_id = tenant_id
+        logger.info(
+            f"API access: user={request.state.user_id}, tenant={tenant_id}, "
+            f"path={request.url.path}, method={request.method}"
+        )
+        return await call_next(request)
+
+
+class TenantHeaderMiddleware(BaseHTTPMiddleware):
+    """The previous tenant response header layer"""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        tenant_id = getattr(request.state, "tenant_id", None)
+        if tenant_id:
+            response.headers["x-tenant-id"] = tenant_id
+        return response
+
+
+class AuditLoggingMiddleware(BaseHTTPMiddleware):
+    """The previous per-request audit logging layer"""
+
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        audit_data = {
+            "method": request.method,
+            "path": request.url.path,
+            "query_params": str(request.query_params),
+            "client_ip": request.client.host if request.client else None,
+            "user_agent": request.headers.get("User-Agent"),
+            "timestamp": datetime.utcnow().isoformat(),
+            "user_id": getattr(request.state, "user_id", None),
+            "tenant_id": getattr(request.state, "tenant_id", None),
+        }
+        logger.info(f"API Request: {request.method} {request.url.path}", extra={"audit_data": audit_data})
+        response = await call_next(request)
+        duration = time.time() - start_time
+        audit_data.update({
+            "status_code": response.status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "success": response.status_code < 400,
+        })
+        logger.info(f"API Response: {response.status_code} in {duration:.3f}s", extra={"audit_data": audit_data})
+        return response
+
+
+class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """The previous security headers layer"""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS.items():
+            response.headers[name] = value
+        return response
+
+
+async def list_orders(request):
+    return JSONResponse({"items": [], "total": 0})
+
+
+async def stream_events(request):
+    async def events():
+        for i in range(100):
+            yield f"data: {i}\n\n".encode()
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def build_app() -> Starlette:
+    return Starlette(routes=[
+        Route("/api/v1/orders/", list_orders),
+        Route("/api/v1/orders/events", stream_events),
+    ])
+
+
+def legacy_app() -> Starlette:
+    app = build_app()
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(AuditLoggingMiddleware)
+    app.add_middleware(AuthenticationMiddleware)
+    app.add_middleware(TenantIsolationMiddleware)
+    app.add_middleware(TenantHeaderMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def fused_app() -> Starlette:
+    app = build_app()
+    requests_total, request_duration = metrics()
+    app.add_middleware(FusedMiddleware, stages=build_pipeline_stages(settings, requests_total, request_duration))
+    return app
+
+
+def make_scope(path: str, token: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"page=1&per_page=20",
+        "headers": [
+            (b"host", b"orders-service"),
+            (b"user-agent", b"benchmark/1.0"),
+            (b"authorization", f"Bearer {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("orders-service", 8003),
+    }
+
+
+async def run(app, path: str, token: str, requests: int, concurrency: int) -> float:
+    """Requests per second with ``concurrency`` requests in flight"""
+    statuses = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def one_request():
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+        await app(make_scope(path, token), receive, send)
+
+    async def worker(count: int):
+        for _ in range(count):
+            await one_request()
+
+    started = time.perf_counter()
+    per_worker = requests // concurrency
+    await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    assert all(status == 200 for status in statuses), f"unexpected statuses: {set(statuses)}"
+    return per_worker * concurrency / elapsed
+
+
+async def benchmark(requests: int, concurrency: int):
+    # Keep log output (auth events, audit records) off the terminal but formatted
+    handler = logging.StreamHandler(open(os.devnull, "w"))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    for existing in list(root.handlers):
+        if existing is not handler:
+            root.removeHandler(existing)
+
+    token = create_access_token(
+        {"sub": "benchmark-user", "tenant_id": "tenant-1", "role_id": "1", "role": "admin"},
+        settings.GLOBAL_JWT_SECRET,
+        algorithm=settings.GLOBAL_JWT_ALGORITHM,
+    )
+    cases = [("BaseHTTPMiddleware stack", legacy_app()), ("fused pure ASGI", fused_app())]
+
+    print(f"{requests} requests per case, {concurrency} in flight\n")
+    print(f"{'stack':<26} {'json req/s':>11} {'stream req/s':>13}")
+    results = {}
+    for name, app in cases:
+        await run(app, "/api/v1/orders/", token, min(2000, requests), concurrency)  # warm up
+        json_rps = await run(app, "/api/v1/orders/", token, requests, concurrency)
+        stream_rps = await run(app, "/api/v1/orders/events", token, max(concurrency, requests // 10), concurrency)
+        results[name] = (json_rps, stream_rps)
+        print(f"{name:<26} {json_rps:>11.0f} {stream_rps:>13.0f}")
+        # Let the audit writer drain before the next case
+        await asyncio.sleep(1.5)
+
+    (before_json, before_stream), (after_json, after_stream) = results.values()
+    print(f"\nspeed-up: json x{after_json / before_json:.2f}, stream x{after_stream / before_stream:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="Requests per case")
+    parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight")
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.requests, args.concurrency))
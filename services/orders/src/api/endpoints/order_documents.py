@@ -1,11 +1,15 @@
 """
 Order Documents API endpoints
 """
-from typing import List
+from email.utils import format_datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 import logging
+import os
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Request, Response
+from fastapi.responses import RedirectResponse, StreamingResponse
+from minio.error import S3Error
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_db
@@ -26,7 +30,10 @@ from src.security import (
     get_current_user_id,
     get_current_tenant_id,
 )
+from src.config import settings
 from src.utils.file_handler import FileHandler
+from src.utils.minio_handler import minio_storage
+from src.services.derivative_pipeline import delete_derivatives, derivative_pipeline
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -92,14 +99,14 @@ async def upload_order_document(
             detail=f"File type {file.content_type} is not allowed"
         )
 
-    if not file_handler.is_valid_file_size(file.size):
+    if file.size is not None and not file_handler.is_valid_file_size(file.size):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File size exceeds maximum limit"
         )
 
-    # Save file
-    file_path, file_hash = await file_handler.save_file(file, order_id)
+    # Stream file to storage; the size limit is enforced again while streaming
+    file_path, file_hash, file_size = await file_handler.save_file(file, order_id)
 
     # Create document record
     document_data = OrderDocumentCreate(
@@ -110,13 +117,16 @@ async def upload_order_document(
         is_required=is_required,
         file_name=file.filename,
         file_path=file_path,
-        file_size=file.size,
+        file_size=file_size,
         mime_type=file.content_type,
         file_hash=file_hash,
         uploaded_by=user_id
     )
 
     document = await document_service.create_document(document_data)
+
+    # Thumbnails/previews are rendered in the background
+    derivative_pipeline.schedule(document.id, document.file_path, document.mime_type)
     return document
 
 
@@ -220,8 +230,9 @@ async def delete_order_document(
             detail="Associated order not found"
         )
 
-    # Delete file from storage
+    # Delete file and its image variants from storage
     await file_handler.delete_file(document.file_path)
+    await delete_derivatives(document.derivatives)
 
     # Delete document record
     await document_service.delete_document(document_id)
@@ -326,8 +337,10 @@ async def upload_delivery_proof_document(
             detail=f"File size exceeds maximum limit of 10MB for delivery proof"
         )
 
-    # Save file to MinIO
-    file_path, file_hash = await file_handler.save_file(file, str(order_id))
+    # Stream file to MinIO, enforcing the delivery proof limit mid-stream
+    file_path, file_hash, file_size = await file_handler.save_file(
+        file, str(order_id), max_size=max_delivery_proof_size
+    )
 
     # Create document record - use order.id (actual database UUID) for foreign key
     document_data = OrderDocumentCreate(
@@ -338,7 +351,7 @@ async def upload_delivery_proof_document(
         is_required=False,
         file_name=file.filename,
         file_path=file_path,
-        file_size=file.size or 0,
+        file_size=file_size,
         mime_type=file.content_type,
         file_hash=file_hash,
         uploaded_by=user_id
@@ -346,6 +359,9 @@ async def upload_delivery_proof_document(
 
     document = await document_service.create_document(document_data)
 
+    # Thumbnails/previews for the trip and order screens, rendered in the background
+    derivative_pipeline.schedule(document.id, document.file_path, document.mime_type)
+
     # Mark order items as delivered - update all items for this specific order only
     from src.models.order_item import OrderItem
     from sqlalchemy import update
@@ -437,7 +453,9 @@ async def get_delivery_proof_documents(
                 "description": doc.description,
                 "is_required": doc.is_required,
                 # Additional field for frontend - backend proxy URL
-                "download_url": download_url
+                "download_url": download_url,
+                # Thumbnail/preview URLs are derived from these once rendered
+                "derivatives": doc.derivatives
             }
             documents_with_urls.append(doc_dict)
 
@@ -454,13 +472,22 @@ async def get_delivery_proof_documents(
 @router.get("/documents/{document_id}/download")
 async def download_document_proxy(
     document_id: UUID,
+    request: Request,
+    mode: str = Query("proxy", regex="^(proxy|redirect|url)$", description="proxy streams the file, redirect/url hand out a presigned URL"),
+    variant: Optional[str] = Query(None, regex="^(thumbnail|preview)$", description="Resized image variant instead of the original"),
     db: AsyncSession = Depends(get_db),
     token_data: TokenData = Depends(require_any_permission(["order_documents:read", "order_documents:read_own"])),
     tenant_id: str = Depends(get_current_tenant_id),
 ):
     """
-    Proxy endpoint to download documents from MinIO.
-    This streams the actual file content.
+    Download a document from MinIO.
+
+    - ``mode=redirect``: 302 to a short-lived presigned URL, bytes bypass this service
+    - ``mode=url``: return the presigned URL and its lifetime as JSON
+    - ``mode=proxy`` (default): stream the file, with Range and If-None-Match support
+
+    ``variant=thumbnail|preview`` serves a resized WebP of an image document.
+    Until the variant has been rendered the original is served.
     """
     document_service = OrderDocumentService(db)
 
@@ -484,52 +511,133 @@ async def download_document_proxy(
             detail="Associated order not found"
         )
 
-    # Stream file from MinIO to client
-    from fastapi.responses import StreamingResponse
-    from minio import Minio
-    from minio.error import S3Error
-    import os
+    object_path = document.file_path
+    mime_type = document.mime_type
+    file_name = document.file_name
+
+    if variant:
+        derivative = (document.derivatives or {}).get(variant)
+        if derivative:
+            object_path = derivative["path"]
+            mime_type = derivative["mime_type"]
+            file_name = f"{os.path.splitext(file_name)[0]}_{variant}.webp"
+        else:
+            # Not rendered yet (or uploaded before variants existed)
+            derivative_pipeline.schedule(document.id, document.file_path, document.mime_type)
+
+    # Use 'inline' instead of 'attachment' so images/PDFs display in browser
+    content_disposition = f'inline; filename="{file_name}"'
+
+    if mode in ("redirect", "url"):
+        expires_in = settings.DOCUMENT_URL_EXPIRY
+        url = minio_storage.generate_presigned_url(
+            object_path,
+            expires_in=expires_in,
+            response_headers={
+                "response-content-disposition": content_disposition,
+                "response-content-type": mime_type,
+            }
+        )
+        if mode == "url":
+            return {"url": url, "expires_in": expires_in}
+        return RedirectResponse(
+            url,
+            status_code=status.HTTP_302_FOUND,
+            headers={"Cache-Control": "private, no-store"}
+        )
 
     try:
-        # Initialize MinIO client
-        minio_client = Minio(
-            endpoint=os.getenv("MINIO_ENDPOINT", "minio:9000"),
-            access_key=os.getenv("MINIO_ROOT_USER", "minioadmin"),
-            secret_key=os.getenv("MINIO_ROOT_PASSWORD", "minioadmin"),
-            secure=False
+        stat = await minio_storage.stat_object(object_path)
+    except S3Error as e:
+        if e.code == "NoSuchKey":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="File not found in storage"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve file from storage: {str(e)}"
         )
 
-        # Get object from MinIO
-        response = minio_client.get_object(
-            bucket_name="order-documents",
-            object_name=document.file_path
-        )
+    etag = f'"{stat.etag}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=3600",  # Cache for 1 hour
+        "Content-Disposition": content_disposition,
+    }
+    if stat.last_modified:
+        headers["Last-Modified"] = format_datetime(stat.last_modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    size = stat.size
+    offset, length = 0, size
+    status_code = status.HTTP_200_OK
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        byte_range = _parse_range(range_header, size)
+        if byte_range is None:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{size}", "ETag": etag}
+            )
+        offset, end = byte_range
+        length = end - offset + 1
+        headers["Content-Range"] = f"bytes {offset}-{end}/{size}"
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+
+    headers["Content-Length"] = str(length)
 
-        # Stream the file with inline disposition for browser preview
-        # Use 'inline' instead of 'attachment' so images/PDFs display in browser
-        def iterfile():
-            yield from response.stream(8192)
-
-        return StreamingResponse(
-            iterfile(),
-            media_type=document.mime_type,
-            headers={
-                "Content-Disposition": f'inline; filename="{document.file_name}"',
-                "Cache-Control": "public, max-age=3600",  # Cache for 1 hour
-            }
+    try:
+        body = await minio_storage.stream_object(
+            object_path,
+            offset=offset,
+            length=length if status_code == status.HTTP_206_PARTIAL_CONTENT else 0
         )
-
     except S3Error as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve file from storage: {str(e)}"
         )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error downloading document {document_id}: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to download document"
-        )
\ No newline at end of file
+    return StreamingResponse(
+        body,
+        status_code=status_code,
+        media_type=mime_type,
+        headers=headers
+    )
+
+
+def _parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range into inclusive (start, end) offsets.
+
+    Returns None when the range is unsatisfiable; multi-range requests are
+    served as the first range only.
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec or size == 0:
+        return None
+
+    first = spec.split(",")[0].strip()
+    start_text, _, end_text = first.partition("-")
+    try:
+        if not start_text:
+            # Suffix range: the last N bytes
+            suffix = int(end_text)
+            if suffix <= 0:
+                return None
+            return max(size - suffix, 0), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
@@ -3,25 +3,34 @@ Orders API endpoints
 """
 from typing import List, Optional, Dict
 from uuid import UUID, uuid4
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 from httpx import AsyncClient
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc, asc, func, cast, String
+from sqlalchemy import select, and_, or_, desc, asc, func, cast, String, literal_column
 
 from src.database import get_db
 from src.models.order import Order, OrderStatus
+from src.models.order_item import OrderItem
 from src.schemas import (
     OrderCreate,
     OrderUpdate,
     OrderResponse,
     OrderListResponse,
     OrderListPaginatedResponse,
+    OrderAggregateGroup,
+    OrderAggregateResponse,
+    OrderCountResponse,
+    OrderProjectionRequest,
+    OrderProjectionResponse,
     OrderStatusUpdate,
     TmsOrderStatusUpdate,
     ItemStatusUpdate,
+    BulkItemStatusUpdate,
     FinanceApprovalRequest,
+    BulkFinanceApprovalRequest,
     LogisticsApprovalRequest,
     OrderQueryParams,
     PaginatedResponse,
@@ -36,6 +45,7 @@ from src.security import (
 )
 import logging
 from src.services.order_service import OrderService
+from src.services.snapshots import ensure_order_snapshots
 
 logger = logging.getLogger(__name__)
 
@@ -43,85 +53,98 @@ logger = logging.getLogger(__name__)
 COMPANY_SERVICE_URL = "http://company-service:8002"
 
 
-async def fetch_customers_by_ids(customer_ids: List[str], tenant_id: str, headers: dict = None) -> Dict[str, dict]:
-    """Fetch customers by IDs from company service"""
-    if not customer_ids:
-        return {}
-
-    customers_map = {}
-
-    # Company service doesn't have batch get by IDs, so we fetch individually
-    async with AsyncClient(timeout=30.0) as client:
-        for customer_id in customer_ids:
-            try:
-                response = await client.get(
-                    f"{COMPANY_SERVICE_URL}/customers/{customer_id}",
-                    params={"tenant_id": tenant_id},
-                    headers=headers or {}
-                )
-
-                if response.status_code == 200:
-                    customer_data = response.json()
-                    customers_map[customer_id] = customer_data
-                else:
-                    logger.error(f"Failed to fetch customer {customer_id}: {response.status_code}")
-            except Exception as e:
-                logger.error(f"Error fetching customer {customer_id}: {str(e)}")
-
-    return customers_map
+router = APIRouter()
 
 
-async def fetch_latest_status_history(
-    db: AsyncSession,
-    order_ids: List[str],
-    tenant_id: str
-) -> Dict[str, datetime]:
+async def _get_assigned_branch_ids(tenant_id: str, auth_headers: dict) -> Optional[List[str]]:
     """
-    Fetch the latest status change timestamp for multiple orders in a single query.
+    IDs of the branches assigned to the calling user in the company service
 
-    Returns: Dict mapping order_id -> most recent status change timestamp
+    Returns None if the company service could not be asked, in which case
+    callers leave the branch filter off.
     """
-    from src.models.order_status_history import OrderStatusHistory
-    from sqlalchemy import func
-
-    # Subquery to get the latest status history entry for each order
-    # Join with orders table to filter by tenant_id
-    latest_history_subquery = (
-        select(
-            OrderStatusHistory.order_id,
-            func.max(OrderStatusHistory.created_at).label('latest_created_at')
-        )
-        .join(Order, Order.id == OrderStatusHistory.order_id)
-        .where(
-            and_(
-                OrderStatusHistory.order_id.in_(order_ids),
-                Order.tenant_id == tenant_id
-            )
-        )
-        .group_by(OrderStatusHistory.order_id)
-        .subquery()
-    )
-
-    # Main query to get the latest history records
-    query = (
-        select(OrderStatusHistory)
-        .join(
-            latest_history_subquery,
-            and_(
-                OrderStatusHistory.order_id == latest_history_subquery.c.order_id,
-                OrderStatusHistory.created_at == latest_history_subquery.c.latest_created_at
+    try:
+        async with AsyncClient(timeout=30.0) as client:
+            branches_response = await client.get(
+                f"{COMPANY_SERVICE_URL}/branches/my/assigned",
+                params={
+                    "is_active": True,
+                    "per_page": 100,
+                    "tenant_id": tenant_id
+                },
+                headers=auth_headers
             )
-        )
-    )
+            logger.info(f"ORDERS SERVICE - Company service branches response status: {branches_response.status_code}")
 
-    result = await db.execute(query)
-    history_records = result.scalars().all()
+            if branches_response.status_code == 200:
+                branches_data = branches_response.json()
+                return [branch["id"] for branch in branches_data.get("items", [])]
+            logger.error(f"ORDERS SERVICE - Failed to fetch assigned branches: {branches_response.status_code}, response: {branches_response.text}")
+    except Exception as e:
+        logger.error(f"ORDERS SERVICE - Error fetching assigned branches: {str(e)}", exc_info=True)
+    return None
 
-    # Build mapping: order_id -> latest status change timestamp
-    return {record.order_id: record.created_at for record in history_records}
 
+async def _visible_order_filters(token_data: TokenData, tenant_id: str, auth_headers: dict) -> Optional[list]:
+    """
+    Tenant and assigned-branch filters of the orders the caller may see
 
-router = APIRouter()
+    Returns None if the caller is not an admin and has no assigned branches,
+    i.e. sees no orders at all.
+    """
+    filters = [Order.tenant_id == tenant_id, Order.is_active == True]
+    if token_data.role != "Admin":
+        assigned_branch_ids = await _get_assigned_branch_ids(tenant_id, auth_headers)
+        if assigned_branch_ids is not None:
+            if not assigned_branch_ids:
+                return None
+            filters.append(Order.branch_id.in_(assigned_branch_ids))
+    return filters
+
+
+# Columns /counts can group by
+ORDER_COUNT_COLUMNS = {
+    "status": Order.status,
+    "branch_id": Order.branch_id,
+    "priority": Order.priority,
+    "payment_type": Order.payment_type,
+    "order_type": Order.order_type,
+    "tms_order_status": Order.tms_order_status,
+}
+
+# Fields /projection can return: the order columns, plus "customer" (the
+# stored customer snapshot) and "items" (the stored order items)
+ORDER_PROJECTION_COLUMNS = {
+    column.key: column for column in Order.__table__.columns if column.key != "tenant_id"
+}
+ORDER_PROJECTION_EXTRA_FIELDS = ("customer", "items")
+
+
+def _plain_value(value):
+    """Numeric columns come back as Decimal, which would serialize as a string"""
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def _project_item(item: OrderItem) -> dict:
+    """Stored item data, preferring the product snapshot like the order list"""
+    product_data = item.product_snapshot or {}
+    return {
+        'id': item.id,
+        'product_id': item.product_id,
+        'product_name': product_data.get('name', item.product_name),
+        'product_code': product_data.get('code', item.product_code),
+        'description': product_data.get('description', item.description),
+        'quantity': item.quantity,
+        'unit': product_data.get('unit', item.unit),
+        'unit_price': float(item.unit_price) if item.unit_price else None,
+        'total_price': float(item.total_price) if item.total_price else None,
+        'weight': float(item.weight) if item.weight else None,
+        'weight_type': product_data.get('weight_type', 'fixed'),
+        'fixed_weight': float(product_data.get('fixed_weight', product_data.get('weight', 0))) if product_data.get('fixed_weight') or product_data.get('weight') else None,
+        'weight_unit': product_data.get('weight_unit', 'kg'),
+        'total_weight': float(item.weight * item.quantity) if item.weight and item.quantity else None,
+        'volume': float(item.volume) if item.volume else None,
+    }
 
 
 @router.get("/", response_model=OrderListPaginatedResponse)
@@ -141,6 +164,8 @@ async def list_orders(
     page_size: int = Query(None, description="Page size (deprecated, use per_page)"),
     sort_by: str = Query("created_at", regex="^(created_at|updated_at|order_number|total_amount)$"),
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    include_items: bool = Query(True, description="Include the items with their trip assignments"),
+    count: str = Query("exact", regex="^(exact|estimated)$", description="Exact total, or the planner's estimate for large filters"),
     db: AsyncSession = Depends(get_db),
     token_data: TokenData = Depends(require_permissions(["orders:read"])),
     tenant_id: str = Depends(get_current_tenant_id),
@@ -161,52 +186,18 @@ async def list_orders(
 
     order_service = OrderService(db, auth_headers, tenant_id)
 
-    # Build filters
-    filters = [Order.tenant_id == tenant_id, Order.is_active == True]
-
-    # Check if user is Admin - if not, filter by assigned branches
-    is_admin = token_data.role == "Admin"
-    logger.info(f"Orders access check - user_id: {token_data.user_id}, role: {token_data.role}, is_admin: {is_admin}")
-
-    if not is_admin:
-        # Fetch assigned branches for non-admin users
-        logger.info(f"ORDERS SERVICE - Non-admin user detected, fetching assigned branches from company service")
-        try:
-            async with AsyncClient(timeout=30.0) as client:
-                branches_response = await client.get(
-                    f"{COMPANY_SERVICE_URL}/branches/my/assigned",
-                    params={
-                        "is_active": True,
-                        "per_page": 100,
-                        "tenant_id": tenant_id
-                    },
-                    headers=auth_headers
-                )
-                logger.info(f"ORDERS SERVICE - Company service branches response status: {branches_response.status_code}")
-
-                if branches_response.status_code == 200:
-                    branches_data = branches_response.json()
-                    assigned_branch_ids = [branch["id"] for branch in branches_data.get("items", [])]
-                    logger.info(f"ORDERS SERVICE - Assigned branches for user {token_data.user_id}: {assigned_branch_ids}")
-
-                    if assigned_branch_ids:
-                        # Filter orders by assigned branches
-                        filters.append(Order.branch_id.in_(assigned_branch_ids))
-                        logger.info(f"ORDERS SERVICE - Filtering orders by assigned branches: {assigned_branch_ids}")
-                    else:
-                        # No assigned branches - return empty result
-                        logger.warning(f"ORDERS SERVICE - No assigned branches found for user {token_data.user_id}")
-                        return OrderListPaginatedResponse(
-                            items=[],
-                            total=0,
-                            page=page,
-                            per_page=per_page or 20,
-                            pages=0
-                        )
-                else:
-                    logger.error(f"ORDERS SERVICE - Failed to fetch assigned branches: {branches_response.status_code}, response: {branches_response.text}")
-        except Exception as e:
-            logger.error(f"ORDERS SERVICE - Error fetching assigned branches: {str(e)}", exc_info=True)
+    # Tenant and assigned-branch visibility, shared with /counts, /aggregate and /projection
+    filters = await _visible_order_filters(token_data, tenant_id, auth_headers)
+    if filters is None:
+        # No assigned branches - return empty result
+        logger.warning(f"ORDERS SERVICE - No assigned branches found for user {token_data.user_id}")
+        return OrderListPaginatedResponse(
+            items=[],
+            total=0,
+            page=page,
+            per_page=per_page or 20,
+            pages=0
+        )
 
     if status:
         filters.append(Order.status == status.value)
@@ -242,13 +233,11 @@ async def list_orders(
         filters=filters,
         order_by=order_by,
         page=page,
-        page_size=limit
+        page_size=limit,
+        include_items=include_items,
+        estimate_count=count == "estimated"
     )
 
-    # Fetch latest status history for all orders
-    order_ids = [order.id for order in orders]
-    latest_status_changes = await fetch_latest_status_history(db, order_ids, tenant_id)
-
     # Get current UTC time once for consistent calculations
     current_time = datetime.now(timezone.utc)
 
@@ -263,56 +252,16 @@ async def list_orders(
     # Prepare enriched orders with customer data and items count
     enriched_orders = []
 
-    # Get unique customer IDs from orders
-    customer_ids = list(set([order.customer_id for order in orders]))
-
-    # Get unique product IDs from order items
-    product_ids = set()
-    for order in orders:
-        if hasattr(order, 'items') and order.items:
-            for item in order.items:
-                product_ids.add(item.product_id)
-
-    # Fetch customer data in batch
-    customers_data = {}
-    if customer_ids:
-        try:
-            customers_data = await fetch_customers_by_ids(customer_ids, tenant_id, auth_headers)
-        except Exception as e:
-            logger.error(f"Failed to fetch customers: {e}")
-
-    # Fetch product data in batch
-    products_data = {}
-    if product_ids:
-        try:
-            order_service = OrderService(db, auth_headers, tenant_id)
-            for product_id in product_ids:
-                product = await order_service._fetch_product_details(product_id)
-                products_data[product_id] = product
-        except Exception as e:
-            logger.error(f"Failed to fetch products: {e}")
+    # Customer and product details come from the snapshots stored on each
+    # order; only orders saved before snapshots existed need a backfill
+    await ensure_order_snapshots(db, orders, order_service, tenant_id, auth_headers)
 
-    # Fetch trip_item_assignments for ALL orders to get status breakdown
-    from src.models.trip_item_assignment import TripItemAssignment
-    from src.models.order_item import OrderItem
+    # Trip item assignments (newest first) came with the page for the status breakdown
     order_ids = [order.id for order in orders]
+    all_trip_assignments = [assignment for order in orders for assignment in order.trip_assignments]
 
-    trip_assignments_query = select(TripItemAssignment).where(
-        and_(
-            TripItemAssignment.order_id.in_(order_ids),
-            TripItemAssignment.tenant_id == tenant_id
-        )
-    ).order_by(TripItemAssignment.updated_at.desc())
-
-    trip_assignments_result = await db.execute(trip_assignments_query)
-    all_trip_assignments = trip_assignments_result.scalars().all()
-
-    # Fetch order_items to get original weight and volume values (critical for correct per-unit calculations)
-    order_items_query = select(OrderItem).where(
-        OrderItem.order_id.in_(order_ids)
-    )
-    order_items_result = await db.execute(order_items_query)
-    all_order_items = order_items_result.scalars().all()
+    # The loaded order_items give the original weight and volume values (critical for correct per-unit calculations)
+    all_order_items = [item for order in orders for item in order.items]
 
     # Create a map of order_item_id -> original weight per unit (from database)
     original_weight_by_item_id = {item.id: float(item.weight) if item.weight else 0 for item in all_order_items}
@@ -327,8 +276,8 @@ async def list_orders(
     seen_trip_item_pairs = set()
 
     for assignment in all_trip_assignments:
-        item_id = assignment.order_item_id
-        trip_id = assignment.trip_id
+        item_id = assignment["order_item_id"]
+        trip_id = assignment["trip_id"]
         pair_key = (item_id, trip_id)
 
         # Only keep the latest status for each (item, trip) pair
@@ -338,12 +287,13 @@ async def list_orders(
             if item_id not in assignments_by_item:
                 assignments_by_item[item_id] = []
 
+            # Timestamps are already ISO strings from the JSON aggregate
             assignments_by_item[item_id].append({
-                "trip_id": assignment.trip_id,
-                "assigned_quantity": assignment.assigned_quantity,
-                "item_status": assignment.item_status,
-                "assigned_at": assignment.assigned_at.isoformat() if assignment.assigned_at else None,
-                "updated_at": assignment.updated_at.isoformat() if assignment.updated_at else None
+                "trip_id": assignment["trip_id"],
+                "assigned_quantity": assignment["assigned_quantity"],
+                "item_status": assignment["item_status"],
+                "assigned_at": assignment["assigned_at"],
+                "updated_at": assignment["updated_at"]
             })
 
     logger.info(f"Fetched {len(all_trip_assignments)} trip assignments for {len(order_ids)} orders")
@@ -358,6 +308,7 @@ async def list_orders(
         # Because items_json contains the split item data (even when fully assigned)
         # EXCLUDE: Delivered orders should show complete order from order_items, not items_json
         is_partial_order = (
+            include_items and
             hasattr(order, 'tms_order_status') and
             order.tms_order_status in ("partial", "fully_assigned") and
             hasattr(order, 'items_json') and
@@ -518,8 +469,8 @@ async def list_orders(
         elif hasattr(order, 'items') and order.items:
             # For non-partial orders, use the original items from the relationship
             for item in order.items:
-                # Get real product data if available, otherwise fall back to stored data
-                product_data = products_data.get(item.product_id, {})
+                # Use the product snapshot if available, otherwise fall back to stored columns
+                product_data = item.product_snapshot or {}
 
                 # Get assignments from trip_item_assignments for this item
                 item_assignments = assignments_by_item.get(item.id, [])
@@ -565,7 +516,7 @@ async def list_orders(
 
         # Calculate time in current status
         try:
-            current_status_since = latest_status_changes.get(order.id, order.created_at)
+            current_status_since = order.status_changed_at or order.created_at
 
             # Ensure both datetimes are timezone-aware for proper comparison
             if current_status_since.tzinfo is None:
@@ -607,10 +558,11 @@ async def list_orders(
             'delivery_date': order.delivery_date,
             'created_at': order.created_at,
             'updated_at': order.updated_at,
-            'customer': customers_data.get(order.customer_id),
+            'customer': order.customer_snapshot,
             'items': items_data,
             # For items_count, use sum of original_quantity for partial orders (shows full original quantity), otherwise count items
-            'items_count': sum(item.get('original_quantity', item.get('quantity', 0)) for item in items_data) if is_partial_order else len(items_data),
+            'items_count': sum(item.get('original_quantity', item.get('quantity', 0)) for item in items_data) if is_partial_order else order.items_count,
+            'documents_count': order.documents_count,
             # Include TMS JSON fields for reference
             'items_json': getattr(order, 'items_json', None),
             'remaining_items_json': getattr(order, 'remaining_items_json', None),
@@ -630,6 +582,243 @@ async def list_orders(
     )
 
 
+@router.get("/aggregate", response_model=OrderAggregateResponse)
+async def aggregate_orders(
+    request: Request,
+    statuses: Optional[List[OrderStatus]] = Query(None, alias="status", description="Only count these order statuses"),
+    branch_id: Optional[str] = Query(None, description="Filter by branch ID"),
+    payment_type: Optional[str] = Query(None, description="Filter by payment type"),
+    date_from: Optional[datetime] = Query(None, description="Filter by date from"),
+    date_to: Optional[datetime] = Query(None, description="Filter by date to"),
+    bucket: Optional[str] = Query(None, regex="^(day|week|month)$", description="Group created_at by day, week or month"),
+    db: AsyncSession = Depends(get_db),
+    token_data: TokenData = Depends(require_permissions(["orders:read"])),
+    tenant_id: str = Depends(get_current_tenant_id),
+):
+    """
+    Count orders and sum their amounts grouped by status, date bucket and payment type
+
+    Applies the same tenant and assigned-branch visibility as the order list,
+    in one grouped query instead of paging through the orders.
+    """
+    auth_headers = {}
+    auth_header = request.headers.get("authorization")
+    if auth_header:
+        auth_headers["Authorization"] = auth_header
+
+    filters = await _visible_order_filters(token_data, tenant_id, auth_headers)
+    if filters is None:
+        return OrderAggregateResponse(bucket=bucket, groups=[], total_count=0, total_amount=0)
+
+    if statuses:
+        filters.append(Order.status.in_([s.value for s in statuses]))
+    if branch_id:
+        filters.append(Order.branch_id == branch_id)
+    if payment_type:
+        filters.append(Order.payment_type == payment_type)
+    if date_from:
+        filters.append(Order.created_at >= date_from)
+    if date_to:
+        filters.append(Order.created_at <= date_to)
+
+    group_columns = [Order.status, Order.payment_type]
+    if bucket:
+        # Inline the validated unit: a bound parameter would differ between
+        # the SELECT and GROUP BY expressions
+        group_columns.insert(1, func.date_trunc(literal_column(f"'{bucket}'"), Order.created_at).label("bucket"))
+
+    result = await db.execute(
+        select(
+            *group_columns,
+            func.count(Order.id).label("count"),
+            func.coalesce(func.sum(Order.total_amount), 0).label("total_amount")
+        )
+        .where(and_(*filters))
+        .group_by(*group_columns)
+        .order_by(*group_columns)
+    )
+
+    groups = [
+        OrderAggregateGroup(
+            status=row.status,
+            bucket=row.bucket if bucket else None,
+            payment_type=row.payment_type,
+            count=row.count,
+            total_amount=float(row.total_amount)
+        )
+        for row in result.all()
+    ]
+
+    return OrderAggregateResponse(
+        bucket=bucket,
+        groups=groups,
+        total_count=sum(group.count for group in groups),
+        total_amount=sum(group.total_amount for group in groups)
+    )
+
+
+@router.get("/counts", response_model=OrderCountResponse)
+async def count_orders(
+    request: Request,
+    group_by: List[str] = Query(["status"], description="Columns to group by: status, branch_id, priority, payment_type, order_type, tms_order_status"),
+    statuses: Optional[List[OrderStatus]] = Query(None, alias="status", description="Only count these order statuses"),
+    branch_id: Optional[str] = Query(None, description="Filter by branch ID"),
+    customer_id: Optional[str] = Query(None, description="Filter by customer ID"),
+    priority: Optional[str] = Query(None, description="Filter by priority"),
+    date_from: Optional[datetime] = Query(None, description="Filter by date from"),
+    date_to: Optional[datetime] = Query(None, description="Filter by date to"),
+    db: AsyncSession = Depends(get_db),
+    token_data: TokenData = Depends(require_permissions(["orders:read"])),
+    tenant_id: str = Depends(get_current_tenant_id),
+):
+    """
+    Count orders grouped by status, branch, priority or other order columns
+
+    One grouped query with the same tenant and assigned-branch visibility as
+    the order list.
+    """
+    unknown = [column for column in group_by if column not in ORDER_COUNT_COLUMNS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Cannot group orders by: {', '.join(unknown)}"
+        )
+    group_by = list(dict.fromkeys(group_by))
+
+    auth_headers = {}
+    auth_header = request.headers.get("authorization")
+    if auth_header:
+        auth_headers["Authorization"] = auth_header
+
+    filters = await _visible_order_filters(token_data, tenant_id, auth_headers)
+    if filters is None:
+        return OrderCountResponse(group_by=group_by, groups=[], total=0)
+
+    if statuses:
+        filters.append(Order.status.in_([s.value for s in statuses]))
+    if branch_id:
+        filters.append(Order.branch_id == branch_id)
+    if customer_id:
+        filters.append(Order.customer_id == customer_id)
+    if priority:
+        filters.append(Order.priority == priority)
+    if date_from:
+        filters.append(Order.created_at >= date_from)
+    if date_to:
+        filters.append(Order.created_at <= date_to)
+
+    group_columns = [ORDER_COUNT_COLUMNS[column].label(column) for column in group_by]
+    result = await db.execute(
+        select(*group_columns, func.count(Order.id).label("count"))
+        .where(and_(*filters))
+        .group_by(*group_columns)
+        .order_by(*group_columns)
+    )
+
+    groups = [dict(row._mapping) for row in result.all()]
+    return OrderCountResponse(
+        group_by=group_by,
+        groups=groups,
+        total=sum(group["count"] for group in groups)
+    )
+
+
+@router.post("/projection", response_model=OrderProjectionResponse)
+async def project_orders(
+    payload: OrderProjectionRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    token_data: TokenData = Depends(require_permissions(["orders:read"])),
+    tenant_id: str = Depends(get_current_tenant_id),
+):
+    """
+    Look up orders returning only the requested fields
+
+    For internal callers that need a few fields of many orders. ``fields``
+    names order columns plus ``customer`` and ``items``, which are read from
+    what is stored on the order; ``ids_only`` returns just the order IDs.
+    Orders are matched by ``ids`` or ``order_numbers`` and the filters, with
+    the visibility of the order list, in one query (and one more for items).
+    Unlike the order list there is no snapshot backfill and no trip
+    assignment enrichment. Results are ordered newest first; page through
+    them with ``offset`` until fewer than ``limit`` orders come back.
+    """
+    fields = ["id"] if payload.ids_only else list(dict.fromkeys(payload.fields))
+    unknown = [
+        field for field in fields
+        if field not in ORDER_PROJECTION_COLUMNS and field not in ORDER_PROJECTION_EXTRA_FIELDS
+    ]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown order fields: {', '.join(unknown)}"
+        )
+
+    auth_headers = {}
+    auth_header = request.headers.get("authorization")
+    if auth_header:
+        auth_headers["Authorization"] = auth_header
+
+    filters = await _visible_order_filters(token_data, tenant_id, auth_headers)
+    if filters is None:
+        return OrderProjectionResponse(fields=fields, total=0)
+
+    if payload.ids is not None or payload.order_numbers is not None:
+        filters.append(or_(
+            Order.id.in_(payload.ids or []),
+            Order.order_number.in_(payload.order_numbers or [])
+        ))
+    if payload.statuses:
+        filters.append(Order.status.in_([s.value for s in payload.statuses]))
+    if payload.branch_id:
+        filters.append(Order.branch_id == payload.branch_id)
+    if payload.customer_id:
+        filters.append(Order.customer_id == payload.customer_id)
+    if payload.priority:
+        filters.append(Order.priority == payload.priority)
+    if payload.payment_type:
+        filters.append(Order.payment_type == payload.payment_type)
+    if payload.date_from:
+        filters.append(Order.created_at >= payload.date_from)
+    if payload.date_to:
+        filters.append(Order.created_at <= payload.date_to)
+
+    columns = [Order.id.label("projection_order_id")]
+    columns.extend(ORDER_PROJECTION_COLUMNS[field] for field in fields if field in ORDER_PROJECTION_COLUMNS)
+    if "customer" in fields:
+        columns.append(Order.customer_snapshot.label("customer"))
+
+    result = await db.execute(
+        select(*columns)
+        .where(and_(*filters))
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .offset(payload.offset)
+        .limit(payload.limit)
+    )
+    rows = result.all()
+
+    if payload.ids_only:
+        return OrderProjectionResponse(fields=fields, ids=[row.projection_order_id for row in rows], total=len(rows))
+
+    items_by_order: Dict[str, List[dict]] = {}
+    if "items" in fields and rows:
+        items_result = await db.execute(
+            select(OrderItem).where(OrderItem.order_id.in_([row.projection_order_id for row in rows]))
+        )
+        for item in items_result.scalars().all():
+            items_by_order.setdefault(item.order_id, []).append(_project_item(item))
+
+    projected = []
+    for row in rows:
+        values = row._mapping
+        entry = {field: _plain_value(values[field]) for field in fields if field != "items"}
+        if "items" in fields:
+            entry["items"] = items_by_order.get(row.projection_order_id, [])
+        projected.append(entry)
+
+    return OrderProjectionResponse(fields=fields, items=projected, total=len(projected))
+
+
 @router.get("/{order_id}")
 async def get_order(
     order_id: str,
@@ -654,19 +843,9 @@ async def get_order(
             detail="Order not found"
         )
 
-    # Fetch customer data
-    customer_data = None
-    try:
-        async with AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{COMPANY_SERVICE_URL}/customers/{order.customer_id}",
-                params={"tenant_id": tenant_id},
-                headers=auth_headers
-            )
-            if response.status_code == 200:
-                customer_data = response.json()
-    except Exception as e:
-        logger.error(f"Error fetching customer {order.customer_id}: {str(e)}")
+    # Customer details come from the order's snapshot
+    await ensure_order_snapshots(db, [order], order_service, tenant_id, auth_headers)
+    customer_data = order.customer_snapshot
 
     # Prepare order data with customer info
     order_dict = {
@@ -920,6 +1099,45 @@ async def finance_approval(
     return order
 
 
+@router.post("/finance-approval/bulk", response_model=dict)
+async def bulk_finance_approval(
+    approval_data: BulkFinanceApprovalRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    token_data: TokenData = Depends(require_permissions(["orders:approve_finance"])),
+    tenant_id: str = Depends(get_current_tenant_id),
+    user_id: str = Depends(get_current_user_id),
+):
+    """
+    Approve or reject several submitted orders in finance in one transaction
+
+    Orders that are missing or not submitted are reported in ``failed``;
+    the rest are moved together and returned in ``reviewed``.
+    """
+    auth_headers = {}
+    auth_header = request.headers.get("authorization")
+    if auth_header:
+        auth_headers["Authorization"] = auth_header
+
+    order_service = OrderService(db, auth_headers=auth_headers)
+
+    reviewed, failed = await order_service.bulk_finance_approval(
+        approval_data.order_ids,
+        approval_data.approved,
+        user_id,
+        tenant_id,
+        approval_data.reason,
+        user_role=token_data.role
+    )
+
+    logger.info(
+        f"Bulk finance {'approval' if approval_data.approved else 'rejection'}: "
+        f"{len(reviewed)} orders moved, {len(failed)} failed"
+    )
+
+    return {"reviewed": reviewed, "failed": failed}
+
+
 @router.post("/{order_id}/logistics-approval", response_model=OrderResponse)
 async def logistics_approval(
     order_id: str,
@@ -1123,6 +1341,54 @@ async def update_tms_order_status(
     return order
 
 
+# Map item status to order status events
+ITEM_STATUS_TO_EVENT = {
+    "picked_up": "picked_up",
+    "on_route": "in_transit",
+    "delivered": "delivered",
+    "failed": "failed",
+    "returned": "returned"
+}
+
+
+def _publish_item_status_event(order: Order, item_status: str, trip_id: Optional[str], tenant_id: str):
+    """Publish the order event matching an item status change (no-op for statuses without one)"""
+    event_type = ITEM_STATUS_TO_EVENT.get(item_status)
+    if not event_type:
+        return
+
+    try:
+        from src.services.kafka_producer import order_event_producer
+
+        # Publish different events based on status
+        if event_type in ("picked_up", "in_transit", "delivered"):
+            order_event_producer.publish_order_status_changed(
+                order_id=str(order.id),
+                order_number=order.order_number,
+                tenant_id=tenant_id,
+                status=event_type,
+                additional_data={
+                    "trip_id": trip_id
+                }
+            )
+        elif event_type == "failed":
+            order_event_producer.publish_order_failed_delivery(
+                order_id=str(order.id),
+                order_number=order.order_number,
+                tenant_id=tenant_id
+            )
+        elif event_type == "returned":
+            order_event_producer.publish_order_returned(
+                order_id=str(order.id),
+                order_number=order.order_number,
+                tenant_id=tenant_id
+            )
+
+        logger.info(f"Published order.{event_type} event for order {order.order_number}")
+    except Exception as e:
+        logger.error(f"Failed to publish Kafka event for item status {item_status}: {e}")
+
+
 @router.post("/item-status", response_model=dict)
 async def update_item_status(
     status_data: ItemStatusUpdate,
@@ -1287,68 +1553,7 @@ async def update_item_status(
     await db.commit()
 
     # Publish Kafka events for delivery status changes
-    # Map item status to order status events
-    item_status_to_event = {
-        "picked_up": "picked_up",
-        "on_route": "in_transit",
-        "delivered": "delivered",
-        "failed": "failed",
-        "returned": "returned"
-    }
-
-    if status_data.item_status in item_status_to_event:
-        try:
-            from src.services.kafka_producer import order_event_producer
-
-            event_type = item_status_to_event[status_data.item_status]
-
-            # Publish different events based on status
-            if event_type == "picked_up":
-                order_event_producer.publish_order_status_changed(
-                    order_id=str(order.id),
-                    order_number=order.order_number,
-                    tenant_id=token_data.tenant_id,
-                    status="picked_up",
-                    additional_data={
-                        "trip_id": status_data.trip_id
-                    }
-                )
-            elif event_type == "in_transit":
-                order_event_producer.publish_order_status_changed(
-                    order_id=str(order.id),
-                    order_number=order.order_number,
-                    tenant_id=token_data.tenant_id,
-                    status="in_transit",
-                    additional_data={
-                        "trip_id": status_data.trip_id
-                    }
-                )
-            elif event_type == "delivered":
-                order_event_producer.publish_order_status_changed(
-                    order_id=str(order.id),
-                    order_number=order.order_number,
-                    tenant_id=token_data.tenant_id,
-                    status="delivered",
-                    additional_data={
-                        "trip_id": status_data.trip_id
-                    }
-                )
-            elif event_type == "failed":
-                order_event_producer.publish_order_failed_delivery(
-                    order_id=str(order.id),
-                    order_number=order.order_number,
-                    tenant_id=token_data.tenant_id
-                )
-            elif event_type == "returned":
-                order_event_producer.publish_order_returned(
-                    order_id=str(order.id),
-                    order_number=order.order_number,
-                    tenant_id=token_data.tenant_id
-                )
-
-            logger.info(f"Published order.{event_type} event for order {order.order_number}")
-        except Exception as e:
-            logger.error(f"Failed to publish Kafka event for item status {status_data.item_status}: {e}")
+    _publish_item_status_event(order, status_data.item_status, status_data.trip_id, token_data.tenant_id)
 
     logger.info(f"Updated {updated_count} order_items, {trip_assignments_updated} trip_item_assignments updated, {trip_assignments_deleted} deleted for order {status_data.order_id} to status {status_data.item_status}")
 
@@ -1363,6 +1568,109 @@ async def update_item_status(
     }
 
 
+@router.post("/item-status/bulk", response_model=dict)
+async def update_item_status_bulk(
+    bulk_data: BulkItemStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    token_data: TokenData = Depends(require_permissions(["orders:update"])),
+    tenant_id: str = Depends(get_current_tenant_id),
+):
+    """
+    Update item statuses of several orders on one trip (called by the TMS delivery journal)
+
+    Applies the same changes as ``/item-status`` for each entry, restricted to the
+    items assigned to ``trip_id``, with one UPDATE per distinct status instead of a
+    round trip and row-by-row update per order. When an order appears more than
+    once, its last entry wins. Everything commits together; order events are
+    published afterwards.
+    """
+    from sqlalchemy import update
+    from src.models.order_item import OrderItem
+    from src.models.trip_item_assignment import TripItemAssignment
+
+    # Last status per order number, keeping first-seen order for event publishing
+    final_status: Dict[str, str] = {}
+    for entry in bulk_data.updates:
+        final_status.pop(entry.order_id, None)
+        final_status[entry.order_id] = entry.item_status
+
+    order_result = await db.execute(
+        select(Order).where(
+            and_(
+                Order.order_number.in_(list(final_status)),
+                Order.tenant_id == tenant_id
+            )
+        )
+    )
+    orders_by_number = {order.order_number: order for order in order_result.scalars().all()}
+    missing = [number for number in final_status if number not in orders_by_number]
+
+    order_ids_by_status: Dict[str, List] = {}
+    for order_number, item_status in final_status.items():
+        order = orders_by_number.get(order_number)
+        if order:
+            order_ids_by_status.setdefault(item_status, []).append(order.id)
+
+    updated_count = 0
+    trip_assignments_updated = 0
+    for item_status, order_ids in order_ids_by_status.items():
+        assignment_result = await db.execute(
+            update(TripItemAssignment)
+            .where(
+                and_(
+                    TripItemAssignment.order_id.in_(order_ids),
+                    TripItemAssignment.trip_id == bulk_data.trip_id
+                )
+            )
+            .values(item_status=item_status)
+            .execution_options(synchronize_session=False)
+        )
+        trip_assignments_updated += assignment_result.rowcount
+
+        # trip_item_assignments is the source of truth for which items belong to this trip
+        assigned_items = select(TripItemAssignment.order_item_id).where(
+            and_(
+                TripItemAssignment.order_id.in_(order_ids),
+                TripItemAssignment.trip_id == bulk_data.trip_id
+            )
+        )
+        item_result = await db.execute(
+            update(OrderItem)
+            .where(
+                and_(
+                    OrderItem.order_id.in_(order_ids),
+                    OrderItem.id.in_(assigned_items)
+                )
+            )
+            .values(item_status=item_status, trip_id=bulk_data.trip_id)
+            .execution_options(synchronize_session=False)
+        )
+        updated_count += item_result.rowcount
+
+    await db.commit()
+
+    for order_number, item_status in final_status.items():
+        order = orders_by_number.get(order_number)
+        if order:
+            _publish_item_status_event(order, item_status, bulk_data.trip_id, token_data.tenant_id)
+
+    if missing:
+        logger.warning(f"Bulk item status for trip {bulk_data.trip_id}: orders not found {missing}")
+    logger.info(
+        f"Bulk item status for trip {bulk_data.trip_id}: {len(orders_by_number)} orders, "
+        f"{updated_count} order_items, {trip_assignments_updated} trip_item_assignments updated"
+    )
+
+    return {
+        "message": f"Updated {updated_count} order_items and {trip_assignments_updated} trip_item_assignments for {len(orders_by_number)} orders",
+        "updated_count": updated_count,
+        "trip_assignments_updated": trip_assignments_updated,
+        "orders_updated": len(orders_by_number),
+        "missing_orders": missing,
+        "trip_id": bulk_data.trip_id,
+    }
+
+
 @router.post("/{order_id}/cancel", response_model=OrderResponse)
 async def cancel_order(
     order_id: str,
@@ -1934,6 +2242,165 @@ async def bulk_get_order_item_assignments(
     return result
 
 
+# Window re-sent on every delta sync: updated_at comes from the writing
+# replica's clock and is stamped before commit
+SYNC_CHANGES_OVERLAP = timedelta(seconds=30)
+
+
+@router.post("/trip-item-assignments/changes")
+async def get_trip_sync_changes(
+    request_data: dict,
+    db: AsyncSession = Depends(get_db),
+    token_data: TokenData = Depends(require_permissions(["orders:read"])),
+    tenant_id: str = Depends(get_current_tenant_id),
+):
+    """
+    Item assignments and delivery proof documents of trips changed since a cursor.
+
+    Used by the driver delta sync, so devices only download what changed.
+
+    Request body:
+    {
+        "trip_ids": ["TRIP-...", ...],
+        "since": "2026-01-05T10:00:00+00:00",   (omit for everything)
+        "full_trip_ids": ["TRIP-...", ...]      (sent in full regardless of since,
+                                                 e.g. trips new to the device)
+    }
+
+    Returns the changed rows, the ids of assignments removed from these trips
+    since ``since`` (``deleted_item_assignments``, apply first), and the
+    ``cursor`` to pass as ``since`` next time. The cursor trails the current
+    time by SYNC_CHANGES_OVERLAP, so recent rows may be sent again; clients
+    upsert by id. Removals are kept for DRIVER_SYNC_TOMBSTONE_RETENTION_DAYS;
+    older cursors need a sync without ``since``.
+    """
+    from src.models.trip_item_assignment import TripItemAssignment, TripItemAssignmentTombstone
+    from src.models.order_item import OrderItem
+    from src.models.order_document import OrderDocument
+
+    trip_ids = request_data.get("trip_ids", [])
+    full_trip_ids = request_data.get("full_trip_ids", [])
+    since = request_data.get("since")
+    if since:
+        try:
+            since = datetime.fromisoformat(since)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="since must be an ISO 8601 timestamp")
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
+    cursor = datetime.now(timezone.utc) - SYNC_CHANGES_OVERLAP
+    if not trip_ids:
+        return {"cursor": cursor.isoformat(), "item_assignments": [], "deleted_item_assignments": [], "documents": []}
+
+    assignment_filters = [
+        TripItemAssignment.trip_id.in_(trip_ids),
+        TripItemAssignment.tenant_id == tenant_id,
+    ]
+    if since:
+        assignment_filters.append(or_(
+            TripItemAssignment.updated_at >= since,
+            TripItemAssignment.trip_id.in_(full_trip_ids)
+        ))
+
+    assignments_result = await db.execute(
+        select(
+            TripItemAssignment,
+            OrderItem.product_name,
+            OrderItem.product_code,
+            OrderItem.unit,
+        )
+        .join(OrderItem, OrderItem.id == TripItemAssignment.order_item_id)
+        .where(and_(*assignment_filters))
+    )
+    item_assignments = [
+        {
+            "id": str(assignment.id),
+            "trip_id": assignment.trip_id,
+            "order_id": assignment.order_id,
+            "order_number": assignment.order_number,
+            "order_item_id": assignment.order_item_id,
+            "product_name": product_name,
+            "product_code": product_code,
+            "unit": unit,
+            "assigned_quantity": assignment.assigned_quantity,
+            "item_status": assignment.item_status,
+            "updated_at": assignment.updated_at.isoformat() if assignment.updated_at else None,
+        }
+        for assignment, product_name, product_code, unit in assignments_result.all()
+    ]
+
+    # Assignments hard-deleted from these trips (removed from the trip, skipped at loading)
+    deleted_item_assignments = []
+    if since:
+        tombstones_result = await db.execute(
+            select(TripItemAssignmentTombstone).where(
+                and_(
+                    TripItemAssignmentTombstone.trip_id.in_(trip_ids),
+                    TripItemAssignmentTombstone.tenant_id == tenant_id,
+                    TripItemAssignmentTombstone.deleted_at >= since
+                )
+            )
+        )
+        deleted_item_assignments = [
+            {"id": str(tombstone.assignment_id), "trip_id": tombstone.trip_id}
+            for tombstone in tombstones_result.scalars().all()
+        ]
+
+    # Delivery proofs of every order on these trips
+    def orders_on(trips: List[str]):
+        return (
+            select(TripItemAssignment.order_id)
+            .where(
+                and_(
+                    TripItemAssignment.trip_id.in_(trips),
+                    TripItemAssignment.tenant_id == tenant_id
+                )
+            )
+            .distinct()
+        )
+
+    document_filters = [
+        OrderDocument.order_id.in_(orders_on(trip_ids)),
+        OrderDocument.document_type == "delivery_proof",
+    ]
+    if since:
+        document_filters.append(or_(
+            OrderDocument.updated_at >= since,
+            OrderDocument.order_id.in_(orders_on(full_trip_ids))
+        ))
+
+    documents_result = await db.execute(
+        select(OrderDocument, Order.order_number)
+        .join(Order, Order.id == OrderDocument.order_id)
+        .where(and_(*document_filters, Order.tenant_id == tenant_id))
+    )
+    documents = [
+        {
+            "id": str(doc.id),
+            "order_id": str(doc.order_id),
+            "order_number": order_number,
+            "document_type": doc.document_type,
+            "title": doc.title,
+            "file_name": doc.file_name,
+            "file_size": doc.file_size,
+            "mime_type": doc.mime_type,
+            "is_verified": doc.is_verified,
+            "download_url": f"/api/orders/documents/{str(doc.id)}/download",
+            "derivatives": doc.derivatives,
+            "updated_at": doc.updated_at.isoformat() if doc.updated_at else None,
+        }
+        for doc, order_number in documents_result.all()
+    ]
+
+    return {
+        "cursor": cursor.isoformat(),
+        "item_assignments": item_assignments,
+        "deleted_item_assignments": deleted_item_assignments,
+        "documents": documents
+    }
+
+
 @router.get("/{order_id}/items-with-assignments")
 async def get_order_items_with_assignments(
     order_id: str,
@@ -61,6 +61,16 @@ class Settings(BaseSettings):
     MINIO_ROOT_PASSWORD: str = "minioadmin"
     MINIO_SECURE: bool = False
     MINIO_BUCKET: str = "order-documents"
+    MINIO_REGION: str = "us-east-1"
+    MINIO_POOL_SIZE: int = 32
+    DOCUMENT_URL_EXPIRY: int = 300  # seconds a presigned download URL stays valid
+
+    # Image derivatives (thumbnails/previews) rendered in a process pool
+    IMAGE_DERIVATIVES_ENABLED: bool = True
+    IMAGE_DERIVATIVE_WORKERS: int = 2
+
+    # Driver delta sync: days removed assignments are kept; must not be shorter than the driver service's
+    DRIVER_SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
 
     # External services
     AUTH_SERVICE_URL: str = "http://localhost:8001"
@@ -115,6 +115,9 @@ class OrdersSettings(BaseSettings):
     # Audit Logging
     AUDIT_LOG_ENABLED: bool = os.getenv("AUDIT_LOG_ENABLED", "true").lower() == "true"
     AUDIT_LOG_LEVEL: str = os.getenv("AUDIT_LOG_LEVEL", "INFO")
+    # Fraction of ordinary requests audited; sensitive routes are always audited
+    AUDIT_SAMPLE_RATE: float = float(os.getenv("AUDIT_SAMPLE_RATE", "1.0"))
+    AUDIT_REQUEST_BUFFER_SIZE: int = int(os.getenv("AUDIT_REQUEST_BUFFER_SIZE", "10000"))
 
     # File upload settings
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB
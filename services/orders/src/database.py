@@ -72,6 +72,19 @@ async def get_company_db_session():
             await session.close()
 
 
+AUDIT_LOG_INSERT = text("""
+    INSERT INTO audit_logs (
+        tenant_id, user_id, user_name, user_email, user_role,
+        action, module, entity_type, entity_id,
+        description, from_status, to_status, created_at
+    ) VALUES (
+        :tenant_id, :user_id, :user_name, :user_email, :user_role,
+        :action, :module, :entity_type, :entity_id,
+        :description, :from_status, :to_status, NOW()
+    )
+""")
+
+
 async def write_audit_log_to_company(
     entity_id: str,
     entity_type: str,
@@ -104,19 +117,7 @@ async def write_audit_log_to_company(
         tenant_id: Tenant ID
     """
     async with CompanyAsyncSessionLocal() as session:
-        query = text("""
-            INSERT INTO audit_logs (
-                tenant_id, user_id, user_name, user_email, user_role,
-                action, module, entity_type, entity_id,
-                description, from_status, to_status, created_at
-            ) VALUES (
-                :tenant_id, :user_id, :user_name, :user_email, :user_role,
-                :action, :module, :entity_type, :entity_id,
-                :description, :from_status, :to_status, NOW()
-            )
-        """)
-
-        await session.execute(query, {
+        await session.execute(AUDIT_LOG_INSERT, {
             "tenant_id": tenant_id or "",
             "user_id": user_id or "",
             "user_name": user_name,
@@ -131,3 +132,34 @@ async def write_audit_log_to_company(
             "to_status": to_status
         })
         await session.commit()
+
+
+async def write_audit_logs_to_company(entries: list):
+    """
+    Write several audit logs to company_db in one statement
+
+    Args:
+        entries: Dicts with the keyword arguments of write_audit_log_to_company
+    """
+    if not entries:
+        return
+
+    async with CompanyAsyncSessionLocal() as session:
+        await session.execute(AUDIT_LOG_INSERT, [
+            {
+                "tenant_id": entry.get("tenant_id") or "",
+                "user_id": entry.get("user_id") or "",
+                "user_name": entry.get("user_name"),
+                "user_email": entry.get("user_email"),
+                "user_role": entry.get("user_role"),
+                "action": entry["action"],
+                "module": entry["module"],
+                "entity_type": entry["entity_type"],
+                "entity_id": entry["entity_id"],
+                "description": entry.get("description") or f"{entry['action']} {entry['entity_type']} {entry['entity_id']}",
+                "from_status": entry.get("from_status"),
+                "to_status": entry.get("to_status")
+            }
+            for entry in entries
+        ])
+        await session.commit()
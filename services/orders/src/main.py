@@ -3,7 +3,6 @@ Orders Service Main Application
 """
 import logging
 from contextlib import asynccontextmanager
-import time
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -17,14 +16,15 @@ from jose import JWTError
 from src.api.endpoints import orders, order_documents, resources, tenant_cleanup, due_days
 from src.config_local import OrdersSettings
 from src.database import engine, Base
-from src.middleware import (
-    SecurityHeadersMiddleware,
-    TenantIsolationMiddleware,
-    AuditLoggingMiddleware,
-    RateLimitMiddleware,
-)
-from src.middleware.tenant import TenantHeaderMiddleware
-from src.middleware.auth import AuthenticationMiddleware
+from src.services.permission_cache import permission_cache
+from src.services.snapshots import company_change_listener
+from src.services.audit_client import audit_shipper
+from src.utils.minio_handler import minio_storage
+from src.services.derivative_pipeline import derivative_pipeline
+from src.services.sync_tombstones import sync_tombstone_pruner
+from src.middleware import RateLimitMiddleware
+from shared.asgi import FusedMiddleware
+from src.middleware.pipeline import build_pipeline_stages
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -80,9 +80,33 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Failed to initialize Kafka producer: {e}. Order events will not be published.")
 
+    # Shared permission cache with push invalidation from the auth service
+    await permission_cache.initialize()
+
+    # Keep customer/product snapshots of open orders in step with the company service
+    await company_change_listener.initialize()
+
+    # Background delivery of buffered audit events
+    await audit_shipper.start()
+
+    # Shared, pooled MinIO client for document storage
+    await minio_storage.initialize()
+
+    # Worker processes rendering document thumbnails/previews
+    await derivative_pipeline.initialize()
+
+    # Daily pruning of expired trip item assignment tombstones
+    await sync_tombstone_pruner.initialize()
+
     yield
 
     logger.info("Shutting down orders service")
+    await sync_tombstone_pruner.shutdown()
+    await derivative_pipeline.shutdown()
+    await minio_storage.shutdown()
+    await audit_shipper.stop()
+    await company_change_listener.shutdown()
+    await permission_cache.shutdown()
 
     # Close Kafka producer
     try:
@@ -103,23 +127,6 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Add security middleware (order matters - add in reverse order of execution)
-# Security headers should be added first (outermost)
-app.add_middleware(
-    SecurityHeadersMiddleware,
-    secure_cookies=settings.ENV == "production"
-)
-
-# Audit logging for all requests
-app.add_middleware(
-    AuditLoggingMiddleware,
-    log_requests=True,
-    log_responses=True,
-    log_headers=False,
-    log_body=False,
-    exclude_health_checks=True
-)
-
 # Rate limiting - Increased limits for 30-40 concurrent users
 # Each user can make ~100 requests/minute, with higher limits for sensitive endpoints
 app.add_middleware(
@@ -138,14 +145,15 @@ app.add_middleware(
     }
 )
 
-# Authentication middleware (optional - doesn't block requests)
-app.add_middleware(AuthenticationMiddleware)
-
-# Tenant isolation for multi-tenancy (after authentication so tenant context is available)
-app.add_middleware(TenantIsolationMiddleware)
-
-# Tenant Headers (adds tenant info to response)
-app.add_middleware(TenantHeaderMiddleware)
+# Authentication, tenant resolution, sampled audit logging, metrics and
+# security headers in a single pure ASGI pass (runs before rate limiting,
+# which keys on the authenticated user)
+middleware_stages = build_pipeline_stages(
+    settings,
+    requests_total=http_requests_total,
+    request_duration=http_request_duration_seconds,
+)
+app.add_middleware(FusedMiddleware, stages=middleware_stages)
 
 # Add standard middleware
 app.add_middleware(
@@ -163,36 +171,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add metrics tracking middleware
-
-
-@app.middleware("http")
-async def metrics_middleware(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-
-    # Calculate request duration
-    duration = time.time() - start_time
-
-    # Get endpoint path (simplified)
-    endpoint = request.url.path
-    if endpoint.startswith("/api/v1/"):
-        endpoint = endpoint.split("/")[-1] or "root"
-
-    # Record metrics
-    http_requests_total.labels(
-        method=request.method,
-        endpoint=endpoint,
-        status_code=str(response.status_code)
-    ).inc()
-
-    http_request_duration_seconds.labels(
-        method=request.method,
-        endpoint=endpoint
-    ).observe(duration)
-
-    return response
-
 
 # Metrics endpoint
 @app.get("/metrics")
@@ -205,7 +183,15 @@ async def metrics():
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "orders-service"}
+    return {
+        "status": "healthy",
+        "service": "orders-service",
+        "audit": audit_shipper.get_stats(),
+        "image_derivatives": derivative_pipeline.get_stats(),
+        "company_changes": company_change_listener.get_stats(),
+        "sync_tombstones": sync_tombstone_pruner.get_status(),
+        "middleware": {stage.name: stage.get_stats() for stage in middleware_stages},
+    }
 
 
 @app.get("/ready", tags=["Health"])
@@ -1,17 +1,8 @@
 """
 Middleware module for Orders Service
 """
-from .security import SecurityHeadersMiddleware
-from .tenant import TenantContextMiddleware, TenantIsolationMiddleware
-from .auth import AuthenticationMiddleware
-from .audit import AuditLoggingMiddleware
 from .rate_limit import RateLimitMiddleware
 
 __all__ = [
-    "SecurityHeadersMiddleware",
-    "TenantContextMiddleware",
-    "TenantIsolationMiddleware",
-    "AuthenticationMiddleware",
-    "AuditLoggingMiddleware",
     "RateLimitMiddleware",
-]
\ No newline at end of file
+]
@@ -4,7 +4,7 @@ Order model definitions
 from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
-    String, Text, DateTime, Numeric, Integer, Boolean, ForeignKey, JSON
+    String, Text, DateTime, Numeric, Integer, Boolean, ForeignKey, JSON, func
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB
@@ -94,6 +94,13 @@ class Order(Base):
         default="draft",
         index=True
     )
+    # Maintained by the track_orders_status_change trigger
+    status_changed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        server_default=func.now()
+    )
+    previous_status: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     priority: Mapped[str] = mapped_column(
         String(20),
         nullable=False,
@@ -109,6 +116,14 @@ class Order(Base):
     items_json: Mapped[Optional[object]] = mapped_column(JSONB, nullable=True)
     remaining_items_json: Mapped[Optional[object]] = mapped_column(JSONB, nullable=True)
 
+    # Customer details captured from the company service when the order is
+    # saved, so reads need no network fan-out
+    customer_snapshot: Mapped[Optional[object]] = mapped_column(JSONB, nullable=True)
+    customer_snapshot_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True
+    )
+
     # Pickup and delivery addresses
     pickup_address: Mapped[str] = mapped_column(Text, nullable=True)
     pickup_contact_name: Mapped[str] = mapped_column(String(100), nullable=True)
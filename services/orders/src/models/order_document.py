@@ -7,7 +7,7 @@ from sqlalchemy import (
     String, Text, Enum, ForeignKey, DateTime
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 import enum
 
@@ -85,6 +85,11 @@ class OrderDocument(Base):
         index=True,
         comment="SHA-256 hash of the file"
     )
+    derivatives: Mapped[Optional[dict]] = mapped_column(
+        JSONB,
+        nullable=True,
+        comment="Resized image variants: name -> {path, mime_type, size, width, height}"
+    )
 
     # Document status
     is_required: Mapped[bool] = mapped_column(
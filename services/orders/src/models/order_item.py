@@ -7,7 +7,7 @@ from sqlalchemy import (
     String, Text, Numeric, Integer, ForeignKey, DateTime
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 
 from src.database import Base
@@ -77,6 +77,11 @@ class OrderItem(Base):
         nullable=True,
         comment="Volume per unit"
     )
+    product_snapshot: Mapped[Optional[object]] = mapped_column(
+        JSONB,
+        nullable=True,
+        comment="Product details captured from the product service when the item was saved"
+    )
     dimensions_length: Mapped[Optional[float]] = mapped_column(
         Numeric(8, 2),
         nullable=True
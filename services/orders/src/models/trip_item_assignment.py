@@ -1,5 +1,5 @@
 """Trip Item Assignment Model"""
-from sqlalchemy import Column, String, Integer, DateTime, CheckConstraint
+from sqlalchemy import BigInteger, Column, String, Integer, DateTime, CheckConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -30,3 +30,14 @@ class TripItemAssignment(Base):
     # Timestamps
     assigned_at = Column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class TripItemAssignmentTombstone(Base):
+    """Trip item assignment removed from a trip, written by a trigger for the driver delta sync"""
+    __tablename__ = "trip_item_assignment_tombstones"
+
+    id = Column(BigInteger, primary_key=True)
+    assignment_id = Column(UUID(as_uuid=True), nullable=False)
+    trip_id = Column(String(50), nullable=False, index=True)
+    tenant_id = Column(String(255), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
@@ -8,10 +8,18 @@ from src.schemas.order import (
     OrderResponse,
     OrderListResponse,
     OrderListPaginatedResponse,
+    OrderAggregateGroup,
+    OrderAggregateResponse,
+    OrderCountResponse,
+    OrderProjectionRequest,
+    OrderProjectionResponse,
     OrderStatusUpdate,
     TmsOrderStatusUpdate,
     ItemStatusUpdate,
+    BulkItemStatusEntry,
+    BulkItemStatusUpdate,
     FinanceApprovalRequest,
+    BulkFinanceApprovalRequest,
     LogisticsApprovalRequest,
     OrderQueryParams,
     OrderStatusHistoryResponse,
@@ -49,10 +57,18 @@ __all__ = [
     "OrderResponse",
     "OrderListResponse",
     "OrderListPaginatedResponse",
+    "OrderAggregateGroup",
+    "OrderAggregateResponse",
+    "OrderCountResponse",
+    "OrderProjectionRequest",
+    "OrderProjectionResponse",
     "OrderStatusUpdate",
     "TmsOrderStatusUpdate",
     "ItemStatusUpdate",
+    "BulkItemStatusEntry",
+    "BulkItemStatusUpdate",
     "FinanceApprovalRequest",
+    "BulkFinanceApprovalRequest",
     "LogisticsApprovalRequest",
     "OrderQueryParams",
     "OrderStatusHistoryResponse",
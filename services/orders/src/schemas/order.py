@@ -238,6 +238,7 @@ class OrderListResponse(BaseModel):
     customer: Optional[dict] = None  # Customer details from company service
     items: List[dict] = []  # Order items with product details
     items_count: int = 0  # Number of items in the order (backward compatibility)
+    documents_count: int = 0  # Number of documents attached to the order
     created_by_role: Optional[str] = None  # Role of user who created the order
 
     # Time in current status fields
@@ -254,6 +255,55 @@ class OrderListPaginatedResponse(BaseModel):
     pages: int
 
 
+class OrderAggregateGroup(BaseModel):
+    """Order count and amount of one status / date bucket / payment type"""
+    status: str
+    bucket: Optional[datetime] = None  # Start of the created_at bucket, None when not bucketed
+    payment_type: Optional[str] = None
+    count: int
+    total_amount: float
+
+
+class OrderAggregateResponse(BaseModel):
+    """Schema for grouped order counts and amounts"""
+    bucket: Optional[str] = None
+    groups: List[OrderAggregateGroup]
+    total_count: int
+    total_amount: float
+
+
+class OrderCountResponse(BaseModel):
+    """Schema for order counts grouped by the requested columns"""
+    group_by: List[str]
+    groups: List[Dict[str, Any]]  # One {column: value, ..., "count": n} per group
+    total: int
+
+
+class OrderProjectionRequest(BaseModel):
+    """Schema for a lean order lookup returning only the requested fields"""
+    ids: Optional[List[str]] = Field(None, max_length=1000)
+    order_numbers: Optional[List[str]] = Field(None, max_length=1000)
+    statuses: Optional[List[OrderStatus]] = None
+    branch_id: Optional[str] = None
+    customer_id: Optional[str] = None
+    priority: Optional[str] = None
+    payment_type: Optional[str] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    fields: List[str] = Field(default_factory=lambda: ["id", "order_number"], min_length=1)
+    ids_only: bool = False
+    limit: int = Field(1000, ge=1, le=5000)
+    offset: int = Field(0, ge=0)
+
+
+class OrderProjectionResponse(BaseModel):
+    """Schema for projected orders; ``ids`` only is filled for ids_only lookups"""
+    fields: List[str]
+    items: List[Dict[str, Any]] = []
+    ids: List[str] = []
+    total: int
+
+
 # Status update schemas
 class OrderStatusUpdate(BaseModel):
     """Schema for updating order status"""
@@ -279,6 +329,18 @@ class ItemStatusUpdate(BaseModel):
     item_ids: Optional[List[str]] = None  # If provided, only update specific items
 
 
+class BulkItemStatusEntry(BaseModel):
+    """One order's new item status within a bulk update"""
+    order_id: str  # Order number
+    item_status: str = Field(..., pattern="^(pending_to_assign|planning|loading|on_route|delivered|failed|returned)$")
+
+
+class BulkItemStatusUpdate(BaseModel):
+    """Schema for updating item statuses of several orders on one trip (TMS delivery journal)"""
+    trip_id: str
+    updates: List[BulkItemStatusEntry] = Field(..., min_length=1, max_length=500)
+
+
 class FinanceApprovalRequest(BaseModel):
     """Schema for finance approval/rejection"""
     approved: bool
@@ -287,6 +349,13 @@ class FinanceApprovalRequest(BaseModel):
     payment_type: Optional[PaymentType] = None
 
 
+class BulkFinanceApprovalRequest(BaseModel):
+    """Schema for approving/rejecting several orders in finance at once"""
+    order_ids: List[str] = Field(..., min_length=1, max_length=500)
+    approved: bool
+    reason: Optional[str] = None
+
+
 class LogisticsApprovalRequest(BaseModel):
     """Schema for logistics approval/rejection"""
     approved: bool
@@ -2,9 +2,9 @@
 Order Document Pydantic schemas for API requests and responses
 """
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 from uuid import UUID
-from pydantic import BaseModel, Field, ConfigDict, validator
+from pydantic import BaseModel, Field, ConfigDict, validator, model_validator
 
 from src.models.order_document import DocumentType
 
@@ -55,6 +55,20 @@ class OrderDocumentResponse(OrderDocumentBase):
     created_at: datetime
     updated_at: datetime
     download_url: Optional[str] = None  # Presigned URL for downloading the file
+    derivatives: Optional[Dict[str, Any]] = None  # Resized image variants, once rendered
+    thumbnail_url: Optional[str] = None
+    preview_url: Optional[str] = None
+
+    @model_validator(mode="after")
+    def set_variant_urls(self):
+        """Backend proxy URLs of the rendered image variants"""
+        variants = self.derivatives or {}
+        base_url = f"/api/orders/documents/{self.id}/download"
+        if self.thumbnail_url is None and "thumbnail" in variants:
+            self.thumbnail_url = f"{base_url}?variant=thumbnail"
+        if self.preview_url is None and "preview" in variants:
+            self.preview_url = f"{base_url}?variant=preview"
+        return self
 
 
 class DocumentVerificationRequest(BaseModel):
@@ -0,0 +1,153 @@
+"""
+Background thumbnail/preview generation for image documents
+
+After an image document is stored, ``derivative_pipeline.schedule`` queues a
+job that reads the original from MinIO, renders the derivatives in a process
+pool (decoding and resampling are CPU bound and would otherwise stall the
+event loop), stores them next to the original and records them in
+``order_documents.derivatives``. Downloads with ``?variant=thumbnail`` or
+``?variant=preview`` then serve a few kilobytes instead of the original.
+Documents uploaded before derivatives existed get them queued on the first
+variant request.
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import update
+
+from src.config import settings
+from src.database import AsyncSessionLocal
+from src.models.order_document import OrderDocument
+from src.utils.image_derivatives import (
+    DERIVATIVE_MIME_TYPE,
+    derivative_path,
+    is_image,
+    render_derivatives,
+)
+from src.utils.minio_handler import minio_storage
+
+logger = logging.getLogger(__name__)
+
+# Largest original that is rendered; bigger uploads keep serving the original
+MAX_SOURCE_SIZE = 20 * 1024 * 1024
+
+
+class DerivativePipeline:
+    """Renders image derivatives in a process pool, off the request path"""
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._pending: Set[str] = set()
+        self.stats = {"generated": 0, "failed": 0}
+
+    async def initialize(self):
+        """Start the worker processes"""
+        if not settings.IMAGE_DERIVATIVES_ENABLED or self._executor:
+            return
+        workers = max(1, settings.IMAGE_DERIVATIVE_WORKERS)
+        # spawn: never fork a process that is running an event loop and threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        # Bounds originals held in memory while waiting for a worker
+        self._semaphore = asyncio.Semaphore(workers * 2)
+        logger.info(f"Image derivative pipeline started with {workers} worker(s)")
+
+    async def shutdown(self, timeout: float = 10.0):
+        """Let running jobs finish briefly, then stop the workers"""
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+            for task in self._tasks:
+                task.cancel()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def schedule(self, document_id: Any, object_path: str, mime_type: str) -> bool:
+        """
+        Queue derivative generation for a stored document.
+
+        Returns False when nothing was queued (not an image, pipeline disabled
+        or a job for the document is already pending).
+        """
+        document_id = str(document_id)
+        if self._executor is None or not is_image(mime_type) or document_id in self._pending:
+            return False
+
+        self._pending.add(document_id)
+        task = asyncio.create_task(self._process(document_id, object_path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "pending": len(self._pending),
+            "enabled": self._executor is not None,
+        }
+
+    async def _process(self, document_id: str, object_path: str):
+        try:
+            async with self._semaphore:
+                data = await minio_storage.read_object(object_path)
+                if len(data) > MAX_SOURCE_SIZE:
+                    logger.info(f"Skipping derivatives for document {document_id}: original too large")
+                    return
+
+                loop = asyncio.get_running_loop()
+                rendered = await loop.run_in_executor(self._executor, render_derivatives, data)
+                del data
+
+            derivatives = {}
+            for name, result in rendered.items():
+                path = derivative_path(object_path, name)
+                await minio_storage.put_bytes(path, result["data"], DERIVATIVE_MIME_TYPE)
+                derivatives[name] = {
+                    "path": path,
+                    "mime_type": DERIVATIVE_MIME_TYPE,
+                    "size": len(result["data"]),
+                    "width": result["width"],
+                    "height": result["height"],
+                }
+
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    update(OrderDocument)
+                    .where(OrderDocument.id == document_id)
+                    .values(derivatives=derivatives)
+                )
+                await session.commit()
+
+            if result.rowcount == 0:
+                # Document deleted while rendering
+                await delete_derivatives(derivatives)
+                return
+
+            self.stats["generated"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.warning(f"Failed to render derivatives for document {document_id}: {str(e)}")
+        finally:
+            self._pending.discard(document_id)
+
+
+async def delete_derivatives(derivatives: Optional[Dict[str, Any]]):
+    """Remove stored derivatives; missing objects are ignored"""
+    for derivative in (derivatives or {}).values():
+        try:
+            await minio_storage.delete_file(derivative["path"])
+        except Exception as e:
+            logger.warning(f"Failed to delete derivative {derivative.get('path')}: {str(e)}")
+
+
+# Global singleton instance, started by the application lifespan
+derivative_pipeline = DerivativePipeline()
@@ -12,6 +12,17 @@ from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Order numbers listed in a bulk notification message; the rest are counted
+MAX_LISTED_ORDER_NUMBERS = 10
+
+
+def summarize_order_numbers(order_numbers: List[str], limit: int = MAX_LISTED_ORDER_NUMBERS) -> str:
+    """``ORD-1, ORD-2, ... and N more`` for notification messages"""
+    listed = ", ".join(order_numbers[:limit])
+    if len(order_numbers) > limit:
+        listed += f" and {len(order_numbers) - limit} more"
+    return listed
+
 
 class OrderEventProducer:
     """
@@ -213,6 +224,41 @@ class OrderEventProducer:
             data=data
         )
 
+    def publish_orders_finance_reviewed(
+        self,
+        orders: List[Dict[str, Any]],
+        tenant_id: str,
+        approved: bool,
+        reviewed_by: str,
+        reviewed_by_role: Optional[str] = None,
+        reason: Optional[str] = None
+    ) -> bool:
+        """
+        Publish one order.bulk_approved / order.bulk_rejected event for a bulk finance review
+
+        Args:
+            orders: Dicts with order_id, order_number and total_amount of each reviewed order
+        """
+        data = {
+            "entity_type": "order",
+            "order_count": len(orders),
+            "order_numbers": summarize_order_numbers([order["order_number"] for order in orders]),
+            "orders": orders,
+            "total_amount": float(sum(order.get("total_amount") or 0 for order in orders)),
+            "approved_by" if approved else "rejected_by": reviewed_by,
+            "action_url": "/orders"
+        }
+        if reason:
+            data["reason"] = reason
+
+        return self.publish_event(
+            event_type="order.bulk_approved" if approved else "order.bulk_rejected",
+            tenant_id=tenant_id,
+            actor_user_id=reviewed_by,
+            actor_role=reviewed_by_role,
+            data=data
+        )
+
     def publish_order_logistics_approved(
         self,
         order_id: str,
@@ -351,6 +397,32 @@ class OrderEventProducer:
             }
         )
 
+    def publish_admin_bulk_action(
+        self,
+        order_numbers: List[str],
+        tenant_id: str,
+        performed_by: str,
+        performed_by_role: Optional[str] = None,
+        action: str = "",
+        notify_roles: Optional[List[str]] = None
+    ) -> bool:
+        """Publish one admin action event for a bulk operation on several orders"""
+        return self.publish_event(
+            event_type="order.bulk_admin_action",
+            tenant_id=tenant_id,
+            actor_user_id=performed_by,
+            actor_role=performed_by_role,
+            data={
+                "entity_type": "order",
+                "order_count": len(order_numbers),
+                "order_numbers": summarize_order_numbers(order_numbers),
+                "performed_by": performed_by,
+                "action": action,
+                "action_url": "/orders",
+                "notify_roles": notify_roles or []
+            }
+        )
+
     def publish_order_due_day_reminder(
         self,
         order_id: str,
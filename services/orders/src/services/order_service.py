@@ -5,13 +5,17 @@ from datetime import datetime
 from typing import List, Tuple, Optional, Dict, Any
 from uuid import uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc, asc, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, insert, and_, or_, desc, asc, func, true, literal_column
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
+from sqlalchemy.orm import selectinload, noload
 from fastapi import HTTPException, status
 
 from src.models.order import Order, OrderStatus, OrderType, PaymentType
 from src.models.order_item import OrderItem
+from src.models.order_document import OrderDocument
 from src.models.order_status_history import OrderStatusHistory
+from src.models.trip_item_assignment import TripItemAssignment
 from src.schemas import (
     OrderCreate,
     OrderUpdate,
@@ -19,6 +23,12 @@ from src.schemas import (
 )
 from src.config_local import OrdersSettings
 from src.services.audit_client import AuditClient
+from src.services.snapshots import (
+    BATCH_LOOKUP_LIMIT,
+    customer_snapshot,
+    fetch_customers_by_ids,
+    product_snapshot,
+)
 
 settings = OrdersSettings()
 
@@ -65,24 +75,78 @@ class OrderService:
         filters: List = None,
         order_by: Any = None,
         page: int = 1,
-        page_size: int = 20
+        page_size: int = 20,
+        include_items: bool = True,
+        estimate_count: bool = False
     ) -> Tuple[List[Order], int]:
-        """Get paginated orders with filters"""
-        query = select(Order).options(
-            selectinload(Order.items),
-            selectinload(Order.documents),
-            selectinload(Order.status_history)
+        """
+        Get a page of orders for the order list, with the total
+
+        Loads only what the list shows: with ``include_items`` the items and
+        their trip assignments, never the documents or status history. Each
+        order gets ``documents_count`` and ``items_count`` attributes, plus
+        ``trip_assignments`` (newest first) with the items. The total rides
+        along on the page rows, either exactly (a window count over the
+        filtered orders) or as the planner's estimate with
+        ``estimate_count``. That is one statement, plus one for the items.
+        """
+        conditions = and_(*filters) if filters else true()
+
+        if estimate_count:
+            filtered = select(Order.id).where(conditions)
+            filtered_sql = str(filtered.compile(
+                dialect=postgresql.dialect(),
+                compile_kwargs={"literal_binds": True}
+            ))
+            total_count = select(func.count_estimate(filtered_sql)).scalar_subquery()
+        else:
+            total_count = func.count().over()
+
+        documents_count = (
+            select(func.count(OrderDocument.id))
+            .where(OrderDocument.order_id == Order.id)
+            .scalar_subquery()
+        )
+        items_count = (
+            select(func.count(OrderItem.id))
+            .where(OrderItem.order_id == Order.id)
+            .scalar_subquery()
         )
 
-        if filters:
-            query = query.where(and_(*filters))
+        columns = [
+            Order,
+            total_count.label("total_count"),
+            documents_count.label("documents_count"),
+            items_count.label("items_count")
+        ]
+        if include_items:
+            assignment = func.jsonb_build_object(
+                literal_column("'order_item_id'"), TripItemAssignment.order_item_id,
+                literal_column("'trip_id'"), TripItemAssignment.trip_id,
+                literal_column("'assigned_quantity'"), TripItemAssignment.assigned_quantity,
+                literal_column("'item_status'"), TripItemAssignment.item_status,
+                literal_column("'assigned_at'"), TripItemAssignment.assigned_at,
+                literal_column("'updated_at'"), TripItemAssignment.updated_at
+            )
+            trip_assignments = (
+                select(func.coalesce(
+                    func.jsonb_agg(aggregate_order_by(assignment, TripItemAssignment.updated_at.desc())),
+                    literal_column("'[]'::jsonb"),
+                    type_=JSONB
+                ))
+                .where(
+                    TripItemAssignment.order_id == Order.id,
+                    TripItemAssignment.tenant_id == Order.tenant_id
+                )
+                .scalar_subquery()
+            )
+            columns.append(trip_assignments.label("trip_assignments"))
 
-        # Get total count
-        count_query = select(func.count(Order.id))
-        if filters:
-            count_query = count_query.where(and_(*filters))
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+        query = select(*columns).where(conditions).options(
+            selectinload(Order.items) if include_items else noload(Order.items),
+            noload(Order.documents),
+            noload(Order.status_history)
+        )
 
         # Apply ordering and pagination
         if order_by is not None:
@@ -91,9 +155,27 @@ class OrderService:
         query = query.offset((page - 1) * page_size).limit(page_size)
 
         result = await self.db.execute(query)
-        orders = result.scalars().unique().all()
+        rows = result.all()
+
+        orders = []
+        for row in rows:
+            order = row.Order
+            order.documents_count = row.documents_count
+            order.items_count = row.items_count
+            order.trip_assignments = row.trip_assignments if include_items else []
+            orders.append(order)
+
+        if rows:
+            # An estimate may undershoot the rows already seen
+            total = max(int(rows[0].total_count or 0), (page - 1) * page_size + len(rows))
+        elif page > 1:
+            # Past the last page there is no row to carry the total
+            total_result = await self.db.execute(select(func.count(Order.id)).where(conditions))
+            total = total_result.scalar()
+        else:
+            total = 0
 
-        return list(orders), total
+        return orders, total
 
     async def get_order_by_id(
         self,
@@ -138,115 +220,99 @@ class OrderService:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
-    async def _fetch_product_details(self, product_id: str) -> Dict[str, Any]:
+    @staticmethod
+    def _format_product(product: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a company service product into the fields orders rely on"""
+        return {
+            "id": str(product["id"]),
+            "name": product["name"],
+            "code": product.get("code", ""),
+            "description": product.get("description", ""),
+            "unit_price": float(product.get("unit_price") or 0),
+            "weight": float(product.get("weight") or 0),
+            "volume": float(product.get("volume") or 0),
+            "weight_type": product.get("weight_type", "fixed"),
+            "fixed_weight": float(product.get("fixed_weight") or 0),
+            "weight_unit": product.get("weight_unit", "kg"),
+            "unit": "pcs"  # Default unit, can be customized later
+        }
+
+    @staticmethod
+    def _product_placeholder(product_id: str, name: str, code: str, description: str) -> Dict[str, Any]:
+        """Stand-in product details used when a product cannot be resolved"""
+        return {
+            "id": str(product_id),
+            "name": name,
+            "code": code,
+            "description": description,
+            "unit_price": 0.0,
+            "weight": 0.0,
+            "volume": 0.0,
+            "unit": "pcs"
+        }
+
+    async def _fetch_products_by_ids(self, product_ids: List[str]) -> Dict[str, Dict[str, Any]]:
         """
-        Fetch product details from company service.
-        Uses the existing products endpoint and searches for the specific product.
+        Fetch details of many products from company service in batch requests
+        of up to BATCH_LOOKUP_LIMIT IDs.
+
+        Every requested ID is present in the result; products that cannot be
+        resolved map to placeholder details.
         """
         from httpx import AsyncClient
         import logging
         logger = logging.getLogger(__name__)
 
-        print(
-            f"DEBUG: _fetch_product_details called for product_id: {product_id}")
+        product_ids = list(dict.fromkeys(str(product_id) for product_id in product_ids))
+        if not product_ids:
+            return {}
+
         COMPANY_SERVICE_URL = "http://company-service:8002"
 
+        products = {}
         async with AsyncClient(timeout=30.0) as client:
-            try:
-                # Get all products (company service doesn't have get by ID endpoint)
-                response = await client.get(
-                    f"{COMPANY_SERVICE_URL}/products/",
-                    params={
-                        "tenant_id": self.tenant_id or "default-tenant",
-                        "is_active": True,
-                        "per_page": 100  # Max allowed by the API
-                    },
-                    headers=self.auth_headers
-                )
+            for start in range(0, len(product_ids), BATCH_LOOKUP_LIMIT):
+                batch = product_ids[start:start + BATCH_LOOKUP_LIMIT]
+                try:
+                    response = await client.post(
+                        f"{COMPANY_SERVICE_URL}/products/batch",
+                        params={"tenant_id": self.tenant_id or "default-tenant"},
+                        json={"ids": batch},
+                        headers=self.auth_headers
+                    )
+                except Exception as e:
+                    logger.error(f"Error fetching products {batch}: {str(e)}")
+                    products.update(
+                        (product_id, self._product_placeholder(
+                            product_id, "Network Error", "ERROR", f"Network error: {str(e)}"))
+                        for product_id in batch
+                    )
+                    continue
 
-                if response.status_code == 200:
-                    data = response.json()
-                    products = data.get("items", [])
-                    print(
-                        f"DEBUG: Fetched {len(products)} products from company service")
-
-                    if products:
-                        # Log first product for debugging
-                        print(
-                            f"DEBUG: Sample product structure: {products[0]}")
-
-                    # Find the product by ID
-                    product = None
-                    print(
-                        f"DEBUG: Searching for product_id: {product_id} (type: {type(product_id)})")
-                    # Log first 5 for debugging
-                    print(
-                        f"DEBUG: Available product IDs: {[str(p.get('id')) for p in products[:5]]}...")
-
-                    for p in products:
-                        if str(p.get("id")) == str(product_id):
-                            product = p
-                            print(
-                                f"DEBUG: Found product: {product.get('name', 'Unknown')}")
-                            break
-
-                    if not product:
-                        print(
-                            f"DEBUG: Product {product_id} not found in {len(products)} products")
-
-                    if product:
-                        return {
-                            "id": str(product["id"]),
-                            "name": product["name"],
-                            "code": product.get("code", ""),
-                            "description": product.get("description", ""),
-                            "unit_price": float(product.get("unit_price") or 0),
-                            "weight": float(product.get("weight") or 0),
-                            "volume": float(product.get("volume") or 0),
-                            "weight_type": product.get("weight_type", "fixed"),
-                            "fixed_weight": float(product.get("fixed_weight") or 0),
-                            "weight_unit": product.get("weight_unit", "kg"),
-                            "unit": "pcs"  # Default unit, can be customized later
-                        }
-                    else:
-                        logger.error(
-                            f"Product {product_id} not found in company service")
-                        return {
-                            "id": str(product_id),
-                            "name": "Unknown Product",
-                            "code": "NOT_FOUND",
-                            "description": "Product not found",
-                            "unit_price": 0.0,
-                            "weight": 0.0,
-                            "volume": 0.0,
-                            "unit": "pcs"
-                        }
-                else:
-                    error_text = response.text
+                if response.status_code != 200:
                     logger.error(
-                        f"Failed to fetch products from company service: {response.status_code} - {error_text}")
-                    return {
-                        "id": str(product_id),
-                        "name": "Service Error",
-                        "code": "ERROR",
-                        "description": f"Service error: {response.status_code}",
-                        "unit_price": 0.0,
-                        "weight": 0.0,
-                        "volume": 0.0,
-                        "unit": "pcs"
-                    }
-            except Exception as e:
-                logger.error(f"Error fetching product {product_id}: {str(e)}")
-                return {
-                    "id": str(product_id),
-                    "name": "Network Error",
-                    "code": "ERROR",
-                    "description": f"Network error: {str(e)}",
-                    "unit_price": 0.0,
-                    "weight": 0.0,
-                    "volume": 0.0,
-                    "unit": "pcs"
-                }
+                        f"Failed to fetch products from company service: {response.status_code} - {response.text}")
+                    products.update(
+                        (product_id, self._product_placeholder(
+                            product_id, "Service Error", "ERROR", f"Service error: {response.status_code}"))
+                        for product_id in batch
+                    )
+                    continue
+
+                found = {str(product["id"]): self._format_product(product) for product in response.json()}
+                for product_id in batch:
+                    if product_id in found:
+                        products[product_id] = found[product_id]
+                    else:
+                        logger.error(f"Product {product_id} not found in company service")
+                        products[product_id] = self._product_placeholder(
+                            product_id, "Unknown Product", "NOT_FOUND", "Product not found")
+        return products
+
+    async def _fetch_product_details(self, product_id: str) -> Dict[str, Any]:
+        """Fetch details of a single product from company service"""
+        products = await self._fetch_products_by_ids([product_id])
+        return products[str(product_id)]
 
     async def create_order(
         self,
@@ -286,9 +352,11 @@ class OrderService:
             # Process items and calculate totals
             order_items = []
             if order_data.items:
+                # Fetch product details for all items in one request
+                products = await self._fetch_products_by_ids(
+                    [item_data.product_id for item_data in order_data.items])
                 for i, item_data in enumerate(order_data.items):
-                    # Fetch product details from product service
-                    product = await self._fetch_product_details(item_data.product_id)
+                    product = products[str(item_data.product_id)]
 
                     # Use user-entered weight if provided (for variable weight products),
                     # otherwise use product weight (for fixed weight products)
@@ -318,14 +386,21 @@ class OrderService:
                         total_price=item_total_price,
                         weight=item_weight,  # Use the calculated item weight
                         volume=product.get("volume", 0),
+                        product_snapshot=product_snapshot(product),
                     )
                     order_items.append(order_item)
 
+            # Capture the customer so order reads need no company service call
+            customers = await fetch_customers_by_ids([order_data.customer_id], tenant_id, self.auth_headers)
+            customer = customers.get(str(order_data.customer_id))
+
             # Create order with calculated totals
             order = Order(
                 order_number=order_number,  # Use generated or provided order number
                 tenant_id=tenant_id,
                 customer_id=order_data.customer_id,
+                customer_snapshot=customer_snapshot(customer) if customer else None,
+                customer_snapshot_at=datetime.utcnow() if customer else None,
                 branch_id=order_data.branch_id,
                 order_type=order_data.order_type,
                 status=OrderStatus.DRAFT,
@@ -452,9 +527,11 @@ class OrderService:
 
             # Process new items
             order_items = []
+            # Fetch product details for all items in one request
+            products = await self._fetch_products_by_ids(
+                [item_data.product_id for item_data in items_data])
             for i, item_data in enumerate(items_data):
-                # Fetch product details
-                product = await self._fetch_product_details(item_data.product_id)
+                product = products[str(item_data.product_id)]
 
                 # Use user-entered weight if provided, otherwise use product weight
                 item_weight = item_data.weight if hasattr(item_data, 'weight') and item_data.weight and item_data.weight > 0 else product.get("weight", 0)
@@ -484,6 +561,7 @@ class OrderService:
                     total_price=item_total_price,
                     weight=item_weight,
                     volume=item_total_volume,
+                    product_snapshot=product_snapshot(product),
                     created_at=datetime.utcnow(),
                     updated_at=datetime.utcnow(),
                 )
@@ -504,6 +582,14 @@ class OrderService:
             update_data['package_count'] = package_count
             update_data['total_amount'] = total_amount
 
+        # Re-capture the customer snapshot when the customer changes
+        new_customer_id = update_data.get('customer_id')
+        if new_customer_id and str(new_customer_id) != order.customer_id:
+            customers = await fetch_customers_by_ids([new_customer_id], order.tenant_id, self.auth_headers)
+            customer = customers.get(str(new_customer_id))
+            update_data['customer_snapshot'] = customer_snapshot(customer) if customer else None
+            update_data['customer_snapshot_at'] = datetime.utcnow() if customer else None
+
         # Apply other field updates
         for field, value in update_data.items():
             setattr(order, field, value)
@@ -702,6 +788,173 @@ class OrderService:
 
         return order
 
+    async def bulk_finance_approval(
+        self,
+        order_ids: List[str],
+        approved: bool,
+        user_id: str,
+        tenant_id: str,
+        reason: Optional[str] = None,
+        user_role: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+        """
+        Approve or reject several submitted orders in finance at once
+
+        Loads the orders with one locking query, moves every submitted one in
+        a single UPDATE with multi-row status history, and publishes one
+        batched Kafka event (plus one admin action event when an Admin reviews). Returns the reviewed orders and the orders that
+        could not be reviewed, each with the reason.
+        """
+        requested = list(dict.fromkeys(str(order_id) for order_id in order_ids))
+        result = await self.db.execute(
+            select(Order).where(
+                and_(
+                    Order.id.in_(requested),
+                    Order.tenant_id == tenant_id,
+                    Order.is_active == True
+                )
+            ).with_for_update()
+        )
+        orders = {order.id: order for order in result.scalars().all()}
+
+        failed = []
+        eligible = []
+        for order_id in requested:
+            order = orders.get(order_id)
+            if not order:
+                failed.append({"order_id": order_id, "error": "Order not found"})
+            elif order.status != OrderStatus.SUBMITTED:
+                failed.append({"order_id": order_id, "error": "Order is not ready for finance approval"})
+            else:
+                eligible.append(order)
+
+        if not eligible:
+            return [], failed
+
+        now = datetime.utcnow()
+        if approved:
+            new_status = OrderStatus.FINANCE_APPROVED
+            values = {"finance_approved_by": user_id, "finance_approved_at": now}
+            message = "Order approved by finance"
+        else:
+            new_status = OrderStatus.FINANCE_REJECTED
+            values = {"finance_rejected_reason": reason}
+            message = "Order rejected by finance"
+
+        await self.db.execute(
+            update(Order)
+            .where(Order.id.in_([order.id for order in eligible]))
+            .values(status=new_status.value, updated_by=user_id, updated_at=now, **values)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.execute(insert(OrderStatusHistory), [
+            {
+                "order_id": order.id,
+                "changed_by": user_id,
+                "from_status": OrderStatus.SUBMITTED.value,
+                "to_status": new_status.value,
+                "reason": reason,
+                "notes": message
+            }
+            for order in eligible
+        ])
+        await self.db.commit()
+
+        import logging
+        logger = logging.getLogger(__name__)
+
+        # Write audit logs to company_db
+        try:
+            from src.database import write_audit_logs_to_company
+            await write_audit_logs_to_company([
+                {
+                    "entity_id": str(order.id),
+                    "entity_type": "order",
+                    "module": "orders",
+                    "action": "status_change",
+                    "from_status": OrderStatus.SUBMITTED.value,
+                    "to_status": new_status.value,
+                    "description": f"Order {order.order_number} status changed from {OrderStatus.SUBMITTED.value} to {new_status.value}",
+                    "user_id": user_id,
+                    "tenant_id": tenant_id
+                }
+                for order in eligible
+            ])
+        except Exception as e:
+            logger.error(f"Failed to write audit logs to company_db: {e}")
+
+        # Send audit logs
+        audit_client = AuditClient(self.auth_headers)
+        for order in eligible:
+            await audit_client.log_event(
+                tenant_id=tenant_id,
+                user_id=user_id,
+                action="approve" if approved else "reject",
+                module="orders",
+                entity_type="order",
+                entity_id=str(order.id),
+                description=f"Order {order.order_number} {'approved' if approved else 'rejected'} by finance",
+                from_status="submitted",
+                to_status=new_status,
+                approval_status="approved" if approved else "rejected",
+                reason=reason
+            )
+        await audit_client.close()
+
+        reviewed = [
+            {
+                "order_id": str(order.id),
+                "order_number": order.order_number,
+                "status": new_status.value,
+                "total_amount": float(order.total_amount) if order.total_amount is not None else None,
+                "customer_id": order.customer_id,
+                "customer_name": (order.customer_snapshot or {}).get("name"),
+                "priority": order.priority,
+                "payment_type": order.payment_type,
+                "created_by": order.created_by
+            }
+            for order in eligible
+        ]
+
+        # Publish one Kafka event for the whole batch
+        try:
+            from src.services.kafka_producer import order_event_producer
+            order_event_producer.publish_orders_finance_reviewed(
+                orders=[
+                    {
+                        "order_id": order["order_id"],
+                        "order_number": order["order_number"],
+                        "total_amount": order["total_amount"]
+                    }
+                    for order in reviewed
+                ],
+                tenant_id=tenant_id,
+                approved=approved,
+                reviewed_by=user_id,
+                reviewed_by_role=user_role,
+                reason=reason
+            )
+        except Exception as e:
+            # Log but don't fail the approvals
+            logger.error(f"Failed to publish bulk finance review event: {e}")
+
+        # If admin performed the review, notify managers once for the batch
+        if user_role == "Admin":
+            try:
+                from src.services.kafka_producer import order_event_producer
+                order_event_producer.publish_admin_bulk_action(
+                    order_numbers=[order["order_number"] for order in reviewed],
+                    tenant_id=tenant_id,
+                    performed_by=user_id,
+                    performed_by_role=user_role,
+                    action="finance_approve" if approved else "finance_reject",
+                    notify_roles=["finance_manager", "logistics_manager", "branch_manager"]
+                )
+            except Exception as e:
+                logger.error(f"Failed to publish bulk admin action event: {e}")
+
+        return reviewed, failed
+
     async def logistics_approval(
         self,
         order_id: str,
@@ -0,0 +1,432 @@
+"""
+Denormalized customer and product snapshots on orders
+
+Orders store a compact copy of their customer (``orders.customer_snapshot``)
+and items store a copy of their product (``order_items.product_snapshot``),
+captured when the order is created or updated. Order reads are then served
+from the orders database alone.
+
+Snapshots are immutable for completed orders. While an order is still open,
+change events published by the company service on the
+``company:changes:stream`` Redis stream refresh the customer snapshot and the
+descriptive product fields; prices, weights and volumes always stay as
+ordered. Orders saved before snapshots existed are backfilled on first read.
+
+The stream is read through the ``orders-snapshots`` consumer group, which
+keeps the position of the orders service in Redis: events published while
+every replica is down are read on startup. One replica at a time holds a
+lease and consumes, so each event is applied once and in order; when the
+lease changes hands, the new holder first re-applies the entries its
+predecessor read but never acknowledged.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import redis.asyncio as redis
+from redis.exceptions import ResponseError
+from httpx import AsyncClient
+from sqlalchemy import func, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.config_local import settings
+from src.database import AsyncSessionLocal
+from src.models.order import Order, OrderStatus
+from src.models.order_item import OrderItem
+
+logger = logging.getLogger(__name__)
+
+COMPANY_SERVICE_URL = "http://company-service:8002"
+COMPANY_CHANGES_STREAM = "company:changes:stream"
+CONSUMER_GROUP = "orders-snapshots"
+# Redis key naming the replica that currently consumes the stream
+CONSUMER_LEASE_KEY = "company:changes:orders-snapshots:lease"
+CONSUMER_LEASE_MS = 30000
+READ_BATCH_SIZE = 100
+READ_BLOCK_MS = 5000
+RETRY_BACKOFF_MIN = 1.0
+RETRY_BACKOFF_MAX = 60.0
+
+# Renews the lease only while this replica still holds it
+RENEW_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+# Most IDs the company service accepts in one batch lookup (BatchLookupRequest.ids)
+BATCH_LOOKUP_LIMIT = 500
+
+CUSTOMER_SNAPSHOT_FIELDS = (
+    "id",
+    "code",
+    "name",
+    "phone",
+    "email",
+    "contact_person_name",
+    "address",
+    "city",
+    "state",
+    "postal_code",
+)
+
+# Product fields that follow catalogue edits on open orders -> order_items column
+PRODUCT_DESCRIPTIVE_FIELDS = {
+    "name": "product_name",
+    "code": "product_code",
+    "description": "description",
+}
+
+# Codes OrderService uses for products it could not resolve
+PLACEHOLDER_PRODUCT_CODES = ("NOT_FOUND", "ERROR")
+
+# Completed orders keep the details they were completed with
+FINAL_ORDER_STATUSES = (OrderStatus.DELIVERED.value, OrderStatus.CANCELLED.value)
+
+
+def customer_snapshot(customer: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact customer snapshot from a company service customer"""
+    snapshot = {field: customer.get(field) for field in CUSTOMER_SNAPSHOT_FIELDS}
+    snapshot["id"] = str(snapshot["id"])
+    return snapshot
+
+
+def product_snapshot(product: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Product snapshot from ``OrderService._format_product`` output.
+
+    Returns None for placeholder details so the item is retried on next read.
+    """
+    if product.get("code") in PLACEHOLDER_PRODUCT_CODES:
+        return None
+    return {key: value for key, value in product.items() if key != "id"}
+
+
+async def fetch_customers_by_ids(customer_ids: List[str], tenant_id: str, headers: dict = None) -> Dict[str, dict]:
+    """Fetch customers by IDs from company service in batch requests of up to BATCH_LOOKUP_LIMIT IDs"""
+    customer_ids = list(dict.fromkeys(str(customer_id) for customer_id in customer_ids if customer_id))
+    customers = {}
+    if not customer_ids:
+        return customers
+
+    async with AsyncClient(timeout=30.0) as client:
+        for start in range(0, len(customer_ids), BATCH_LOOKUP_LIMIT):
+            batch = customer_ids[start:start + BATCH_LOOKUP_LIMIT]
+            try:
+                response = await client.post(
+                    f"{COMPANY_SERVICE_URL}/customers/batch",
+                    params={"tenant_id": tenant_id},
+                    json={"ids": batch},
+                    headers=headers or {}
+                )
+            except Exception as e:
+                logger.error(f"Error fetching customers {batch}: {str(e)}")
+                continue
+
+            if response.status_code != 200:
+                logger.error(f"Failed to fetch customers: {response.status_code}")
+                continue
+
+            customers.update((str(customer["id"]), customer) for customer in response.json())
+
+    return customers
+
+
+async def ensure_order_snapshots(
+    db: AsyncSession,
+    orders: List[Order],
+    order_service,
+    tenant_id: str,
+    headers: dict = None
+) -> None:
+    """
+    Backfill missing snapshots of a page of orders.
+
+    Missing customers and products are fetched with two concurrent batch
+    requests; once stored, later reads of the same orders skip the network.
+    Backfilling does not touch ``updated_at``.
+    """
+    missing_customer_ids = {order.customer_id for order in orders if order.customer_snapshot is None}
+    missing_items = [
+        item
+        for order in orders
+        for item in (getattr(order, "items", None) or [])
+        if item.product_snapshot is None
+    ]
+    if not missing_customer_ids and not missing_items:
+        return
+
+    customers, products = await asyncio.gather(
+        fetch_customers_by_ids(list(missing_customer_ids), tenant_id, headers),
+        order_service._fetch_products_by_ids([item.product_id for item in missing_items]),
+        return_exceptions=True
+    )
+    if isinstance(customers, Exception):
+        logger.error(f"Failed to fetch customers for snapshots: {customers}")
+        customers = {}
+    if isinstance(products, Exception):
+        logger.error(f"Failed to fetch products for snapshots: {products}")
+        products = {}
+
+    now = datetime.now(timezone.utc)
+    try:
+        for customer_id, customer in customers.items():
+            snapshot = customer_snapshot(customer)
+            targets = [
+                order for order in orders
+                if order.customer_id == customer_id and order.customer_snapshot is None
+            ]
+            await db.execute(
+                update(Order)
+                .where(Order.id.in_([order.id for order in targets]))
+                .values(customer_snapshot=snapshot, customer_snapshot_at=now, updated_at=Order.updated_at)
+            )
+            for order in targets:
+                set_committed_value(order, "customer_snapshot", snapshot)
+                set_committed_value(order, "customer_snapshot_at", now)
+
+        items_by_product: Dict[str, List[OrderItem]] = {}
+        for item in missing_items:
+            items_by_product.setdefault(str(item.product_id), []).append(item)
+
+        for product_id, items in items_by_product.items():
+            snapshot = product_snapshot(products.get(product_id, {"code": "NOT_FOUND"}))
+            if snapshot is None:
+                continue
+            await db.execute(
+                update(OrderItem)
+                .where(OrderItem.id.in_([item.id for item in items]))
+                .values(product_snapshot=snapshot, updated_at=OrderItem.updated_at)
+            )
+            for item in items:
+                set_committed_value(item, "product_snapshot", snapshot)
+
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Failed to store order snapshots: {e}")
+
+
+async def refresh_customer_snapshots(db: AsyncSession, tenant_id: str, customer: Dict[str, Any]) -> int:
+    """Refresh the customer snapshot of a customer's open orders"""
+    result = await db.execute(
+        update(Order)
+        .where(
+            Order.tenant_id == tenant_id,
+            Order.customer_id == str(customer["id"]),
+            Order.status.notin_(FINAL_ORDER_STATUSES)
+        )
+        .values(
+            customer_snapshot=customer_snapshot(customer),
+            customer_snapshot_at=func.now(),
+            updated_at=Order.updated_at
+        )
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def refresh_product_snapshots(db: AsyncSession, tenant_id: str, product: Dict[str, Any]) -> int:
+    """Refresh the descriptive product fields on items of open orders"""
+    changes = {field: product[field] for field in PRODUCT_DESCRIPTIVE_FIELDS if product.get(field) is not None}
+    if not changes:
+        return 0
+
+    open_orders = select(Order.id).where(
+        Order.tenant_id == tenant_id,
+        Order.status.notin_(FINAL_ORDER_STATUSES)
+    )
+    result = await db.execute(
+        update(OrderItem)
+        .where(
+            OrderItem.product_id == str(product["id"]),
+            OrderItem.order_id.in_(open_orders)
+        )
+        .values(
+            **{PRODUCT_DESCRIPTIVE_FIELDS[field]: value for field, value in changes.items()},
+            product_snapshot=func.coalesce(OrderItem.product_snapshot, literal({}, JSONB)).op("||")(
+                literal(changes, JSONB)
+            ),
+            updated_at=OrderItem.updated_at
+        )
+    )
+    await db.commit()
+    return result.rowcount
+
+
+class CompanyChangeListener:
+    """Applies company service customer/product change events to open orders"""
+
+    def __init__(self, redis_url: Optional[str]):
+        self._redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+        self._consumer = f"orders-{socket.gethostname()}-{os.getpid()}"
+        self._listener_task: Optional[asyncio.Task] = None
+        self._consuming = False
+        self._stats = {"events_applied": 0, "invalid_events": 0, "failures": 0, "claimed": 0}
+
+    async def initialize(self):
+        """Start consuming change events from the company service"""
+        if not self._redis_url or self._redis:
+            return
+        self._redis = redis.from_url(
+            self._redis_url,
+            encoding="utf-8",
+            decode_responses=True
+        )
+        # Joins the consumer group in the background, retrying until Redis is reachable
+        self._listener_task = asyncio.create_task(self._consume())
+
+    async def shutdown(self):
+        """Stop the consumer, hand over the lease and close the Redis connection"""
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        if self._redis:
+            try:
+                await self._redis.eval(RELEASE_LEASE_SCRIPT, 1, CONSUMER_LEASE_KEY, self._consumer)
+            except Exception:
+                pass
+            await self._redis.close()
+            self._redis = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Consumer statistics"""
+        return {
+            **self._stats,
+            "consumer": self._consumer,
+            "consuming": self._consuming,
+            "running": self._listener_task is not None and not self._listener_task.done(),
+        }
+
+    async def _consume(self):
+        backoff = RETRY_BACKOFF_MIN
+        group_ready = False
+        while True:
+            try:
+                if not group_ready:
+                    await self._create_group()
+                    group_ready = True
+
+                if not await self._hold_lease():
+                    # Another replica consumes; take over if its lease lapses
+                    self._consuming = False
+                    await asyncio.sleep(CONSUMER_LEASE_MS / 3000)
+                    continue
+
+                if not self._consuming:
+                    if not await self._apply_pending():
+                        continue
+                    self._consuming = True
+
+                response = await self._redis.xreadgroup(
+                    CONSUMER_GROUP,
+                    self._consumer,
+                    {COMPANY_CHANGES_STREAM: ">"},
+                    count=READ_BATCH_SIZE,
+                    block=READ_BLOCK_MS
+                )
+                for _, entries in response or []:
+                    await self._apply_entries(entries)
+                backoff = RETRY_BACKOFF_MIN
+            except asyncio.CancelledError:
+                self._consuming = False
+                raise
+            except Exception as e:
+                # Unacknowledged entries stay pending and are re-applied first
+                self._consuming = False
+                self._stats["failures"] += 1
+                logger.error(f"Company change consumer failed, retrying in {backoff:.0f}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, RETRY_BACKOFF_MAX)
+
+    async def _create_group(self):
+        try:
+            # From the start of the stream, so events published before the
+            # group first existed are applied too
+            await self._redis.xgroup_create(COMPANY_CHANGES_STREAM, CONSUMER_GROUP, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _hold_lease(self) -> bool:
+        """Acquire the consumer lease, or renew it if this replica holds it"""
+        if await self._redis.set(CONSUMER_LEASE_KEY, self._consumer, nx=True, px=CONSUMER_LEASE_MS):
+            return True
+        renewed = await self._redis.eval(
+            RENEW_LEASE_SCRIPT, 1, CONSUMER_LEASE_KEY, self._consumer, CONSUMER_LEASE_MS
+        )
+        return bool(renewed)
+
+    async def _apply_pending(self) -> bool:
+        """
+        Re-apply entries read but not acknowledged by any consumer of the group
+
+        Returns False if the lease was lost part way (e.g. a long catch-up).
+        """
+        start_id = "0-0"
+        while True:
+            result = await self._redis.xautoclaim(
+                COMPANY_CHANGES_STREAM,
+                CONSUMER_GROUP,
+                self._consumer,
+                min_idle_time=0,
+                start_id=start_id,
+                count=READ_BATCH_SIZE
+            )
+            start_id, entries = result[0], result[1]
+            self._stats["claimed"] += len(entries)
+            await self._apply_entries(entries)
+            if start_id == "0-0":
+                return True
+            if not await self._hold_lease():
+                return False
+
+    async def _apply_entries(self, entries):
+        """Apply entries in order, acknowledging each; a failure stops the batch"""
+        for entry_id, fields in entries:
+            if fields is None:
+                # Trimmed from the stream while pending
+                await self._redis.xack(COMPANY_CHANGES_STREAM, CONSUMER_GROUP, entry_id)
+                continue
+            try:
+                await self._apply(json.loads(fields["event"]))
+                self._stats["events_applied"] += 1
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                self._stats["invalid_events"] += 1
+                logger.error(f"Invalid company change event {entry_id}: {e}")
+            await self._redis.xack(COMPANY_CHANGES_STREAM, CONSUMER_GROUP, entry_id)
+
+    async def _apply(self, event: Dict[str, Any]):
+        entity = event["entity"]
+        tenant_id = event["tenant_id"]
+        data = event["data"]
+
+        async with AsyncSessionLocal() as db:
+            if entity == "customer":
+                count = await refresh_customer_snapshots(db, tenant_id, data)
+            elif entity == "product":
+                count = await refresh_product_snapshots(db, tenant_id, data)
+            else:
+                return
+        logger.info(f"Refreshed {entity} {data['id']} snapshot on {count} open order rows")
+
+
+# Global singleton instance
+company_change_listener = CompanyChangeListener(redis_url=settings.REDIS_URL)
@@ -7,7 +7,7 @@ By default, it uses MinIO for production deployments.
 import os
 import hashlib
 import aiofiles
-from typing import Tuple
+from typing import Optional, Tuple
 from uuid import uuid4
 from fastapi import UploadFile, HTTPException, status
 from fastapi.responses import FileResponse
@@ -18,7 +18,8 @@ from src.config_local import OrdersSettings
 settings = OrdersSettings()
 
 # Import MinIO handler
-from src.utils.minio_handler import MinIOHandler
+from src.utils.minio_handler import minio_storage
+from src.utils.upload_stream import UploadTooLarge, iter_upload, upload_too_large
 
 
 class FileHandler:
@@ -33,9 +34,9 @@ class FileHandler:
         self.allowed_file_types = settings.ALLOWED_FILE_TYPES
         self.use_minio = use_minio
 
-        # Initialize MinIO handler if enabled
+        # Shared MinIO handler if enabled
         if self.use_minio:
-            self.minio_handler = MinIOHandler()
+            self.minio_handler = minio_storage
         else:
             # Ensure upload directory exists for local storage
             os.makedirs(self.upload_dir, exist_ok=True)
@@ -48,10 +49,22 @@ class FileHandler:
         """Check if file size is within limits"""
         return file_size <= self.max_file_size
 
-    async def save_file(self, file: UploadFile, order_id: str) -> Tuple[str, str]:
-        """Save uploaded file and return file path/hash or object path/hash"""
+    async def save_file(
+        self,
+        file: UploadFile,
+        order_id: str,
+        max_size: Optional[int] = None
+    ) -> Tuple[str, str, int]:
+        """
+        Stream uploaded file to storage and return its path, SHA-256 hash and size
+
+        The file is copied in chunks and rejected with 413 as soon as it
+        exceeds ``max_size`` (default: MAX_FILE_SIZE).
+        """
+        max_size = max_size or self.max_file_size
+
         if self.use_minio:
-            return await self.minio_handler.save_file(file, order_id)
+            return await self.minio_handler.save_file(file, order_id, max_size)
         else:
             # Local storage fallback
             file_extension = os.path.splitext(file.filename)[1]
@@ -63,15 +76,22 @@ class FileHandler:
             file_path = os.path.join(order_dir, unique_filename)
 
             sha256_hash = hashlib.sha256()
-            file_content = await file.read()
-            sha256_hash.update(file_content)
+            file_size = 0
+            await file.seek(0)
 
-            async with aiofiles.open(file_path, 'wb') as f:
-                await f.write(file_content)
+            try:
+                async with aiofiles.open(file_path, 'wb') as f:
+                    async for chunk in iter_upload(file, max_size):
+                        sha256_hash.update(chunk)
+                        file_size += len(chunk)
+                        await f.write(chunk)
+            except UploadTooLarge as e:
+                os.remove(file_path)
+                raise upload_too_large(e.max_size)
 
             await file.seek(0)
 
-            return file_path, sha256_hash.hexdigest()
+            return file_path, sha256_hash.hexdigest(), file_size
 
     async def delete_file(self, file_path: str) -> None:
         """Delete file from storage"""
@@ -0,0 +1,85 @@
+"""
+Resized image derivatives for uploaded documents
+
+Images are re-encoded as WebP at a few fixed sizes so list views and
+previews do not download multi-megabyte originals. Rendering is CPU bound and
+runs in a worker process (see ``src.services.derivative_pipeline``), so the
+functions here are plain, picklable module-level functions.
+"""
+import io
+import os
+from typing import Any, Dict
+
+from PIL import Image, ImageOps
+
+# Derivative name -> longest edge in pixels and WebP quality
+DERIVATIVE_SPECS: Dict[str, Dict[str, int]] = {
+    "thumbnail": {"max_size": 320, "quality": 70},
+    "preview": {"max_size": 1280, "quality": 80},
+}
+
+DERIVATIVE_FORMAT = "WEBP"
+DERIVATIVE_MIME_TYPE = "image/webp"
+DERIVATIVE_EXTENSION = ".webp"
+
+IMAGE_MIME_TYPES = {"image/jpeg", "image/jpg", "image/png", "image/gif", "image/webp"}
+
+# Decompression bomb guard: refuse images above ~50 megapixels
+MAX_IMAGE_PIXELS = 50_000_000
+
+
+def is_image(mime_type: str) -> bool:
+    """Whether derivatives can be rendered for this MIME type"""
+    return mime_type in IMAGE_MIME_TYPES
+
+
+def derivative_path(object_path: str, name: str) -> str:
+    """Storage path of a derivative, next to its original"""
+    root, _ = os.path.splitext(object_path)
+    return f"{root}_{name}{DERIVATIVE_EXTENSION}"
+
+
+def render_derivatives(
+    data: bytes,
+    specs: Dict[str, Dict[str, int]] = DERIVATIVE_SPECS
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Render every derivative of an image.
+
+    Runs in a worker process. EXIF orientation is applied, JPEGs are decoded
+    at a reduced scale when possible, and each smaller derivative is resampled
+    from the next larger one rather than from the original.
+
+    Returns:
+        Derivative name -> {"data", "width", "height"}
+    """
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    largest = max(spec["max_size"] for spec in specs.values())
+    rendered: Dict[str, Dict[str, Any]] = {}
+
+    with Image.open(io.BytesIO(data)) as original:
+        # JPEG only: let the decoder downscale by a power of two
+        original.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        source = image
+        for name, spec in sorted(specs.items(), key=lambda item: -item[1]["max_size"]):
+            derived = source.copy()
+            derived.thumbnail(
+                (spec["max_size"], spec["max_size"]),
+                Image.Resampling.LANCZOS,
+                reducing_gap=3.0
+            )
+            buffer = io.BytesIO()
+            derived.save(buffer, DERIVATIVE_FORMAT, quality=spec["quality"], method=4)
+            rendered[name] = {
+                "data": buffer.getvalue(),
+                "width": derived.width,
+                "height": derived.height,
+            }
+            source = derived
+
+    return rendered
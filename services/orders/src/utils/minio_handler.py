@@ -1,17 +1,37 @@
 """
 MinIO S3 storage handler for file uploads
+
+A single ``minio_storage`` instance is shared by the whole service and
+managed by the application lifespan: it owns one pooled HTTP connection pool
+to MinIO, plus a signing-only client for the public endpoint so presigned
+URLs carry a signature that is valid for the host the browser talks to.
+The MinIO SDK is synchronous, so every call is run in the threadpool.
 """
+import io
 import os
-import hashlib
-from typing import Tuple, Optional
+import logging
+from typing import AsyncIterator, Dict, Tuple, Optional
 from uuid import uuid4
 from datetime import timedelta
 from fastapi import UploadFile, HTTPException, status
 from fastapi.responses import FileResponse
+import urllib3
 from minio import Minio
 from minio.error import S3Error
+from starlette.concurrency import run_in_threadpool
 
 from src.config import settings
+from src.utils.upload_stream import (
+    HashingReader,
+    MULTIPART_PART_SIZE,
+    UploadTooLarge,
+    upload_too_large,
+)
+
+logger = logging.getLogger(__name__)
+
+# Chunk size when proxying objects through the service
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
 
 
 class MinIOHandler:
@@ -19,27 +39,58 @@ class MinIOHandler:
 
     def __init__(self):
         self.minio_client = None
-        self.bucket_name = "order-documents"
+        self.public_client = None
+        self.bucket_name = settings.MINIO_BUCKET
         self.max_file_size = settings.MAX_FILE_SIZE
         self.allowed_file_types = settings.ALLOWED_FILE_TYPES
 
-        # Initialize MinIO client
-        self._initialize_client()
+    async def initialize(self):
+        """Create the shared clients and make sure the bucket exists"""
+        await run_in_threadpool(self._initialize_client)
+
+    async def shutdown(self):
+        """Close pooled connections"""
+        for client in (self.minio_client, self.public_client):
+            if client is not None:
+                client._http.clear()
+        self.minio_client = None
+        self.public_client = None
 
     def _initialize_client(self):
         """Initialize MinIO client"""
         try:
             # Get MinIO credentials from config or environment
             minio_endpoint = os.getenv("MINIO_ENDPOINT", settings.MINIO_ENDPOINT)
+            minio_public_endpoint = os.getenv("MINIO_PUBLIC_ENDPOINT", settings.MINIO_PUBLIC_ENDPOINT)
             minio_access_key = os.getenv("MINIO_ROOT_USER", settings.MINIO_ROOT_USER)
             minio_secret_key = os.getenv("MINIO_ROOT_PASSWORD", settings.MINIO_ROOT_PASSWORD)
             minio_secure = os.getenv("MINIO_SECURE", str(settings.MINIO_SECURE)).lower() == "true"
+            minio_region = settings.MINIO_REGION
+
+            # One pool shared by all requests; sized for the threadpool
+            http_client = urllib3.PoolManager(
+                maxsize=settings.MINIO_POOL_SIZE,
+                timeout=urllib3.Timeout(connect=5.0, read=60.0),
+                retries=urllib3.Retry(total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504])
+            )
 
             self.minio_client = Minio(
                 endpoint=minio_endpoint,
                 access_key=minio_access_key,
                 secret_key=minio_secret_key,
-                secure=minio_secure
+                secure=minio_secure,
+                region=minio_region,
+                http_client=http_client
+            )
+
+            # Presigned URLs are signed for the public host; signing is local,
+            # the region is fixed so no bucket location lookup is made
+            self.public_client = Minio(
+                endpoint=minio_public_endpoint,
+                access_key=minio_access_key,
+                secret_key=minio_secret_key,
+                secure=minio_secure,
+                region=minio_region
             )
 
             # Create bucket if it doesn't exist
@@ -47,7 +98,18 @@ class MinIOHandler:
 
         except Exception as e:
             # Log error but don't fail startup - will retry on operations
-            print(f"Warning: Failed to initialize MinIO client: {str(e)}")
+            logger.warning(f"Failed to initialize MinIO client: {str(e)}")
+
+    def _require_client(self) -> Minio:
+        """Shared client, created on first use outside the application lifespan"""
+        if self.minio_client is None:
+            self._initialize_client()
+        if self.minio_client is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="MinIO client not initialized"
+            )
+        return self.minio_client
 
     def _ensure_bucket_exists(self):
         """Ensure the bucket exists, create if not"""
@@ -56,9 +118,9 @@ class MinIOHandler:
                 self.minio_client.make_bucket(self.bucket_name)
                 # Set bucket policy for public read (optional, adjust as needed)
                 # For now, we'll use presigned URLs for secure access
-                print(f"Created MinIO bucket: {self.bucket_name}")
+                logger.info(f"Created MinIO bucket: {self.bucket_name}")
         except S3Error as e:
-            print(f"Error ensuring bucket exists: {str(e)}")
+            logger.error(f"Error ensuring bucket exists: {str(e)}")
 
     def is_allowed_file_type(self, mime_type: str) -> bool:
         """Check if file type is allowed"""
@@ -68,32 +130,32 @@ class MinIOHandler:
         """Check if file size is within limits"""
         return file_size <= self.max_file_size
 
-    async def save_file(self, file: UploadFile, order_id: str) -> Tuple[str, str]:
+    async def save_file(
+        self,
+        file: UploadFile,
+        order_id: str,
+        max_size: Optional[int] = None
+    ) -> Tuple[str, str, int]:
         """
-        Save uploaded file to MinIO and return object path and hash
+        Stream uploaded file to MinIO and return object path, hash and size
+
+        The file is streamed from the upload spool as a multipart upload, so at
+        most one part is held in memory. The SHA-256 hash is computed on the
+        way, and the upload is aborted as soon as it exceeds the size limit.
 
         Args:
             file: UploadFile object from FastAPI
             order_id: Order ID for organizing files
+            max_size: Size limit in bytes (default: MAX_FILE_SIZE)
 
         Returns:
-            Tuple of (object_path, file_hash)
+            Tuple of (object_path, file_hash, file_size)
         """
-        if not self.minio_client:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="MinIO client not initialized"
-            )
-
-        try:
-            # Read file content
-            file_content = await file.read()
+        self._require_client()
 
-            # Calculate file hash
-            sha256_hash = hashlib.sha256()
-            sha256_hash.update(file_content)
-            file_hash = sha256_hash.hexdigest()
+        max_size = max_size or self.max_file_size
 
+        try:
             # Generate unique filename
             file_extension = os.path.splitext(file.filename)[1]
             unique_filename = f"{uuid4()}{file_extension}"
@@ -101,21 +163,26 @@ class MinIOHandler:
             # Create object path with order_id prefix for organization
             object_path = f"orders/{order_id}/{unique_filename}"
 
-            # Upload to MinIO
-            from io import BytesIO
-            self.minio_client.put_object(
+            # Stream to MinIO (unknown length -> multipart), hashing as parts are read
+            await file.seek(0)
+            reader = HashingReader(file.file, max_size)
+            await run_in_threadpool(
+                self.minio_client.put_object,
                 bucket_name=self.bucket_name,
                 object_name=object_path,
-                data=BytesIO(file_content),
-                length=len(file_content),
+                data=reader,
+                length=-1,
+                part_size=MULTIPART_PART_SIZE,
                 content_type=file.content_type
             )
 
             # Reset file pointer
             await file.seek(0)
 
-            return object_path, file_hash
+            return object_path, reader.hexdigest(), reader.size
 
+        except UploadTooLarge as e:
+            raise upload_too_large(e.max_size)
         except S3Error as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -129,14 +196,11 @@ class MinIOHandler:
 
     async def delete_file(self, object_path: str) -> None:
         """Delete file from MinIO"""
-        if not self.minio_client:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="MinIO client not initialized"
-            )
+        self._require_client()
 
         try:
-            self.minio_client.remove_object(
+            await run_in_threadpool(
+                self.minio_client.remove_object,
                 bucket_name=self.bucket_name,
                 object_name=object_path
             )
@@ -149,51 +213,33 @@ class MinIOHandler:
     def generate_presigned_url(
         self,
         object_path: str,
-        expires_in: int = 3600
+        expires_in: int = 3600,
+        response_headers: Optional[Dict[str, str]] = None
     ) -> str:
         """
         Generate presigned URL for file access
 
+        The URL is signed for the public MinIO endpoint (signing is local, no
+        request is made), so browsers can fetch the object directly.
+
         Args:
             object_path: Path to the object in MinIO
             expires_in: URL expiration time in seconds (default 1 hour)
+            response_headers: Response header overrides, e.g.
+                {"response-content-disposition": "inline; filename=..."}
 
         Returns:
             Presigned URL string
         """
-        if not self.minio_client:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="MinIO client not initialized"
-            )
+        self._require_client()
 
         try:
-            url = self.minio_client.presigned_get_object(
+            return self.public_client.presigned_get_object(
                 bucket_name=self.bucket_name,
                 object_name=object_path,
-                expires=timedelta(seconds=expires_in)
+                expires=timedelta(seconds=expires_in),
+                response_headers=response_headers
             )
-            # Replace internal MinIO endpoint with public-facing one
-            # The presigned URL uses the endpoint from initialization, which might be 'minio:9000'
-            # We need to replace it with 'localhost:9000' for browser access
-            minio_endpoint = settings.MINIO_ENDPOINT
-            public_endpoint = settings.MINIO_PUBLIC_ENDPOINT
-
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.info(f"Original URL: {url}")
-            logger.info(f"Replacing {minio_endpoint} with {public_endpoint}")
-
-            # Try with and without http:// prefix
-            if f"http://{minio_endpoint}" in url:
-                url = url.replace(f"http://{minio_endpoint}", f"http://{public_endpoint}")
-            elif f"https://{minio_endpoint}" in url:
-                url = url.replace(f"https://{minio_endpoint}", f"https://{public_endpoint}")
-            elif minio_endpoint in url:
-                url = url.replace(minio_endpoint, public_endpoint)
-
-            logger.info(f"Final URL: {url}")
-            return url
         except S3Error as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -215,14 +261,10 @@ class MinIOHandler:
         Returns:
             Presigned upload URL string
         """
-        if not self.minio_client:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="MinIO client not initialized"
-            )
+        self._require_client()
 
         try:
-            url = self.minio_client.presigned_put_object(
+            url = self.public_client.presigned_put_object(
                 bucket_name=self.bucket_name,
                 object_name=object_path,
                 expires=timedelta(seconds=expires_in)
@@ -251,18 +293,11 @@ class MinIOHandler:
         Returns:
             Dictionary with file info and download URL
         """
-        if not self.minio_client:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="MinIO client not initialized"
-            )
+        self._require_client()
 
         try:
             # Check if object exists
-            self.minio_client.stat_object(
-                bucket_name=self.bucket_name,
-                object_name=object_path
-            )
+            await self.stat_object(object_path)
 
             # Generate presigned URL for download
             download_url = self.generate_presigned_url(object_path)
@@ -284,6 +319,79 @@ class MinIOHandler:
                 detail=f"Failed to get file: {str(e)}"
             )
 
+    async def stat_object(self, object_path: str):
+        """Object metadata (size, etag, last_modified); raises S3Error"""
+        self._require_client()
+        return await run_in_threadpool(
+            self.minio_client.stat_object,
+            bucket_name=self.bucket_name,
+            object_name=object_path
+        )
+
+    async def stream_object(
+        self,
+        object_path: str,
+        offset: int = 0,
+        length: int = 0
+    ) -> AsyncIterator[bytes]:
+        """
+        Open an object (or a byte range of it) for streaming.
+
+        Chunks are read in the threadpool so the event loop never blocks on
+        MinIO; the pooled connection is released once the body is consumed
+        or the client goes away.
+        """
+        self._require_client()
+        response = await run_in_threadpool(
+            self.minio_client.get_object,
+            bucket_name=self.bucket_name,
+            object_name=object_path,
+            offset=offset,
+            length=length
+        )
+
+        async def body() -> AsyncIterator[bytes]:
+            try:
+                while True:
+                    chunk = await run_in_threadpool(response.read, DOWNLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                response.close()
+                response.release_conn()
+
+        return body()
+
+    async def read_object(self, object_path: str) -> bytes:
+        """Read a whole object into memory; raises S3Error"""
+        self._require_client()
+
+        def read() -> bytes:
+            response = self.minio_client.get_object(
+                bucket_name=self.bucket_name,
+                object_name=object_path
+            )
+            try:
+                return response.read()
+            finally:
+                response.close()
+                response.release_conn()
+
+        return await run_in_threadpool(read)
+
+    async def put_bytes(self, object_path: str, data: bytes, content_type: str) -> None:
+        """Store a small in-memory object; raises S3Error"""
+        self._require_client()
+        await run_in_threadpool(
+            self.minio_client.put_object,
+            bucket_name=self.bucket_name,
+            object_name=object_path,
+            data=io.BytesIO(data),
+            length=len(data),
+            content_type=content_type
+        )
+
     def get_file_size(self, object_path: str) -> int:
         """Get file size in bytes"""
         if not self.minio_client:
@@ -297,3 +405,7 @@ class MinIOHandler:
             return stat.size
         except S3Error:
             return 0
+
+
+# Global singleton instance, initialized by the application lifespan
+minio_storage = MinIOHandler()
@@ -0,0 +1,74 @@
+"""
+Streaming helpers for document uploads
+
+Uploaded files are never read into memory as a whole. Starlette spools the
+multipart file part to a temporary file; from there it is read in chunks,
+hashed incrementally with SHA-256 and counted, so the size limit is enforced
+while the file is being copied rather than after it has been buffered.
+"""
+import hashlib
+from typing import AsyncIterator, BinaryIO
+
+from fastapi import HTTPException, UploadFile, status
+
+# Chunk size for reads from the upload spool
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# MinIO multipart part size (the S3 minimum is 5 MiB); bounds memory per upload
+MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised mid-stream once an upload exceeds its size limit"""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"File size exceeds maximum limit of {max_size} bytes")
+        self.max_size = max_size
+
+
+def upload_too_large(max_size: int) -> HTTPException:
+    """HTTP error for an upload over its size limit"""
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File size exceeds maximum limit of {max_size // (1024 * 1024)}MB"
+    )
+
+
+class HashingReader:
+    """
+    File-like wrapper that hashes and counts the bytes read through it
+
+    Used as the ``data`` stream of a MinIO multipart upload; raises
+    ``UploadTooLarge`` as soon as more than ``max_size`` bytes were read, which
+    aborts the multipart upload.
+    """
+
+    def __init__(self, raw: BinaryIO, max_size: int):
+        self._raw = raw
+        self._max_size = max_size
+        self._sha256 = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._raw.read(size if size and size > 0 else UPLOAD_CHUNK_SIZE)
+        self.size += len(chunk)
+        if self.size > self._max_size:
+            raise UploadTooLarge(self._max_size)
+        self._sha256.update(chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
+
+
+async def iter_upload(file: UploadFile, max_size: int, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield an upload in chunks, raising ``UploadTooLarge`` past ``max_size``"""
+    received = 0
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            return
+        received += len(chunk)
+        if received > max_size:
+            raise UploadTooLarge(max_size)
+        yield chunk
@@ -0,0 +1,106 @@
+"""
+Backfill trips.status_changed_at and trips.previous_status from company audit logs
+
+Migration 029 seeds ``status_changed_at`` with ``created_at``; from then on the
+``track_trips_status_change`` trigger keeps both columns current. This one-off
+job copies the latest ``status_change`` audit record of each trip from the
+centralized ``audit_logs`` table in company_db, so trips that changed status
+before the migration report the right time in status:
+
+    python scripts/backfill_trip_status_changes.py [--batch-size 500] [--dry-run]
+
+Only trips whose audit record is newer than their current ``status_changed_at``
+(or that have no ``previous_status`` yet) are updated, so re-running is safe.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.config import settings
+from src.database import engine as tms_engine
+
+# Latest status change per trip, newest first within each entity_id
+# (served by idx_audit_logs_status_change)
+LATEST_STATUS_CHANGES = text("""
+    SELECT DISTINCT ON (entity_id)
+        entity_id,
+        action_timestamp,
+        COALESCE(from_status, old_values->>'from_status', old_values->>'status') AS from_status,
+        COALESCE(to_status, new_values->>'to_status', new_values->>'status') AS to_status
+    FROM audit_logs
+    WHERE entity_type = 'trip'
+      AND action = 'status_change'
+      AND entity_id = ANY(:trip_ids)
+    ORDER BY entity_id, action_timestamp DESC
+""")
+
+APPLY_STATUS_CHANGE = text("""
+    UPDATE trips
+    SET status_changed_at = :changed_at,
+        previous_status = :from_status
+    WHERE id = :trip_id
+      AND status = :to_status
+      AND (previous_status IS NULL OR status_changed_at < :changed_at)
+""")
+
+
+async def backfill(batch_size: int, dry_run: bool):
+    company_engine = create_async_engine(settings.COMPANY_DATABASE_URL, pool_size=1, max_overflow=0)
+    updated = scanned = 0
+    last_id = ""
+
+    try:
+        while True:
+            async with tms_engine.connect() as tms_conn:
+                result = await tms_conn.execute(
+                    text("SELECT id FROM trips WHERE id > :last_id ORDER BY id LIMIT :limit"),
+                    {"last_id": last_id, "limit": batch_size},
+                )
+                trip_ids = [row.id for row in result]
+            if not trip_ids:
+                break
+            last_id = trip_ids[-1]
+            scanned += len(trip_ids)
+
+            async with company_engine.connect() as company_conn:
+                result = await company_conn.execute(LATEST_STATUS_CHANGES, {"trip_ids": trip_ids})
+                changes = [
+                    {
+                        "trip_id": row.entity_id,
+                        "changed_at": row.action_timestamp,
+                        "from_status": row.from_status,
+                        "to_status": row.to_status,
+                    }
+                    for row in result
+                    if row.to_status
+                ]
+
+            if changes and not dry_run:
+                # The status trigger only fires on UPDATE OF status, so it leaves these untouched
+                async with tms_engine.begin() as tms_conn:
+                    result = await tms_conn.execute(APPLY_STATUS_CHANGE, changes)
+                    updated += result.rowcount
+            elif changes:
+                updated += len(changes)
+
+            print(f"Scanned {scanned} trips, {'would update' if dry_run else 'updated'} {updated}")
+    finally:
+        await company_engine.dispose()
+        await tms_engine.dispose()
+
+    print(f"Done: {updated} of {scanned} trips {'would be ' if dry_run else ''}backfilled")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500, help="Trips per batch")
+    parser.add_argument("--dry-run", action="store_true", help="Report matches without updating trips")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size, args.dry_run))
@@ -1,22 +1,37 @@
 """Driver API endpoints - providing driver-specific data to the Driver Service"""
 
+import base64
+import json
 import logging
-from typing import Optional, List
+from typing import Optional, List, Tuple, Dict
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.exceptions import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, update, func
-from datetime import date, datetime
-
-from src.database import get_async_session, Trip, TripOrder, TMSAuditLog
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, and_, or_, update, func, tuple_, text
+from datetime import date, datetime, timedelta, timezone
+
+from src.config import settings
+from src.database import (
+    get_async_session,
+    Trip,
+    TripOrder,
+    TMSAuditLog,
+    DriverSyncTombstone,
+    DriverJournalEvent,
+    PendingOrderItemSync,
+)
 
 logger = logging.getLogger(__name__)
 from src.schemas import (
     TripResponse, TripWithOrders, TripOrderResponse,
     DeliveryUpdate, DriverTripListResponse, DriverTripDetailResponse,
-    MessageResponse
+    DriverSyncResponse, DriverJournalRequest, DriverJournalEntry,
+    DriverJournalEventResult, DriverJournalResponse, MessageResponse
 )
-from src.services.orders_service_client import orders_client, OrdersServiceUnavailable
+from src.services.orders_service_client import orders_client, OrdersServiceError, OrdersServiceUnavailable
+from src.services.audit_client import AuditClient
+from src.api.endpoints.trips import _update_resource_statuses_for_trip
 from src.security import (
     TokenData,
     require_permissions,
@@ -27,6 +42,32 @@ from src.security import (
 
 router = APIRouter()
 
+# Trips a driver can still act on (everything but completed/cancelled)
+OPEN_TRIP_STATUSES = ['planning', 'loading', 'on-route', 'paused', 'truck-malfunction']
+
+# Allowed delivery status changes of a trip order
+DELIVERY_STATUS_TRANSITIONS = {
+    'pending': ['out-for-delivery'],
+    'out-for-delivery': ['delivered', 'failed'],
+    'failed': ['out-for-delivery', 'returned'],
+    'returned': []
+}
+
+
+def _encode_cursor(trip: Trip) -> str:
+    """Opaque keyset cursor for the trip list: position after ``trip``"""
+    raw = json.dumps([trip.created_at.isoformat(), trip.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, trip_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(trip_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 
 @router.get("/trips", response_model=DriverTripListResponse)
 async def get_driver_trips(
@@ -34,58 +75,81 @@ async def get_driver_trips(
     status: Optional[str] = Query(None, description="Filter by trip status"),
     trip_date: Optional[date] = Query(None, description="Filter by trip date"),
     company_id: Optional[str] = Query(None, description="Filter by company ID"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Trips per page; omit for every trip"),
+    compact: bool = Query(False, description="Return only the fields the trip list screen shows"),
     token_data: TokenData = Depends(
         require_any_permission(["driver:read", "trips:read", "trips:read_all"])
     ),
     tenant_id: str = Depends(get_current_tenant_id),
     db: AsyncSession = Depends(get_async_session)
 ):
-    """Get all trips for the current driver (extracts driver_id from JWT token) with statistics"""
-    query = select(Trip).where(Trip.driver_id == driver_id)
-
-    # Apply filters
+    """
+    Get the current driver's trips (driver_id from JWT token), newest first, with statistics
+
+    With ``limit``, trips are paged with a keyset cursor on (created_at, id);
+    without it every trip is returned, as before paging existed, until all
+    clients follow ``next_cursor``. Order counts come from the same grouped
+    query as the page, and the statistics (over all matching trips, not just
+    the page) from one aggregate, so a request costs two queries however long
+    the driver's history is.
+    """
+    filters = [Trip.driver_id == driver_id]
     if status:
-        query = query.where(Trip.status == status)
+        filters.append(Trip.status == status)
     if trip_date:
-        query = query.where(Trip.trip_date == trip_date)
+        filters.append(Trip.trip_date == trip_date)
     if company_id:
-        query = query.where(Trip.company_id == company_id)
-
-    # Order by created date descending
-    query = query.order_by(Trip.created_at.desc())
+        filters.append(Trip.company_id == company_id)
 
-    result = await db.execute(query)
-    trips = result.scalars().all()
-
-    # Calculate statistics
-    total_trips = len(trips)
-    active_trips = len([t for t in trips if t.status in ['loading', 'on-route']])
-    completed_trips = len([t for t in trips if t.status == 'completed'])
-
-    # Convert to response models
-    trip_responses = []
-    for trip in trips:
-        # Get order counts for this trip
-        orders_query = select(func.count(TripOrder.id)).where(TripOrder.trip_id == trip.id)
-        if company_id:
-            orders_query = orders_query.where(TripOrder.company_id == company_id)
-
-        orders_result = await db.execute(orders_query)
-        total_orders = orders_result.scalar() or 0
+    # Order counts per trip, restricted to the company's orders when filtering by company
+    order_join = TripOrder.trip_id == Trip.id
+    if company_id:
+        order_join = and_(order_join, TripOrder.company_id == company_id)
 
-        # Get completed orders count
-        completed_orders_query = select(func.count(TripOrder.id)).where(
-            and_(
-                TripOrder.trip_id == trip.id,
-                TripOrder.delivery_status == 'delivered'
-            )
+    query = (
+        select(
+            Trip,
+            func.count(TripOrder.id).label("total_orders"),
+            func.count(TripOrder.id).filter(TripOrder.delivery_status == 'delivered').label("completed_orders"),
         )
-        if company_id:
-            completed_orders_query = completed_orders_query.where(TripOrder.company_id == company_id)
+        .outerjoin(TripOrder, order_join)
+        .where(*filters)
+        .group_by(Trip.id)
+        .order_by(Trip.created_at.desc(), Trip.id.desc())
+    )
+    if limit:
+        query = query.limit(limit + 1)
+    if cursor:
+        query = query.where(tuple_(Trip.created_at, Trip.id) < tuple_(*_decode_cursor(cursor)))
 
-        completed_orders_result = await db.execute(completed_orders_query)
-        completed_orders_count = completed_orders_result.scalar() or 0
+    result = await db.execute(query)
+    rows = result.all()
+    has_more = bool(limit) and len(rows) > limit
+    if has_more:
+        rows = rows[:limit]
+
+    # Statistics over every matching trip in one aggregate
+    stats_result = await db.execute(
+        select(
+            func.count(Trip.id),
+            func.count(Trip.id).filter(Trip.status.in_(['loading', 'on-route'])),
+            func.count(Trip.id).filter(Trip.status == 'completed'),
+        ).where(*filters)
+    )
+    total_trips, active_trips, completed_trips = stats_result.one()
 
+    trip_responses = []
+    for trip, total_orders, completed_orders in rows:
+        if compact:
+            trip_responses.append({
+                "id": trip.id,
+                "status": trip.status,
+                "trip_date": trip.trip_date,
+                "total_orders": total_orders,
+                "completed_orders": completed_orders
+            })
+            continue
         trip_responses.append({
             "id": trip.id,
             "driver_id": trip.driver_id,
@@ -96,7 +160,7 @@ async def get_driver_trips(
             "truck_model": trip.truck_model,
             "trip_date": trip.trip_date,
             "total_orders": total_orders,
-            "completed_orders": completed_orders_count,
+            "completed_orders": completed_orders,
             "capacity_used": trip.capacity_used,
             "capacity_total": trip.capacity_total
         })
@@ -105,7 +169,8 @@ async def get_driver_trips(
         trips=trip_responses,
         total=total_trips,
         active=active_trips,
-        completed=completed_trips
+        completed=completed_trips,
+        next_cursor=_encode_cursor(rows[-1][0]) if has_more else None
     )
 
 
@@ -120,41 +185,34 @@ async def get_driver_current_trip(
     db: AsyncSession = Depends(get_async_session)
 ):
     """Get the currently active trip for a driver (extracts driver_id from JWT token)"""
-    query = select(Trip).where(
-        and_(
-            Trip.driver_id == driver_id,
-            Trip.status.in_(['on-route'])
+    order_join = TripOrder.trip_id == Trip.id
+    if company_id:
+        order_join = and_(order_join, TripOrder.company_id == company_id)
+
+    query = (
+        select(
+            Trip,
+            func.count(TripOrder.id),
+            func.count(TripOrder.id).filter(TripOrder.delivery_status == 'delivered'),
         )
+        .outerjoin(TripOrder, order_join)
+        .where(
+            and_(
+                Trip.driver_id == driver_id,
+                Trip.status.in_(['on-route'])
+            )
+        )
+        .group_by(Trip.id)
     )
     if company_id:
         query = query.where(Trip.company_id == company_id)
 
     result = await db.execute(query)
-    trip = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not trip:
+    if not row:
         return None
-
-    # Get order statistics
-    orders_query = select(func.count(TripOrder.id)).where(TripOrder.trip_id == trip.id)
-    if company_id:
-        orders_query = orders_query.where(TripOrder.company_id == company_id)
-
-    orders_result = await db.execute(orders_query)
-    total_orders = orders_result.scalar() or 0
-
-    # Get completed orders
-    completed_orders_query = select(func.count(TripOrder.id)).where(
-        and_(
-            TripOrder.trip_id == trip.id,
-            TripOrder.delivery_status == 'delivered'
-        )
-    )
-    if company_id:
-        completed_orders_query = completed_orders_query.where(TripOrder.company_id == company_id)
-
-    completed_orders_result = await db.execute(completed_orders_query)
-    completed_orders = completed_orders_result.scalar() or 0
+    trip, total_orders, completed_orders = row
 
     return {
         "id": trip.id,
@@ -172,6 +230,92 @@ async def get_driver_current_trip(
     }
 
 
+@router.get("/sync", response_model=DriverSyncResponse)
+async def sync_driver_trips(
+    driver_id: str = Depends(get_current_user_id),
+    since: Optional[int] = Query(None, ge=0, description="cursor of the previous sync; omit for a full snapshot"),
+    company_id: Optional[str] = Query(None, description="Filter by company ID"),
+    token_data: TokenData = Depends(
+        require_any_permission(["driver:read", "trips:read", "trips:read_all"])
+    ),
+    tenant_id: str = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Trips and stops of the current driver that changed since ``since``
+
+    Every write to trips/trip_orders stamps ``sync_version`` with the writing
+    transaction id (migration 032). The returned cursor is the snapshot xmin,
+    read before the data: every transaction below it has finished, so rows with
+    ``sync_version >= cursor`` are all the next sync can be missing. Rows may
+    be sent twice; clients upsert by id, applying ``deleted`` first.
+
+    Without ``since`` the response is a full snapshot of the driver's open
+    trips and those of the last DRIVER_SYNC_HISTORY_DAYS days.
+    """
+    cursor_result = await db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"))
+    cursor = cursor_result.scalar_one()
+
+    trip_filters = [Trip.driver_id == driver_id]
+    if company_id:
+        trip_filters.append(Trip.company_id == company_id)
+
+    deleted = []
+    if since is None:
+        history_start = date.today() - timedelta(days=settings.DRIVER_SYNC_HISTORY_DAYS)
+        trips_result = await db.execute(
+            select(Trip).where(
+                *trip_filters,
+                or_(Trip.status.in_(OPEN_TRIP_STATUSES), Trip.trip_date >= history_start)
+            )
+        )
+        trips = trips_result.scalars().all()
+        stops = []
+        if trips:
+            stops_result = await db.execute(
+                select(TripOrder)
+                .where(TripOrder.trip_id.in_([trip.id for trip in trips]))
+                .order_by(TripOrder.trip_id, TripOrder.sequence_number)
+            )
+            stops = stops_result.scalars().all()
+    else:
+        trips_result = await db.execute(
+            select(Trip).where(*trip_filters, Trip.sync_version >= since)
+        )
+        trips = trips_result.scalars().all()
+
+        stops_result = await db.execute(
+            select(TripOrder)
+            .join(Trip, Trip.id == TripOrder.trip_id)
+            .where(*trip_filters, TripOrder.sync_version >= since)
+            .order_by(TripOrder.trip_id, TripOrder.sequence_number)
+        )
+        stops = stops_result.scalars().all()
+
+        tombstones_result = await db.execute(
+            select(DriverSyncTombstone).where(
+                and_(
+                    DriverSyncTombstone.driver_id == driver_id,
+                    DriverSyncTombstone.sync_version >= since
+                )
+            )
+        )
+        deleted = tombstones_result.scalars().all()
+
+    active_result = await db.execute(
+        select(Trip.id).where(*trip_filters, Trip.status.in_(OPEN_TRIP_STATUSES))
+    )
+
+    return DriverSyncResponse(
+        cursor=cursor,
+        full=since is None,
+        trips=trips,
+        stops=stops,
+        deleted=deleted,
+        active_trip_ids=active_result.scalars().all()
+    )
+
+
 @router.get("/trips/{trip_id}", response_model=DriverTripDetailResponse)
 async def get_driver_trip_detail(
     trip_id: str,
@@ -426,17 +570,10 @@ async def update_order_delivery_status(
         raise HTTPException(status_code=404, detail="Order not found in this trip")
 
     # Validate status transition
-    valid_transitions = {
-        'pending': ['out-for-delivery'],
-        'out-for-delivery': ['delivered', 'failed'],
-        'failed': ['out-for-delivery', 'returned'],
-        'returned': []
-    }
-
     current_status = order.delivery_status or 'pending'
     new_status = delivery_update.status.value if hasattr(delivery_update.status, 'value') else delivery_update.status
 
-    if new_status not in valid_transitions.get(current_status, []):
+    if new_status not in DELIVERY_STATUS_TRANSITIONS.get(current_status, []):
         raise HTTPException(
             status_code=400,
             detail=f"Invalid status transition from {current_status} to {new_status}"
@@ -555,54 +692,14 @@ async def update_order_delivery_status(
             )
 
             # Update driver and truck status to available when trip is completed
-            try:
-                from src.services.company_client import company_client
-
-                # Extract auth token from request
-                auth_token = None
-                if request:
-                    auth_header = request.headers.get("authorization")
-                    if auth_header and auth_header.startswith("Bearer "):
-                        auth_token = auth_header[7:]  # Remove "Bearer " prefix
-                        logger.info(f"Using auth token for status update (length: {len(auth_token)})")
-
-                # Use the company_id from trip or query parameter for tenant
-                actual_tenant_id = trip.company_id or company_id or tenant_id
-
-                # Update driver status to available
-                driver_update_success = await company_client.update_driver_status(
-                    driver_id=trip.driver_id,
-                    status="available",
-                    tenant_id=actual_tenant_id,
-                    auth_token=auth_token
-                )
-
-                # Update truck/vehicle status to available
-                # First get the vehicle ID from the plate number
-                vehicle_id = await company_client.get_vehicle_id_by_plate(
-                    truck_plate=trip.truck_plate,
-                    tenant_id=actual_tenant_id,
-                    auth_token=auth_token
-                )
-
-                vehicle_update_success = False
-                if vehicle_id:
-                    vehicle_update_success = await company_client.update_vehicle_status(
-                        vehicle_id=vehicle_id,  # Use actual vehicle ID instead of plate
-                        status="available",
-                        tenant_id=actual_tenant_id,
-                        auth_token=auth_token
-                    )
-                else:
-                    logger.warning(f"Could not find vehicle ID for plate {trip.truck_plate}")
-
-                logger.info(
-                    f"Trip {trip_id} completed. Driver {trip.driver_id} status update: {driver_update_success}, "
-                    f"Vehicle {trip.truck_plate} (ID: {vehicle_id}) status update: {vehicle_update_success}"
-                )
-            except Exception as e:
-                logger.error(f"Failed to update driver/vehicle status after trip completion: {e}")
-                # Don't fail the request if status update fails
+            auth_header = request.headers.get("authorization") if request else None
+            await _update_resource_statuses_for_trip(
+                "completed",
+                trip.truck_plate,
+                trip.driver_id,
+                {"Authorization": auth_header} if auth_header else {},
+                trip.company_id or company_id or tenant_id
+            )
 
     # Log the action
     audit_log = TMSAuditLog(
@@ -671,16 +768,9 @@ async def mark_order_delivered(
             raise HTTPException(status_code=404, detail="Order not found in this trip")
 
         # Validate status transition
-        valid_transitions = {
-            'pending': ['out-for-delivery'],
-            'out-for-delivery': ['delivered', 'failed'],
-            'failed': ['out-for-delivery', 'returned'],
-            'returned': []
-        }
-
         current_status = order.delivery_status or 'pending'
 
-        if new_status not in valid_transitions.get(current_status, []):
+        if new_status not in DELIVERY_STATUS_TRANSITIONS.get(current_status, []):
             raise HTTPException(
                 status_code=400,
                 detail=f"Invalid status transition from {current_status} to {new_status}"
@@ -799,53 +889,14 @@ async def mark_order_delivered(
                 )
 
                 # Update driver and truck status to available when trip is completed
-                try:
-                    from src.services.company_client import company_client
-
-                    # Extract auth token from request
-                    auth_token = None
-                    if request:
-                        auth_header = request.headers.get("authorization")
-                        if auth_header and auth_header.startswith("Bearer "):
-                            auth_token = auth_header[7:]  # Remove "Bearer " prefix
-                            logger.info(f"Using auth token for status update (length: {len(auth_token)})")
-
-                    # Update driver status to available
-                    # Use the company_id from trip or query parameter for tenant
-                    actual_tenant_id = trip.company_id or company_id or tenant_id
-                    driver_update_success = await company_client.update_driver_status(
-                        driver_id=trip.driver_id,
-                        status="available",
-                        tenant_id=actual_tenant_id,
-                        auth_token=auth_token
-                    )
-
-                    # Update truck/vehicle status to available
-                    # First get the vehicle ID from the plate number
-                    vehicle_id = await company_client.get_vehicle_id_by_plate(
-                        truck_plate=trip.truck_plate,
-                        tenant_id=actual_tenant_id,
-                        auth_token=auth_token
-                    )
-
-                    vehicle_update_success = False
-                    if vehicle_id:
-                        vehicle_update_success = await company_client.update_vehicle_status(
-                            vehicle_id=vehicle_id,  # Use actual vehicle ID instead of plate
-                            status="available",
-                            tenant_id=actual_tenant_id,
-                            auth_token=auth_token
-                        )
-                    else:
-                        logger.warning(f"Could not find vehicle ID for plate {trip.truck_plate}")
-
-                    logger.info(
-                        f"Trip {trip_id} completed. Driver {trip.driver_id} status update: {driver_update_success}, "
-                        f"Vehicle {trip.truck_plate} (ID: {vehicle_id}) status update: {vehicle_update_success}"
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to update driver/vehicle status after trip completion: {e}")
-                    # Don't fail the request if status update fails
+                auth_header = request.headers.get("authorization") if request else None
+                await _update_resource_statuses_for_trip(
+                    "completed",
+                    trip.truck_plate,
+                    trip.driver_id,
+                    {"Authorization": auth_header} if auth_header else {},
+                    trip.company_id or company_id or tenant_id
+                )
 
         # Log the action
         audit_log = TMSAuditLog(
@@ -940,4 +991,342 @@ async def report_maintenance(
 
     # Create the response explicitly
     result = {"message": f"Maintenance issue reported for trip {trip_id}"}
-    return result
\ No newline at end of file
+    return result
+
+def _naive_utc(value: Optional[datetime]) -> datetime:
+    """Device timestamp as naive UTC (how trips store times); now when missing"""
+    if value is None:
+        return datetime.utcnow()
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _apply_journal_event(event: DriverJournalEntry, trip: Trip, stops: List[TripOrder], effects: dict) -> Optional[str]:
+    """
+    Apply one journal event to the loaded trip and its stops, in memory
+
+    Uses the same rules as the single-event endpoints. Everything is checked
+    before anything is changed, so a rejected event (returned reason) leaves
+    the trip untouched. Downstream work is collected in ``effects``.
+    """
+    if event.type in ("delivery_status", "deliver"):
+        stop = next((s for s in stops if s.order_id == event.order_id), None) if event.order_id else None
+        if not stop:
+            return "Order not found in this trip"
+
+        current_status = stop.delivery_status or 'pending'
+        if event.type == "deliver":
+            steps = ['out-for-delivery', 'delivered'] if current_status == 'pending' else ['delivered']
+        elif event.status is None:
+            return "status is required for delivery_status events"
+        else:
+            steps = [event.status.value]
+
+        for new_status in steps:
+            if new_status not in DELIVERY_STATUS_TRANSITIONS.get(current_status, []):
+                return f"Invalid status transition from {current_status} to {new_status}"
+            # Sequential delivery - all previous orders must be delivered
+            if new_status == 'out-for-delivery' and any(
+                s.sequence_number < stop.sequence_number
+                and s.delivery_status is not None and s.delivery_status != 'delivered'
+                for s in stops
+            ):
+                return "Cannot start delivery for this order. Previous orders must be delivered first."
+            current_status = new_status
+
+        for new_status in steps:
+            effects["audit"].append((
+                f"Updated order delivery status to {new_status}", "trip_order", stop.order_id,
+                stop.delivery_status or 'pending', new_status
+            ))
+            stop.delivery_status = new_status
+            stop.status = 'completed' if new_status == 'delivered' else 'on-route'
+
+        if current_status == 'delivered':
+            trip.capacity_used = max(0, (trip.capacity_used or 0) - stop.weight)
+            effects["item_statuses"][stop.order_id] = "delivered"
+            if all(s.delivery_status == 'delivered' for s in stops):
+                trip.status = 'completed'
+        return None
+
+    if event.type == "pause":
+        if trip.status not in ["loading", "on-route"]:
+            return f"Can only pause trips in 'loading' or 'on-route' status. Current status: {trip.status}"
+        if not event.reason:
+            return "reason is required for pause events"
+        effects["audit"].append((f"Trip {trip.id} paused due to {event.reason}", "trip", trip.id, trip.status, "paused"))
+        trip.status = "paused"
+        trip.paused_reason = event.reason
+        trip.maintenance_note = event.note
+        trip.paused_at = _naive_utc(event.occurred_at)
+        effects["trip_events"].append(("paused", event))
+        return None
+
+    if event.type == "resume":
+        if trip.status != "paused":
+            return f"Can only resume trips in 'paused' status. Current status: {trip.status}"
+        effects["audit"].append((f"Trip {trip.id} resumed", "trip", trip.id, "paused", "on-route"))
+        trip.status = "on-route"
+        trip.resumed_at = _naive_utc(event.occurred_at)
+        if event.note:
+            trip.maintenance_note = event.note
+        effects["trip_events"].append(("resumed", event))
+        return None
+
+    return f"Unsupported event type {event.type}"
+
+
+async def _sync_pending_item_statuses(db: AsyncSession, trip_ids: List[str], auth_token: Optional[str]) -> set:
+    """
+    Send the outstanding journal item statuses of these trips to Orders
+
+    Delivered statuses are removed from the outbox; failed ones stay for the
+    next journal of the trip. Returns the trips whose statuses are still pending.
+    """
+    if not trip_ids:
+        return set()
+
+    pending_result = await db.execute(
+        select(PendingOrderItemSync).where(PendingOrderItemSync.trip_id.in_(trip_ids))
+    )
+    still_pending = set()
+    for pending in pending_result.scalars().all():
+        try:
+            await orders_client.update_order_items_status_bulk(
+                trip_id=pending.trip_id,
+                updates=[
+                    {"order_id": order_id, "item_status": item_status}
+                    for order_id, item_status in pending.item_statuses.items()
+                ],
+                auth_token=auth_token,
+                tenant_id=pending.tenant_id
+            )
+        except OrdersServiceError as e:
+            logger.error(
+                f"Failed to update order_items/trip_item_assignments for trip {pending.trip_id} "
+                f"(attempt {pending.attempts + 1}): {e}. Kept for retry on the next journal."
+            )
+            pending.attempts += 1
+            pending.last_error = str(e)
+            still_pending.add(pending.trip_id)
+        else:
+            await db.delete(pending)
+    await db.commit()
+    return still_pending
+
+
+@router.post("/journal", response_model=DriverJournalResponse)
+async def apply_driver_journal(
+    journal: DriverJournalRequest,
+    driver_id: str = Query(..., description="Driver ID for authorization"),
+    company_id: Optional[str] = Query(None, description="Filter by company ID"),
+    token_data: TokenData = Depends(require_permissions(["driver:update"])),
+    tenant_id: str = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_async_session),
+    request: Request = None
+):
+    """
+    Apply a driver's delivery journal: ordered events captured on the device
+
+    Events are grouped by trip and applied in order with the rules of the
+    single-event endpoints, in one transaction per trip. Each outcome is
+    stored under the client's ``event_id`` in that transaction, so re-sending
+    a journal (e.g. after a lost response) returns the stored outcomes marked
+    ``duplicate`` instead of applying anything twice. An invalid event is
+    rejected without affecting the rest of the trip.
+
+    After each trip commits, downstream updates go out once per trip: one bulk
+    item-status call to Orders, one driver/vehicle status update for the
+    trip's final status, and the trip events and audit records.
+
+    Item statuses are written to an outbox in the trip's transaction and only
+    removed once Orders accepts them. Until then the trip's results are marked
+    ``orders_sync_pending``; re-sending the journal (even if every event is a
+    duplicate) retries the call.
+    """
+    auth_header = request.headers.get("authorization") if request else None
+    auth_headers = {"Authorization": auth_header} if auth_header else {}
+    auth_token = auth_header[7:] if auth_header and auth_header.startswith("Bearer ") else None
+
+    # Outcomes of events already recorded by an earlier submission
+    event_ids = list(dict.fromkeys(event.event_id for event in journal.events))
+    stored_result = await db.execute(select(DriverJournalEvent).where(DriverJournalEvent.event_id.in_(event_ids)))
+    stored = {row.event_id: row for row in stored_result.scalars().all()}
+
+    results: Dict[str, DriverJournalEventResult] = {}
+    events_by_trip: Dict[str, List[DriverJournalEntry]] = {}
+    # Trips of this driver whose outstanding item statuses are retried below
+    sync_trip_ids: List[str] = []
+    seen = set()
+    for event in journal.events:
+        # Within one journal, the first event with an id counts
+        if event.event_id in seen:
+            continue
+        seen.add(event.event_id)
+        previous = stored.get(event.event_id)
+        if previous:
+            if previous.driver_id == driver_id:
+                results[event.event_id] = DriverJournalEventResult(
+                    event_id=event.event_id, trip_id=previous.trip_id, result=previous.result,
+                    detail=previous.detail, duplicate=True
+                )
+                sync_trip_ids.append(previous.trip_id)
+            else:
+                results[event.event_id] = DriverJournalEventResult(
+                    event_id=event.event_id, trip_id=event.trip_id, result="rejected",
+                    detail="event_id already used"
+                )
+            continue
+        events_by_trip.setdefault(event.trip_id, []).append(event)
+
+    for trip_id, events in events_by_trip.items():
+        trip_query = select(Trip).where(and_(Trip.id == trip_id, Trip.driver_id == driver_id))
+        if company_id:
+            trip_query = trip_query.where(Trip.company_id == company_id)
+        trip = (await db.execute(trip_query)).scalar_one_or_none()
+
+        stops: List[TripOrder] = []
+        if trip:
+            stops_query = select(TripOrder).where(TripOrder.trip_id == trip_id)
+            if company_id:
+                stops_query = stops_query.where(TripOrder.company_id == company_id)
+            stops = list((await db.execute(stops_query)).scalars().all())
+
+        initial_status = trip.status if trip else None
+        actual_tenant_id = (trip.company_id if trip else None) or company_id or tenant_id
+        effects = {"item_statuses": {}, "trip_events": [], "audit": []}
+        trip_results = []
+        for event in events:
+            if trip:
+                reason = _apply_journal_event(event, trip, stops, effects)
+            else:
+                reason = "Trip not found or not assigned to this driver"
+            outcome = "rejected" if reason else "applied"
+            db.add(DriverJournalEvent(
+                event_id=event.event_id,
+                driver_id=driver_id,
+                trip_id=trip_id,
+                event_type=event.type.value,
+                result=outcome,
+                detail=reason,
+                occurred_at=_naive_utc(event.occurred_at) if event.occurred_at else None,
+            ))
+            trip_results.append(DriverJournalEventResult(
+                event_id=event.event_id, trip_id=trip_id, result=outcome, detail=reason
+            ))
+
+        if effects["item_statuses"]:
+            # Outbox: newer statuses replace older undelivered ones for the same order
+            pending = await db.get(PendingOrderItemSync, trip_id)
+            if pending:
+                pending.item_statuses = {**pending.item_statuses, **effects["item_statuses"]}
+                pending.tenant_id = actual_tenant_id
+            else:
+                db.add(PendingOrderItemSync(
+                    trip_id=trip_id,
+                    tenant_id=actual_tenant_id,
+                    item_statuses=dict(effects["item_statuses"]),
+                    attempts=0,
+                ))
+
+        try:
+            await db.commit()
+        except IntegrityError:
+            # A concurrent submission of the same journal recorded these events first
+            await db.rollback()
+            recorded_result = await db.execute(
+                select(DriverJournalEvent).where(DriverJournalEvent.event_id.in_([e.event_id for e in events]))
+            )
+            recorded = {row.event_id: row for row in recorded_result.scalars().all()}
+            for event in events:
+                row = recorded.get(event.event_id)
+                results[event.event_id] = DriverJournalEventResult(
+                    event_id=event.event_id, trip_id=trip_id,
+                    result=row.result if row else "retry",
+                    detail=row.detail if row else "Conflicting concurrent submission",
+                    duplicate=row is not None
+                )
+            continue
+
+        for trip_result in trip_results:
+            results[trip_result.event_id] = trip_result
+        if not trip:
+            continue
+        sync_trip_ids.append(trip_id)
+
+        # Resources follow the trip's final status, once per trip
+        if trip.status != initial_status:
+            await _update_resource_statuses_for_trip(
+                trip.status,
+                trip.truck_plate,
+                trip.driver_id,
+                auth_headers,
+                actual_tenant_id
+            )
+
+        try:
+            from src.services.kafka_producer import trip_event_producer
+            for kind, event in effects["trip_events"]:
+                if kind == "paused":
+                    trip_event_producer.publish_trip_paused(
+                        trip_id=str(trip.id),
+                        tenant_id=actual_tenant_id,
+                        driver_id=trip.driver_id,
+                        driver_name=trip.driver_name,
+                        branch_id=trip.branch,
+                        paused_by=driver_id,
+                        paused_by_role=token_data.role,
+                        reason=event.reason,
+                        note=event.note
+                    )
+                else:
+                    trip_event_producer.publish_trip_resumed(
+                        trip_id=str(trip.id),
+                        tenant_id=actual_tenant_id,
+                        driver_id=trip.driver_id,
+                        driver_name=trip.driver_name,
+                        branch_id=trip.branch,
+                        resumed_by=driver_id,
+                        resumed_by_role=token_data.role,
+                        note=event.note
+                    )
+        except Exception as e:
+            logger.error(f"Failed to publish trip pause/resume events for trip {trip_id}: {e}")
+
+        audit_client = AuditClient(auth_headers)
+        for description, entity_type, entity_id, from_status, to_status in effects["audit"]:
+            await audit_client.log_event(
+                tenant_id=actual_tenant_id,
+                user_id=driver_id,
+                user_role=token_data.role,
+                action="status_change",
+                module="trips",
+                entity_type=entity_type,
+                entity_id=str(entity_id),
+                description=f"{description} (driver journal)",
+                from_status=from_status,
+                to_status=to_status,
+                old_values={"status": from_status},
+                new_values={"status": to_status}
+            )
+        await audit_client.close()
+
+        logger.info(
+            f"Driver journal for trip {trip_id}: {sum(r.result == 'applied' for r in trip_results)} applied, "
+            f"{sum(r.result == 'rejected' for r in trip_results)} rejected"
+        )
+
+    # Item statuses for Orders: this journal's and any left over from earlier ones
+    pending_trip_ids = await _sync_pending_item_statuses(db, list(dict.fromkeys(sync_trip_ids)), auth_token)
+    for result in results.values():
+        if result.trip_id in pending_trip_ids:
+            result.orders_sync_pending = True
+
+    ordered = [results[event_id] for event_id in event_ids if event_id in results]
+    return DriverJournalResponse(
+        results=ordered,
+        applied=sum(r.result == "applied" and not r.duplicate for r in ordered),
+        rejected=sum(r.result == "rejected" and not r.duplicate for r in ordered),
+        duplicates=sum(r.duplicate for r in ordered),
+    )
@@ -20,6 +20,9 @@ logger = logging.getLogger(__name__)
 # Company service URL
 COMPANY_SERVICE_URL = "http://company-service:8002"
 
+# Orders per /orders/projection request (the Orders service maximum)
+ORDER_PROJECTION_PAGE_SIZE = 5000
+
 
 # Mock orders data - will be integrated with order service later
 ORDERS = [
@@ -302,25 +305,32 @@ async def get_orders(
 
     async with AsyncClient(timeout=30.0) as client:
         try:
-            # Build query parameters for orders service
-            params = {
-                "tenant_id": tenant_id,
-                "per_page": 100  # Max per_page value
+            # Only the fields used below, filtered in the Orders service
+            projection = {
+                "fields": [
+                    "id", "order_number", "customer", "status", "tms_order_status",
+                    "total_amount", "total_weight", "total_volume", "priority", "created_at",
+                    "items", "items_json", "remaining_items_json"
+                ],
+                "limit": ORDER_PROJECTION_PAGE_SIZE,
+                "offset": 0
             }
+            if status:
+                projection["statuses"] = [status]
+            if priority:
+                projection["priority"] = priority
 
             # Fetch all pages of orders
-            all_orders = []
-            current_page = 1
-            total_pages = 1
-
-            while current_page <= total_pages:
-                params["page"] = current_page
-
-                # Call Orders service
-                logger.info(f"Calling orders service with params: {params}")
-                response = await client.get(
-                    f"{settings.ORDERS_SERVICE_URL}/api/v1/orders/",
-                    params=params,
+            orders = []
+            while True:
+                logger.info(
+                    f"Calling orders service projection with filters: status={status}, priority={priority}, "
+                    f"offset={projection['offset']}"
+                )
+                response = await client.post(
+                    f"{settings.ORDERS_SERVICE_URL}/api/v1/orders/projection",
+                    params={"tenant_id": tenant_id},
+                    json=projection,
                     headers=headers
                 )
 
@@ -329,23 +339,13 @@ async def get_orders(
                     logger.error(f"Response text: {response.text}")
                     break
 
-                data = response.json()
-                orders = data.get("items", [])
-                all_orders.extend(orders)
-
-                # Update pagination info
-                total_pages = data.get("pages", 1)
-                current_page += 1
-
-            logger.info(f"Total orders fetched: {len(all_orders)}")
-            orders = all_orders
-
-            # Apply filters locally after fetching all orders
-            if status:
-                orders = [o for o in orders if o.get("status") == status]
+                page = response.json().get("items", [])
+                orders.extend(page)
+                if len(page) < ORDER_PROJECTION_PAGE_SIZE:
+                    break
+                projection["offset"] += len(page)
 
-            if priority:
-                orders = [o for o in orders if o.get("priority") == priority]
+            logger.info(f"Total orders fetched: {len(orders)}")
 
             # BULK FETCH: Get all trip-item assignments in a single request
             # This solves the N+1 query problem
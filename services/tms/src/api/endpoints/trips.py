@@ -7,13 +7,13 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.security import HTTPBearer
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, update, func
+from sqlalchemy import select, and_, or_, update
 from datetime import date, datetime, timezone
 from httpx import AsyncClient
 import uuid
 import logging
 
-from src.database import get_db, Trip, TripOrder, TMSAuditLog, CompanyAuditLog, write_audit_log_to_company, get_company_db_session
+from src.database import get_db, Trip, TripOrder, TMSAuditLog
 from src.schemas import (
     TripCreate, TripUpdate, TripResponse, TripWithOrders,
     AssignOrdersRequest, TripOrderCreate, TripOrderResponse,
@@ -30,6 +30,7 @@ from src.security import (
 )
 from src.config import settings
 from src.services.audit_client import AuditClient
+from src.services.resource_directory import resource_directory
 from src.services.trip_service import TripService
 
 logger = logging.getLogger(__name__)
@@ -47,156 +48,6 @@ router = APIRouter(
 COMPANY_SERVICE_URL = "http://company-service:8002"
 
 
-async def _get_vehicle_id_by_plate(
-    plate_number: str,
-    auth_headers: dict,
-    tenant_id: str
-) -> Optional[str]:
-    """
-    Get vehicle ID from plate number by querying Company Service
-    """
-    try:
-        async with AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{COMPANY_SERVICE_URL}/vehicles/",
-                params={
-                    "search": plate_number,
-                    "tenant_id": tenant_id,
-                    "per_page": 1
-                },
-                headers=auth_headers
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                items = data.get("items", [])
-                if items and len(items) > 0:
-                    # Find exact match for plate number
-                    for vehicle in items:
-                        if vehicle.get("plate_number") == plate_number:
-                            vehicle_id = vehicle.get("id")
-                            logger.info(f"Found vehicle ID {vehicle_id} for plate {plate_number}")
-                            return str(vehicle_id)
-
-            logger.warning(f"No vehicle found for plate number: {plate_number}")
-            return None
-    except Exception as e:
-        logger.error(f"Error getting vehicle ID by plate: {str(e)}")
-        return None
-
-
-async def _update_truck_status(
-    truck_plate: str,
-    new_status: str,
-    auth_headers: dict,
-    tenant_id: str
-):
-    """
-    Update truck status in Company Service
-
-    Status mapping:
-    - assigned: When truck is assigned to a trip (planning -> loading)
-    - on_trip: When trip is on-route
-    - available: When trip is completed or cancelled
-    """
-    logger.info(f"_update_truck_status called: truck_plate={truck_plate}, new_status={new_status}")
-
-    # The new_status is already the target status (assigned, on_trip, maintenance, available)
-    # No additional mapping needed - pass it directly to company service
-    company_status = new_status
-
-    # Validate that the status is supported
-    valid_statuses = ["assigned", "on_trip", "maintenance", "available"]
-    if company_status not in valid_statuses:
-        logger.warning(f"Invalid truck status: {new_status}. Must be one of: {valid_statuses}")
-        return
-
-    # Get vehicle ID from plate number
-    logger.info(f"Getting vehicle_id for plate: {truck_plate}")
-    vehicle_id = await _get_vehicle_id_by_plate(truck_plate, auth_headers, tenant_id)
-    if not vehicle_id:
-        logger.error(f"Cannot update truck status - vehicle not found for plate: {truck_plate}")
-        return
-
-    logger.info(f"Found vehicle_id: {vehicle_id} for plate: {truck_plate}")
-
-    try:
-        async with AsyncClient(timeout=10.0) as client:
-            url = f"{COMPANY_SERVICE_URL}/vehicles/{vehicle_id}/status"
-            params = {"tenant_id": tenant_id, "status": company_status}
-            logger.info(f"Calling PUT {url} with params: {params}")
-
-            response = await client.put(
-                url,
-                params=params,
-                headers=auth_headers
-            )
-
-            logger.info(f"Company Service response status: {response.status_code}")
-            logger.info(f"Company Service response body: {response.text}")
-
-            if response.status_code == 200:
-                logger.info(f"Updated truck {truck_plate} (ID: {vehicle_id}) status to {company_status}")
-            else:
-                logger.error(f"Failed to update truck status: {response.status_code} - {response.text}")
-    except Exception as e:
-        logger.error(f"Error updating truck status: {str(e)}", exc_info=True)
-
-
-async def _update_driver_status(
-    driver_id: str,
-    new_status: str,
-    auth_headers: dict,
-    tenant_id: str
-):
-    """
-    Update driver status in Company Service
-
-    Status mapping:
-    - assigned: When driver is assigned to a trip
-    - on_trip: When trip is on-route
-    - available: When trip is completed or cancelled
-
-    Note: driver_id is user_id from auth service. We need to get the driver profile ID first.
-    """
-    try:
-        # First, get the driver profile using user_id
-        async with AsyncClient(timeout=10.0) as client:
-            # Get driver profile by user_id
-            get_response = await client.get(
-                f"{COMPANY_SERVICE_URL}/profiles/drivers/by-user/{driver_id}",
-                params={"tenant_id": tenant_id},
-                headers=auth_headers
-            )
-
-            if get_response.status_code != 200:
-                logger.error(f"Failed to get driver profile for user_id {driver_id}: {get_response.status_code} - {get_response.text}")
-                return
-
-            driver_profile = get_response.json()
-            driver_profile_id = driver_profile.get("id")
-
-            if not driver_profile_id:
-                logger.error(f"No driver profile ID found for user_id {driver_id}")
-                return
-
-            logger.info(f"Found driver profile {driver_profile_id} for user_id {driver_id}")
-
-            # Now update the driver profile using the dedicated status endpoint
-            update_response = await client.put(
-                f"{COMPANY_SERVICE_URL}/profiles/drivers/{driver_profile_id}/status",
-                params={"status": new_status, "tenant_id": tenant_id},
-                headers=auth_headers
-            )
-
-            if update_response.status_code == 200:
-                logger.info(f"Updated driver {driver_id} (profile: {driver_profile_id}) status to {new_status}")
-            else:
-                logger.error(f"Failed to update driver status: {update_response.status_code} - {update_response.text}")
-    except Exception as e:
-        logger.error(f"Error updating driver status: {str(e)}")
-
-
 async def _update_resource_statuses_for_trip(
     trip_status: str,
     truck_plate: str,
@@ -252,11 +103,13 @@ async def _update_resource_statuses_for_trip(
 
     logger.info(f"Resource status mapping: truck={mapping['truck']}, driver={mapping['driver']}")
 
-    # Update truck status
-    await _update_truck_status(truck_plate, mapping["truck"], auth_headers, tenant_id)
-
-    # Update driver status
-    await _update_driver_status(driver_id, mapping["driver"], auth_headers, tenant_id)
+    # Truck and driver in one call; IDs come from the directory instead of plate/user lookups
+    await resource_directory.update_statuses(
+        tenant_id,
+        auth_headers,
+        vehicles={truck_plate: mapping["truck"]},
+        drivers={driver_id: mapping["driver"]}
+    )
 
 
 async def _check_trip_completion_and_update_status(
@@ -405,80 +258,6 @@ async def _update_order_item_statuses(
             logger.error(f"Error updating item status for order {trip_order.order_id}: {str(e)}", exc_info=True)
 
 
-async def fetch_latest_trip_status_change(
-    db: AsyncSession,
-    trip_ids: List[str]
-) -> dict:
-    """
-    Fetch the latest status change info for multiple trips from centralized audit logs.
-
-    Returns: Dict mapping trip_id -> status change info dict with keys:
-        - timestamp: datetime of the status change
-        - from_status: previous status
-        - to_status: new status
-    """
-    import json
-    from src.database import company_async_session_maker
-
-    logger.info(f"TMS - Fetching status changes for {len(trip_ids)} trips: {trip_ids[:3]}...")
-
-    # Query the centralized audit_logs table in company_db
-    async with company_async_session_maker() as company_db:
-        # Subquery to get the latest audit log entry for each trip
-        latest_audit_subquery = (
-            select(
-                CompanyAuditLog.entity_id,
-                func.max(CompanyAuditLog.action_timestamp).label('latest_timestamp')
-            )
-            .where(
-                and_(
-                    CompanyAuditLog.entity_type == 'trip',
-                    CompanyAuditLog.action == 'status_change',
-                    CompanyAuditLog.entity_id.in_(trip_ids)
-                )
-            )
-            .group_by(CompanyAuditLog.entity_id)
-            .subquery()
-        )
-
-        # Main query to get the latest audit log records
-        query = (
-            select(CompanyAuditLog)
-            .join(
-                latest_audit_subquery,
-                and_(
-                    CompanyAuditLog.entity_id == latest_audit_subquery.c.entity_id,
-                    CompanyAuditLog.action_timestamp == latest_audit_subquery.c.latest_timestamp
-                )
-            )
-        )
-
-        result = await company_db.execute(query)
-        audit_records = result.scalars().all()
-
-    logger.info(f"TMS - Found {len(audit_records)} audit log records from company_db")
-
-    # Build mapping: trip_id -> status change info
-    status_change_map = {}
-    for record in audit_records:
-        # Extract from_status and to_status from old_values and new_values
-        old_values = record.old_values if isinstance(record.old_values, dict) else {}
-        new_values = record.new_values if isinstance(record.new_values, dict) else {}
-
-        from_status = old_values.get('from_status') or old_values.get('status')
-        to_status = new_values.get('to_status') or new_values.get('status')
-
-        if to_status:
-            status_change_map[record.entity_id] = {
-                'timestamp': record.action_timestamp,
-                'from_status': from_status,
-                'to_status': to_status
-            }
-
-    logger.info(f"TMS - Built status_change_map with {len(status_change_map)} entries: {list(status_change_map.keys())[:3]}")
-    return status_change_map
-
-
 @router.get(
     "",
     response_model=List[TripResponse],
@@ -563,34 +342,38 @@ async def get_trips(
     result = await db.execute(query)
     trips = result.scalars().all()
 
-    # Fetch latest status changes for all trips from audit logs
-    trip_ids = [trip.id for trip in trips]
-    latest_status_changes = await fetch_latest_trip_status_change(db, trip_ids)
-
     # Get current UTC time once for consistent calculations
     current_time = datetime.now(timezone.utc)
 
     # Convert to response models with orders
     trip_responses = []
 
-    # Fetch all orders from Orders service to get items data (with pagination)
+    # Fetch the items of the orders on these trips from Orders service
     orders_with_items = {}
     bulk_assignments_data = {}
 
+    trip_order_refs = []
+    if trips:
+        refs_result = await db.execute(
+            select(TripOrder.order_id).where(TripOrder.trip_id.in_([trip.id for trip in trips])).distinct()
+        )
+        trip_order_refs = [ref for ref in refs_result.scalars().all() if ref]
+
     try:
         async with AsyncClient(timeout=30.0) as client:
-            # Fetch all pages of orders
-            all_orders = []
-            current_page = 1
-            total_pages = 1
-
-            while current_page <= total_pages:
-                orders_response = await client.get(
-                    f"{settings.ORDERS_SERVICE_URL}/api/v1/orders/",
-                    params={
-                        "tenant_id": tenant_id,
-                        "per_page": 100,  # Max per_page value
-                        "page": current_page
+            order_numbers = []
+            # Trip orders reference orders by ID or by order number; the
+            # projection endpoint takes up to 1000 of each per call
+            for start in range(0, len(trip_order_refs), 1000):
+                refs = trip_order_refs[start:start + 1000]
+                orders_response = await client.post(
+                    f"{settings.ORDERS_SERVICE_URL}/api/v1/orders/projection",
+                    params={"tenant_id": tenant_id},
+                    json={
+                        "ids": refs,
+                        "order_numbers": refs,
+                        "fields": ["id", "order_number", "items"],
+                        "limit": 2 * len(refs)
                     },
                     headers=auth_headers
                 )
@@ -600,29 +383,13 @@ async def get_trips(
                     logger.error(f"Failed to fetch orders: status {orders_response.status_code}, response: {orders_response.text}")
                     break
 
-                orders_data = orders_response.json()
-                orders = orders_data.get("items", [])
-                all_orders.extend(orders)
-
-                # Update pagination info
-                total_pages = orders_data.get("pages", 1)
-                current_page += 1
-
-            logger.info(f"Fetched {len(all_orders)} total orders from Orders service")
-
-            # Index orders by order_number for quick lookup
-            order_numbers = []
-            for order in all_orders:
-                order_key = order.get("order_number") or order.get("id")
-                orders_with_items[order_key] = order
-                # Also index by 'id' in case order_id matches the UUID
-                if order.get("id"):
+                for order in orders_response.json().get("items", []):
+                    orders_with_items[order["order_number"]] = order
                     orders_with_items[order["id"]] = order
-                if order.get("order_number"):
                     order_numbers.append(order["order_number"])
 
-            logger.info(f"Fetched {len(orders_with_items)} orders with items data")
-            logger.info(f"Sample orders_with_items keys: {list(orders_with_items.keys())[:5]}")
+            order_numbers = list(dict.fromkeys(order_numbers))
+            logger.info(f"Fetched items data for {len(order_numbers)} of {len(trip_order_refs)} trip orders")
 
             # BULK FETCH: Get all trip-item assignments for all orders
             if order_numbers:
@@ -777,18 +544,14 @@ async def get_trips(
             )
             order_responses.append(order_response)
 
-        # Calculate time in current status and get status change info
+        # Calculate time in current status from the trip's own status change columns
         try:
-            status_change_info = latest_status_changes.get(trip.id)
-
-            if status_change_info:
-                # We have a status change record
-                current_status_since = status_change_info.get('timestamp', trip.created_at)
-                from_status = status_change_info.get('from_status')
-                to_status = status_change_info.get('to_status')
+            current_status_since = trip.status_changed_at or trip.created_at
+            if trip.previous_status:
+                from_status = trip.previous_status
+                to_status = trip.status
             else:
-                # No status change record, use created_at
-                current_status_since = trip.created_at
+                # Status never changed since the trip was created
                 from_status = None
                 to_status = None
 
@@ -1788,51 +1551,32 @@ async def get_trip_orders(
 
     try:
         async with AsyncClient(timeout=30.0) as client:
-            # First, fetch all orders with their order_numbers
-            # We'll filter by tenant_id and paginate to get all orders
-            all_orders_list = []
-            current_page = 1
-            per_page = 100
-
-            while True:
-                params = {
-                    "tenant_id": tenant_id,
-                    "page": current_page,
-                    "per_page": per_page
-                }
-
-                orders_response = await client.get(
-                    f"{settings.ORDERS_SERVICE_URL}/api/v1/orders/",
-                    params=params,
-                    headers=auth_headers
-                )
-
-                if orders_response.status_code != 200:
-                    logger.warning(f"Failed to fetch orders: {orders_response.status_code}")
-                    break
-
-                data = orders_response.json()
-                page_orders = data.get("items", [])
-                if not page_orders:
-                    break
-
-                all_orders_list.extend(page_orders)
-
-                # Check if we've fetched all pages
-                total_pages = data.get("pages", 1)
-                if current_page >= total_pages:
-                    break
-                current_page += 1
-
-            # Filter to only orders in this trip and build order_numbers map
-            trip_order_ids = {order.order_id for order in orders}
+            # Look up the order numbers of this trip's orders, which are
+            # referenced by ID or by order number
+            trip_order_ids = list({order.order_id for order in orders if order.order_id})
             order_numbers_map = {}  # order_id -> order_number
             trip_order_numbers = []
 
-            for order_data in all_orders_list:
-                if order_data.get("id") in trip_order_ids:
-                    order_numbers_map[order_data["id"]] = order_data["order_number"]
+            orders_response = await client.post(
+                f"{settings.ORDERS_SERVICE_URL}/api/v1/orders/projection",
+                params={"tenant_id": tenant_id},
+                json={
+                    "ids": trip_order_ids,
+                    "order_numbers": trip_order_ids,
+                    "fields": ["id", "order_number"],
+                    "limit": 2 * len(trip_order_ids)
+                },
+                headers=auth_headers
+            )
+
+            if orders_response.status_code == 200:
+                for order_data in orders_response.json().get("items", []):
+                    for ref in (order_data["id"], order_data["order_number"]):
+                        if ref in trip_order_ids:
+                            order_numbers_map[ref] = order_data["order_number"]
                     trip_order_numbers.append(order_data["order_number"])
+            else:
+                logger.warning(f"Failed to fetch orders: {orders_response.status_code}")
 
             # Now fetch trip-item assignments using order_numbers
             if trip_order_numbers:
@@ -2499,18 +2243,25 @@ async def remove_order_from_trip(
         # We'll calculate what the new remaining_items should be
         async with AsyncClient(timeout=10.0) as client:
             # Fetch current order state from Orders service
-            orders_response = await client.get(
-                f"{settings.ORDERS_SERVICE_URL}/api/v1/orders/?order_number={order_id}&tenant_id={tenant_id}",
+            orders_response = await client.post(
+                f"{settings.ORDERS_SERVICE_URL}/api/v1/orders/projection",
+                params={"tenant_id": tenant_id},
+                json={
+                    "ids": [order_id],
+                    "order_numbers": [order_id],
+                    "fields": ["remaining_items_json"],
+                    "limit": 1
+                },
                 headers=auth_headers
             )
 
             current_remaining_items = []
             if orders_response.status_code == 200:
                 orders_data = orders_response.json()
-                if orders_data.get("data") and len(orders_data["data"]) > 0:
-                    current_order = orders_data["data"][0]
+                if orders_data.get("items"):
+                    current_order = orders_data["items"][0]
                     # Get the authoritative remaining_items_json from Orders service
-                    current_remaining_items = current_order.get("remaining_items_json", [])
+                    current_remaining_items = current_order.get("remaining_items_json") or []
 
             # Calculate new remaining_items: current remaining + removed items
             # We need to merge items by ID, summing up quantities for duplicates
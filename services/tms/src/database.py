@@ -4,9 +4,8 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime, date
-from sqlalchemy import Column, String, Integer, Float, DateTime, Date, Text, ForeignKey, CheckConstraint, JSON, Boolean
+from sqlalchemy import Column, String, Integer, BigInteger, Float, DateTime, Date, Text, ForeignKey, CheckConstraint, JSON, func
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 
 from src.config import settings
@@ -18,23 +17,11 @@ engine = create_async_engine(
     future=True,
 )
 
-# Create async engine for company database (for centralized audit_logs)
-company_engine = create_async_engine(
-    settings.COMPANY_DATABASE_URL,
-    echo=False,  # Don't echo SQL for audit log writes
-    future=True,
-)
-
 # Create session factory
 async_session_maker = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
-# Create session factory for company database (for audit logs)
-company_async_session_maker = sessionmaker(
-    company_engine, class_=AsyncSession, expire_on_commit=False
-)
-
 # Base class for models
 Base = declarative_base()
 
@@ -77,6 +64,13 @@ class Trip(Base):
     paused_reason = Column(String(500), nullable=True)
     resumed_at = Column(DateTime, nullable=True)
 
+    # Last status change, maintained by the track_trip_status_change trigger
+    status_changed_at = Column(DateTime(timezone=True), server_default=func.now())
+    previous_status = Column(String(50), nullable=True)
+
+    # Last writing transaction, stamped by the stamp_trips_sync_version trigger (driver delta sync)
+    sync_version = Column(BigInteger, nullable=True)
+
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -144,6 +138,10 @@ class TripOrder(Base):
     special_instructions = Column(Text)
     delivery_instructions = Column(Text)
 
+    # Last writing transaction, stamped by the stamp_trip_orders_sync_version trigger (driver delta sync)
+    sync_version = Column(BigInteger, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
     # Relationships
     trip = relationship("Trip", back_populates="orders")
 
@@ -171,8 +169,47 @@ class TripRoute(Base):
     trip = relationship("Trip", back_populates="routes")
 
 
+class DriverSyncTombstone(Base):
+    """Trip or stop removed from a driver, written by triggers for the driver delta sync"""
+    __tablename__ = "driver_sync_tombstones"
+
+    id = Column(BigInteger, primary_key=True)
+    driver_id = Column(String(50), nullable=False)
+    entity_type = Column(String(20), nullable=False)  # 'trip' or 'stop'
+    entity_id = Column(String(50), nullable=False)
+    trip_id = Column(String(50), nullable=False)
+    sync_version = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class DriverJournalEvent(Base):
+    """Outcome of an offline driver journal event, keyed by the client's event id"""
+    __tablename__ = "driver_journal_events"
+
+    event_id = Column(String(64), primary_key=True)
+    driver_id = Column(String(50), nullable=False)
+    trip_id = Column(String(50), nullable=False)
+    event_type = Column(String(30), nullable=False)
+    result = Column(String(20), nullable=False)  # 'applied' or 'rejected'
+    detail = Column(Text)
+    occurred_at = Column(DateTime)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+
+class PendingOrderItemSync(Base):
+    """Item statuses of a trip recorded by the driver journal but not yet accepted by Orders"""
+    __tablename__ = "pending_order_item_syncs"
+
+    trip_id = Column(String(50), primary_key=True)
+    tenant_id = Column(String(50))
+    item_statuses = Column(JSON, nullable=False)  # order number -> item status, latest wins
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class TMSAuditLog(Base):
-    """TMS Audit Log model (deprecated - use CompanyAuditLog instead)"""
+    """TMS Audit Log model (deprecated - audit events go to the company service via AuditClient)"""
     __tablename__ = "tms_audit_logs"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -190,43 +227,6 @@ class TMSAuditLog(Base):
     # and can be added later when needed for specific audit log queries
 
 
-class CompanyAuditLog(Base):
-    """Centralized Audit Log model from company_db"""
-    __tablename__ = "audit_logs"
-
-    id = Column(UUID(as_uuid=True), primary_key=True)
-    tenant_id = Column(String(255))
-    user_id = Column(String(255))
-    user_name = Column(String(255))
-    user_role = Column(String(100))
-    user_email = Column(String(255))
-    entity_type = Column(String(50))
-    entity_id = Column(String(255))
-    entity_name = Column(String(500))
-    action = Column(String(100))
-    module = Column(String(50))
-    sub_module = Column(String(50))
-    old_status = Column(String(50))
-    new_status = Column(String(50))
-    status_changed = Column(Boolean)
-    description = Column(Text)
-    reason = Column(Text)
-    notes = Column(Text)
-    meta_data = Column(JSONB)
-    ip_address = Column(String(45))
-    user_agent = Column(Text)
-    request_id = Column(String(100))
-    action_timestamp = Column(DateTime(timezone=True))
-    created_at = Column(DateTime(timezone=True))
-    updated_at = Column(DateTime(timezone=True))
-    old_values = Column(JSONB)
-    new_values = Column(JSONB)
-    from_status = Column(String(50))
-    to_status = Column(String(50))
-    approval_status = Column(String(20))
-    service_name = Column(String(50))
-
-
 # Dependency to get database session
 async def get_db():
     """Dependency to get database session (matching company service pattern)"""
@@ -245,75 +245,3 @@ async def get_async_session() -> AsyncSession:
             yield session
         finally:
             await session.close()
-
-
-async def get_company_db_session() -> AsyncSession:
-    """Get async session for company database (for centralized audit_logs)"""
-    async with company_async_session_maker() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
-
-
-async def write_audit_log_to_company(
-    entity_id: str,
-    entity_type: str,
-    module: str,
-    action: str,
-    from_status: str = None,
-    to_status: str = None,
-    description: str = None,
-    user_id: str = None,
-    user_name: str = None,
-    user_email: str = None,
-    user_role: str = None,
-    tenant_id: str = None,
-):
-    """
-    Write audit log to centralized audit_logs table in company_db
-
-    Args:
-        entity_id: ID of the entity (trip_id, order_id, etc.)
-        entity_type: Type of entity ('trip', 'trip_order', etc.)
-        module: Module name ('trips', 'orders', etc.)
-        action: Action performed ('create', 'status_change', etc.)
-        from_status: Previous status (for status changes)
-        to_status: New status (for status changes)
-        description: Human-readable description
-        user_id: ID of the user who performed the action
-        user_name: Name of the user
-        user_email: Email of the user
-        user_role: Role of the user
-        tenant_id: Tenant ID
-    """
-    from sqlalchemy import text
-
-    async with company_async_session_maker() as session:
-        query = text("""
-            INSERT INTO audit_logs (
-                tenant_id, user_id, user_name, user_email, user_role,
-                action, module, entity_type, entity_id,
-                description, from_status, to_status, created_at
-            ) VALUES (
-                :tenant_id, :user_id, :user_name, :user_email, :user_role,
-                :action, :module, :entity_type, :entity_id,
-                :description, :from_status, :to_status, NOW()
-            )
-        """)
-
-        await session.execute(query, {
-            "tenant_id": tenant_id or "",
-            "user_id": user_id or "",
-            "user_name": user_name,
-            "user_email": user_email,
-            "user_role": user_role,
-            "action": action,
-            "module": module,
-            "entity_type": entity_type,
-            "entity_id": entity_id,
-            "description": description or f"{action} {entity_type} {entity_id}",
-            "from_status": from_status,
-            "to_status": to_status
-        })
-        await session.commit()
\ No newline at end of file
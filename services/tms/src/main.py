@@ -8,15 +8,14 @@ import logging
 
 from src.config import settings
 from src.database import engine, Base
+from src.services.permission_cache import permission_cache
+from src.services.resource_directory import resource_directory
+from src.services.sync_tombstones import sync_tombstone_pruner
+from src.services.audit_client import audit_shipper
 from src.api.endpoints import trips, orders, resources, driver, tenant_cleanup
-from src.middleware import (
-    AuthenticationMiddleware,
-    TenantContextMiddleware,
-    TenantIsolationMiddleware,
-    SecurityHeadersMiddleware,
-    AuditLoggingMiddleware,
-    RateLimitMiddleware,
-)
+from src.middleware import RateLimitMiddleware
+from shared.asgi import FusedMiddleware
+from src.middleware.pipeline import build_pipeline_stages
 
 # Configure logging
 logging.basicConfig(
@@ -39,10 +38,26 @@ async def lifespan(app: FastAPI):
         await conn.run_sync(Base.metadata.create_all)
     logger.info("Database tables created/verified")
 
+    # Shared permission cache with push invalidation from the auth service
+    await permission_cache.initialize()
+
+    # Vehicle/driver IDs and statuses, kept current by company change events
+    await resource_directory.initialize()
+
+    # Background delivery of buffered audit events
+    await audit_shipper.start()
+
+    # Daily pruning of expired driver sync tombstones
+    await sync_tombstone_pruner.initialize()
+
     yield
 
     # Shutdown
     logger.info("Shutting down TMS Service...")
+    await sync_tombstone_pruner.shutdown()
+    await audit_shipper.stop()
+    await resource_directory.shutdown()
+    await permission_cache.shutdown()
 
 
 # Create FastAPI app
@@ -105,11 +120,17 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
-# Add security middleware (order matters - middleware executes in reverse order of addition)
-# 1. Security headers (outermost - executes last)
-app.add_middleware(SecurityHeadersMiddleware)
+# Add middleware (order matters - middleware executes in reverse order of addition)
+# 1. Rate limiting (innermost - keys on the authenticated user when available)
+if getattr(settings, 'RATE_LIMIT_ENABLED', True):
+    app.add_middleware(RateLimitMiddleware)
+
+# 2. Authentication, tenant context, sampled audit logging and security
+#    headers in a single pure ASGI pass
+middleware_stages = build_pipeline_stages(settings)
+app.add_middleware(FusedMiddleware, stages=middleware_stages)
 
-# 2. CORS (executes after security headers)
+# 3. CORS (outermost - answers preflight requests before authentication)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=getattr(settings, 'allowed_origins', ["*"]),
@@ -119,34 +140,6 @@ app.add_middleware(
     expose_headers=getattr(settings, 'expose_headers', []),
 )
 
-# 3. Audit logging (captures all requests)
-if getattr(settings, 'AUDIT_LOG_ENABLED', True):
-    app.add_middleware(AuditLoggingMiddleware)
-
-# 4. Rate limiting (if enabled)
-if getattr(settings, 'RATE_LIMIT_ENABLED', True):
-    app.add_middleware(RateLimitMiddleware)
-
-# 5. Tenant context for database operations
-app.add_middleware(TenantContextMiddleware)
-
-# 6. Tenant isolation for multi-tenancy (executes after authentication)
-app.add_middleware(TenantIsolationMiddleware)
-
-# 7. Authentication middleware (innermost - executes first)
-app.add_middleware(
-    AuthenticationMiddleware,
-    skip_paths=[
-        "/health",
-        "/ready",
-        "/metrics",
-        "/docs",
-        "/openapi.json",
-        "/redoc",
-        "/favicon.ico"
-    ]
-)
-
 # Add security exception handlers
 from src.security.exceptions import (
     SecurityException,
@@ -185,7 +178,14 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "tms"}
+    return {
+        "status": "healthy",
+        "service": "tms",
+        "audit": audit_shipper.get_stats(),
+        "resource_directory": resource_directory.get_stats(),
+        "sync_tombstones": sync_tombstone_pruner.get_status(),
+        "middleware": {stage.name: stage.get_stats() for stage in middleware_stages},
+    }
 
 
 @app.get("/metrics")
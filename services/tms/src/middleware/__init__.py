@@ -1,23 +1,8 @@
 """
 Middleware package for TMS Service
 """
-from .auth import AuthenticationMiddleware, SecurityHeadersMiddleware, AuditLoggingMiddleware, RateLimitMiddleware
-from .tenant import (
-    TenantContextMiddleware,
-    TenantIsolationMiddleware,
-    TripAccessMiddleware,
-    OrderAccessMiddleware,
-    ResourceAccessMiddleware,
-)
+from .auth import RateLimitMiddleware
 
 __all__ = [
-    "AuthenticationMiddleware",
-    "SecurityHeadersMiddleware",
-    "AuditLoggingMiddleware",
     "RateLimitMiddleware",
-    "TenantContextMiddleware",
-    "TenantIsolationMiddleware",
-    "TripAccessMiddleware",
-    "OrderAccessMiddleware",
-    "ResourceAccessMiddleware",
-]
\ No newline at end of file
+]
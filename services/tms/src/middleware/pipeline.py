@@ -0,0 +1,113 @@
+"""
+Fused middleware pipeline for TMS Service
+
+Authentication, tenant resolution, audit logging and security headers run as
+stages of one pure ASGI middleware (``shared.asgi``) instead of a stack of
+``BaseHTTPMiddleware`` layers.
+"""
+import logging
+from typing import List
+
+from fastapi import HTTPException
+
+from shared.asgi import (
+    AuditStage,
+    AuthStage,
+    Reject,
+    RequestContext,
+    SecurityHeadersStage,
+    Stage,
+    TenantStage,
+)
+from src.security.auth import (
+    verify_token,
+    extract_token_from_header,
+    log_authentication_event,
+    TokenExpiredError,
+    TokenInvalidError,
+)
+
+logger = logging.getLogger(__name__)
+
+BEARER_CHALLENGE = {"WWW-Authenticate": "Bearer"}
+
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "X-Permitted-Cross-Domain-Policies": "none",
+}
+
+# Served without a token. Unlike shared.asgi.PUBLIC_PATHS, /api/v1/internal
+# (tenant cleanup) and /static still require authentication in TMS
+AUTH_SKIP_PATHS = (
+    "/health",
+    "/ready",
+    "/metrics",
+    "/docs",
+    "/openapi.json",
+    "/redoc",
+    "/favicon.ico",
+)
+
+# Cache control headers for API endpoints
+API_HEADERS = {
+    "Cache-Control": "no-store, no-cache, must-revalidate",
+    "Pragma": "no-cache",
+    "Expires": "0",
+}
+
+
+def authenticate(ctx: RequestContext, authorization: str) -> dict:
+    """Verify the bearer token and return the request state it grants"""
+    try:
+        token = extract_token_from_header(authorization)
+        token_data = verify_token(token)
+    except HTTPException as e:
+        raise Reject(e.status_code, e.detail, e.headers)
+    except TokenExpiredError:
+        log_authentication_event("TOKEN_EXPIRED", request=ctx.request, success=False, reason="Token has expired")
+        raise Reject(401, "Token has expired", BEARER_CHALLENGE)
+    except TokenInvalidError as e:
+        log_authentication_event("TOKEN_INVALID", request=ctx.request, success=False, reason=str(e))
+        raise Reject(401, "Invalid token", BEARER_CHALLENGE)
+    except Exception as e:
+        logger.error(f"Authentication middleware error: {str(e)}")
+        # Generic 401 to avoid leaking details
+        raise Reject(401, "Authentication failed", BEARER_CHALLENGE)
+
+    log_authentication_event("TOKEN_VALIDATED", token_data=token_data, request=ctx.request, success=True)
+    return {
+        "user_id": token_data.user_id,
+        "tenant_id": token_data.tenant_id,
+        "role_id": token_data.role_id,
+        "permissions": token_data.permissions,
+        "is_super_user": token_data.is_super_user(),
+    }
+
+
+def missing_token(ctx: RequestContext):
+    log_authentication_event(
+        "MISSING_TOKEN",
+        request=ctx.request,
+        success=False,
+        reason="Missing Authorization header"
+    )
+
+
+def build_pipeline_stages(settings) -> List[Stage]:
+    """Stages in execution order"""
+    stages: List[Stage] = [
+        AuthStage(authenticate, on_missing=missing_token, skip_paths=AUTH_SKIP_PATHS),
+        # Super-user tokens without a tenant are passed on for the endpoints to authorize
+        TenantStage(require_tenant=False, response_header=False, skip_exact=["/"]),
+    ]
+    if getattr(settings, 'AUDIT_LOG_ENABLED', True):
+        stages.append(AuditStage(
+            "tms_audit",
+            sample_rate=getattr(settings, 'AUDIT_SAMPLE_RATE', 1.0),
+            buffer_size=getattr(settings, 'AUDIT_REQUEST_BUFFER_SIZE', 10000),
+        ))
+    stages.append(SecurityHeadersStage(SECURITY_HEADERS, api_headers=API_HEADERS))
+    return stages
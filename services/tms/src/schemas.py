@@ -1,7 +1,7 @@
 """Pydantic schemas for TMS Service"""
 
 from datetime import datetime, date
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from pydantic import BaseModel, Field, ConfigDict
 from enum import Enum
 
@@ -309,11 +309,22 @@ class DriverTripSummary(BaseModel):
     capacity_total: int
 
 
+class DriverTripCompact(BaseModel):
+    """Trip list entry for ``compact=true`` (mobile list screen)"""
+    id: str
+    status: TripStatus
+    trip_date: date
+    total_orders: int
+    completed_orders: int
+
+
 class DriverTripListResponse(BaseModel):
-    trips: List[DriverTripSummary]
+    trips: List[Union[DriverTripSummary, DriverTripCompact]]
     total: int
     active: int
     completed: int
+    # Pass as ``cursor`` to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
 
 
 class DriverOrderItemDimensions(BaseModel):
@@ -396,6 +407,113 @@ class DriverTripDetailResponse(BaseModel):
     items_error_message: Optional[str] = None
 
 
+# Driver delta sync schemas
+class DriverSyncTrip(BaseSchema):
+    """Trip as stored on the driver's device"""
+    id: str
+    status: TripStatus
+    origin: Optional[str] = None
+    destination: Optional[str] = None
+    distance: Optional[int] = None
+    truck_plate: str
+    truck_model: str
+    capacity_used: Optional[int] = 0
+    capacity_total: int
+    trip_date: date
+    estimated_duration: Optional[int] = None
+    maintenance_note: Optional[str] = None
+    paused_at: Optional[datetime] = None
+    paused_reason: Optional[str] = None
+    resumed_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class DriverSyncStop(BaseSchema):
+    """Trip order (delivery stop) as stored on the driver's device"""
+    id: int
+    trip_id: str
+    order_id: str
+    customer: str
+    customer_address: Optional[str] = None
+    customer_phone: Optional[str] = None
+    address: Optional[str] = None
+    status: str
+    delivery_status: Optional[str] = None
+    priority: str
+    sequence_number: int
+    total: Optional[float] = None
+    weight: Optional[float] = None
+    volume: Optional[float] = None
+    items: Optional[int] = None
+    items_json: Optional[Any] = None
+    special_instructions: Optional[str] = None
+    delivery_instructions: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+
+class DriverSyncDeletion(BaseSchema):
+    """Trip or stop the device must drop"""
+    entity_type: str  # 'trip' or 'stop'
+    entity_id: str
+    trip_id: str
+
+
+class DriverSyncResponse(BaseModel):
+    """Changes to a driver's trips since a sync cursor"""
+    # Pass as ``since`` on the next sync
+    cursor: int
+    # True when the response is a full snapshot (no ``since``): replace local state
+    full: bool
+    trips: List[DriverSyncTrip]
+    stops: List[DriverSyncStop]
+    deleted: List[DriverSyncDeletion]
+    # The driver's open trips, for syncing their item assignments and documents
+    active_trip_ids: List[str]
+
+
+class DriverJournalEventType(str, Enum):
+    DELIVERY_STATUS = "delivery_status"  # status set through PUT .../delivery
+    DELIVER = "deliver"  # POST .../deliver (out-for-delivery first when pending)
+    PAUSE = "pause"
+    RESUME = "resume"
+
+
+class DriverJournalEntry(BaseModel):
+    """Driver action captured on the device, possibly while offline"""
+    # Generated on the device; a re-sent event with the same id is not applied twice
+    event_id: str = Field(..., min_length=1, max_length=64)
+    trip_id: str
+    type: DriverJournalEventType
+    order_id: Optional[str] = None  # delivery_status and deliver
+    status: Optional[DeliveryStatus] = None  # delivery_status
+    reason: Optional[str] = Field(None, max_length=500)  # pause
+    note: Optional[str] = Field(None, max_length=2000)  # pause and resume
+    occurred_at: Optional[datetime] = None
+
+
+class DriverJournalRequest(BaseModel):
+    """Ordered driver actions; applied in order within each trip"""
+    events: List[DriverJournalEntry] = Field(..., min_length=1, max_length=500)
+
+
+class DriverJournalEventResult(BaseModel):
+    event_id: str
+    trip_id: str
+    result: str  # 'applied', 'rejected', or 'retry' (not recorded, send again)
+    detail: Optional[str] = None
+    # True when the event was already recorded by an earlier submission
+    duplicate: bool = False
+    # True while the trip's item statuses have not reached Orders; re-send the journal to retry
+    orders_sync_pending: bool = False
+
+
+class DriverJournalResponse(BaseModel):
+    results: List[DriverJournalEventResult]
+    applied: int
+    rejected: int
+    duplicates: int
+
+
 # Pause/Resume Schemas
 class TripPause(BaseModel):
     """Schema for pausing a trip"""
@@ -310,5 +310,77 @@ class OrdersServiceClient:
             raise OrdersServiceUnavailable(f"Unexpected error: {str(e)}")
 
 
+    async def update_order_items_status_bulk(
+        self,
+        trip_id: str,
+        updates: List[Dict[str, str]],
+        auth_token: Optional[str] = None,
+        tenant_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Update item statuses of several orders on one trip in a single request.
+
+        Same effect as calling update_order_items_status for each entry.
+
+        Args:
+            trip_id: Trip ID for filtering assignments
+            updates: List of {"order_id": order number, "item_status": new status}
+            auth_token: JWT token for authentication
+            tenant_id: Tenant ID for filtering
+
+        Returns:
+            Response from Orders service with update counts and missing orders
+
+        Raises:
+            OrdersServiceError: If service is unavailable or request fails
+        """
+        if not updates:
+            return {"updated_count": 0, "trip_assignments_updated": 0, "orders_updated": 0, "missing_orders": []}
+
+        headers = {}
+        if auth_token:
+            headers["Authorization"] = f"Bearer {auth_token}"
+
+        try:
+            async with AsyncClient(timeout=self.bulk_timeout) as client:
+                params = {}
+                if tenant_id:
+                    params["tenant_id"] = tenant_id
+
+                response = await client.post(
+                    f"{self.base_url}/api/v1/orders/item-status/bulk",
+                    json={"trip_id": trip_id, "updates": updates},
+                    headers=headers,
+                    params=params
+                )
+
+                if response.status_code == 200:
+                    result = response.json()
+                    logger.info(f"Bulk updated item statuses for {len(updates)} orders in trip {trip_id}: {result}")
+                    return result
+                elif response.status_code == 401:
+                    logger.error("Orders service authentication failed")
+                    raise OrdersServiceError("Authentication failed")
+                elif response.status_code == 403:
+                    logger.error("Orders service authorization failed")
+                    raise OrdersServiceError("Authorization failed")
+                else:
+                    logger.error(f"Orders service returned error: {response.status_code} - {response.text}")
+                    raise OrdersServiceError(f"Service error: {response.status_code}")
+
+        except TimeoutException:
+            logger.error("Orders service timeout")
+            raise OrdersServiceUnavailable("Service timeout")
+        except HTTPError as e:
+            logger.error(f"HTTP error calling Orders service: {e}")
+            raise OrdersServiceUnavailable(f"HTTP error: {str(e)}")
+        except OrdersServiceError:
+            # Re-raise our custom exceptions
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error calling Orders service: {e}")
+            raise OrdersServiceUnavailable(f"Unexpected error: {str(e)}")
+
+
 # Create singleton instance
 orders_client = OrdersServiceClient()
@@ -2,10 +2,10 @@
 Permission service for TMS - communicates with Auth Service
 """
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
 import httpx
 import logging
 from src.config import settings
+from src.services.permission_cache import permission_cache
 
 logger = logging.getLogger(__name__)
 
@@ -15,27 +15,15 @@ class TMSServicePermission:
 
     def __init__(self):
         self.auth_service_url = settings.AUTH_SERVICE_URL or "http://localhost:8001"
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_ttl = 900  # 15 minutes cache TTL
-        self._cache_hits = 0
-        self._cache_misses = 0
+        # Shared two-tier cache, invalidated by events from the auth service
+        self.cache = permission_cache
 
     async def get_user_permissions(self, user_id: str, role_id: int) -> List[str]:
         """Get permissions for a user from Auth Service with caching"""
-        cache_key = f"user_permissions:{user_id}"
-        current_time = datetime.utcnow()
-
-        # Check cache first
-        if cache_key in self.cache:
-            cache_entry = self.cache[cache_key]
-            if current_time < cache_entry["expires_at"]:
-                self._cache_hits += 1
-                return cache_entry["permissions"]
-            else:
-                # Cache expired, remove it
-                del self.cache[cache_key]
-
-        self._cache_misses += 1
+        # Check local LRU, then the shared Redis tier
+        cached = await self.cache.get(user_id)
+        if cached is not None:
+            return cached
 
         try:
             # Fetch permissions from Auth Service
@@ -50,17 +38,14 @@ class TMSServicePermission:
                     permissions = data.get("permissions", [])
                 else:
                     logger.error(f"Failed to fetch permissions: {response.status_code}")
-                    permissions = []
+                    return []
 
         except Exception as e:
             logger.error(f"Error fetching permissions from auth service: {str(e)}")
-            permissions = []
+            return []
 
-        # Cache the result
-        self.cache[cache_key] = {
-            "permissions": permissions,
-            "expires_at": current_time + timedelta(seconds=self._cache_ttl)
-        }
+        # Cache only successful lookups so auth outages are not pinned for the TTL
+        await self.cache.set(user_id, role_id, permissions)
 
         return permissions
 
@@ -113,23 +98,12 @@ class TMSServicePermission:
 
     async def invalidate_user_cache(self, user_id: str):
         """Invalidate cached permissions for a specific user"""
-        cache_key = f"user_permissions:{user_id}"
-        if cache_key in self.cache:
-            del self.cache[cache_key]
+        await self.cache.invalidate_user(user_id)
 
     def clear_cache(self):
-        """Clear all cached permissions"""
-        self.cache.clear()
-        self._cache_hits = 0
-        self._cache_misses = 0
+        """Clear locally cached permissions"""
+        self.cache.clear_local()
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache performance statistics"""
-        total_requests = self._cache_hits + self._cache_misses
-        return {
-            "cache_size": len(self.cache),
-            "hits": self._cache_hits,
-            "misses": self._cache_misses,
-            "hit_rate": self._cache_hits / total_requests if total_requests > 0 else 0,
-            "total_requests": total_requests
-        }
\ No newline at end of file
+        return self.cache.get_stats()
\ No newline at end of file
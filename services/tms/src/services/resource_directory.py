@@ -0,0 +1,275 @@
+"""
+Tenant-scoped directory of company vehicles and drivers for trip transitions
+
+Trip transitions move the trip's truck and driver between statuses in the
+company service. The directory remembers, per tenant, each vehicle by plate
+and each driver by auth user ID with its company ID and last known status,
+and sends both status changes of a transition in one call to the company
+service's batched ``/api/v1/internal/resources/status`` endpoint (by ID once
+known, by plate / user ID before that).
+
+Entries come from the responses of that endpoint and from the vehicle and
+driver events the company service publishes on ``company:changes``, which
+also drop renamed and deleted resources; the TTL only bounds staleness if an
+event is missed. If the subscription drops, the cache is cleared and the
+listener resubscribes with exponential backoff; ``get_stats`` reports
+``listening: False`` until it is back.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import redis.asyncio as redis
+from httpx import AsyncClient, HTTPError
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+COMPANY_CHANGES_CHANNEL = "company:changes"
+RECONNECT_BACKOFF_MIN = 1.0
+RECONNECT_BACKOFF_MAX = 60.0
+
+
+class ResourceDirectory:
+    """Per-tenant vehicle (by plate) and driver (by user ID) cache with batched status updates"""
+
+    def __init__(self, company_url: str, redis_url: Optional[str], ttl: int = 3600):
+        self._company_url = company_url
+        self._redis_url = redis_url
+        self._ttl = ttl
+        # tenant_id -> plate / user_id -> {"id", "status", "expires_at"}
+        self._vehicles: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._drivers: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._client: Optional[AsyncClient] = None
+        self._redis: Optional[redis.Redis] = None
+        self._pubsub = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self._listening = False
+        self._stats = {
+            "hits": 0, "misses": 0, "batches_sent": 0, "failures": 0,
+            "events_applied": 0, "reconnects": 0
+        }
+
+    async def initialize(self):
+        """Subscribe to vehicle/driver change events from the company service"""
+        if not self._redis_url or self._redis:
+            return
+        self._redis = redis.from_url(
+            self._redis_url,
+            encoding="utf-8",
+            decode_responses=True
+        )
+        # Subscribes in the background, retrying until Redis is reachable
+        self._listener_task = asyncio.create_task(self._listen())
+
+    async def shutdown(self):
+        """Stop the listener and close connections"""
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        await self._close_pubsub()
+        if self._redis:
+            await self._redis.close()
+            self._redis = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    def get_vehicle(self, tenant_id: str, plate_number: str) -> Optional[Dict[str, Any]]:
+        """Cached ``{"id", "status"}`` of a vehicle, or None"""
+        return self._lookup(self._vehicles, tenant_id, plate_number)
+
+    def get_driver(self, tenant_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Cached ``{"id", "status"}`` of a driver's profile, or None"""
+        return self._lookup(self._drivers, tenant_id, user_id)
+
+    async def update_statuses(
+        self,
+        tenant_id: str,
+        auth_headers: dict,
+        vehicles: Optional[Dict[str, str]] = None,
+        drivers: Optional[Dict[str, str]] = None
+    ) -> bool:
+        """
+        Set vehicle (plate -> status) and driver (user ID -> status) statuses in one call
+
+        Returns False if the company service could not be reached or refused
+        the batch; failures are logged, never raised, like the per-resource
+        updates they replace.
+        """
+        vehicle_changes = []
+        for plate_number, status in (vehicles or {}).items():
+            if not plate_number:
+                continue
+            cached = self.get_vehicle(tenant_id, plate_number)
+            if cached:
+                vehicle_changes.append({"vehicle_id": cached["id"], "status": status})
+            else:
+                vehicle_changes.append({"plate_number": plate_number, "status": status})
+
+        driver_changes = []
+        for user_id, status in (drivers or {}).items():
+            if not user_id:
+                continue
+            cached = self.get_driver(tenant_id, user_id)
+            if cached:
+                driver_changes.append({"driver_id": cached["id"], "status": status})
+            else:
+                driver_changes.append({"user_id": user_id, "status": status})
+
+        if not vehicle_changes and not driver_changes:
+            return True
+
+        try:
+            response = await self._get_client().post(
+                f"{self._company_url}/api/v1/internal/resources/status",
+                params={"tenant_id": tenant_id},
+                json={"vehicles": vehicle_changes, "drivers": driver_changes},
+                headers=auth_headers
+            )
+        except HTTPError as e:
+            self._stats["failures"] += 1
+            logger.error(f"Error updating resource statuses: {str(e)}")
+            return False
+
+        if response.status_code != 200:
+            self._stats["failures"] += 1
+            logger.error(f"Failed to update resource statuses: {response.status_code} - {response.text}")
+            return False
+
+        self._stats["batches_sent"] += 1
+        result = response.json()
+        for vehicle in result.get("vehicles", []):
+            self._apply_vehicle(tenant_id, vehicle)
+        for driver in result.get("drivers", []):
+            self._apply_driver(tenant_id, driver)
+        if result.get("not_found"):
+            # A cached ID that no longer exists: look it up by plate / user ID next time
+            for missing in result["not_found"]:
+                kind, _, resource_id = missing.partition(":")
+                index = self._vehicles if kind == "vehicle" else self._drivers
+                entries = index.get(tenant_id, {})
+                for key in [key for key, entry in entries.items() if entry["id"] == resource_id]:
+                    del entries[key]
+            logger.warning(f"Resources not found in company service for tenant {tenant_id}: {result['not_found']}")
+
+        logger.info(f"Updated resource statuses for tenant {tenant_id}: vehicles={vehicles}, drivers={drivers}")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            **self._stats,
+            "tenants": len(set(self._vehicles) | set(self._drivers)),
+            "vehicles": sum(len(entries) for entries in self._vehicles.values()),
+            "drivers": sum(len(entries) for entries in self._drivers.values()),
+            "listening": self._listening
+        }
+
+    def _get_client(self) -> AsyncClient:
+        if self._client is None:
+            self._client = AsyncClient(timeout=10.0)
+        return self._client
+
+    def _lookup(self, index: Dict[str, Dict[str, Dict[str, Any]]], tenant_id: str, key: str) -> Optional[Dict[str, Any]]:
+        entry = index.get(tenant_id, {}).get(key)
+        if entry is not None and time.monotonic() < entry["expires_at"]:
+            self._stats["hits"] += 1
+            return entry
+        if entry is not None:
+            del index[tenant_id][key]
+        self._stats["misses"] += 1
+        return None
+
+    def _apply_vehicle(self, tenant_id: str, vehicle: Dict[str, Any]):
+        entries = self._vehicles.setdefault(tenant_id, {})
+        # Drop the entry under a previous plate number
+        for plate_number in [plate for plate, entry in entries.items() if entry["id"] == vehicle["id"]]:
+            del entries[plate_number]
+        if not vehicle.get("deleted"):
+            entries[vehicle["plate_number"]] = {
+                "id": vehicle["id"],
+                "status": vehicle.get("status"),
+                "expires_at": time.monotonic() + self._ttl
+            }
+
+    def _apply_driver(self, tenant_id: str, driver: Dict[str, Any]):
+        entries = self._drivers.setdefault(tenant_id, {})
+        for user_id in [uid for uid, entry in entries.items() if entry["id"] == driver["id"]]:
+            del entries[user_id]
+        if driver.get("user_id") and not driver.get("deleted"):
+            entries[driver["user_id"]] = {
+                "id": driver["id"],
+                "status": driver.get("status"),
+                "expires_at": time.monotonic() + self._ttl
+            }
+
+    async def _listen(self):
+        backoff = RECONNECT_BACKOFF_MIN
+        try:
+            while True:
+                try:
+                    self._pubsub = self._redis.pubsub()
+                    await self._pubsub.subscribe(COMPANY_CHANGES_CHANNEL)
+                    self._listening = True
+                    backoff = RECONNECT_BACKOFF_MIN
+                    async for message in self._pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        self._apply_event(message["data"])
+                    logger.error(f"Resource directory subscription closed, resubscribing in {backoff:.0f}s")
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Resource directory listener stopped, resubscribing in {backoff:.0f}s: {e}")
+
+                # Without the channel the cached IDs may point at renamed or deleted resources
+                self._listening = False
+                self._vehicles.clear()
+                self._drivers.clear()
+                await self._close_pubsub()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, RECONNECT_BACKOFF_MAX)
+                self._stats["reconnects"] += 1
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._listening = False
+            if self._listener_task is asyncio.current_task():
+                self._listener_task = None
+
+    def _apply_event(self, data: str):
+        try:
+            event = json.loads(data)
+            if event["entity"] == "vehicle":
+                self._apply_vehicle(event["tenant_id"], event["data"])
+            elif event["entity"] == "driver":
+                self._apply_driver(event["tenant_id"], event["data"])
+            else:
+                return
+            self._stats["events_applied"] += 1
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.error(f"Invalid company change event: {e}")
+
+    async def _close_pubsub(self):
+        if self._pubsub:
+            try:
+                await self._pubsub.unsubscribe(COMPANY_CHANGES_CHANNEL)
+                await self._pubsub.close()
+            except Exception:
+                pass
+            self._pubsub = None
+
+# Global singleton instance
+resource_directory = ResourceDirectory(
+    company_url=settings.COMPANY_SERVICE_URL,
+    redis_url=getattr(settings, "REDIS_URL", None),
+    ttl=getattr(settings, "RESOURCE_DIRECTORY_TTL", 3600)
+)
@@ -0,0 +1,105 @@
+"""
+Retention of the driver delta sync tombstones
+
+Deleted and reassigned trips and stops leave rows in ``driver_sync_tombstones``
+(migration 032) so devices can drop them on their next sync. A device that
+has not synced for DRIVER_SYNC_TOMBSTONE_RETENTION_DAYS is given a full
+snapshot by the driver service instead, so older tombstones are never read
+again. ``sync_tombstone_pruner`` deletes them on startup and then daily.
+
+Replicas coordinate through a Postgres advisory lock, so only one of them
+runs a pass at a time.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from src.config import settings
+from src.database import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+PRUNE_INTERVAL_SECONDS = 24 * 60 * 60
+
+# Arbitrary, stable key for pg_try_advisory_xact_lock
+PRUNE_LOCK_KEY = 0x44535954  # "DSYT"
+
+
+class SyncTombstonePruner:
+    """Deletes driver sync tombstones older than the retention period"""
+
+    def __init__(self, retention_days: int = 30):
+        self._retention_days = retention_days
+        self._task: Optional[asyncio.Task] = None
+        self._last_run: Dict[str, Any] = {}
+
+    async def initialize(self):
+        """Run a pass now and schedule one daily"""
+        await self.prune()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_periodically())
+
+    async def shutdown(self):
+        """Stop the pruning task"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Outcome of the last pass"""
+        return dict(self._last_run)
+
+    async def prune(self) -> Dict[str, Any]:
+        """Delete expired tombstones; failures are logged"""
+        outcome: Dict[str, Any] = {"ran_at": datetime.now(timezone.utc).isoformat()}
+        if self._retention_days <= 0:
+            outcome["skipped"] = "retention disabled"
+            self._last_run = outcome
+            return outcome
+
+        async with async_session_maker() as db:
+            try:
+                locked = (await db.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"),
+                    {"key": PRUNE_LOCK_KEY}
+                )).scalar()
+                if not locked:
+                    outcome["skipped"] = "pruning running on another replica"
+                else:
+                    result = await db.execute(
+                        text(
+                            "DELETE FROM driver_sync_tombstones "
+                            "WHERE created_at < NOW() - make_interval(days => :days)"
+                        ),
+                        {"days": self._retention_days}
+                    )
+                    outcome["deleted"] = result.rowcount
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                outcome["error"] = str(e)
+                logger.error(f"Driver sync tombstone pruning failed: {e}")
+
+        if outcome.get("deleted"):
+            logger.info(f"Pruned {outcome['deleted']} driver sync tombstones older than {self._retention_days} days")
+
+        self._last_run = outcome
+        return outcome
+
+    async def _run_periodically(self):
+        while True:
+            await asyncio.sleep(PRUNE_INTERVAL_SECONDS)
+            await self.prune()
+
+
+# Global singleton instance
+sync_tombstone_pruner = SyncTombstonePruner(
+    retention_days=getattr(settings, "DRIVER_SYNC_TOMBSTONE_RETENTION_DAYS", 30)
+)
@@ -0,0 +1,29 @@
+"""Shared pure-ASGI middleware pipeline for all services"""
+
+from .paths import PathTrie
+from .pipeline import FusedMiddleware, RawHeaders, Reject, RequestContext, Stage
+from .stages import (
+    PUBLIC_PATHS,
+    AuthStage,
+    MetricsStage,
+    SecurityHeadersStage,
+    TenantStage,
+    route_template,
+)
+from .audit import AuditStage
+
+__all__ = [
+    "PathTrie",
+    "FusedMiddleware",
+    "RawHeaders",
+    "Reject",
+    "RequestContext",
+    "Stage",
+    "PUBLIC_PATHS",
+    "AuthStage",
+    "MetricsStage",
+    "SecurityHeadersStage",
+    "TenantStage",
+    "route_template",
+    "AuditStage",
+]
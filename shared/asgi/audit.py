@@ -0,0 +1,218 @@
+"""
+Audit stage for the fused middleware pipeline
+
+Ordinary requests are sampled, sensitive routes are always captured, and the
+request path only appends raw values to a ring buffer that a background writer
+formats and logs in a worker thread.
+"""
+import asyncio
+import logging
+import random
+import re
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .pipeline import RequestContext, Stage
+
+logger = logging.getLogger(__name__)
+
+# Routes that are always audited, regardless of sampling
+SENSITIVE_PATTERNS = (
+    "/delete",
+    "/approve",
+    "/cancel",
+    "/payment",
+    "/refund",
+    "/login",
+    "/logout",
+)
+
+# Keywords that make POST/DELETE requests sensitive
+SENSITIVE_WRITE_KEYWORDS = ("password", "token", "auth")
+
+EXCLUDED_PATHS = ("/metrics", "/docs", "/redoc", "/openapi.json", "/health", "/ready")
+
+# (timestamp, method, path, query_string, status_code, duration, headers, client, state, sensitive)
+AuditRecord = Tuple[float, str, str, bytes, int, float, list, Optional[tuple], Optional[dict], bool]
+
+
+class AuditRingBuffer:
+    """
+    Fixed-size ring of audit records
+
+    ``deque(maxlen=...)`` appends and pops atomically without a lock; when the
+    writer falls behind, the oldest records are overwritten and counted.
+    """
+
+    def __init__(self, capacity: int):
+        self._records: deque = deque(maxlen=capacity)
+        self.capacity = capacity
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def append(self, record: AuditRecord):
+        if len(self._records) == self.capacity:
+            self.dropped += 1
+        self._records.append(record)
+
+    def drain(self, limit: int) -> List[AuditRecord]:
+        records = []
+        popleft = self._records.popleft
+        try:
+            for _ in range(limit):
+                records.append(popleft())
+        except IndexError:
+            pass
+        return records
+
+
+class AuditStage(Stage):
+    """
+    Sampled request audit logging with a background writer
+
+    Args:
+        logger_name: Audit logger, e.g. "orders_audit"
+        sample_rate: Fraction of ordinary requests audited (0.0 - 1.0)
+        sensitive_patterns: Path fragments that are always audited
+        skip_paths: Path prefixes never audited
+        buffer_size: Ring buffer capacity (records)
+        flush_interval: Seconds between writer batches
+        batch_size: Maximum records written per batch
+    """
+
+    name = "audit"
+    skip_paths = EXCLUDED_PATHS
+
+    def __init__(
+        self,
+        logger_name: str,
+        sample_rate: float = 1.0,
+        sensitive_patterns: Iterable[str] = SENSITIVE_PATTERNS,
+        skip_paths: Optional[Iterable[str]] = None,
+        buffer_size: int = 10000,
+        flush_interval: float = 1.0,
+        batch_size: int = 1000,
+    ):
+        super().__init__(skip_paths)
+        self.audit_logger = logging.getLogger(logger_name)
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self._sensitive = re.compile("|".join(re.escape(pattern) for pattern in sensitive_patterns))
+        self._sensitive_write = re.compile("|".join(SENSITIVE_WRITE_KEYWORDS))
+        self.buffer = AuditRingBuffer(buffer_size)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._writer: Optional[asyncio.Task] = None
+        self.stats = {"captured": 0, "sampled_out": 0, "written": 0}
+
+    def on_complete(self, ctx: RequestContext) -> None:
+        sensitive = self._is_sensitive(ctx.method, ctx.path)
+        if not sensitive and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.stats["sampled_out"] += 1
+            return
+
+        if self._writer is None:
+            self._writer = asyncio.get_running_loop().create_task(self._write_loop())
+
+        scope = ctx.scope
+        self.stats["captured"] += 1
+        self.buffer.append((
+            time.time(),
+            ctx.method,
+            ctx.path,
+            scope.get("query_string", b""),
+            ctx.status_code,
+            ctx.duration,
+            scope.get("headers", []),
+            scope.get("client"),
+            ctx.state,
+            sensitive,
+        ))
+
+    def _is_sensitive(self, method: str, path: str) -> bool:
+        """Whether the request is always audited"""
+        lowered = path.lower()
+        if self._sensitive.search(lowered):
+            return True
+        return method in ("DELETE", "POST") and self._sensitive_write.search(lowered) is not None
+
+    async def close(self):
+        """Stop the writer and write what is left in the buffer"""
+        if self._writer:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        while len(self.buffer):
+            self._write_batch(self.buffer.drain(self.batch_size))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "buffered": len(self.buffer),
+            "dropped": self.buffer.dropped,
+            "sample_rate": self.sample_rate,
+        }
+
+    async def _write_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            while len(self.buffer):
+                records = self.buffer.drain(self.batch_size)
+                try:
+                    await asyncio.to_thread(self._write_batch, records)
+                except Exception as e:
+                    logger.error(f"Failed to write audit records: {str(e)}")
+
+    def _write_batch(self, records: List[AuditRecord]):
+        for record in records:
+            level, message, audit_data = self._format(record)
+            self.audit_logger.log(level, message, extra={"audit_data": audit_data})
+        self.stats["written"] += len(records)
+
+    def _format(self, record: AuditRecord) -> Tuple[int, str, Dict[str, Any]]:
+        timestamp, method, path, query_string, status_code, duration, headers, client, state, sensitive = record
+        header_map = {name: value for name, value in headers if name in (b"x-forwarded-for", b"x-real-ip", b"user-agent")}
+
+        audit_data: Dict[str, Any] = {
+            "timestamp": timestamp,
+            "method": method,
+            "path": path,
+            "query_string": query_string.decode("latin-1"),
+            "client_ip": self._client_ip(header_map, client),
+            "user_agent": header_map.get(b"user-agent", b"").decode("latin-1") or None,
+            "status_code": status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "sensitive": sensitive,
+        }
+        for key in ("user_id", "tenant_id", "role_id"):
+            if state and key in state:
+                audit_data[key] = state[key]
+
+        message = f"API Request: {method} {path} | {status_code} | Duration: {audit_data['duration_ms']}ms"
+        if "user_id" in audit_data:
+            message += f" | User: {audit_data['user_id']}"
+        if "tenant_id" in audit_data:
+            message += f" | Tenant: {audit_data['tenant_id']}"
+
+        if status_code >= 500:
+            level = logging.ERROR
+        elif status_code >= 400 or sensitive:
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+        return level, message, audit_data
+
+    @staticmethod
+    def _client_ip(headers: Dict[bytes, bytes], client: Optional[tuple]) -> str:
+        forwarded_for = headers.get(b"x-forwarded-for")
+        if forwarded_for:
+            return forwarded_for.split(b",")[0].strip().decode("latin-1")
+        real_ip = headers.get(b"x-real-ip")
+        if real_ip:
+            return real_ip.decode("latin-1")
+        return client[0] if client else "unknown"
@@ -0,0 +1,75 @@
+"""
+Precompiled path matching for middleware skip lists
+"""
+from typing import Dict, Iterable, Optional
+
+
+class _Node:
+    __slots__ = ("children", "terminal", "subtree")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.terminal = False  # the path itself matches
+        self.subtree = False   # every path below matches
+
+
+class PathTrie:
+    """
+    Segment trie of path prefixes
+
+    Matches with the same semantics as the services' former
+    ``_should_skip_path`` loops, in one walk over the path's segments instead
+    of one string comparison per configured entry:
+
+    - ``"/static"``: ``/static`` and everything below ``/static/``
+    - ``"/reports/"``: everything below ``/reports/`` (not ``/reports``)
+    - ``"/"``: every path
+    - ``exact=["/"]``: only the path itself
+    """
+
+    def __init__(self, prefixes: Iterable[str] = (), exact: Iterable[str] = ()):
+        self._root = _Node()
+        self._empty = True
+        self._all = False
+        for prefix in prefixes:
+            self.add(prefix)
+        for path in exact:
+            self.add(path, prefix=False)
+
+    def add(self, path: str, prefix: bool = True):
+        """Add a path; ``prefix`` also matches its descendants"""
+        self._empty = False
+        if prefix and path == "/":
+            self._all = True
+            return
+        children_only = prefix and len(path) > 1 and path.endswith("/")
+        node = self._root
+        for segment in self._segments(path.rstrip("/") if children_only else path):
+            node = node.children.setdefault(segment, _Node())
+        if children_only:
+            node.subtree = True
+        else:
+            node.terminal = True
+            node.subtree = node.subtree or prefix
+
+    def match(self, path: str) -> bool:
+        """Whether the path equals or falls below a configured entry"""
+        if self._empty:
+            return False
+        if self._all:
+            return True
+        node: Optional[_Node] = self._root
+        for segment in self._segments(path):
+            if node.subtree and node is not self._root:
+                return True
+            node = node.children.get(segment)
+            if node is None:
+                return False
+        return node.terminal
+
+    __contains__ = match
+
+    @staticmethod
+    def _segments(path: str):
+        # "/a/b" -> ["a", "b"], "/" -> [""], "/a/" -> ["a", ""]
+        return path.split("/")[1:] if path.startswith("/") else path.split("/")
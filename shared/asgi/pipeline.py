@@ -0,0 +1,198 @@
+"""
+Fused ASGI middleware pipeline
+
+Every ``BaseHTTPMiddleware`` layer runs the rest of the app in a separate
+task and re-streams the response body through a memory channel, so a stack
+of five layers costs five tasks and five body copies per request and delays
+every SSE event and download chunk. ``FusedMiddleware`` instead runs a list of
+``Stage`` objects in a single ASGI call:
+
+- ``on_request``: in order, before the app; raise ``Reject`` to answer early
+- ``on_response``: on ``http.response.start``, may edit the raw header list
+- ``on_complete``: after the response (or failure), for metrics and audit
+
+The response body is passed through untouched. Each stage has its own skip
+paths compiled into a ``PathTrie``.
+"""
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .paths import PathTrie
+
+logger = logging.getLogger(__name__)
+
+RawHeaders = List[Tuple[bytes, bytes]]
+
+
+class Reject(Exception):
+    """Raised by a stage to answer the request without calling the app"""
+
+    def __init__(self, status_code: int, detail: Any, headers: Optional[Dict[str, str]] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.headers = headers or {}
+
+
+class RequestContext:
+    """Per-request values shared by all stages"""
+
+    __slots__ = ("scope", "method", "path", "state", "status_code", "started", "_headers", "_request")
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.method: str = scope["method"]
+        self.path: str = scope["path"]
+        # Same dict as ``request.state`` in endpoints
+        self.state: Dict[str, Any] = scope.setdefault("state", {})
+        self.status_code = 500
+        self.started = time.perf_counter()
+        self._headers: Optional[Dict[str, str]] = None
+        self._request: Optional[Request] = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Request headers, lower-cased names, decoded once"""
+        if self._headers is None:
+            self._headers = {
+                name.decode("latin-1"): value.decode("latin-1")
+                for name, value in self.scope.get("headers", [])
+            }
+        return self._headers
+
+    @property
+    def request(self) -> Request:
+        """A Starlette request over the same scope, for helpers that need one"""
+        if self._request is None:
+            self._request = Request(self.scope)
+        return self._request
+
+    @property
+    def client_host(self) -> Optional[str]:
+        client = self.scope.get("client")
+        return client[0] if client else None
+
+    @property
+    def duration(self) -> float:
+        return time.perf_counter() - self.started
+
+
+class Stage:
+    """
+    One concern of the fused pipeline
+
+    Subclasses override only the hooks they need; hooks that are not
+    overridden are never called.
+    """
+
+    name = "stage"
+    skip_paths: Sequence[str] = ()
+
+    def __init__(self, skip_paths: Optional[Iterable[str]] = None, skip_exact: Iterable[str] = ()):
+        self.skip = PathTrie(self.skip_paths if skip_paths is None else skip_paths, exact=skip_exact)
+
+    async def on_request(self, ctx: RequestContext) -> None:
+        pass
+
+    def on_response(self, ctx: RequestContext, headers: RawHeaders) -> None:
+        pass
+
+    def on_complete(self, ctx: RequestContext) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {}
+
+
+def _overrides(stage: Stage, hook: str) -> bool:
+    return getattr(type(stage), hook) is not getattr(Stage, hook)
+
+
+class FusedMiddleware:
+    """
+    Runs all stages in one pure ASGI middleware
+
+    Args:
+        app: ASGI application
+        stages: Stages in execution order (e.g. auth, tenant, audit, metrics)
+    """
+
+    def __init__(self, app: ASGIApp, stages: Sequence[Stage]):
+        self.app = app
+        self.stages = list(stages)
+        self._request_stages = [stage for stage in self.stages if _overrides(stage, "on_request")]
+        self._response_stages = [stage for stage in self.stages if _overrides(stage, "on_response")]
+        self._complete_stages = [stage for stage in self.stages if _overrides(stage, "on_complete")]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "lifespan":
+            await self.app(scope, receive, self._lifespan_send(send))
+            return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(scope)
+        path = ctx.path
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                ctx.status_code = message["status"]
+                if self._response_stages:
+                    headers = list(message.get("headers", []))
+                    for stage in self._response_stages:
+                        if not stage.skip.match(path):
+                            stage.on_response(ctx, headers)
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            try:
+                for stage in self._request_stages:
+                    if not stage.skip.match(path):
+                        await stage.on_request(ctx)
+            except Reject as rejection:
+                await self._reject(rejection, send_wrapper)
+                return
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            for stage in self._complete_stages:
+                if not stage.skip.match(path):
+                    try:
+                        stage.on_complete(ctx)
+                    except Exception as e:
+                        logger.error(f"{stage.name} stage failed: {str(e)}")
+
+    @staticmethod
+    async def _reject(rejection: Reject, send: Send):
+        body = json.dumps({"detail": rejection.detail}).encode("utf-8")
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ]
+        headers.extend(
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in rejection.headers.items()
+        )
+        await send({"type": "http.response.start", "status": rejection.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def _lifespan_send(self, send: Send) -> Send:
+        """Close stages (e.g. flush audit records) when the application shuts down"""
+        async def lifespan_send(message: Message):
+            if message["type"] == "lifespan.shutdown.complete":
+                for stage in self.stages:
+                    try:
+                        await stage.close()
+                    except Exception as e:
+                        logger.error(f"Failed to close {stage.name} stage: {str(e)}")
+            await send(message)
+        return lifespan_send
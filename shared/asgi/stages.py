@@ -0,0 +1,246 @@
+"""
+Stages for the fused middleware pipeline
+
+Service-specific logic (token verification, extra tenant checks) is passed
+in as callables, so each service keeps its own security module.
+"""
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from .pipeline import RawHeaders, Reject, RequestContext, Stage
+
+logger = logging.getLogger(__name__)
+
+# Paths that never require authentication
+PUBLIC_PATHS = (
+    "/health",
+    "/ready",
+    "/metrics",
+    "/docs",
+    "/openapi.json",
+    "/redoc",
+    "/favicon.ico",
+    "/static",
+    "/api/v1/internal",  # Inter-service communication
+)
+
+BEARER_CHALLENGE = {"WWW-Authenticate": "Bearer"}
+
+
+class AuthStage(Stage):
+    """
+    JWT authentication
+
+    Args:
+        authenticate: ``(ctx, authorization_header) -> claims`` returning the
+            request state to set (user_id, tenant_id, role_id, permissions,
+            is_super_user, ...) or raising ``Reject``; may be sync or async
+        on_missing: Called with the context when the header is missing
+        skip_paths: Path prefixes served without authentication
+        credentials: ``ctx -> credential`` passed to ``authenticate`` in place
+            of the Authorization header (e.g. to also accept a cookie)
+    """
+
+    name = "auth"
+    skip_paths = PUBLIC_PATHS
+
+    def __init__(
+        self,
+        authenticate: Callable[[RequestContext, str], Any],
+        on_missing: Optional[Callable[[RequestContext], None]] = None,
+        skip_paths: Optional[Iterable[str]] = None,
+        credentials: Optional[Callable[[RequestContext], Optional[str]]] = None,
+    ):
+        super().__init__(skip_paths)
+        self.authenticate = authenticate
+        self.on_missing = on_missing
+        self.credentials = credentials
+        self.stats = {"authenticated": 0, "rejected": 0}
+
+    async def on_request(self, ctx: RequestContext) -> None:
+        if self.credentials:
+            authorization = self.credentials(ctx)
+        else:
+            authorization = ctx.headers.get("authorization")
+        if not authorization:
+            self.stats["rejected"] += 1
+            if self.on_missing:
+                self.on_missing(ctx)
+            raise Reject(401, "Authorization header required", BEARER_CHALLENGE)
+
+        try:
+            claims = self.authenticate(ctx, authorization)
+            if inspect.isawaitable(claims):
+                claims = await claims
+        except Reject:
+            self.stats["rejected"] += 1
+            raise
+        ctx.state.update(claims)
+        self.stats["authenticated"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
+
+
+class TenantStage(Stage):
+    """
+    Tenant resolution from the authenticated claims
+
+    Sets ``validated_tenant_id``/``current_tenant_id`` and ``db_context`` in the
+    request state, rejects an ``X-Tenant-ID`` header that does not match the
+    token, and echoes the tenant in the response headers.
+
+    Args:
+        require_tenant: Reject requests without tenant context (401) instead
+            of passing them on for the endpoints to authorize
+        check: Optional ``async (ctx, tenant_id)`` hook for service checks
+        response_header: Add ``x-tenant-id`` to responses
+        skip_paths: Path prefixes without tenant context
+    """
+
+    name = "tenant"
+    skip_paths = PUBLIC_PATHS
+
+    def __init__(
+        self,
+        require_tenant: bool = False,
+        check: Optional[Callable[[RequestContext, str], Awaitable[None]]] = None,
+        response_header: bool = True,
+        skip_paths: Optional[Iterable[str]] = None,
+        skip_exact: Iterable[str] = (),
+    ):
+        super().__init__(skip_paths, skip_exact)
+        self.require_tenant = require_tenant
+        self.check = check
+        self.response_header = response_header
+
+    async def on_request(self, ctx: RequestContext) -> None:
+        state = ctx.state
+        tenant_id = state.get("tenant_id")
+        if not tenant_id:
+            if self.require_tenant:
+                logger.error(f"Request missing tenant context for {ctx.path}")
+                raise Reject(401, "Authentication required", BEARER_CHALLENGE)
+            return
+
+        header_tenant_id = ctx.headers.get("x-tenant-id")
+        if header_tenant_id and header_tenant_id != tenant_id:
+            logger.warning(f"Tenant mismatch: header={header_tenant_id}, token={tenant_id}")
+            raise Reject(403, "Tenant access denied")
+
+        if self.check:
+            await self.check(ctx, tenant_id)
+
+        state["validated_tenant_id"] = tenant_id
+        state["current_tenant_id"] = tenant_id
+        state["db_context"] = {
+            "tenant_id": tenant_id,
+            "is_super_user": state.get("is_super_user", False),
+            "user_id": state.get("user_id"),
+        }
+
+    def on_response(self, ctx: RequestContext, headers: RawHeaders) -> None:
+        tenant_id = ctx.state.get("tenant_id")
+        if self.response_header and tenant_id:
+            headers.append((b"x-tenant-id", str(tenant_id).encode("latin-1")))
+
+
+class MetricsStage(Stage):
+    """
+    Prometheus request count and duration
+
+    Args:
+        requests_total: Counter labelled (method, endpoint, status_code)
+        request_duration: Histogram labelled (method, endpoint)
+        endpoint_label: ``ctx -> label``; defaults to the matched route
+            template (``/api/v1/orders/{order_id}``), so ids do not become labels
+    """
+
+    name = "metrics"
+    skip_paths = ("/metrics",)
+
+    def __init__(
+        self,
+        requests_total,
+        request_duration,
+        endpoint_label: Optional[Callable[[RequestContext], str]] = None,
+        skip_paths: Optional[Iterable[str]] = None,
+    ):
+        super().__init__(skip_paths)
+        self.requests_total = requests_total
+        self.request_duration = request_duration
+        self.endpoint_label = endpoint_label or route_template
+
+    def on_complete(self, ctx: RequestContext) -> None:
+        endpoint = self.endpoint_label(ctx)
+        self.requests_total.labels(
+            method=ctx.method,
+            endpoint=endpoint,
+            status_code=str(ctx.status_code)
+        ).inc()
+        self.request_duration.labels(method=ctx.method, endpoint=endpoint).observe(ctx.duration)
+
+
+def route_template(ctx: RequestContext) -> str:
+    """Path template of the route the router matched (set in the scope by routing)"""
+    route = ctx.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class SecurityHeadersStage(Stage):
+    """
+    Security response headers
+
+    Args:
+        headers: Headers added to every response
+        api_headers: Headers added to responses under /api/ (e.g. no-store)
+        secure_cookies: Add Secure (https), HttpOnly and SameSite to cookies
+    """
+
+    name = "security_headers"
+
+    def __init__(
+        self,
+        headers: Dict[str, str],
+        api_headers: Optional[Dict[str, str]] = None,
+        secure_cookies: bool = False,
+        skip_paths: Optional[Iterable[str]] = None,
+    ):
+        super().__init__(skip_paths)
+        self.headers = self._encode(headers)
+        self.api_headers = self._encode(api_headers or {})
+        self._names = {name for name, _ in self.headers + self.api_headers} | {b"server", b"x-powered-by"}
+        self.secure_cookies = secure_cookies
+
+    @staticmethod
+    def _encode(headers: Dict[str, str]) -> RawHeaders:
+        return [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+
+    def on_response(self, ctx: RequestContext, headers: RawHeaders) -> None:
+        https = ctx.scope.get("scheme") == "https"
+        kept = []
+        for name, value in headers:
+            lowered = name.lower()
+            if lowered in self._names:
+                continue
+            if lowered == b"set-cookie" and self.secure_cookies:
+                value = self._secure_cookie(value, https)
+            kept.append((name, value))
+        kept.extend(self.headers)
+        if self.api_headers and ctx.path.startswith("/api/"):
+            kept.extend(self.api_headers)
+        if https:
+            kept.append((b"strict-transport-security", b"max-age=31536000; includeSubDomains"))
+        headers[:] = kept
+
+    @staticmethod
+    def _secure_cookie(cookie: bytes, https: bool) -> bytes:
+        lowered = cookie.lower()
+        if https and b"secure" not in lowered:
+            cookie += b"; Secure"
+        if b"httponly" not in lowered:
+            cookie += b"; HttpOnly"
+        if b"samesite" not in lowered:
+            cookie += b"; SameSite=Strict"
+        return cookie